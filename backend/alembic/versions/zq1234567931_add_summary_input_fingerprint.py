@@ -0,0 +1,52 @@
+"""Add input fingerprint to custom_summaries.
+
+Scheduled summaries skip all widget queries when the entities and facet
+values they reference are unchanged. The fingerprint is built from
+count + max(updated_at) per entity type and facet type, backed by:
+1. Entities: entity_type_id + updated_at
+2. FacetValues: facet_type_id + updated_at
+
+Revision ID: zq1234567931
+Revises: zp1234567930
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "zq1234567931"
+down_revision = "zp1234567930"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "custom_summaries",
+        sa.Column(
+            "last_input_fingerprint",
+            sa.String(64),
+            nullable=True,
+            comment="Fingerprint of referenced entities/facets at last execution (skips unchanged runs)",
+        ),
+    )
+
+    # Example: SELECT count(*), max(updated_at) FROM entities WHERE entity_type_id = ?
+    op.create_index(
+        "ix_entities_type_updated_at",
+        "entities",
+        ["entity_type_id", "updated_at"],
+    )
+
+    # Example: SELECT count(*), max(updated_at) FROM facet_values WHERE facet_type_id = ?
+    op.create_index(
+        "ix_facet_values_facet_type_updated_at",
+        "facet_values",
+        ["facet_type_id", "updated_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_facet_values_facet_type_updated_at", table_name="facet_values")
+    op.drop_index("ix_entities_type_updated_at", table_name="entities")
+    op.drop_column("custom_summaries", "last_input_fingerprint")
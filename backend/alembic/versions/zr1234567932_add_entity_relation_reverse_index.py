@@ -0,0 +1,31 @@
+"""Add reverse traversal index to entity_relations.
+
+Multi-hop Smart Queries resolve relation chains in a single statement that
+joins entity_relations once per hop. Forward hops (source -> target) are
+served by uq_entity_relation_type_source_target; this index serves reverse
+hops (target -> source) as index-only scans.
+
+Revision ID: zr1234567932
+Revises: zq1234567931
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "zr1234567932"
+down_revision = "zq1234567931"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Example: ... JOIN entity_relations r2 ON r2.relation_type_id = ? AND r2.target_entity_id = r1.source_entity_id
+    op.create_index(
+        "ix_entity_relations_type_target_source",
+        "entity_relations",
+        ["relation_type_id", "target_entity_id", "source_entity_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_entity_relations_type_target_source", table_name="entity_relations")
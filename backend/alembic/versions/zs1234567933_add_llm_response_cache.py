@@ -0,0 +1,67 @@
+"""Add llm_response_cache table and cache_hit to llm_usage_records.
+
+Document analysis responses are cached under a hash of model, prompt,
+analyzed text, temperature and response format. A second key based on the
+document file hash lets duplicate documents share one extraction.
+
+Revision ID: zs1234567933
+Revises: zr1234567932
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "zs1234567933"
+down_revision = "zr1234567932"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column(
+            "content_key",
+            sa.String(length=64),
+            nullable=True,
+            comment="Alternative key based on the document content hash",
+        ),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("prompt_hash", sa.String(length=64), nullable=False),
+        sa.Column("temperature", sa.Float(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False, comment="Raw completion content"),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+    # Example: SELECT ... FROM llm_response_cache WHERE cache_key = ? OR content_key = ?
+    op.create_index("ix_llm_response_cache_content_key", "llm_response_cache", ["content_key"])
+    # Example: DELETE FROM llm_response_cache WHERE created_at < ?
+    op.create_index("ix_llm_response_cache_created_at", "llm_response_cache", ["created_at"])
+
+    op.add_column(
+        "llm_usage_records",
+        sa.Column(
+            "cache_hit",
+            sa.Boolean(),
+            nullable=True,
+            comment="Whether the response was served from the LLM response cache",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("llm_usage_records", "cache_hit")
+    op.drop_index("ix_llm_response_cache_created_at", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_content_key", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
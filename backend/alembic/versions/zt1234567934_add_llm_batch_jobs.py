@@ -0,0 +1,64 @@
+"""Add llm_batch_jobs table.
+
+Bulk document analyses are submitted to the provider batch endpoint. Each
+row tracks one submitted JSONL file and maps its request ids back to the
+documents, so a beat task can feed the results into the extraction pipeline.
+
+Revision ID: zt1234567934
+Revises: zs1234567933
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "zt1234567934"
+down_revision = "zs1234567933"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_batch_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("purpose", sa.String(length=50), nullable=False, comment="Result handler, e.g. document_analysis"),
+        sa.Column("backend", sa.String(length=20), nullable=False, comment="openai or local"),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("provider_batch_id", sa.String(length=255), nullable=True),
+        sa.Column(
+            "status",
+            sa.String(length=20),
+            nullable=False,
+            server_default="pending",
+            comment="pending, submitted, in_progress, completed, failed, expired, cancelled",
+        ),
+        sa.Column("items", postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default="{}"),
+        sa.Column("input_file_path", sa.Text(), nullable=True),
+        sa.Column("output_file_id", sa.String(length=255), nullable=True),
+        sa.Column("error_file_id", sa.String(length=255), nullable=True),
+        sa.Column("request_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Example: SELECT ... FROM llm_batch_jobs WHERE provider_batch_id = ?
+    op.create_index("ix_llm_batch_jobs_provider_batch_id", "llm_batch_jobs", ["provider_batch_id"])
+    # Example: SELECT ... FROM llm_batch_jobs WHERE status IN ('submitted', 'in_progress') ORDER BY created_at
+    op.create_index("ix_llm_batch_jobs_status_created", "llm_batch_jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_batch_jobs_status_created", table_name="llm_batch_jobs")
+    op.drop_index("ix_llm_batch_jobs_provider_batch_id", table_name="llm_batch_jobs")
+    op.drop_table("llm_batch_jobs")
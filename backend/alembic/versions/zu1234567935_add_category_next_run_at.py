@@ -0,0 +1,45 @@
+"""Add next_run_at to categories for the indexed crawl scheduler.
+
+The crawl scheduler stores the next cron fire per category and selects only
+due categories through a partial index instead of evaluating every schedule
+on every tick. Existing rows start with NULL, which the scheduler treats as
+due, so all enabled schedules are evaluated once on the first tick.
+
+Revision ID: zu1234567935
+Revises: zt1234567934
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "zu1234567935"
+down_revision = "zt1234567934"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "categories",
+        sa.Column(
+            "next_run_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Next scheduled crawl run; NULL lets the scheduler evaluate the category on its next tick",
+        ),
+    )
+
+    # Example: SELECT ... FROM categories WHERE schedule_enabled IS true AND next_run_at <= now()
+    #          FOR UPDATE SKIP LOCKED
+    op.create_index(
+        "ix_categories_schedule_due",
+        "categories",
+        ["next_run_at"],
+        postgresql_where=sa.text("schedule_enabled IS TRUE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_categories_schedule_due", table_name="categories")
+    op.drop_column("categories", "next_run_at")
@@ -0,0 +1,67 @@
+"""Add crawl_url_states for incremental website recrawls.
+
+Stores ETag, Last-Modified, content hash, discovered links and change
+counters per crawled URL so recrawls can revalidate pages with conditional
+requests and skip documents that are already registered.
+
+Revision ID: zv1234567936
+Revises: zu1234567935
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "zv1234567936"
+down_revision = "zu1234567935"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crawl_url_states",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "source_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("data_sources.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "category_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("categories.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("url_hash", sa.String(64), nullable=False, comment="SHA256 of the URL"),
+        sa.Column(
+            "is_document",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+            comment="Linked document (registered, never fetched by the crawler) instead of an HTML page",
+        ),
+        sa.Column("etag", sa.Text(), nullable=True),
+        sa.Column("last_modified", sa.Text(), nullable=True),
+        sa.Column("content_hash", sa.String(64), nullable=True),
+        sa.Column(
+            "links",
+            postgresql.JSONB(),
+            nullable=True,
+            comment="Same-domain links found on the page, followed when the page is not modified",
+        ),
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("last_changed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("check_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("change_count", sa.Integer(), nullable=False, server_default="0"),
+        # Example: SELECT ... FROM crawl_url_states WHERE source_id = :source AND category_id = :category
+        sa.UniqueConstraint("source_id", "category_id", "url_hash", name="uq_crawl_url_state"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("crawl_url_states")
@@ -0,0 +1,34 @@
+"""Add config_fingerprint to crawl_url_states.
+
+Pages processed with different HTML capture settings (category search
+terms, relevance threshold) must be fetched and checked again instead of
+being revalidated from the stored state.
+
+Revision ID: zw1234567937
+Revises: zv1234567936
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "zw1234567937"
+down_revision = "zv1234567936"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "crawl_url_states",
+        sa.Column(
+            "config_fingerprint",
+            sa.String(64),
+            nullable=True,
+            comment="Fingerprint of the capture settings the page was last processed with",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("crawl_url_states", "config_fingerprint")
@@ -42,6 +42,7 @@ from app.models.user_api_credentials import (
 )
 from app.services.audit_service import create_audit_log
 from services.credentials_resolver import ensure_search_credential_from_purpose
+from services.llm_client_service import invalidate_llm_config_cache
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -239,6 +240,7 @@ async def save_credential(
     )
 
     await session.commit()
+    invalidate_llm_config_cache()
 
     logger.info(
         "credential_saved",
@@ -476,6 +478,7 @@ async def delete_credential(
 
     await session.delete(cred)
     await session.commit()
+    invalidate_llm_config_cache()
 
     logger.info(
         "credential_deleted",
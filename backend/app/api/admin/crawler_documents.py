@@ -23,6 +23,7 @@ class BulkDocumentActionRequest(BaseModel):
 
     document_ids: list[UUID] = Field(..., min_length=1, description="Document IDs to process")
     skip_relevance_check: bool = Field(default=False, description="Skip relevance pre-filter for analysis")
+    force_reanalysis: bool = Field(default=False, description="Bypass the LLM response cache")
 
 
 class BulkDocumentActionResponse(BaseModel):
@@ -63,6 +64,7 @@ async def process_document(
 async def analyze_document(
     document_id: UUID,
     skip_relevance_check: bool = Query(default=False, description="Skip relevance pre-filter"),
+    force_reanalysis: bool = Query(default=False, description="Bypass the LLM response cache"),
     session: AsyncSession = Depends(get_session),
     _: User = Depends(require_editor),
 ):
@@ -83,7 +85,11 @@ async def analyze_document(
         await session.commit()
 
     # Queue for AI analysis
-    analyze_doc_task.delay(str(document_id), skip_relevance_check=skip_relevance_check)
+    analyze_doc_task.delay(
+        str(document_id),
+        skip_relevance_check=skip_relevance_check,
+        force_reanalysis=force_reanalysis,
+    )
 
     return MessageResponse(message="Document queued for AI analysis")
 
@@ -160,7 +166,10 @@ async def bulk_analyze_documents(
     # Dispatch tasks in parallel using Celery group
     if eligible:
         skip_check = payload.skip_relevance_check
-        task_group = group(analyze_doc_task.s(str(doc.id), skip_relevance_check=skip_check) for doc in eligible)
+        force = payload.force_reanalysis
+        task_group = group(
+            analyze_doc_task.s(str(doc.id), skip_relevance_check=skip_check, force_reanalysis=force) for doc in eligible
+        )
         task_group.apply_async()
 
     return BulkDocumentActionResponse(
@@ -18,7 +18,7 @@ from sqlalchemy.orm import selectinload
 from app.core.deps import require_editor
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.rate_limit import check_rate_limit
-from app.database import get_session
+from app.database import async_session_factory, get_session
 from app.models import (
     CustomSummary,
     SummaryExecution,
@@ -649,7 +649,7 @@ async def execute_summary(
     if not summary or summary.user_id != current_user.id:
         raise NotFoundError("Zusammenfassung", str(summary_id))
 
-    executor = SummaryExecutor(session)
+    executor = SummaryExecutor(session, session_factory=async_session_factory)
     execution = await executor.execute_summary(
         summary_id=summary_id,
         triggered_by="manual",
@@ -45,6 +45,7 @@ from app.models.user_api_credentials import (
 )
 from app.services.audit_service import create_audit_log
 from services.credentials_resolver import get_search_api_config
+from services.llm_client_service import invalidate_llm_config_cache
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -404,6 +405,7 @@ async def save_purpose_config(
     )
 
     await session.commit()
+    invalidate_llm_config_cache()
 
     purpose_name = PURPOSE_DESCRIPTIONS.get(llm_purpose, {}).get(
         f"name_{current_user.language or 'de'}",
@@ -460,6 +462,7 @@ async def delete_purpose_config(
 
     await session.delete(config)
     await session.commit()
+    invalidate_llm_config_cache()
 
     logger.info(
         "llm_config_deleted",
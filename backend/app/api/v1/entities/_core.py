@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
 from app.core.audit import AuditContext  # noqa: E402
 from app.core.cache_headers import cache_for_detail  # noqa: E402
 from app.core.deps import require_editor  # noqa: E402
+from app.core.responses import ModelResponse  # noqa: E402
 from app.database import get_session  # noqa: E402
 from app.models import Entity, EntityRelation, EntityType, FacetValue  # noqa: E402
 from app.models.audit_log import AuditAction  # noqa: E402
@@ -72,7 +73,7 @@ async def list_entities(
     ] = None,
     sort_order: Annotated[str | None, Query(description="Sort order (asc, desc)")] = "asc",
     session: AsyncSession = Depends(get_session),
-) -> EntityListResponse:
+) -> ModelResponse:
     """List entities with filters."""
     from sqlalchemy.orm import selectinload
 
@@ -225,12 +226,14 @@ async def list_entities(
     entities = result.scalars().all()
 
     if not entities:
-        return EntityListResponse(
-            items=[],
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=(total + per_page - 1) // per_page if per_page > 0 else 0,
+        return ModelResponse(
+            EntityListResponse(
+                items=[],
+                total=total,
+                page=page,
+                per_page=per_page,
+                pages=(total + per_page - 1) // per_page if per_page > 0 else 0,
+            )
         )
 
     # Collect entity IDs for batch queries
@@ -313,12 +316,15 @@ async def list_entities(
             item.parent_name = parent_names_map[entity.parent_id]["name"]
         items.append(item)
 
-    return EntityListResponse(
-        items=items,
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=(total + per_page - 1) // per_page if per_page > 0 else 0,
+    # Serialized directly by pydantic-core; response_model only documents the schema
+    return ModelResponse(
+        EntityListResponse(
+            items=items,
+            total=total,
+            page=page,
+            per_page=per_page,
+            pages=(total + per_page - 1) // per_page if per_page > 0 else 0,
+        )
     )
 
 
@@ -922,7 +928,6 @@ async def _build_entity_response(
 @router.get("/{entity_id}", response_model=EntityResponse)
 async def get_entity(
     entity_id: UUID,
-    response: Response,
     session: AsyncSession = Depends(get_session),
 ):
     """Get a single entity by ID."""
@@ -931,8 +936,8 @@ async def get_entity(
         raise NotFoundError("Entity", str(entity_id))
 
     entity_type = await session.get(EntityType, entity.entity_type_id)
-    result = await _build_entity_response(entity, entity_type, session)
-    cache_for_detail(response, result.model_dump())
+    result = ModelResponse(await _build_entity_response(entity, entity_type, session))
+    cache_for_detail(result, result.body)
     return result
 
 
@@ -940,7 +945,6 @@ async def get_entity(
 async def get_entity_by_slug(
     entity_type_slug: str,
     entity_slug: str,
-    response: Response,
     session: AsyncSession = Depends(get_session),
 ):
     """Get an entity by type slug and entity slug."""
@@ -958,8 +962,8 @@ async def get_entity_by_slug(
     if not entity:
         raise NotFoundError("Entity", f"{entity_type_slug}/{entity_slug}")
 
-    result = await _build_entity_response(entity, entity_type, session)
-    cache_for_detail(response, result.model_dump())
+    result = ModelResponse(await _build_entity_response(entity, entity_type, session))
+    cache_for_detail(result, result.body)
     return result
 
 
@@ -1,13 +1,19 @@
 """API endpoints for Facet Value Full-Text Search."""
 
+import base64
+import binascii
+import json
 import time
+from typing import Any
 from uuid import UUID
 
+import structlog
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from sqlalchemy import Float, Select, cast, func, literal, select, text, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.exceptions import ValidationError
 from app.database import get_session
 from app.models import (
     FacetType,
@@ -19,6 +25,129 @@ from app.schemas.facet_value import (
 )
 
 router = APIRouter()
+logger = structlog.get_logger()
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=50, MinWords=20"
+
+# Reciprocal rank fusion: score = sum(1 / (RRF_K + position)) over both rankings
+RRF_K = 60
+# Candidates taken from each ranking before fusion (also the HNSW ef_search)
+HYBRID_CANDIDATES = 200
+
+
+def encode_cursor(score: float, facet_value_id: UUID) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = json.dumps({"s": score, "id": str(facet_value_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, UUID]:
+    """Decode a cursor created by encode_cursor."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(payload["s"]), UUID(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid cursor") from None
+
+
+def _filters(entity_id: UUID | None, facet_type_slug: str | None) -> list[Any]:
+    clauses: list[Any] = [FacetValue.is_active.is_(True)]
+    if entity_id:
+        clauses.append(FacetValue.entity_id == entity_id)
+    if facet_type_slug:
+        clauses.append(FacetValue.facet_type_id.in_(select(FacetType.id).where(FacetType.slug == facet_type_slug)))
+    return clauses
+
+
+def fulltext_ranking(search_query, filters: list[Any], after: tuple[float, UUID] | None, with_total: bool) -> Select:
+    """
+    Rank the matching facet values by ts_rank (ids and scores only).
+
+    The match uses the GIN index on search_vector; no headline is computed here.
+    """
+    rank = func.ts_rank(FacetValue.search_vector, search_query)
+    columns = [FacetValue.id.label("id"), rank.label("score")]
+    if with_total:
+        columns.append(func.count().over().label("total"))
+    query = select(*columns).where(FacetValue.search_vector.op("@@")(search_query), *filters)
+    if after:
+        query = query.where(tuple_(rank, FacetValue.id) < tuple_(literal(after[0], Float), literal(after[1])))
+    return query.order_by(rank.desc(), FacetValue.id.desc())
+
+
+def hybrid_ranking(
+    search_query,
+    embedding: list[float],
+    filters: list[Any],
+    after: tuple[float, UUID] | None,
+    with_total: bool,
+) -> Select:
+    """
+    Fuse the full-text and the embedding ranking by reciprocal rank fusion.
+
+    Each ranking contributes its top HYBRID_CANDIDATES; the vector ranking
+    uses the HNSW index on text_embedding.
+    """
+    rank = func.ts_rank(FacetValue.search_vector, search_query)
+    fulltext = (
+        select(
+            FacetValue.id.label("id"),
+            func.row_number().over(order_by=(rank.desc(), FacetValue.id.desc())).label("position"),
+        )
+        .where(FacetValue.search_vector.op("@@")(search_query), *filters)
+        .order_by(rank.desc(), FacetValue.id.desc())
+        .limit(HYBRID_CANDIDATES)
+    )
+
+    distance = FacetValue.text_embedding.cosine_distance(embedding)
+    nearest = (
+        select(FacetValue.id.label("id"), distance.label("distance"))
+        .where(FacetValue.text_embedding.isnot(None), *filters)
+        .order_by(distance)
+        .limit(HYBRID_CANDIDATES)
+        .subquery("nearest")
+    )
+    vector = select(nearest.c.id, func.row_number().over(order_by=nearest.c.distance).label("position"))
+
+    candidates = union_all(fulltext, vector).subquery("candidates")
+    score = cast(func.sum(literal(1.0) / (RRF_K + candidates.c.position)), Float)
+    columns = [candidates.c.id.label("id"), score.label("score")]
+    if with_total:
+        columns.append(func.count().over().label("total"))
+    query = select(*columns).group_by(candidates.c.id)
+    if after:
+        query = query.having(tuple_(score, candidates.c.id) < tuple_(literal(after[0], Float), literal(after[1])))
+    return query.order_by(score.desc(), candidates.c.id.desc())
+
+
+def page_query(ranking: Select, search_query, limit: int, offset: int = 0) -> Select:
+    """
+    Load one page of a ranking with headlines.
+
+    ts_headline re-parses the text, so it is evaluated only for the rows of the page.
+    """
+    ranked = ranking.offset(offset).limit(limit).subquery("ranked")
+    headline = func.ts_headline("german", FacetValue.text_representation, search_query, HEADLINE_OPTIONS)
+    total = ranked.c.total if "total" in ranked.c else literal(None).label("total")
+    return (
+        select(FacetValue, ranked.c.score, headline.label("headline"), total)
+        .join(ranked, FacetValue.id == ranked.c.id)
+        .order_by(ranked.c.score.desc(), ranked.c.id.desc())
+        .options(
+            selectinload(FacetValue.entity),
+            selectinload(FacetValue.facet_type),
+        )
+    )
+
+
+def count_query(ranking: Select) -> Select:
+    """
+    Count all rows of a ranking.
+
+    Needed for an OFFSET page behind the last one, which has no row to carry
+    the window count.
+    """
+    return select(func.count()).select_from(ranking.order_by(None).subquery("matches"))
 
 
 @router.get("/search", response_model=FacetValueSearchResponse)
@@ -26,8 +155,10 @@ async def search_facet_values(
     q: str = Query(..., min_length=2, description="Search query"),
     entity_id: UUID | None = Query(default=None, description="Filter by entity"),
     facet_type_slug: str | None = Query(default=None, description="Filter by facet type"),
-    page: int = Query(default=1, ge=1, description="Page number"),
+    page: int = Query(default=1, ge=1, description="Page number (ignored with cursor)"),
     per_page: int = Query(default=20, ge=1, le=100, description="Results per page"),
+    cursor: str | None = Query(default=None, description="next_cursor of the previous page"),
+    semantic: bool = Query(default=False, description="Fuse with embedding similarity (hybrid search)"),
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -39,63 +170,49 @@ async def search_facet_values(
     Features:
     - German language stemming and normalization
     - Relevance-based ranking
-    - Highlighted search matches
+    - Highlighted search matches (computed for the returned page only)
+    - Keyset pagination via next_cursor (the total is only counted for page requests)
+    - Optional hybrid ranking with embedding similarity (reciprocal rank fusion);
+      falls back to full-text ranking if no query embedding is available
     """
     start_time = time.time()
 
-    # Build the search query with ts_rank for relevance scoring
     search_query = func.plainto_tsquery("german", q)
+    after = decode_cursor(cursor) if cursor else None
+    offset = 0 if after else (page - 1) * per_page
+    filters = _filters(entity_id, facet_type_slug)
 
-    # Build base query with ranking
-    query = (
-        select(
-            FacetValue,
-            func.ts_rank(FacetValue.search_vector, search_query).label("rank"),
-            func.ts_headline(
-                "german",
-                FacetValue.text_representation,
-                search_query,
-                "StartSel=<mark>, StopSel=</mark>, MaxWords=50, MinWords=20",
-            ).label("headline"),
-        )
-        .where(FacetValue.search_vector.op("@@")(search_query))
-        .where(FacetValue.is_active.is_(True))
-    )
-
-    # Apply filters
-    if entity_id:
-        query = query.where(FacetValue.entity_id == entity_id)
-    if facet_type_slug:
-        subq = select(FacetType.id).where(FacetType.slug == facet_type_slug)
-        query = query.where(FacetValue.facet_type_id.in_(subq))
+    embedding = None
+    if semantic:
+        from app.utils.similarity import generate_embedding
 
-    # Order by rank (highest first) with pagination
-    query = query.order_by(func.ts_rank(FacetValue.search_vector, search_query).desc())
-    query = query.offset((page - 1) * per_page).limit(per_page)
+        embedding = await generate_embedding(q, session=session)
+        if embedding is None:
+            logger.info("facet_search_semantic_unavailable", query=q)
 
-    # Execute with eager loading
-    query = query.options(
-        selectinload(FacetValue.entity),
-        selectinload(FacetValue.facet_type),
-    )
+    if embedding is not None:
+        mode = "hybrid"
+        ranking = hybrid_ranking(search_query, embedding, filters, after, with_total=after is None)
+        # Let the HNSW scan return enough candidates (default ef_search is 40)
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {HYBRID_CANDIDATES}"))
+    else:
+        mode = "fulltext"
+        ranking = fulltext_ranking(search_query, filters, after, with_total=after is None)
 
-    result = await session.execute(query)
+    # One row more than the page tells whether there is a next page
+    result = await session.execute(page_query(ranking, search_query, per_page + 1, offset))
     rows = result.all()
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
 
-    # Count total matches (without limit)
-    count_query = (
-        select(func.count())
-        .select_from(FacetValue)
-        .where(FacetValue.search_vector.op("@@")(search_query))
-        .where(FacetValue.is_active.is_(True))
-    )
-    if entity_id:
-        count_query = count_query.where(FacetValue.entity_id == entity_id)
-    if facet_type_slug:
-        subq = select(FacetType.id).where(FacetType.slug == facet_type_slug)
-        count_query = count_query.where(FacetValue.facet_type_id.in_(subq))
-
-    total = (await session.execute(count_query)).scalar() or 0
+    total = None
+    if after is None and rows:
+        total = rows[0].total
+    elif after is None and page == 1:
+        total = 0
+    elif after is None:
+        # Page past the last one: no row carries the window count
+        total = await session.scalar(count_query(ranking))
 
     # Build response
     items = []
@@ -123,8 +240,11 @@ async def search_facet_values(
             )
         )
 
+    next_cursor = encode_cursor(rows[-1][1], rows[-1][0].id) if has_next else None
     search_time_ms = (time.time() - start_time) * 1000
-    pages = (total + per_page - 1) // per_page if total > 0 else 1
+    pages = None
+    if total is not None:
+        pages = (total + per_page - 1) // per_page if total > 0 else 1
 
     return FacetValueSearchResponse(
         items=items,
@@ -133,5 +253,7 @@ async def search_facet_values(
         per_page=per_page,
         pages=pages,
         query=q,
+        mode=mode,
+        next_cursor=next_cursor,
         search_time_ms=round(search_time_ms, 2),
     )
@@ -56,6 +56,11 @@ class Settings(BaseSettings):
     # Report-only mode: logs violations without blocking (useful for testing)
     csp_report_only: bool = False
 
+    # Authenticated principal cache (per API process, invalidated via Redis pub/sub)
+    auth_principal_cache_enabled: bool = True
+    auth_principal_cache_ttl_seconds: int = 30
+    auth_principal_cache_size: int = 10000
+
     @model_validator(mode="after")
     def validate_production_settings(self) -> "Settings":
         """Validate critical settings for production environment."""
@@ -117,6 +122,8 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     celery_broker_url: str = "redis://localhost:6379/1"
     celery_result_backend: str = "redis://localhost:6379/2"
+    # One event loop and database engine per worker process (False: a new loop per task)
+    celery_persistent_event_loop: bool = True
 
     # Azure Document Intelligence (system-level, not per-user)
     azure_document_intelligence_endpoint: str = ""
@@ -136,6 +143,12 @@ class Settings(BaseSettings):
     attachment_stream_threshold_mb: int = 5  # Stream to disk if file > 5MB
     attachment_temp_dir: str | None = None  # None = system temp directory
 
+    # Summary Exports
+    export_render_workers: int = 2  # WeasyPrint render processes per API process
+    export_cache_path: str = "./storage/export_cache"  # Rendered PDF/XLSX files
+    export_cache_ttl_seconds: int = 86400  # 24 hours
+    export_map_boundaries_path: str | None = None  # Optional GeoJSON drawn beneath export maps
+
     # PySis Integration
     pysis_api_base_url: str = "https://pisys.caeli-wind.de/api/pisys/v1"
     pysis_tenant_id: str = ""
@@ -162,6 +175,38 @@ class Settings(BaseSettings):
     ai_discovery_max_extraction_pages: int = 10
     ai_discovery_timeout: int = 60
 
+    # LLM Rate Governor (cluster-wide token bucket per model / deployment)
+    llm_governor_enabled: bool = True
+    llm_governor_tokens_per_minute: int = 240000  # Deployment TPM quota
+    llm_governor_requests_per_minute: int = 1440  # Deployment RPM quota
+    llm_governor_max_wait_seconds: int = 120  # Send anyway after waiting this long
+    llm_governor_model_limits: dict[str, tuple[int, int]] = {}  # model -> (TPM, RPM) overrides
+
+    # Document Analysis (long texts are analyzed in chunks and merged)
+    ai_analysis_chunk_tokens: int = 12000  # Token budget per chunk
+    ai_analysis_chunk_concurrency: int = 4  # Parallel chunk requests per document
+
+    # Assistant Intent Classification (rules -> embedding kNN -> LLM)
+    assistant_intent_local_enabled: bool = True
+    assistant_intent_knn_k: int = 5  # Nearest example utterances per vote
+    assistant_intent_knn_threshold: float = 0.8  # Below this confidence the LLM classifies
+    assistant_speculation_enabled: bool = True  # Streaming: run likely handler work during classification
+
+    # PySis Field Extraction (several fields per LLM request)
+    pysis_extraction_batch_tokens: int = 8000  # Field instructions + expected answers per request
+    pysis_extraction_concurrency: int = 4  # Parallel requests per process
+
+    # LLM Response Cache (content-addressed document analysis results)
+    llm_response_cache_enabled: bool = True
+    llm_response_cache_ttl_days: int = 90
+
+    # LLM Batch Inference (bulk analyses via the provider batch endpoint)
+    llm_batch_enabled: bool = False  # Requires a batch deployment (Azure: GlobalBatch)
+    llm_batch_backend: str = "openai"  # "openai" or "local" (file-based stand-in)
+    llm_batch_deployment: str | None = None  # Batch deployment name (default: analysis model)
+    llm_batch_storage_path: str = "./storage/llm_batches"
+    llm_batch_max_requests: int = 1000  # Requests per batch file
+
     # API Settings
     api_v1_prefix: str = "/api/v1"
     admin_api_prefix: str = "/api/admin"
@@ -177,11 +222,16 @@ class Settings(BaseSettings):
     smtp_use_tls: bool = True
     smtp_use_ssl: bool = False
     smtp_timeout: int = 30
+    # Connection pool per worker process and SMTP server
+    smtp_pool_size: int = 3  # Concurrent SMTP sessions per server
+    smtp_max_messages_per_connection: int = 100  # Reconnect after this many messages (provider session limits)
+    smtp_max_messages_per_second: float = 10.0  # Per server and process, 0 = unlimited
 
     # Notification Settings
     notification_batch_size: int = 100
     notification_retry_max: int = 3
     notification_retry_delay: int = 300  # seconds
+    notification_sse_queue_size: int = 64  # Buffered events per SSE client, oldest dropped when full
 
     # Logging
     log_level: str = "INFO"
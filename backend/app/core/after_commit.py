@@ -0,0 +1,59 @@
+"""
+Non-blocking follow-up work of database commits.
+
+SQLAlchemy session events (after_commit) run synchronously - for an
+AsyncSession inside the event loop. Redis calls made there would block the
+loop on every commit, so the listeners of app.core.data_versions and
+app.core.principal_cache hand their coroutine to run_after_commit(), which
+schedules it as a task on the running loop.
+
+The Celery worker loop only runs while a task executes, so run_async waits
+for the scheduled work (wait_for_after_commit_tasks) before a task returns.
+Outside an event loop (sync sessions in scripts) the coroutine is run to
+completion right away.
+"""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Scheduled tasks (strong references until they are done)
+_pending: set[asyncio.Task] = set()
+
+
+def run_after_commit(coro: Coroutine[Any, Any, Any]) -> None:
+    """
+    Run a coroutine after a commit without blocking the caller.
+
+    Args:
+        coro: Coroutine to run; it must handle its own errors
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(coro)
+        return
+
+    task = loop.create_task(coro)
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def wait_for_after_commit_tasks(timeout: float = 2.0) -> None:
+    """
+    Wait for the work scheduled by run_after_commit() on the running loop.
+
+    Args:
+        timeout: Maximum seconds to wait; unfinished tasks keep running
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _pending if task.get_loop() is loop]
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    if pending:
+        logger.warning("after_commit_tasks_pending", count=len(pending))
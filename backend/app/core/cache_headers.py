@@ -36,15 +36,16 @@ def generate_etag(data: Any) -> str:
     not cryptographic security.
 
     Args:
-        data: The response data to hash
+        data: The response data to hash, or an already serialized response body
 
     Returns:
         ETag string (quoted as per HTTP spec)
     """
     try:
-        serialized = json.dumps(data, sort_keys=True, default=str)
+        # A rendered body is hashed as-is instead of being serialized again
+        serialized = data if isinstance(data, bytes) else json.dumps(data, sort_keys=True, default=str).encode()
         # MD5 is fine for ETags - only used for change detection, not security
-        hash_digest = hashlib.md5(serialized.encode(), usedforsecurity=False).hexdigest()[:16]
+        hash_digest = hashlib.md5(serialized, usedforsecurity=False).hexdigest()[:16]
         return f'"{hash_digest}"'
     except (TypeError, ValueError):
         # Fallback for non-serializable data
@@ -0,0 +1,44 @@
+"""
+Response compression middleware.
+
+Wraps Starlette's GZipMiddleware so that streaming media types are sent
+uncompressed. A gzip stream only flushes whole deflate blocks, which holds
+Server-Sent Events back until enough data has accumulated and breaks the
+live progress updates of the assistant, smart query and crawler streams.
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Media types that are passed through without compression
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+
+
+class StreamingAwareGZipResponder(GZipResponder):
+    """GZip responder that leaves streaming media types untouched."""
+
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(UNCOMPRESSED_MEDIA_TYPES):
+                # Same pass-through path as an already encoded response
+                self.content_encoding_set = True
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip compression that skips Server-Sent Events.
+
+    Drop-in replacement for ``GZipMiddleware`` with the same arguments.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = StreamingAwareGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
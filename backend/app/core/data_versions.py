@@ -0,0 +1,303 @@
+"""
+Data versions for exact cache invalidation.
+
+Every write to entities, facet values, relations or the type schema bumps a
+Redis counter ("data version") for the scope it touches. Caches that key
+their entries by the versions of the scopes they read (e.g. smart query
+results) are invalidated exactly on the next write - no TTL guessing.
+
+Scopes:
+- entity_type:<id>  ORM writes to entities of that entity type
+- entity_type:*     bulk INSERT/UPDATE/DELETE statements on entities (type unknown)
+- entities          any write to entities
+- facet_type:<id>   ORM writes to facet values of that facet type
+- facet_type:*      bulk INSERT/UPDATE/DELETE statements on facet values
+- facet_values      any write to facet values
+- relations         any write to entity relations
+- schema            entity/facet/relation types and categories
+- notification_rules  notification rules and the notification settings of users
+- llm_config        LLM purpose configs and API credentials of users
+
+Versions are bumped from SQLAlchemy session events after a successful
+commit, so all write paths (API, Smart Query writes, Celery workers) are
+covered without touching them individually. The bump runs as a task on the
+event loop of the session (app.core.after_commit), so commits never wait
+for Redis. Raw SQL writes bypass the ORM and are not tracked; caches keep a
+TTL as safety net.
+"""
+
+import asyncio
+import weakref
+from collections.abc import Iterable
+from typing import Any
+
+import structlog
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.config import settings
+from app.core.after_commit import run_after_commit
+
+logger = structlog.get_logger(__name__)
+
+# Redis key prefix for data version counters
+VERSION_PREFIX = "dv:"
+
+SCOPE_ENTITIES = "entities"
+SCOPE_FACET_VALUES = "facet_values"
+SCOPE_RELATIONS = "relations"
+SCOPE_SCHEMA = "schema"
+SCOPE_ALL_ENTITY_TYPES = "entity_type:*"
+SCOPE_ALL_FACET_TYPES = "facet_type:*"
+SCOPE_NOTIFICATION_RULES = "notification_rules"
+SCOPE_LLM_CONFIG = "llm_config"
+
+# Attributes the compiled notification rule index depends on
+_RULE_INDEX_ATTRIBUTES = ("user_id", "is_active", "event_type", "channel", "conditions")
+_USER_NOTIFICATION_ATTRIBUTES = ("is_active", "notifications_enabled")
+# Attributes resolved LLM configs depend on (not the usage bookkeeping)
+_LLM_CONFIG_ATTRIBUTES = ("user_id", "purpose", "provider", "encrypted_data", "is_active")
+_API_CREDENTIAL_ATTRIBUTES = ("user_id", "credential_type", "encrypted_data", "is_active")
+
+# Key in Session.info collecting the scopes changed in the current transaction
+_SESSION_INFO_KEY = "changed_data_scopes"
+
+# Async Redis clients for version bumps and reads by event loop (created
+# lazily; a Celery worker process reuses the client of its worker loop)
+_redis_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+# Client override for all loops (tests / custom setups)
+_redis_client: Any = None
+_listeners_registered = False
+
+
+def entity_type_scope(entity_type_id: Any) -> str:
+    """Scope of all entities of an entity type."""
+    return f"entity_type:{entity_type_id}"
+
+
+def facet_type_scope(facet_type_id: Any) -> str:
+    """Scope of all facet values of a facet type."""
+    return f"facet_type:{facet_type_id}"
+
+
+def _get_redis_client():
+    """Get the async Redis client of the running event loop."""
+    if _redis_client is not None:
+        return _redis_client
+    # Redis connections are bound to the event loop they were opened in
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.get(loop)
+    if client is None:
+        import redis.asyncio as redis
+
+        client = redis.from_url(
+            settings.redis_url,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+        _redis_clients[loop] = client
+    return client
+
+
+def set_data_version_client(client: Any) -> None:
+    """Set the async Redis client used for version bumps (tests / custom setups)."""
+    global _redis_client
+    _redis_client = client
+
+
+def _attribute_values(obj: Any, attribute: str) -> set[Any]:
+    """Return the current and (if changed) previous value of an attribute."""
+    values = {getattr(obj, attribute, None)}
+    try:
+        history = inspect(obj).attrs[attribute].history
+        values.update(history.deleted or ())
+    except Exception:  # noqa: S110 - transient objects have no history
+        pass
+    values.discard(None)
+    return values
+
+
+def _is_changed(obj: Any, attributes: tuple[str, ...]) -> bool:
+    """True if the object is new or deleted, or one of the attributes changed."""
+    state = inspect(obj)
+    if state.transient or state.pending or (state.session is not None and obj in state.session.deleted):
+        return True
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+def scopes_for_objects(objects: Iterable[Any]) -> set[str]:
+    """
+    Map changed ORM objects to the data scopes they affect.
+
+    Args:
+        objects: New, dirty or deleted ORM instances
+
+    Returns:
+        Set of scope names
+    """
+    from app.models import (
+        Category,
+        Entity,
+        EntityRelation,
+        EntityType,
+        FacetType,
+        FacetValue,
+        NotificationRule,
+        RelationType,
+        User,
+        UserApiCredentials,
+        UserLLMConfig,
+    )
+
+    scopes: set[str] = set()
+    for obj in objects:
+        if isinstance(obj, Entity):
+            scopes.add(SCOPE_ENTITIES)
+            scopes.update(entity_type_scope(v) for v in _attribute_values(obj, "entity_type_id"))
+        elif isinstance(obj, FacetValue):
+            scopes.add(SCOPE_FACET_VALUES)
+            scopes.update(facet_type_scope(v) for v in _attribute_values(obj, "facet_type_id"))
+        elif isinstance(obj, EntityRelation):
+            scopes.add(SCOPE_RELATIONS)
+        elif isinstance(obj, EntityType | FacetType | RelationType | Category):
+            scopes.add(SCOPE_SCHEMA)
+        elif isinstance(obj, NotificationRule):
+            # Statistics and digest bookkeeping do not change the rule index
+            if _is_changed(obj, _RULE_INDEX_ATTRIBUTES):
+                scopes.add(SCOPE_NOTIFICATION_RULES)
+        elif isinstance(obj, User) and _is_changed(obj, _USER_NOTIFICATION_ATTRIBUTES):
+            scopes.add(SCOPE_NOTIFICATION_RULES)
+        elif isinstance(obj, UserLLMConfig | UserApiCredentials):
+            attributes = _LLM_CONFIG_ATTRIBUTES if isinstance(obj, UserLLMConfig) else _API_CREDENTIAL_ATTRIBUTES
+            # last_used_at / last_error updates do not change resolved configs
+            if _is_changed(obj, attributes):
+                scopes.add(SCOPE_LLM_CONFIG)
+    return scopes
+
+
+def scopes_for_bulk_statement(entity_class: type | None) -> set[str]:
+    """Map a bulk INSERT/UPDATE/DELETE statement to the scopes it may affect."""
+    from app.models import (
+        Category,
+        Entity,
+        EntityRelation,
+        EntityType,
+        FacetType,
+        FacetValue,
+        NotificationRule,
+        RelationType,
+        UserApiCredentials,
+        UserLLMConfig,
+    )
+
+    if entity_class is None:
+        return set()
+    if issubclass(entity_class, Entity):
+        return {SCOPE_ENTITIES, SCOPE_ALL_ENTITY_TYPES}
+    if issubclass(entity_class, FacetValue):
+        return {SCOPE_FACET_VALUES, SCOPE_ALL_FACET_TYPES}
+    if issubclass(entity_class, EntityRelation):
+        return {SCOPE_RELATIONS}
+    if issubclass(entity_class, EntityType | FacetType | RelationType | Category):
+        return {SCOPE_SCHEMA}
+    if issubclass(entity_class, NotificationRule):
+        return {SCOPE_NOTIFICATION_RULES}
+    if issubclass(entity_class, UserLLMConfig | UserApiCredentials):
+        return {SCOPE_LLM_CONFIG}
+    return set()
+
+
+async def bump_data_versions(scopes: Iterable[str]) -> None:
+    """
+    Increment the data versions of the given scopes (one round trip).
+
+    Best effort: failures are logged, caches fall back to their TTL.
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    try:
+        pipe = _get_redis_client().pipeline(transaction=False)
+        for scope in scopes:
+            pipe.incr(f"{VERSION_PREFIX}{scope}")
+        await pipe.execute()
+        logger.debug("data_versions_bumped", scopes=scopes)
+    except Exception as e:
+        logger.warning("data_version_bump_failed", scopes=scopes, error=str(e))
+
+
+async def get_data_versions(redis_client: Any, scopes: Iterable[str]) -> dict[str, int]:
+    """
+    Read the current data versions of the given scopes (one MGET).
+
+    Args:
+        redis_client: Async Redis client
+        scopes: Scope names
+
+    Returns:
+        Dict of scope -> version (0 if never bumped)
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return {}
+    values = await redis_client.mget([f"{VERSION_PREFIX}{scope}" for scope in scopes])
+    return {scope: int(value or 0) for scope, value in zip(scopes, values, strict=True)}
+
+
+async def read_data_versions(scopes: Iterable[str]) -> dict[str, int] | None:
+    """
+    Read data versions with the client of the running event loop.
+
+    Also used by Celery tasks: they run on the event loop of their worker
+    process, which keeps its client between tasks.
+
+    Returns:
+        Dict of scope -> version, or None if Redis is unavailable
+    """
+    try:
+        return await get_data_versions(_get_redis_client(), scopes)
+    except Exception as e:
+        logger.warning("data_version_read_failed", scopes=sorted(set(scopes)), error=str(e))
+        return None
+
+
+# =============================================================================
+# Session event listeners
+# =============================================================================
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    scopes = scopes_for_objects([*session.new, *session.dirty, *session.deleted])
+    if scopes:
+        session.info.setdefault(_SESSION_INFO_KEY, set()).update(scopes)
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    scopes = scopes_for_bulk_statement(mapper.class_ if mapper is not None else None)
+    if scopes:
+        orm_execute_state.session.info.setdefault(_SESSION_INFO_KEY, set()).update(scopes)
+
+
+def _after_commit(session: Session) -> None:
+    scopes = session.info.pop(_SESSION_INFO_KEY, None)
+    if scopes:
+        run_after_commit(bump_data_versions(scopes))
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def register_data_version_listeners() -> None:
+    """Register the session event listeners (idempotent)."""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "do_orm_execute", _do_orm_execute)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _listeners_registered = True
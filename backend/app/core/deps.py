@@ -6,8 +6,8 @@ from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_access_token, decode_sse_ticket
-from app.core.token_blacklist import is_token_blacklisted
+from app.core.principal_cache import decode_token, is_token_revoked, load_principal
+from app.core.security import decode_sse_ticket
 from app.database import get_session
 from app.models.user import User, UserRole
 
@@ -51,12 +51,16 @@ async def get_current_user(
     2. Token blacklist (for logged out tokens)
     3. User existence and active status
 
+    Blacklist and user are served from the per-process principal cache
+    when it is synced (see app.core.principal_cache), so most requests
+    need neither Redis nor a database round trip here.
+
     Raises:
         HTTPException: 401 if token is invalid, expired, or blacklisted
         HTTPException: 403 if user account is deactivated
     """
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_token(token)
 
     if not payload:
         raise HTTPException(
@@ -66,7 +70,7 @@ async def get_current_user(
         )
 
     # Check if token is blacklisted (logged out)
-    if await is_token_blacklisted(token):
+    if await is_token_revoked(token, payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
@@ -82,7 +86,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         ) from None
 
-    user = await session.get(User, user_id)
+    user = await load_principal(session, user_id, payload.get("role"))
 
     if not user:
         raise HTTPException(
@@ -126,7 +130,7 @@ async def get_current_user_from_token(
 
     Used internally for SSE authentication where tokens come from query params.
     """
-    payload = decode_access_token(token)
+    payload = decode_token(token)
 
     if not payload:
         raise HTTPException(
@@ -134,7 +138,7 @@ async def get_current_user_from_token(
             detail="Invalid or expired token",
         )
 
-    if await is_token_blacklisted(token):
+    if await is_token_revoked(token, payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
@@ -148,7 +152,7 @@ async def get_current_user_from_token(
             detail="Invalid token payload",
         ) from None
 
-    user = await session.get(User, user_id)
+    user = await load_principal(session, user_id, payload.get("role"))
 
     if not user:
         raise HTTPException(
@@ -318,7 +322,7 @@ async def get_current_session_id(
         Session UUID if present in token, None otherwise
     """
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_token(token)
 
     if not payload:
         return None
@@ -8,14 +8,13 @@ Sets the locale for each request based on:
 4. Default locale (de)
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.i18n import DEFAULT_LOCALE, SUPPORTED_LOCALES, get_locale, set_locale
 
 
-class I18nMiddleware(BaseHTTPMiddleware):
+class I18nMiddleware:
     """
     Middleware that sets the locale based on request headers or user preference.
 
@@ -26,36 +25,48 @@ class I18nMiddleware(BaseHTTPMiddleware):
 
     Note: User preference from JWT is handled in the auth dependency,
     which runs after middleware but can override the locale if needed.
+
+    Implemented as pure ASGI middleware: the endpoint runs in the same task
+    and context as the middleware, so an override by the auth dependency is
+    reflected in the Content-Language header and streaming responses are
+    passed through without buffering.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        locale = self._determine_locale(request)
-        set_locale(locale)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        set_locale(self._determine_locale(Headers(scope=scope)))
 
-        # Add Content-Language header to response
-        response.headers["Content-Language"] = get_locale()
+        async def send_with_language(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add Content-Language header to response
+                MutableHeaders(scope=message)["Content-Language"] = get_locale()
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_language)
 
-    def _determine_locale(self, request: Request) -> str:
+    def _determine_locale(self, headers: Headers) -> str:
         """
         Determine the locale for this request.
 
         Args:
-            request: The incoming request
+            headers: The incoming request headers
 
         Returns:
             The locale code to use
         """
         # Priority 1: X-Language header (explicit override)
-        x_language = request.headers.get("X-Language", "").lower()
+        x_language = headers.get("X-Language", "").lower()
         if x_language and x_language in SUPPORTED_LOCALES:
             return x_language
 
         # Priority 2: Parse Accept-Language header
-        accept_language = request.headers.get("Accept-Language", "")
+        accept_language = headers.get("Accept-Language", "")
         for lang_entry in accept_language.split(","):
             # Handle entries like "de-DE;q=0.9" or "en"
             lang_code = lang_entry.split(";")[0].strip().split("-")[0].lower()
@@ -0,0 +1,484 @@
+"""
+Authenticated principal cache.
+
+Without it, every authenticated request made a Redis round trip
+(token blacklist) and a database query (``session.get(User, ...)``), so
+endpoints that never touch the database still needed a connection.
+
+Each API process keeps:
+- Token payloads: verified JWT payloads by token string (the signature
+  is checked once per token, expiry on every request).
+- Principals: a short-TTL LRU of active users, keyed by ``sub`` and the
+  token's role claim (tokens carry no version claim). A hit attaches a
+  copy of the cached row to the request session without any SQL.
+- Revocations: the token blacklist replicated as a local set of token ids
+  with their expiry, loaded with SCAN on connect and kept current via
+  pub/sub.
+
+Both are kept consistent through the Redis channel ``auth:invalidate``:
+- Token revocations (logout) are published by app.core.token_blacklist.
+- Changes to users (deactivation, role change, deletion, profile
+  updates) are published from SQLAlchemy session events after commit, so
+  every write path (API, admin, Celery) is covered. The publish runs as a
+  task on the session's event loop (app.core.after_commit).
+
+The cache is only trusted while the listener is subscribed and synced.
+On a disconnect it is cleared, and authentication falls back to Redis and
+the database until the listener has resubscribed and reloaded the
+blacklist.
+"""
+
+import asyncio
+import json
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any
+from uuid import UUID
+
+import structlog
+from redis.asyncio import Redis
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.config import settings
+from app.core.after_commit import run_after_commit
+from app.monitoring.metrics import auth_principal_cache_requests_total, auth_revocation_checks_total
+
+logger = structlog.get_logger(__name__)
+
+# Pub/sub channel for principal and token invalidations
+INVALIDATION_CHANNEL = "auth:invalidate"
+
+# Interval for dropping expired token ids from the revocation set
+REVOCATION_PRUNE_SECONDS = 60
+
+# Reconnect backoff of the invalidation listener
+LISTENER_MAX_BACKOFF_SECONDS = 30
+
+# Key in Session.info collecting the user ids changed in the current transaction
+_SESSION_INFO_KEY = "changed_user_ids"
+_ALL_USERS = "*"
+
+
+class PrincipalCache:
+    """Per-process cache of active users and revoked token ids."""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.synced = False
+        self._principals: OrderedDict[tuple[str, str | None], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._payloads: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._revoked: dict[str, float] = {}
+        self._epoch = 0
+        self._last_prune = time.monotonic()
+
+    # --- Token payloads ---
+
+    def get_payload(self, token: str) -> dict[str, Any] | None:
+        """Get the verified payload of a token that has not expired yet."""
+        payload = self._payloads.get(token)
+        if payload is None:
+            return None
+        if payload.get("exp", 0) <= time.time():
+            del self._payloads[token]
+            return None
+        self._payloads.move_to_end(token)
+        return payload
+
+    def put_payload(self, token: str, payload: dict[str, Any]) -> None:
+        """Remember the payload of a verified token."""
+        self._payloads[token] = payload
+        while len(self._payloads) > self.max_size:
+            self._payloads.popitem(last=False)
+
+    # --- Principals ---
+
+    @property
+    def epoch(self) -> int:
+        """Invalidation counter (read before loading a user, pass to put())."""
+        return self._epoch
+
+    def get(self, user_id: str, role: str | None) -> dict[str, Any] | None:
+        """Get the cached column values of an active user."""
+        key = (user_id, role)
+        entry = self._principals.get(key)
+        if entry is None:
+            return None
+        expires_at, state = entry
+        if expires_at < time.monotonic():
+            del self._principals[key]
+            return None
+        self._principals.move_to_end(key)
+        return state
+
+    def put(self, user_id: str, role: str | None, state: dict[str, Any], epoch: int) -> None:
+        """Cache a user unless an invalidation happened since epoch was read."""
+        if epoch != self._epoch:
+            return
+        self._principals[(user_id, role)] = (time.monotonic() + self.ttl_seconds, state)
+        self._principals.move_to_end((user_id, role))
+        while len(self._principals) > self.max_size:
+            self._principals.popitem(last=False)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop all cached entries of a user ("*" drops all users)."""
+        self._epoch += 1
+        if user_id == _ALL_USERS:
+            self._principals.clear()
+            return
+        for key in [key for key in self._principals if key[0] == user_id]:
+            del self._principals[key]
+
+    # --- Revocations ---
+
+    def revoke(self, token_id: str, expires_at: float) -> None:
+        """Add a revoked token id (expires_at as Unix timestamp)."""
+        self._revoked[token_id] = max(expires_at, self._revoked.get(token_id, 0.0))
+
+    def is_revoked(self, token_id: str) -> bool:
+        """Check a token id against the local revocation set."""
+        return token_id in self._revoked
+
+    def prune_revocations(self) -> None:
+        """Drop expired token ids (at most every REVOCATION_PRUNE_SECONDS)."""
+        if time.monotonic() - self._last_prune < REVOCATION_PRUNE_SECONDS:
+            return
+        self._last_prune = time.monotonic()
+        now = time.time()
+        self._revoked = {token_id: exp for token_id, exp in self._revoked.items() if exp > now}
+
+    def mark_unsynced(self) -> None:
+        """Stop trusting the cache (listener disconnected)."""
+        self.synced = False
+        self.invalidate_user(_ALL_USERS)
+        self._revoked.clear()
+
+    def apply(self, message: dict[str, Any]) -> None:
+        """Apply an invalidation message from the pub/sub channel."""
+        kind = message.get("type")
+        if kind == "user":
+            self.invalidate_user(str(message["id"]))
+        elif kind == "token":
+            self.revoke(str(message["id"]), float(message["exp"]))
+
+
+# Global cache instance (set in the API lifespan when Redis is available)
+_principal_cache: PrincipalCache | None = None
+
+
+def get_principal_cache() -> PrincipalCache | None:
+    """Get the global principal cache instance."""
+    return _principal_cache
+
+
+def set_principal_cache(cache: PrincipalCache | None) -> None:
+    """Set the global principal cache instance."""
+    global _principal_cache
+    _principal_cache = cache
+
+
+# =============================================================================
+# Authentication helpers (used by app.core.deps)
+# =============================================================================
+
+
+def decode_token(token: str) -> dict[str, Any] | None:
+    """
+    Decode and validate an access token, verifying each token only once.
+
+    Returns:
+        Decoded payload dict or None if invalid
+    """
+    from app.core.security import decode_access_token
+
+    cache = _principal_cache
+    if cache is None:
+        return decode_access_token(token)
+
+    payload = cache.get_payload(token)
+    if payload is None:
+        payload = decode_access_token(token)
+        if payload is not None and "exp" in payload:
+            cache.put_payload(token, payload)
+    return payload
+
+
+async def is_token_revoked(token: str, payload: dict[str, Any]) -> bool:
+    """
+    Check whether a decoded token was revoked.
+
+    Uses the local revocation set while it is synced, the Redis blacklist
+    otherwise.
+    """
+    from app.core.token_blacklist import get_token_id, is_token_blacklisted
+
+    cache = _principal_cache
+    if cache is not None and cache.synced:
+        auth_revocation_checks_total.labels(source="local").inc()
+        return cache.is_revoked(get_token_id(token, payload))
+
+    auth_revocation_checks_total.labels(source="redis").inc()
+    return await is_token_blacklisted(token)
+
+
+def _snapshot(user: Any) -> dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(user).mapper.column_attrs}
+
+
+def _restore(session: AsyncSession, user_class: type, state: dict[str, Any]) -> Any:
+    """Attach a cached row to the session as a clean persistent instance (no SQL)."""
+    mapper = inspect(user_class)
+    identity = mapper.identity_key_from_primary_key((state["id"],))
+    existing = session.sync_session.identity_map.get(identity)
+    if existing is not None:
+        return existing
+
+    user = mapper.class_manager.new_instance()
+    for key, value in state.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
+
+async def load_principal(session: AsyncSession, user_id: UUID, role: str | None) -> Any:
+    """
+    Get the user of an authenticated request.
+
+    A cache hit is attached to the request session without any SQL;
+    endpoints can modify and commit it as usual.
+
+    Args:
+        session: Request database session
+        user_id: User id from the token's sub claim
+        role: Role claim of the token
+
+    Returns:
+        User or None if the user does not exist
+    """
+    from app.models.user import User
+
+    cache = _principal_cache
+    if cache is None or not cache.synced:
+        return await session.get(User, user_id)
+
+    key = str(user_id)
+    state = cache.get(key, role)
+    if state is not None:
+        auth_principal_cache_requests_total.labels(result="hit").inc()
+        return _restore(session, User, state)
+
+    auth_principal_cache_requests_total.labels(result="miss").inc()
+    epoch = cache.epoch
+    user = await session.get(User, user_id)
+    if user is not None and user.is_active:
+        cache.put(key, role, _snapshot(user), epoch)
+    return user
+
+
+# =============================================================================
+# Publishing
+# =============================================================================
+
+# Async Redis clients for user invalidations by event loop (created lazily)
+_publish_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+# Client override for all loops (tests / custom setups)
+_publish_client: Any = None
+_listeners_registered = False
+
+
+def _get_publish_client():
+    """Get the async Redis client for user invalidations of the running event loop."""
+    if _publish_client is not None:
+        return _publish_client
+    # Redis connections are bound to the event loop they were opened in
+    loop = asyncio.get_running_loop()
+    client = _publish_clients.get(loop)
+    if client is None:
+        import redis.asyncio as redis
+
+        client = redis.from_url(
+            settings.redis_url,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+        _publish_clients[loop] = client
+    return client
+
+
+def set_principal_publish_client(client: Any) -> None:
+    """Set the async Redis client used for user invalidations (tests / custom setups)."""
+    global _publish_client
+    _publish_client = client
+
+
+def publish_user_invalidations(user_ids: set[str]) -> None:
+    """
+    Invalidate cached users in this and all other API processes.
+
+    The local cache is invalidated right away; the publish to the other
+    processes runs without blocking the caller (run_after_commit). Best
+    effort: failures are logged, other processes fall back to the TTL.
+    """
+    if not user_ids:
+        return
+    if _ALL_USERS in user_ids:
+        user_ids = {_ALL_USERS}
+
+    cache = _principal_cache
+    if cache is not None:
+        for user_id in user_ids:
+            cache.invalidate_user(user_id)
+
+    run_after_commit(_publish_user_invalidations(sorted(user_ids)))
+
+
+async def _publish_user_invalidations(user_ids: list[str]) -> None:
+    try:
+        client = _get_publish_client()
+        for user_id in user_ids:
+            await client.publish(INVALIDATION_CHANNEL, json.dumps({"type": "user", "id": user_id}))
+        logger.debug("principal_invalidations_published", users=len(user_ids))
+    except Exception as e:
+        logger.warning("principal_invalidation_publish_failed", error=str(e))
+
+
+async def publish_token_revocation(redis: Redis, token_id: str, expires_at: float) -> None:
+    """Add a revoked token id to the local set and publish it to all processes."""
+    cache = _principal_cache
+    if cache is not None:
+        cache.revoke(token_id, expires_at)
+    try:
+        await redis.publish(INVALIDATION_CHANNEL, json.dumps({"type": "token", "id": token_id, "exp": expires_at}))
+    except Exception as e:
+        logger.warning("token_revocation_publish_failed", error=str(e))
+
+
+# =============================================================================
+# Session event listeners
+# =============================================================================
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    from app.models.user import User
+
+    user_ids = {
+        str(obj.id)
+        for obj in [*session.dirty, *session.deleted]
+        if isinstance(obj, User) and (obj in session.deleted or session.is_modified(obj))
+    }
+    if user_ids:
+        session.info.setdefault(_SESSION_INFO_KEY, set()).update(user_ids)
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    from app.models.user import User
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, User):
+        orm_execute_state.session.info.setdefault(_SESSION_INFO_KEY, set()).add(_ALL_USERS)
+
+
+def _after_commit(session: Session) -> None:
+    user_ids = session.info.pop(_SESSION_INFO_KEY, None)
+    if user_ids:
+        publish_user_invalidations(user_ids)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def register_principal_cache_listeners() -> None:
+    """Register the session event listeners (idempotent)."""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "do_orm_execute", _do_orm_execute)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _listeners_registered = True
+
+
+# =============================================================================
+# Invalidation listener (API process)
+# =============================================================================
+
+
+class PrincipalInvalidationListener:
+    """Keeps a PrincipalCache in sync with the invalidation channel."""
+
+    def __init__(self, redis: Redis, cache: PrincipalCache):
+        self.redis = redis
+        self.cache = cache
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start listening in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="principal-invalidation-listener")
+
+    async def stop(self) -> None:
+        """Stop listening and stop trusting the cache."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.cache.mark_unsynced()
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                # Subscribe before loading the blacklist, so no revocation is missed
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                await self._load_revocations()
+                self.cache.synced = True
+                logger.info("principal_cache_synced")
+                backoff = 1.0
+
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self.cache.apply(json.loads(message["data"]))
+                    self.cache.prune_revocations()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("principal_cache_listener_error", error=str(e), retry_in=backoff)
+            finally:
+                self.cache.mark_unsynced()
+                with suppress(Exception):
+                    await pubsub.aclose()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, LISTENER_MAX_BACKOFF_SECONDS)
+
+    async def _load_revocations(self) -> None:
+        """Replicate the Redis token blacklist into the local revocation set."""
+        from app.core.token_blacklist import TokenBlacklist
+
+        prefix = TokenBlacklist.KEY_PREFIX
+        keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*", count=1000)]
+        now = time.time()
+        for start in range(0, len(keys), 1000):
+            batch = keys[start : start + 1000]
+            pipe = self.redis.pipeline(transaction=False)
+            for key in batch:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+            for key, ttl in zip(batch, ttls, strict=True):
+                if ttl is not None and ttl > 0:
+                    key = key.decode() if isinstance(key, bytes) else key
+                    self.cache.revoke(key[len(prefix) :], now + ttl)
+        logger.debug("token_revocations_loaded", count=len(keys))
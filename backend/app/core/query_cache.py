@@ -1,42 +1,98 @@
 """
-Redis-based query cache for Smart Query results.
+Redis-based two-level cache for Smart Query.
 
-Provides a simple caching mechanism to avoid repeated expensive AI
-interpretations and database queries for identical natural language queries.
+Level 1 - Plans: the interpretation (``query_params``) of a question, keyed by
+the normalized question text. Paraphrases are matched via an in-process
+nearest-neighbour index over question embeddings; a paraphrase must also
+name the same numbers, regions and entity/location values as the question
+whose plan it reuses. A plan hit skips all LLM calls (compound detection and
+interpretation).
+
+Level 2 - Results: the executed result of a plan, keyed by the plan hash and
+the data versions of everything the plan reads (see app.core.data_versions).
+Writes bump the data versions, so a cached result is never served after the
+data behind it changed.
 
 Cache Strategy:
-- Only cache read-only queries (not writes)
-- TTL of 5 minutes (smart query results can change)
-- Hash includes query text only (session-independent)
-- Cache invalidation on write operations
+- Only cache read-only queries (not writes, not plan mode)
+- Plan keys include the current date (the interpreter resolves relative
+  dates like "nächste Woche") and the schema version (available types)
+- Result TTL of 1 hour as safety net, 5 minutes for time-relative queries
+- Compound queries are not cached
 
 Usage:
-    from app.core.query_cache import get_cached_query, set_cached_query
-
-    # Check cache first
-    cached = await get_cached_query(question)
-    if cached:
-        return cached
+    from app.core.query_cache import get_cached_plan, build_result_cache_key, get_cached_result
 
-    # Execute query and cache result
-    result = await smart_query(session, question)
-    await set_cached_query(question, result)
+    query_params = await get_cached_plan(question)
+    ...
+    result_key = await build_result_cache_key(query_params, scopes)
+    cached = await get_cached_result(result_key)
 """
 
 import hashlib
 import json
+import math
+import operator
+import re
+import unicodedata
+from collections import OrderedDict
+from datetime import date
+from functools import cache
 from typing import Any
 
 import structlog
 from redis.asyncio import Redis
 
+from app.core.data_versions import SCOPE_SCHEMA, get_data_versions
+
 logger = structlog.get_logger(__name__)
 
-# Cache TTL in seconds (5 minutes)
+# Result TTL for time-relative queries (time_filter/date_range) in seconds
 QUERY_CACHE_TTL = 300
 
-# Cache key prefix
+# Result TTL for all other queries (safety net - invalidation is version based)
+RESULT_CACHE_TTL = 3600
+
+# Plan TTL (plan keys also change daily, see _plan_key)
+PLAN_CACHE_TTL = 86400
+
+# Cache key prefixes
 CACHE_PREFIX = "sq:"
+PLAN_PREFIX = f"{CACHE_PREFIX}plan:"
+RESULT_PREFIX = f"{CACHE_PREFIX}result:"
+
+# Minimum cosine similarity for reusing the plan of a paraphrased question
+PLAN_SIMILARITY_THRESHOLD = 0.97
+
+# Maximum number of question embeddings kept per process
+PLAN_INDEX_SIZE = 256
+
+# Words that never change the meaning of a query
+FILLER_WORDS = frozenset(
+    {
+        "bitte",
+        "mal",
+        "doch",
+        "gerne",
+        "gern",
+        "eigentlich",
+        "einfach",
+        "kurz",
+        "please",
+        "pls",
+        "just",
+    }
+)
+
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)?")
+
+# query_params filters naming entities or locations; a paraphrase must mention them
+PLAN_SLOT_FILTERS = ("admin_level_1", "country", "location_keywords", "negative_locations", "parent_name")
+
+# Tag aliases that are not regions
+_NON_REGION_TAGS = frozenset({"kommunal", "landkreis"})
+
+_TRANSLITERATION = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
 
 # Global Redis client (set during app startup)
 _redis_client: Redis | None = None
@@ -53,49 +109,356 @@ def get_query_cache_client() -> Redis | None:
     return _redis_client
 
 
-def _generate_cache_key(question: str) -> str:
+def normalize_question(question: str) -> str:
     """
-    Generate a deterministic cache key for a query.
+    Normalize a question for plan cache lookups.
 
-    Uses SHA-256 hash of the lowercase, stripped question.
+    Applies Unicode NFKC normalization and case folding, strips punctuation,
+    removes filler words and collapses whitespace, so that e.g.
+    "Zeige mir bitte alle Gemeinden in NRW!" and "zeige mir alle Gemeinden in NRW"
+    share one plan.
     """
-    normalized = question.lower().strip()
-    hash_digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
-    return f"{CACHE_PREFIX}{hash_digest}"
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = re.sub(r"[^\w\s.,-]", " ", text)
+    text = re.sub(r"(?<!\d)[.,]|[.,](?!\d)", " ", text)
+    return " ".join(word for word in text.split() if word not in FILLER_WORDS)
+
+
+def _fold(text: str) -> str:
+    """Normalize a question or slot value for slot comparison (umlauts transliterated)."""
+    return normalize_question(text).translate(_TRANSLITERATION)
+
+
+@cache
+def _region_aliases() -> dict[str, str]:
+    """Map region names and abbreviations to their canonical name."""
+    # Imported lazily: services.smart_query imports this module
+    from services.smart_query.constants import TAG_ALIASES
+
+    aliases = {}
+    for name, variants in TAG_ALIASES.items():
+        if name in _NON_REGION_TAGS:
+            continue
+        canonical = max((name, *variants), key=len)
+        for variant in (name, *variants):
+            aliases[variant] = canonical
+    return aliases
+
+
+def _regions(folded_text: str) -> frozenset[str]:
+    """Canonical names of the regions mentioned in a folded text."""
+    aliases = _region_aliases()
+    # Two-letter codes ("by", "de", "at") are ordinary words in a question
+    return frozenset(aliases[word] for word in folded_text.split() if len(word) > 2 and word in aliases)
+
+
+def plan_slots(query_params: dict[str, Any]) -> frozenset[str]:
+    """Folded entity and location values of a plan (see PLAN_SLOT_FILTERS)."""
+    filters = query_params.get("filters") or {}
+    slots = set()
+    for key in PLAN_SLOT_FILTERS:
+        values = filters.get(key)
+        for value in values if isinstance(values, list) else [values]:
+            if isinstance(value, str) and value.strip():
+                slots.add(_fold(value))
+    return frozenset(slots)
+
+
+def _mentions(folded_question: str, regions: frozenset[str], slot: str) -> bool:
+    """Whether a question names a plan slot, literally or by a region alias."""
+    if f" {slot} " in f" {folded_question} ":
+        return True
+    canonical = _region_aliases().get(slot)
+    return canonical is not None and canonical in regions
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+
+
+def _plan_key(normalized_question: str, schema_version: int) -> str:
+    return f"{PLAN_PREFIX}{date.today().isoformat()}:{schema_version}:{_hash(normalized_question)}"
+
+
+async def _get_schema_version() -> int:
+    versions = await get_data_versions(_redis_client, [SCOPE_SCHEMA])
+    return versions[SCOPE_SCHEMA]
+
 
+# =============================================================================
+# Paraphrase index (process-local)
+# =============================================================================
 
-async def get_cached_query(question: str) -> dict[str, Any] | None:
+
+class PlanEmbeddingIndex:
+    """
+    Bounded LRU index of question embeddings for paraphrase matching.
+
+    Embeddings alone do not separate questions that differ only in a number
+    or a name, so a known question is only a match if both questions share
+    all numbers and regions and the new question names every entity and
+    location value of the known question's plan: "Top 10 ..." never reuses
+    the plan of "Top 5 ...", "... in Bayern" never the plan of "... in NRW".
+    """
+
+    def __init__(self, max_size: int = PLAN_INDEX_SIZE, threshold: float = PLAN_SIMILARITY_THRESHOLD):
+        self.max_size = max_size
+        self.threshold = threshold
+        # question -> (unit embedding, numbers, regions, plan slots)
+        self._entries: OrderedDict[str, tuple[list[float], tuple[str, ...], frozenset[str], frozenset[str]]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _unit(vector: list[float]) -> list[float] | None:
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return None
+        return [v / norm for v in vector]
+
+    @staticmethod
+    def _numbers(normalized_question: str) -> tuple[str, ...]:
+        return tuple(sorted(_NUMBER_PATTERN.findall(normalized_question)))
+
+    def add(self, normalized_question: str, embedding: list[float], query_params: dict[str, Any] | None = None) -> None:
+        """Remember the embedding and slots of a question with a cached plan."""
+        unit = self._unit(embedding)
+        if unit is None:
+            return
+        self._entries[normalized_question] = (
+            unit,
+            self._numbers(normalized_question),
+            _regions(_fold(normalized_question)),
+            plan_slots(query_params or {}),
+        )
+        self._entries.move_to_end(normalized_question)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _candidates(self, normalized_question: str):
+        """Known questions whose numbers, regions and plan slots the question shares."""
+        folded = _fold(normalized_question)
+        numbers = self._numbers(normalized_question)
+        regions = _regions(folded)
+        for question, (vector, question_numbers, question_regions, slots) in self._entries.items():
+            if (
+                question_numbers == numbers
+                and question_regions == regions
+                and all(_mentions(folded, regions, slot) for slot in slots)
+            ):
+                yield question, vector
+
+    def has_candidates(self, normalized_question: str) -> bool:
+        """Whether any known question could match (no embedding needed to tell)."""
+        return next(self._candidates(normalized_question), None) is not None
+
+    def find(self, normalized_question: str, embedding: list[float]) -> str | None:
+        """Return the most similar known question above the threshold, if any."""
+        unit = self._unit(embedding)
+        if unit is None:
+            return None
+        best_question, best_score = None, self.threshold
+        for question, vector in self._candidates(normalized_question):
+            if len(vector) != len(unit):
+                continue
+            score = sum(map(operator.mul, vector, unit))
+            if score >= best_score:
+                best_question, best_score = question, score
+        if best_question is not None:
+            self._entries.move_to_end(best_question)
+        return best_question
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_plan_index = PlanEmbeddingIndex()
+
+
+def get_plan_index() -> PlanEmbeddingIndex:
+    """Get the process-wide paraphrase index."""
+    return _plan_index
+
+
+# =============================================================================
+# Level 1: Plans
+# =============================================================================
+
+
+async def _get_plan(normalized_question: str) -> dict[str, Any] | None:
+    plan_key = _plan_key(normalized_question, await _get_schema_version())
+    cached_data = await _redis_client.get(plan_key)
+    if cached_data:
+        logger.debug("Query plan cache hit", cache_key=plan_key)
+        return json.loads(cached_data)
+    return None
+
+
+async def get_cached_plan(question: str) -> dict[str, Any] | None:
     """
-    Get cached query result if available.
+    Get the cached interpretation of a question (exact match after normalization).
 
     Args:
         question: The natural language query
 
     Returns:
-        Cached result dict or None if not cached
+        Cached query_params or None if not cached
+    """
+    if not _redis_client:
+        return None
+
+    try:
+        return await _get_plan(normalize_question(question))
+    except Exception as e:
+        logger.warning("Query plan cache get failed", error=str(e))
+        return None
+
+
+def may_have_similar_plan(question: str) -> bool:
+    """
+    Whether a paraphrase lookup can succeed for a question.
+
+    Lets callers skip the question embedding when no known question shares
+    its numbers, regions and entity/location values.
+    """
+    return _redis_client is not None and _plan_index.has_candidates(normalize_question(question))
+
+
+async def get_similar_cached_plan(question: str, embedding: list[float] | None) -> dict[str, Any] | None:
+    """
+    Get the cached interpretation of the most similar previously asked question.
+
+    Args:
+        question: The natural language query
+        embedding: Embedding of the question
+
+    Returns:
+        Cached query_params or None if no paraphrase is known
+    """
+    if not _redis_client or not embedding:
+        return None
+
+    normalized = normalize_question(question)
+    similar_question = _plan_index.find(normalized, embedding)
+    if similar_question is None or similar_question == normalized:
+        return None
+
+    try:
+        plan = await _get_plan(similar_question)
+    except Exception as e:
+        logger.warning("Query plan cache get failed", error=str(e))
+        return None
+
+    if plan is not None:
+        logger.info("Query plan paraphrase hit", question=question[:50], matched=similar_question[:50])
+        # Store under the new wording as well, so the next lookup is exact
+        await set_cached_plan(question, plan, embedding)
+    return plan
+
+
+async def set_cached_plan(
+    question: str,
+    query_params: dict[str, Any],
+    embedding: list[float] | None = None,
+) -> bool:
+    """
+    Cache the interpretation of a question.
+
+    Args:
+        question: The natural language query
+        query_params: Interpreted query parameters
+        embedding: Optional embedding of the question (enables paraphrase hits)
+
+    Returns:
+        True if cached successfully, False otherwise
+    """
+    if not _redis_client or not query_params:
+        return False
+
+    normalized = normalize_question(question)
+    try:
+        plan_key = _plan_key(normalized, await _get_schema_version())
+        await _redis_client.setex(plan_key, PLAN_CACHE_TTL, json.dumps(query_params, default=str))
+    except Exception as e:
+        logger.warning("Query plan cache set failed", error=str(e))
+        return False
+
+    if embedding:
+        _plan_index.add(normalized, embedding, query_params)
+    return True
+
+
+# =============================================================================
+# Level 2: Results
+# =============================================================================
+
+
+def plan_hash(query_params: dict[str, Any]) -> str:
+    """Stable hash of interpreted query parameters."""
+    return _hash(json.dumps(query_params, sort_keys=True, default=str))
+
+
+def result_cache_ttl(query_params: dict[str, Any]) -> int:
+    """TTL for a result: short for time-relative queries, long otherwise."""
+    if query_params.get("date_range") or query_params.get("time_filter", "all") != "all":
+        return QUERY_CACHE_TTL
+    return RESULT_CACHE_TTL
+
+
+async def build_result_cache_key(query_params: dict[str, Any], scopes: set[str]) -> str | None:
+    """
+    Build the result cache key of a plan from the current data versions.
+
+    Args:
+        query_params: Interpreted query parameters
+        scopes: Data version scopes read by the query
+
+    Returns:
+        Cache key, or None if caching is unavailable
     """
     if not _redis_client:
         return None
 
-    cache_key = _generate_cache_key(question)
+    try:
+        versions = await get_data_versions(_redis_client, scopes)
+    except Exception as e:
+        logger.warning("Data version lookup failed", error=str(e))
+        return None
+
+    version_hash = _hash(json.dumps(versions, sort_keys=True))
+    return f"{RESULT_PREFIX}{date.today().isoformat()}:{plan_hash(query_params)}:{version_hash}"
+
+
+async def get_cached_result(result_key: str | None) -> dict[str, Any] | None:
+    """
+    Get a cached query result.
+
+    Args:
+        result_key: Key from build_result_cache_key()
+
+    Returns:
+        Cached result dict or None if not cached
+    """
+    if not _redis_client or not result_key:
+        return None
 
     try:
-        cached_data = await _redis_client.get(cache_key)
+        cached_data = await _redis_client.get(result_key)
         if cached_data:
-            logger.debug("Query cache hit", cache_key=cache_key)
+            logger.debug("Query result cache hit", cache_key=result_key)
             result = json.loads(cached_data)
             result["_cached"] = True
             return result
     except Exception as e:
-        logger.warning("Query cache get failed", error=str(e), cache_key=cache_key)
+        logger.warning("Query cache get failed", error=str(e), cache_key=result_key)
 
     return None
 
 
-async def set_cached_query(
-    question: str,
+async def set_cached_result(
+    result_key: str | None,
     result: dict[str, Any],
-    ttl: int = QUERY_CACHE_TTL,
+    ttl: int = RESULT_CACHE_TTL,
 ) -> bool:
     """
     Cache a query result.
@@ -106,14 +469,14 @@ async def set_cached_query(
     - Empty results
 
     Args:
-        question: The natural language query
+        result_key: Key from build_result_cache_key()
         result: The query result dict
-        ttl: Time-to-live in seconds (default: 5 minutes)
+        ttl: Time-to-live in seconds
 
     Returns:
         True if cached successfully, False otherwise
     """
-    if not _redis_client:
+    if not _redis_client or not result_key:
         return False
 
     # Don't cache write operations or errors
@@ -124,25 +487,23 @@ async def set_cached_query(
     if result.get("items") is None and result.get("visualizations") is None:
         return False
 
-    cache_key = _generate_cache_key(question)
-
     try:
         # Remove session-specific data before caching
         cache_data = result.copy()
         cache_data.pop("_cached", None)
 
         serialized = json.dumps(cache_data, default=str)
-        await _redis_client.setex(cache_key, ttl, serialized)
-        logger.debug("Query cached", cache_key=cache_key, ttl=ttl)
+        await _redis_client.setex(result_key, ttl, serialized)
+        logger.debug("Query cached", cache_key=result_key, ttl=ttl)
         return True
     except Exception as e:
-        logger.warning("Query cache set failed", error=str(e), cache_key=cache_key)
+        logger.warning("Query cache set failed", error=str(e), cache_key=result_key)
         return False
 
 
 async def invalidate_query_cache(pattern: str = "*") -> int:
     """
-    Invalidate cached queries matching a pattern.
+    Invalidate cached plans and results matching a pattern.
 
     Args:
         pattern: Key pattern to match (default: all smart query keys)
@@ -150,6 +511,7 @@ async def invalidate_query_cache(pattern: str = "*") -> int:
     Returns:
         Number of keys deleted
     """
+    _plan_index.clear()
     if not _redis_client:
         return 0
 
@@ -1,18 +1,31 @@
 """
 Rate Limiting for API endpoints.
 
-Uses Redis to track request counts per IP/user.
+Uses Redis to track a token bucket per IP/user (GCRA, one round-trip per check).
 Includes in-memory fallback when Redis is unavailable.
 """
 
-import time
-from threading import Lock
+import math
 
+import structlog
 from fastapi import HTTPException, Request, status
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
+from app.core.rate_limiter import GCRA_SCRIPT, LocalTokenBucket
 from app.core.security_logging import security_logger
 
+logger = structlog.get_logger(__name__)
+
+
+def _too_many_requests(retry_after: float) -> HTTPException:
+    ttl = max(1, math.ceil(retry_after))
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Too many requests. Try again in {ttl} seconds.",
+        headers={"Retry-After": str(ttl)},
+    )
+
 
 class InMemoryRateLimiter:
     """
@@ -23,8 +36,7 @@ class InMemoryRateLimiter:
     """
 
     def __init__(self):
-        self._data: dict[str, tuple[int, float]] = {}  # key -> (count, window_start)
-        self._lock = Lock()
+        self._bucket = LocalTokenBucket()
 
     def check(
         self,
@@ -34,50 +46,18 @@ class InMemoryRateLimiter:
         window_seconds: int,
     ) -> bool:
         """Check if request is allowed under rate limit."""
-        key = f"{key_prefix}:{identifier}"
-        current_time = time.time()
-
-        with self._lock:
-            if key in self._data:
-                count, window_start = self._data[key]
-
-                # Check if window has expired
-                if current_time - window_start >= window_seconds:
-                    # Reset window
-                    self._data[key] = (1, current_time)
-                    return True
-
-                if count >= max_requests:
-                    ttl = int(window_seconds - (current_time - window_start))
-                    raise HTTPException(
-                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                        detail=f"Too many requests. Try again in {ttl} seconds.",
-                        headers={"Retry-After": str(ttl)},
-                    )
-
-                # Increment counter
-                self._data[key] = (count + 1, window_start)
-            else:
-                # First request
-                self._data[key] = (1, current_time)
-
-            return True
+        allowed, _, retry_after = self._bucket.acquire(f"{key_prefix}:{identifier}", max_requests, window_seconds)
+        if not allowed:
+            raise _too_many_requests(retry_after)
+        return True
 
     def reset(self, key_prefix: str, identifier: str) -> None:
         """Reset rate limit counter."""
-        key = f"{key_prefix}:{identifier}"
-        with self._lock:
-            self._data.pop(key, None)
+        self._bucket.reset(f"{key_prefix}:{identifier}")
 
-    def cleanup_expired(self, max_age_seconds: int = 3600) -> None:
-        """Remove expired entries to prevent memory growth."""
-        current_time = time.time()
-        with self._lock:
-            expired_keys = [
-                k for k, (_, window_start) in self._data.items() if current_time - window_start > max_age_seconds
-            ]
-            for key in expired_keys:
-                del self._data[key]
+    def cleanup_expired(self) -> None:
+        """Remove refilled buckets to prevent memory growth."""
+        self._bucket.prune()
 
 
 class RateLimiter:
@@ -91,6 +71,8 @@ class RateLimiter:
 
     def __init__(self, redis: Redis):
         self.redis = redis
+        # EVALSHA with the cached SHA; the script is loaded again after NOSCRIPT
+        self._script = redis.register_script(GCRA_SCRIPT)
 
     async def check(
         self,
@@ -112,28 +94,9 @@ class RateLimiter:
             True if allowed, raises HTTPException if rate limited
         """
         key = f"rate_limit:{key_prefix}:{identifier}"
-
-        # Get current count
-        current = await self.redis.get(key)
-
-        if current is None:
-            # First request, set counter with expiry
-            await self.redis.setex(key, window_seconds, 1)
-            return True
-
-        current_count = int(current)
-
-        if current_count >= max_requests:
-            # Get remaining TTL for error message
-            ttl = await self.redis.ttl(key)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Too many requests. Try again in {ttl} seconds.",
-                headers={"Retry-After": str(ttl)},
-            )
-
-        # Increment counter
-        await self.redis.incr(key)
+        allowed, _, retry_after_ms, _ = await self._script(keys=[key], args=[window_seconds * 1000, max_requests, 1])
+        if not allowed:
+            raise _too_many_requests(retry_after_ms / 1000)
         return True
 
     async def reset(self, key_prefix: str, identifier: str) -> None:
@@ -146,15 +109,12 @@ class RateLimiter:
         key_prefix: str,
         identifier: str,
         max_requests: int,
+        window_seconds: int = 60,
     ) -> int:
-        """Get remaining requests in current window."""
+        """Get the requests that are allowed right now (without taking one)."""
         key = f"rate_limit:{key_prefix}:{identifier}"
-        current = await self.redis.get(key)
-
-        if current is None:
-            return max_requests
-
-        return max(0, max_requests - int(current))
+        _, remaining, _, _ = await self._script(keys=[key], args=[window_seconds * 1000, max_requests, 0])
+        return int(remaining)
 
 
 # Rate limit configurations by action type
@@ -242,7 +202,8 @@ async def check_rate_limit(
     """
     Convenience function to check rate limit.
 
-    Uses Redis-based limiter when available, falls back to in-memory limiter.
+    Uses Redis-based limiter when available, falls back to in-memory limiter
+    (also for single checks while Redis is unreachable).
     Logs rate limit exceeded events to the security logger.
 
     Args:
@@ -262,21 +223,24 @@ async def check_rate_limit(
     try:
         if limiter is not None:
             # Use Redis-based rate limiter
-            return await limiter.check(
-                key_prefix=action,
-                identifier=client_id,
-                max_requests=config["max_requests"],
-                window_seconds=config["window_seconds"],
-            )
-        else:
-            # Fallback to in-memory rate limiter (security: don't allow unlimited requests)
-            fallback = get_fallback_limiter()
-            return fallback.check(
-                key_prefix=action,
-                identifier=client_id,
-                max_requests=config["max_requests"],
-                window_seconds=config["window_seconds"],
-            )
+            try:
+                return await limiter.check(
+                    key_prefix=action,
+                    identifier=client_id,
+                    max_requests=config["max_requests"],
+                    window_seconds=config["window_seconds"],
+                )
+            except RedisError as e:
+                logger.warning("rate_limit_redis_unavailable", action=action, error=str(e))
+
+        # Fallback to in-memory rate limiter (security: don't allow unlimited requests)
+        fallback = get_fallback_limiter()
+        return fallback.check(
+            key_prefix=action,
+            identifier=client_id,
+            max_requests=config["max_requests"],
+            window_seconds=config["window_seconds"],
+        )
     except HTTPException as e:
         if e.status_code == 429:
             # Log rate limit exceeded
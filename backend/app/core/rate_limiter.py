@@ -5,16 +5,19 @@ Provides configurable rate limiting for API endpoints using Redis as a backend
 for distributed rate limiting across multiple instances.
 
 Features:
-- Sliding window rate limiting
+- GCRA (token bucket) rate limiting in one atomic Lua script per check
 - IP-based and user-based limiting
 - Configurable limits per endpoint/group
 - Redis-backed for scalability
-- Graceful fallback when Redis unavailable
+- Graceful fallback to a local token bucket when Redis is unavailable
 """
 
+import math
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 from functools import wraps
+from threading import Lock
 
 import structlog
 from fastapi import HTTPException, Request, status
@@ -22,6 +25,10 @@ from fastapi import HTTPException, Request, status
 logger = structlog.get_logger(__name__)
 
 
+# Seconds between connection attempts while Redis is unavailable
+REDIS_RETRY_SECONDS = 30
+
+
 class RateLimitExceeded(Exception):
     """Raised when rate limit is exceeded."""
 
@@ -35,9 +42,89 @@ class RateLimitExceeded(Exception):
         super().__init__(detail)
 
 
+# Generic cell rate algorithm: a token bucket holding max_requests tokens that
+# refills completely within the window. Only the theoretical arrival time (TAT)
+# of the next request is stored, so a check is one GET and at most one SET in a
+# single round-trip. The server clock is used, so all instances agree.
+# KEYS[1]: TAT key
+# ARGV: window_ms, max_requests, cost (0 only reads the state)
+# Returns {allowed (0/1), remaining, retry_after_ms, reset_after_ms}
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+local window = tonumber(ARGV[1])
+local interval = window / tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now)
+local new_tat = tat + interval * cost
+local allow_at = new_tat - window
+if now < allow_at then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+if cost > 0 then
+    redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+end
+return {1, math.floor((now - allow_at) / interval + 1e-9), 0, math.ceil(new_tat - now)}
+"""
+
+
+class LocalTokenBucket:
+    """
+    Per-process token bucket with the same semantics as GCRA_SCRIPT.
+
+    Each key costs one float (the theoretical arrival time), and a check is
+    O(1). At most max_keys keys are kept; the least recently used key is
+    dropped first, which is a bucket that has usually refilled anyway.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def acquire(self, key: str, max_requests: int, window_seconds: float) -> tuple[bool, int, float]:
+        """
+        Take one token from the bucket of a key.
+
+        Returns:
+            Tuple of (allowed, remaining, retry_after_seconds)
+        """
+        now = time.monotonic()
+        interval = window_seconds / max_requests
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + interval
+            allow_at = new_tat - window_seconds
+            if now < allow_at:
+                return False, 0, allow_at - now
+
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+            if len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+            return True, math.floor((now - allow_at) / interval + 1e-9), 0.0
+
+    def reset(self, key: str) -> None:
+        """Refill the bucket of a key."""
+        with self._lock:
+            self._tats.pop(key, None)
+
+    def prune(self) -> int:
+        """Drop all full buckets and return their number."""
+        now = time.monotonic()
+        with self._lock:
+            full = [key for key, tat in self._tats.items() if tat <= now]
+            for key in full:
+                del self._tats[key]
+        return len(full)
+
+
 class RateLimiter:
     """
-    Sliding window rate limiter using Redis.
+    GCRA rate limiter using Redis.
 
     Usage:
         rate_limiter = RateLimiter(redis_url="redis://localhost:6379/0")
@@ -69,27 +156,33 @@ class RateLimiter:
         self.default_window = default_window
         self.enabled = enabled
         self._redis = None
-        self._fallback_storage: dict = {}  # In-memory fallback
+        self._script = None
+        self._redis_retry_at = 0.0
+        self._fallback = LocalTokenBucket()
 
     async def _get_redis(self):
         """Get Redis client with lazy initialization."""
         if not self.redis_url:
             return None
 
-        if self._redis is None:
+        if self._redis is None and time.monotonic() >= self._redis_retry_at:
             try:
                 import redis.asyncio as redis
 
-                self._redis = redis.from_url(
+                client = redis.from_url(
                     self.redis_url,
                     encoding="utf-8",
                     decode_responses=True,
                 )
                 # Test connection
-                await self._redis.ping()
+                await client.ping()
+                # EVALSHA with the cached SHA; the script is loaded again after NOSCRIPT
+                self._script = client.register_script(GCRA_SCRIPT)
+                self._redis = client
             except Exception as e:
                 logger.warning("Redis unavailable for rate limiting", error=str(e))
-                self._redis = None
+                # Don't pay a connection attempt on every request while Redis is down
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
 
         return self._redis
 
@@ -115,44 +208,24 @@ class RateLimiter:
         window: int,
     ) -> tuple[bool, int, int]:
         """
-        Check rate limit using Redis sliding window.
+        Check rate limit with one EVALSHA of the GCRA script.
+
+        Falls back to the local token bucket if the call fails.
 
         Returns:
             Tuple of (allowed, remaining, reset_time)
         """
-        redis_client = await self._get_redis()
-        if not redis_client:
-            return True, max_requests, 0
-
-        now = time.time()
-        window_start = now - window
-
         try:
-            pipeline = redis_client.pipeline()
-
-            # Remove old entries
-            pipeline.zremrangebyscore(key, "-inf", window_start)
-            # Count current entries
-            pipeline.zcard(key)
-            # Add current request
-            pipeline.zadd(key, {str(now): now})
-            # Set expiry
-            pipeline.expire(key, window)
-
-            results = await pipeline.execute()
-            current_count = results[1]
-
-            remaining = max(0, max_requests - current_count - 1)
-            reset_time = int(now + window)
-
-            if current_count >= max_requests:
-                return False, 0, reset_time
-
-            return True, remaining, reset_time
-
+            allowed, remaining, retry_after_ms, reset_after_ms = await self._script(
+                keys=[key], args=[window * 1000, max_requests, 1]
+            )
         except Exception as e:
-            logger.warning("Rate limit check failed", error=str(e), key=key)
-            return True, max_requests, 0
+            logger.warning("Rate limit check failed, using local bucket", error=str(e), key=key)
+            return self._check_rate_limit_memory(key, max_requests, window)
+
+        if not allowed:
+            return False, 0, math.ceil(time.time() + retry_after_ms / 1000)
+        return True, int(remaining), math.ceil(time.time() + reset_after_ms / 1000)
 
     def _check_rate_limit_memory(
         self,
@@ -166,24 +239,10 @@ class RateLimiter:
         Returns:
             Tuple of (allowed, remaining, reset_time)
         """
-        now = time.time()
-        window_start = now - window
-
-        if key not in self._fallback_storage:
-            self._fallback_storage[key] = []
-
-        # Remove old entries
-        self._fallback_storage[key] = [ts for ts in self._fallback_storage[key] if ts > window_start]
-
-        current_count = len(self._fallback_storage[key])
-        remaining = max(0, max_requests - current_count - 1)
-        reset_time = int(now + window)
-
-        if current_count >= max_requests:
-            return False, 0, reset_time
-
-        self._fallback_storage[key].append(now)
-        return True, remaining, reset_time
+        allowed, remaining, retry_after = self._fallback.acquire(key, max_requests, window)
+        if not allowed:
+            return False, 0, math.ceil(time.time() + retry_after)
+        return True, remaining, math.ceil(time.time() + window)
 
     async def check_rate_limit(
         self,
@@ -270,16 +329,18 @@ class RateLimiter:
                 )
 
                 if not allowed:
+                    # For a rejected request reset_time is when the next one is allowed
+                    retry_after = max(1, reset_time - int(time.time()))
                     raise HTTPException(
                         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                         detail={
                             "error": "Rate limit exceeded",
-                            "retry_after": window_seconds,
+                            "retry_after": retry_after,
                             "limit": max_requests,
                             "window": window_seconds,
                         },
                         headers={
-                            "Retry-After": str(window_seconds),
+                            "Retry-After": str(retry_after),
                             "X-RateLimit-Limit": str(max_requests),
                             "X-RateLimit-Remaining": "0",
                             "X-RateLimit-Reset": str(reset_time),
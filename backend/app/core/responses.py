@@ -0,0 +1,31 @@
+"""
+Response classes for the JSON hot path.
+
+FastAPI serializes a returned Pydantic model in three steps: it validates
+the model again against ``response_model``, dumps it to a dict of JSON
+primitives and then encodes that dict. For large list responses this is
+the dominant per-request cost. ``ModelResponse`` writes the model with
+pydantic-core's serializer in a single step instead.
+
+Usage:
+    from app.core.responses import ModelResponse
+
+    @router.get("", response_model=EntityListResponse)
+    async def list_entities(...):
+        ...
+        return ModelResponse(EntityListResponse(items=items, ...))
+
+Keep ``response_model`` on the route so the OpenAPI schema is unchanged.
+"""
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """JSON response rendered directly from a Pydantic model."""
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json(by_alias=True).encode("utf-8")
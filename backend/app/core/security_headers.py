@@ -14,8 +14,8 @@ CSP Strategy (2026 Best Practices):
 import secrets
 from contextvars import ContextVar
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from fastapi import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Context variable for per-request nonce (for future nonce-based CSP)
 _csp_nonce: ContextVar[str | None] = ContextVar("csp_nonce", default=None)
@@ -43,7 +43,7 @@ def set_csp_nonce(nonce: str) -> None:
     _csp_nonce.set(nonce)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Middleware that adds comprehensive security headers to all responses.
 
@@ -56,11 +56,16 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Referrer-Policy: strict-origin-when-cross-origin
     - Permissions-Policy: disable unnecessary browser features
     - Cross-Origin-* headers: isolation and protection
+
+    Implemented as pure ASGI middleware. The header values do not depend on
+    the request, so they are encoded once at startup and only swapped into
+    the ``http.response.start`` message; response bodies (including SSE
+    streams) pass through untouched.
     """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         enable_hsts: bool = False,
         csp_report_uri: str | None = None,
         csp_report_only: bool = False,
@@ -73,35 +78,56 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             csp_report_uri: URI for CSP violation reports (optional)
             csp_report_only: Use Content-Security-Policy-Report-Only instead of enforcing
         """
-        super().__init__(app)
+        self.app = app
         self.enable_hsts = enable_hsts
         self.csp_report_uri = csp_report_uri
         self.csp_report_only = csp_report_only
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        headers = self._build_headers()
+        self._raw_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()
+        ]
+        self._raw_header_names = {name for name, _ in self._raw_headers}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate nonce for this request (prepared for future nonce-based CSP)
-        nonce = generate_nonce()
-        set_csp_nonce(nonce)
+        set_csp_nonce(generate_nonce())
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Security headers override any value set by the endpoint
+                raw = [item for item in message.get("headers", []) if item[0] not in self._raw_header_names]
+                raw.extend(self._raw_headers)
+                message["headers"] = raw
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
-        response = await call_next(request)
+    def _build_headers(self) -> dict[str, str]:
+        """Build the security headers added to every response."""
+        headers: dict[str, str] = {}
 
         # === Standard Security Headers ===
 
         # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Content-Type-Options"] = "nosniff"
 
         # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
+        headers["X-Frame-Options"] = "DENY"
 
         # XSS Protection: Disabled - modern browsers use CSP
         # Note: X-XSS-Protection: 1 can introduce vulnerabilities in some cases
-        response.headers["X-XSS-Protection"] = "0"
+        headers["X-XSS-Protection"] = "0"
 
         # Referrer Policy - don't leak URLs to third parties
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
         # Permissions Policy (Feature Policy) - disable browser features we don't need
-        response.headers["Permissions-Policy"] = (
+        headers["Permissions-Policy"] = (
             "geolocation=(), "
             "camera=(), "
             "microphone=(), "
@@ -115,19 +141,17 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         # === Cross-Origin Headers ===
 
         # Cross-Origin-Opener-Policy: Prevent window.opener attacks
-        response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
+        headers["Cross-Origin-Opener-Policy"] = "same-origin"
 
         # Cross-Origin-Resource-Policy: Prevent cross-origin resource loading
         # 'same-site' allows same-site but blocks cross-site
-        response.headers["Cross-Origin-Resource-Policy"] = "same-site"
+        headers["Cross-Origin-Resource-Policy"] = "same-site"
 
         # === HSTS (Production Only) ===
 
         if self.enable_hsts:
             # 1 year, include subdomains, preload-ready
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
-            )
+            headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
 
         # === Content Security Policy ===
 
@@ -175,9 +199,9 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         if self.csp_report_uri:
             csp_directives.append(f"report-uri {self.csp_report_uri}")
 
-        response.headers[csp_header] = "; ".join(csp_directives)
+        headers[csp_header] = "; ".join(csp_directives)
 
-        return response
+        return headers
 
 
 class TrustedHostMiddleware:
@@ -3,15 +3,26 @@ Token Blacklist Service.
 
 Uses Redis to store invalidated JWT tokens until they expire.
 This enables proper logout functionality with stateless JWTs.
+
+Revocations are also published to the API processes, which replicate the
+blacklist locally (see app.core.principal_cache).
 """
 
+import hashlib
+import time
 from datetime import UTC, datetime
 
 from redis.asyncio import Redis
 
+from app.core.principal_cache import publish_token_revocation
 from app.core.security import ACCESS_TOKEN_EXPIRE_MINUTES, decode_access_token
 
 
+def get_token_id(token: str, payload: dict) -> str:
+    """Get the blacklist id of a decoded token (jti, or a hash of the token)."""
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
 class TokenBlacklist:
     """
     Redis-based token blacklist.
@@ -49,6 +60,7 @@ class TokenBlacklist:
         if exp is None:
             # No expiration, use default
             ttl = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            exp = time.time() + ttl
         else:
             # Calculate remaining TTL
             exp_time = datetime.fromtimestamp(exp, tz=UTC)
@@ -61,10 +73,11 @@ class TokenBlacklist:
 
         # Store token in blacklist
         # We use the token's "jti" (JWT ID) if available, otherwise hash the token
-        token_id = payload.get("jti") or self._hash_token(token)
+        token_id = get_token_id(token, payload)
         key = f"{self.KEY_PREFIX}{token_id}"
 
         await self.redis.setex(key, ttl, "1")
+        await publish_token_revocation(self.redis, token_id, float(exp))
         return True
 
     async def is_blacklisted(self, token: str) -> bool:
@@ -83,7 +96,7 @@ class TokenBlacklist:
             # Invalid token
             return False
 
-        token_id = payload.get("jti") or self._hash_token(token)
+        token_id = get_token_id(token, payload)
         key = f"{self.KEY_PREFIX}{token_id}"
 
         result = await self.redis.exists(key)
@@ -104,18 +117,12 @@ class TokenBlacklist:
         if payload is None:
             return False
 
-        token_id = payload.get("jti") or self._hash_token(token)
+        token_id = get_token_id(token, payload)
         key = f"{self.KEY_PREFIX}{token_id}"
 
         result = await self.redis.delete(key)
         return result > 0
 
-    def _hash_token(self, token: str) -> str:
-        """Create a short hash of the token for storage."""
-        import hashlib
-
-        return hashlib.sha256(token.encode()).hexdigest()[:32]
-
 
 # Global blacklist instance
 _token_blacklist: TokenBlacklist | None = None
@@ -184,6 +191,7 @@ async def blacklist_token_by_jti(jti: str, ttl_seconds: int) -> bool:
 
     key = f"{blacklist.KEY_PREFIX}{jti}"
     await blacklist.redis.setex(key, ttl_seconds, "1")
+    await publish_token_revocation(blacklist.redis, jti, time.time() + ttl_seconds)
     return True
 
 
@@ -17,7 +17,7 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager, suppress
 
 import structlog
-from sqlalchemy import MetaData, text
+from sqlalchemy import MetaData, event, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -27,6 +27,9 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
+from app.core.data_versions import register_data_version_listeners
+from app.core.principal_cache import register_principal_cache_listeners
+from app.monitoring.metrics import celery_db_connections_opened_total
 
 logger = structlog.get_logger(__name__)
 
@@ -74,6 +77,12 @@ async_session_factory = async_sessionmaker(
     autoflush=False,
 )
 
+# Bump data versions after every commit (exact smart query cache invalidation)
+register_data_version_listeners()
+
+# Invalidate cached principals after commits that change users
+register_principal_cache_listeners()
+
 
 async def get_session() -> AsyncGenerator[AsyncSession]:
     """Dependency for getting async database sessions.
@@ -167,9 +176,14 @@ def get_celery_engine():
             pool_recycle=300,
             pool_timeout=30,
         )
+        event.listen(_celery_engine.sync_engine, "connect", _count_celery_connection)
     return _celery_engine
 
 
+def _count_celery_connection(dbapi_connection, connection_record) -> None:
+    celery_db_connections_opened_total.inc()
+
+
 def get_celery_session_factory():
     """Get or create a session factory for Celery workers."""
     global _celery_session_factory
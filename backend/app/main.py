@@ -8,8 +8,7 @@ import structlog
 from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from redis.asyncio import Redis
 
 from app import __version__
@@ -60,8 +59,10 @@ from app.api.v1.analysis_api import router as analysis_router
 from app.api.v1.data_api import router as data_router
 from app.config import settings
 from app.core.cache_headers import cache_for_config
+from app.core.compression import StreamingAwareGZipMiddleware
 from app.core.exceptions import AppException
 from app.core.i18n_middleware import I18nMiddleware
+from app.core.principal_cache import PrincipalCache, PrincipalInvalidationListener, set_principal_cache
 from app.core.query_cache import set_query_cache_client
 from app.core.rate_limit import RateLimiter, set_rate_limiter
 from app.core.security_headers import SecurityHeadersMiddleware, TrustedHostMiddleware
@@ -70,7 +71,11 @@ from app.core.token_blacklist import TokenBlacklist, set_token_blacklist
 from app.database import close_db, init_db
 from app.i18n import load_translations
 from app.monitoring.metrics import get_metrics_router, set_app_info
+from app.services.notification_broadcast import notification_broadcaster
+from services.llm_client_service import close_llm_client_pool
+from services.llm_rate_governor import LLMPriority, set_default_llm_priority
 from services.llm_usage_tracker import get_tracker as get_llm_usage_tracker
+from services.summaries.render_service import shutdown_render_pool
 
 
 def sanitize_sensitive_data(
@@ -129,12 +134,13 @@ logger = structlog.get_logger()
 
 # Global Redis connection for cleanup
 _redis_client: Redis | None = None
+_principal_listener: PrincipalInvalidationListener | None = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
     """Application lifespan handler."""
-    global _redis_client
+    global _redis_client, _principal_listener
 
     # Startup
     logger.info("Starting CaeliCrawler", version=__version__, env=settings.app_env)
@@ -143,6 +149,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     load_translations()
     logger.info("Translations loaded")
 
+    # LLM calls from API requests are user-facing and go before background work
+    set_default_llm_priority(LLMPriority.INTERACTIVE)
+
     # Initialize database (create tables if they don't exist)
     if settings.is_development:
         await init_db()
@@ -168,6 +177,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         set_token_blacklist(token_blacklist)
         logger.info("Token blacklist initialized")
 
+        # Initialize principal cache (local user cache and blacklist replica)
+        if settings.auth_principal_cache_enabled:
+            principal_cache = PrincipalCache(
+                ttl_seconds=settings.auth_principal_cache_ttl_seconds,
+                max_size=settings.auth_principal_cache_size,
+            )
+            set_principal_cache(principal_cache)
+            _principal_listener = PrincipalInvalidationListener(_redis_client, principal_cache)
+            _principal_listener.start()
+            logger.info("Principal cache initialized")
+
         # Initialize query cache
         set_query_cache_client(_redis_client)
         logger.info("Query cache initialized")
@@ -198,6 +218,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     await llm_tracker.force_flush()
     logger.info("LLM usage tracker flushed")
 
+    # Stop PDF render processes
+    shutdown_render_pool()
+
+    # Close pooled LLM client connections
+    await close_llm_client_pool()
+
+    # Stop principal cache invalidation listener
+    if _principal_listener:
+        await _principal_listener.stop()
+        set_principal_cache(None)
+
+    # Stop the notification pub/sub listener
+    await notification_broadcaster.close()
+
     # Close Redis connection
     if _redis_client:
         await _redis_client.close()
@@ -246,6 +280,7 @@ Diese API verwendet JWT (JSON Web Tokens) für die Authentifizierung.
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Security headers middleware (add first, executes last)
@@ -277,8 +312,9 @@ Diese API verwendet JWT (JSON Web Tokens) für die Authentifizierung.
 
     # GZip compression for responses > 2KB
     # Minimum size of 2000 bytes avoids compression overhead for small responses
-    # where the gzip headers would negate bandwidth savings
-    app.add_middleware(GZipMiddleware, minimum_size=2000)
+    # where the gzip headers would negate bandwidth savings.
+    # Server-Sent Events are never compressed so every event is flushed immediately.
+    app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=2000)
 
     # Exception handlers
     @app.exception_handler(AppException)
@@ -23,6 +23,9 @@ from app.models.crawl_job import CrawlJob, JobStatus
 # Crawl Presets
 from app.models.crawl_preset import CrawlPreset
 
+# Incremental Crawling
+from app.models.crawl_url_state import CrawlUrlState
+
 # Custom Summaries
 from app.models.custom_summary import CustomSummary, SummaryStatus, SummaryTriggerType
 from app.models.data_source import DataSource, SourceStatus, SourceType
@@ -43,6 +46,9 @@ from app.models.extracted_data import ExtractedData
 from app.models.facet_type import AggregationMethod, FacetType, TimeFilter, ValueType
 from app.models.facet_value import FacetValue, FacetValueSourceType
 from app.models.facet_value_history import FacetValueHistory
+
+# LLM Batch Inference
+from app.models.llm_batch_job import LLMBatchJob
 from app.models.llm_budget import (
     BudgetType,
     LimitIncreaseRequestStatus,
@@ -51,6 +57,9 @@ from app.models.llm_budget import (
     LLMBudgetLimitRequest,
 )
 
+# LLM Response Cache
+from app.models.llm_response_cache import LLMResponseCache
+
 # LLM Usage Tracking
 from app.models.llm_usage import (
     LLMProvider,
@@ -134,6 +143,7 @@ __all__ = [
     "SourceType",
     "CrawlJob",
     "JobStatus",
+    "CrawlUrlState",
     "Document",
     "ProcessingStatus",
     "ExtractedData",
@@ -236,6 +246,8 @@ __all__ = [
     # LLM Usage Tracking
     "LLMUsageRecord",
     "LLMUsageMonthlyAggregate",
+    "LLMResponseCache",
+    "LLMBatchJob",
     "LLMProvider",
     "LLMTaskType",
     "LLMBudgetConfig",
@@ -5,9 +5,9 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any, Optional
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.database import Base
 
@@ -33,6 +33,12 @@ class Category(Base):
     __table_args__ = (
         # User's visible categories: WHERE created_by_id = ? OR is_public = true
         Index("ix_categories_creator_public", "created_by_id", "is_public"),
+        # Scheduler tick: WHERE schedule_enabled IS true AND next_run_at <= now
+        Index(
+            "ix_categories_schedule_due",
+            "next_run_at",
+            postgresql_where=text("schedule_enabled IS TRUE"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -145,6 +151,13 @@ class Category(Base):
         comment="User whose API credentials are used for automatic scheduled crawls",
     )
 
+    # Next cron fire, maintained by the crawl scheduler (NULL = due for evaluation)
+    next_run_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Next scheduled crawl run; NULL lets the scheduler evaluate the category on its next tick",
+    )
+
     # Ownership & Visibility
     created_by_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
@@ -232,6 +245,12 @@ class Category(Base):
         order_by="CategoryEntityType.extraction_order",
     )
 
+    @validates("schedule_cron", "schedule_enabled")
+    def _reset_next_run(self, key: str, value: Any) -> Any:
+        """Let the scheduler recompute next_run_at after a schedule change."""
+        self.next_run_at = None
+        return value
+
     @property
     def entity_types(self) -> list["EntityType"]:
         """Get all associated EntityTypes in extraction order."""
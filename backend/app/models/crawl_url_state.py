@@ -0,0 +1,93 @@
+"""Per-URL fetch state for incremental website crawls.
+
+The website crawler remembers the validators (ETag, Last-Modified) and the
+content hash of every page it fetched, plus the same-domain links found on
+it. Recrawls revalidate pages with conditional requests and continue the
+link traversal from the stored links when the server answers 304. Linked
+documents that are already registered are skipped without any lookup.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CrawlUrlState(Base):
+    """
+    Fetch state of one URL of a data source, per category.
+
+    State is kept per category because HTML capture (relevance check) and
+    document registration are scoped to the crawling job's category.
+    """
+
+    __tablename__ = "crawl_url_states"
+    __table_args__ = (UniqueConstraint("source_id", "category_id", "url_hash", name="uq_crawl_url_state"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    source_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("data_sources.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    category_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    url_hash: Mapped[str] = mapped_column(String(64), nullable=False, comment="SHA256 of the URL")
+    is_document: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        comment="Linked document (registered, never fetched by the crawler) instead of an HTML page",
+    )
+
+    # HTTP validators and content fingerprint of the last 200 response
+    etag: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    config_fingerprint: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Fingerprint of the capture settings the page was last processed with",
+    )
+    links: Mapped[list[str] | None] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Same-domain links found on the page, followed when the page is not modified",
+    )
+
+    # Change frequency
+    first_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_changed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    check_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    change_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    @property
+    def change_rate(self) -> float:
+        """Share of checks in which the content changed (0.0 - 1.0)."""
+        if not self.check_count:
+            return 0.0
+        return self.change_count / self.check_count
+
+    def __repr__(self) -> str:
+        return f"<CrawlUrlState(url={self.url[:60]}, checks={self.check_count}, changes={self.change_count})>"
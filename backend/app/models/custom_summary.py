@@ -228,6 +228,11 @@ class CustomSummary(Base):
         nullable=True,
         comment="Hash of last execution data for change detection",
     )
+    last_input_fingerprint: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Fingerprint of referenced entities/facets at last execution (skips unchanged runs)",
+    )
 
     # Favorite / Sorting
     is_favorite: Mapped[bool] = mapped_column(
@@ -46,6 +46,8 @@ class Entity(Base):
     __table_args__ = (
         # For list queries filtering by type and active status
         Index("ix_entities_type_active", "entity_type_id", "is_active"),
+        # For summary input fingerprints (count + max(updated_at) per type)
+        Index("ix_entities_type_updated_at", "entity_type_id", "updated_at"),
         # For entity lookup by normalized name within a type
         Index("ix_entities_type_name_normalized", "entity_type_id", "name_normalized"),
         # For hierarchy queries
@@ -171,6 +171,8 @@ class EntityRelation(Base):
         Index("ix_entity_relations_source_active", "source_entity_id", "is_active"),
         Index("ix_entity_relations_target_active", "target_entity_id", "is_active"),
         Index("ix_entity_relations_type_active", "relation_type_id", "is_active"),
+        # Reverse hops in multi-hop queries (forward hops use the unique constraint)
+        Index("ix_entity_relations_type_target_source", "relation_type_id", "target_entity_id", "source_entity_id"),
     )
 
     @property
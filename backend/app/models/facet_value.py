@@ -64,6 +64,8 @@ class FacetValue(Base):
         Index("ix_facet_values_entity_event_date", "entity_id", "event_date"),
         # For filtering facets by entity and source type
         Index("ix_facet_values_entity_source", "entity_id", "source_type"),
+        # For summary input fingerprints (count + max(updated_at) per facet type)
+        Index("ix_facet_values_facet_type_updated_at", "facet_type_id", "updated_at"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
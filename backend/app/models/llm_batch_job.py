@@ -0,0 +1,90 @@
+"""Offline LLM batch jobs.
+
+Bulk analyses (batch_analyze, reanalyze_low_confidence) are written to a JSONL
+file and submitted to the provider batch endpoint instead of occupying the
+interactive deployment quota. A beat task polls the jobs and feeds the
+results back into the extraction pipeline.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class LLMBatchJob(Base):
+    """Model for tracking submitted LLM batch jobs."""
+
+    __tablename__ = "llm_batch_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # Job metadata
+    purpose: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        comment="Result handler, e.g. document_analysis",
+    )
+    backend: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="openai or local",
+    )
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    provider_batch_id: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        index=True,
+    )
+
+    # Status tracking
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="pending",
+        comment="pending, submitted, in_progress, completed, failed, expired, cancelled",
+    )
+
+    # Requests (custom_id -> handler metadata, e.g. document_id and cache keys)
+    items: Mapped[dict[str, Any]] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+    )
+    input_file_path: Mapped[str | None] = mapped_column(Text, nullable=True)
+    output_file_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error_file_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # Progress
+    request_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    submitted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (Index("ix_llm_batch_jobs_status_created", "status", "created_at"),)
+
+    def __repr__(self) -> str:
+        return f"<LLMBatchJob(id={self.id}, status={self.status}, requests={self.request_count})>"
+
+    @property
+    def is_finished(self) -> bool:
+        """Check if job is in a terminal state."""
+        return self.status in ("completed", "failed", "expired", "cancelled")
@@ -0,0 +1,60 @@
+"""Content-addressed cache of LLM extraction responses.
+
+Identical documents (same PDF mirrored on several portals) and re-runs with
+unchanged prompts produce identical requests. Their responses are stored
+under a hash of everything that determines the completion, so repeated
+analyses are served without a new LLM call.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class LLMResponseCache(Base):
+    """
+    Cached LLM response keyed by its request.
+
+    cache_key:   SHA256 of (model, prompt hash, analyzed-text hash, temperature, response_format)
+    content_key: SHA256 of (model, prompt hash, document content hash, page selection,
+                 temperature, response_format) - lets duplicate documents share an
+                 extraction even if their extracted text differs slightly
+    """
+
+    __tablename__ = "llm_response_cache"
+    __table_args__ = (
+        Index("ix_llm_response_cache_content_key", "content_key"),
+        Index("ix_llm_response_cache_created_at", "created_at"),
+    )
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    content_key: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Alternative key based on the document content hash",
+    )
+
+    # Request parameters (for inspection / targeted invalidation)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    prompt_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    temperature: Mapped[float] = mapped_column(Float, nullable=False)
+
+    # Response
+    response: Mapped[str] = mapped_column(Text, nullable=False, comment="Raw completion content")
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Statistics
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<LLMResponseCache(key={self.cache_key[:12]}, model={self.model}, hits={self.hit_count})>"
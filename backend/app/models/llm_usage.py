@@ -188,6 +188,12 @@ class LLMUsageRecord(Base):
         nullable=True,
     )
 
+    # Response cache (None = call is not cached)
+    cache_hit: Mapped[bool | None] = mapped_column(
+        nullable=True,
+        comment="Whether the response was served from the LLM response cache",
+    )
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -73,6 +73,13 @@ crawler_job_duration_seconds = Histogram(
     buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
 )
 
+crawler_db_round_trips = Histogram(
+    "crawler_db_round_trips",
+    "Database round-trips per crawl for document registration",
+    ["source_type"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250, 500, 1000),
+)
+
 
 # === Document Processing Metrics ===
 
@@ -122,6 +129,92 @@ ai_tokens_used = Counter(
     ["model", "token_type"],
 )
 
+# === LLM Rate Governor Metrics ===
+
+llm_governor_waiting = Gauge(
+    "llm_governor_waiting",
+    "Number of LLM calls waiting for rate limit tokens",
+    ["model", "priority"],
+)
+
+llm_governor_wait_seconds = Histogram(
+    "llm_governor_wait_seconds",
+    "Time LLM calls waited for rate limit tokens",
+    ["model", "priority"],
+    buckets=(0.01, 0.1, 0.5, 1, 2, 5, 10, 30, 60, 120),
+)
+
+llm_governor_throttled_total = Counter(
+    "llm_governor_throttled_total",
+    "Total number of 429 responses reported to the LLM rate governor",
+    ["model"],
+)
+
+
+# === Assistant Intent Metrics ===
+
+assistant_intent_classifications_total = Counter(
+    "assistant_intent_classifications_total",
+    "Total number of assistant intent classifications by tier (rules, knn, llm)",
+    ["tier", "intent"],
+)
+
+assistant_intent_classification_seconds = Histogram(
+    "assistant_intent_classification_seconds",
+    "Assistant intent classification duration by tier",
+    ["tier"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+
+assistant_speculative_branches_total = Counter(
+    "assistant_speculative_branches_total",
+    "Speculative assistant pipeline branches by outcome (used, cancelled, failed)",
+    ["branch", "outcome"],
+)
+
+
+# === Notification Metrics ===
+
+notification_dispatch_seconds = Histogram(
+    "notification_dispatch_seconds",
+    "Duration of matching an event against the notification rules and creating notifications",
+    ["event_type"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+smtp_connections_opened_total = Counter(
+    "smtp_connections_opened_total",
+    "SMTP sessions (TCP, TLS and AUTH) opened by the connection pool",
+    ["server"],
+)
+
+smtp_messages_total = Counter(
+    "smtp_messages_total",
+    "Emails sent through the SMTP connection pool by result",
+    ["server", "result"],
+)
+
+notification_sse_subscribers = Gauge(
+    "notification_sse_subscribers",
+    "Connected notification SSE clients of this process",
+)
+
+notification_sse_redis_channels = Gauge(
+    "notification_sse_redis_channels",
+    "Redis channels subscribed on the shared notification pub/sub connection",
+)
+
+notification_sse_queue_depth = Gauge(
+    "notification_sse_queue_depth",
+    "Events buffered in the SSE client queues of this process",
+)
+
+notification_sse_events_discarded_total = Counter(
+    "notification_sse_events_discarded_total",
+    "Events not delivered to slow SSE clients (dropped: queue full, coalesced: superseded)",
+    ["reason"],
+)
+
 
 # === Data Source Metrics ===
 
@@ -146,6 +239,17 @@ celery_workers_active = Gauge(
     ["queue"],
 )
 
+celery_async_tasks_total = Counter(
+    "celery_async_tasks_total",
+    "Async task bodies run by run_async, by event loop mode (persistent worker loop or a new loop per task)",
+    ["loop"],
+)
+
+celery_db_connections_opened_total = Counter(
+    "celery_db_connections_opened_total",
+    "New database connections opened by the Celery engine (compare with celery_async_tasks_total)",
+)
+
 redis_connection_status = Gauge(
     "redis_connection_status",
     "Redis connection status (1=connected, 0=disconnected)",
@@ -204,6 +308,18 @@ csp_violations_total = Counter(
     ["directive", "blocked_uri"],
 )
 
+auth_principal_cache_requests_total = Counter(
+    "auth_principal_cache_requests_total",
+    "Authenticated principal lookups by cache result (hit, miss)",
+    ["result"],
+)
+
+auth_revocation_checks_total = Counter(
+    "auth_revocation_checks_total",
+    "Token revocation checks by source (local replica, redis)",
+    ["source"],
+)
+
 
 # === Application Info ===
 
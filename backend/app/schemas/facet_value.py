@@ -178,9 +178,11 @@ class FacetValueSearchResponse(BaseModel):
     """Response for facet value search."""
 
     items: list[FacetValueSearchResult]
-    total: int
+    total: int | None = Field(None, description="Number of matches (not computed for cursor pages)")
     page: int
     per_page: int
-    pages: int
+    pages: int | None = Field(None, description="Number of pages (not computed for cursor pages)")
     query: str
+    mode: str = Field(default="fulltext", description="Search mode used (fulltext or hybrid)")
+    next_cursor: str | None = Field(None, description="Cursor of the next page, None on the last page")
     search_time_ms: float = Field(default=0.0, description="Search execution time")
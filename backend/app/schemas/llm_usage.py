@@ -21,6 +21,8 @@ class LLMUsageSummary(BaseModel):
     avg_duration_ms: float = Field(description="Average request duration in milliseconds")
     error_count: int = Field(description="Number of failed requests")
     error_rate: float = Field(description="Error rate as decimal (0-1)")
+    cache_hits: int = Field(default=0, description="Requests served from the LLM response cache")
+    cache_misses: int = Field(default=0, description="Cacheable requests that needed a new completion")
 
 
 class LLMUsageByModel(BaseModel):
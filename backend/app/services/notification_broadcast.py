@@ -2,11 +2,22 @@
 
 This service uses Redis Pub/Sub to broadcast notification events to all
 connected SSE clients, enabling real-time updates without polling.
+
+Each API process holds a single pub/sub connection. It is subscribed to
+the channels of the users with at least one connected client; a listener
+task parses every message once and fans it out to the bounded in-process
+queues of the clients. A slow client does not hold up the others:
+
+- count_update and all_read events replace a pending event of the same
+  type (only the latest state matters)
+- when the queue is full, the oldest event is dropped
 """
 
 import asyncio
 import json
+from collections import deque
 from collections.abc import AsyncGenerator
+from contextlib import suppress
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
@@ -15,9 +26,74 @@ import redis.asyncio as redis
 import structlog
 
 from app.config import settings
+from app.monitoring.metrics import (
+    notification_sse_events_discarded_total,
+    notification_sse_queue_depth,
+    notification_sse_redis_channels,
+    notification_sse_subscribers,
+)
 
 logger = structlog.get_logger()
 
+# Seconds without events after which a heartbeat is sent to the client
+HEARTBEAT_INTERVAL = 30.0
+
+# Maximum delay between reconnect attempts of the pub/sub listener
+LISTENER_MAX_BACKOFF_SECONDS = 30.0
+
+
+class SubscriberQueue:
+    """Bounded event buffer of one SSE client."""
+
+    # Events that carry the complete state and supersede a pending one
+    COALESCED_EVENTS = frozenset({"count_update", "all_read"})
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        self._events: deque[dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of buffered events."""
+        return len(self._events)
+
+    def put(self, event: dict[str, Any]) -> None:
+        """Buffer an event without waiting for the client."""
+        if event.get("type") in self.COALESCED_EVENTS:
+            for pending in self._events:
+                if pending.get("type") == event["type"]:
+                    # Keep the position relative to the other events: move to the end
+                    self._events.remove(pending)
+                    self._events.append(event)
+                    self.coalesced += 1
+                    notification_sse_events_discarded_total.labels(reason="coalesced").inc()
+                    return
+
+        if len(self._events) >= self.maxsize:
+            self._events.popleft()
+            self.dropped += 1
+            notification_sse_events_discarded_total.labels(reason="dropped").inc()
+        else:
+            notification_sse_queue_depth.inc()
+        self._events.append(event)
+        self._ready.set()
+
+    async def get(self) -> dict[str, Any]:
+        """Wait for the next event."""
+        while not self._events:
+            self._ready.clear()
+            await self._ready.wait()
+        notification_sse_queue_depth.dec()
+        return self._events.popleft()
+
+    def close(self) -> None:
+        """Discard the buffered events."""
+        notification_sse_queue_depth.dec(len(self._events))
+        self._events.clear()
+
 
 class NotificationBroadcaster:
     """
@@ -39,7 +115,14 @@ class NotificationBroadcaster:
 
     def __init__(self):
         self._redis: redis.Redis | None = None
-        self._pubsub_connections: dict[str, redis.client.PubSub] = {}
+        # Local subscribers by Redis channel
+        self._subscribers: dict[str, set[SubscriberQueue]] = {}
+        # Shared pub/sub connection (None while (re)connecting) and its channels
+        self._pubsub: redis.client.PubSub | None = None
+        self._subscribed: set[str] = set()
+        # Serializes SUBSCRIBE/UNSUBSCRIBE on the shared connection
+        self._pubsub_lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
 
     async def get_redis(self) -> redis.Redis:
         """Get or create Redis connection."""
@@ -129,7 +212,9 @@ class NotificationBroadcaster:
         Subscribe to notification events for a user.
 
         Yields events as they are published. This is designed to be used
-        with SSE endpoints.
+        with SSE endpoints. Events arrive over the shared pub/sub connection
+        of the process; the yielded dictionaries are shared between the
+        subscribers of a user and must not be modified.
 
         Args:
             user_id: ID of the user to subscribe for
@@ -137,39 +222,126 @@ class NotificationBroadcaster:
         Yields:
             Event dictionaries with type, data, and timestamp
         """
-        r = await self.get_redis()
-        pubsub = r.pubsub()
-
         channel = self.USER_CHANNEL.format(user_id=str(user_id))
+        queue = SubscriberQueue(settings.notification_sse_queue_size)
 
         try:
-            await pubsub.subscribe(channel)
+            await self._add_subscriber(channel, queue)
             logger.debug(f"Subscribed to notifications for user {user_id}")
 
             while True:
                 try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(ignore_subscribe_messages=True),
-                        timeout=30.0,  # Timeout for heartbeat
-                    )
-
-                    if message and message["type"] == "message":
-                        event = json.loads(message["data"])
-                        yield event
-
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
                 except TimeoutError:
                     # Yield heartbeat to keep connection alive
                     yield {"type": "heartbeat", "data": {}, "timestamp": datetime.now(UTC).isoformat()}
+                    continue
+                yield event
 
         except asyncio.CancelledError:
             logger.debug(f"SSE subscription cancelled for user {user_id}")
             raise
         finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
+            await self._remove_subscriber(channel, queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers of this process."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def _add_subscriber(self, channel: str, queue: SubscriberQueue) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(), name="notification-broadcast-listener")
+        self._subscribers.setdefault(channel, set()).add(queue)
+        notification_sse_subscribers.inc()
+        await self._sync_channel(channel)
+
+    async def _remove_subscriber(self, channel: str, queue: SubscriberQueue) -> None:
+        queues = self._subscribers.get(channel)
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[channel]
+        queue.close()
+        notification_sse_subscribers.dec()
+        await self._sync_channel(channel)
+
+    async def _sync_channel(self, channel: str) -> None:
+        """Subscribe or unsubscribe the shared connection as the local subscribers require."""
+        async with self._pubsub_lock:
+            pubsub = self._pubsub
+            wanted = channel in self._subscribers
+            if pubsub is None or wanted == (channel in self._subscribed):
+                # Not connected: the listener subscribes all channels on connect
+                return
+            try:
+                if wanted:
+                    await pubsub.subscribe(channel)
+                    self._subscribed.add(channel)
+                else:
+                    await pubsub.unsubscribe(channel)
+                    self._subscribed.discard(channel)
+            except Exception as e:
+                # The listener notices the broken connection and resubscribes
+                logger.warning("notification_pubsub_command_failed", channel=channel, error=str(e))
+            notification_sse_redis_channels.set(len(self._subscribed))
+
+    async def _listen(self) -> None:
+        """Read the shared pub/sub connection and fan messages out to the local queues."""
+        backoff = 1.0
+        while True:
+            r = await self.get_redis()
+            pubsub = r.pubsub()
+            try:
+                await pubsub.connect()
+                async with self._pubsub_lock:
+                    channels = list(self._subscribers)
+                    if channels:
+                        await pubsub.subscribe(*channels)
+                    self._pubsub = pubsub
+                    self._subscribed = set(channels)
+                notification_sse_redis_channels.set(len(channels))
+                logger.info("notification_pubsub_connected", channels=len(channels))
+                backoff = 1.0
+
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self._fan_out(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("notification_pubsub_error", error=str(e), retry_in=backoff)
+            finally:
+                self._pubsub = None
+                self._subscribed = set()
+                notification_sse_redis_channels.set(0)
+                with suppress(Exception):
+                    await pubsub.aclose()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, LISTENER_MAX_BACKOFF_SECONDS)
+
+    def _fan_out(self, channel: str, data: str) -> None:
+        queues = self._subscribers.get(channel)
+        if not queues:
+            return
+        try:
+            event = json.loads(data)
+        except ValueError:
+            logger.warning("notification_event_invalid", channel=channel)
+            return
+        for queue in queues:
+            queue.put(event)
 
     async def close(self) -> None:
-        """Close Redis connection."""
+        """Stop the pub/sub listener and close the Redis connection."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
         if self._redis:
             await self._redis.close()
             self._redis = None
@@ -196,7 +196,8 @@ async def _generate_embedding_with_db_credentials(
     from app.models.llm_usage import LLMProvider, LLMTaskType
     from app.models.user_api_credentials import LLMPurpose
     from services.llm_client_service import LLMClientService
-    from services.llm_usage_tracker import track_llm_usage
+    from services.llm_rate_governor import governed_llm_call
+    from services.llm_usage_tracker import estimate_tokens, track_llm_usage
 
     try:
         service = LLMClientService(session)
@@ -223,11 +224,12 @@ async def _generate_embedding_with_db_credentials(
             task_type=LLMTaskType.EMBEDDING,
             task_name="generate_embedding_single",
         ) as usage_ctx:
-            response = await client.embeddings.create(
-                input=text,
-                model=model,
-                dimensions=EMBEDDING_DIMENSIONS,
-            )
+            async with governed_llm_call(model, estimate_tokens(text)):
+                response = await client.embeddings.create(
+                    input=text,
+                    model=model,
+                    dimensions=EMBEDDING_DIMENSIONS,
+                )
 
             # Track token usage - Azure sometimes doesn't return usage, so estimate
             if response.usage and response.usage.prompt_tokens:
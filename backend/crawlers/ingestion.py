@@ -0,0 +1,165 @@
+"""Batched document registration for feed and API crawlers.
+
+Crawlers add the documents of one page of results to a DocumentIngestor
+and flush it. A flush costs two statements per batch, independent of the
+number of items:
+
+- one existence lookup (``file_hash = ANY(:hashes)``) for the candidates
+- one multi-row ``INSERT ... ON CONFLICT DO NOTHING`` for the new ones
+
+The conflict clause covers documents registered by a concurrent crawl of
+the same source between lookup and insert. The round-trips of a crawl are
+reported via ``record_round_trips``.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Any
+
+import structlog
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Document, ProcessingStatus
+
+logger = structlog.get_logger()
+
+# Rows per statement (asyncpg allows at most 32767 bind parameters)
+INSERT_BATCH_SIZE = 1000
+
+
+class DocumentIngestor:
+    """
+    Collects new documents of one source and registers them in bulk.
+
+    Usage:
+        ingestor = DocumentIngestor(session, source.id, job.category_id, job.id)
+        for item in page:
+            ingestor.add(file_hash=..., original_url=..., document_type="PDF", title=...)
+        new_count = await ingestor.flush()
+        await session.commit()
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        source_id: uuid.UUID,
+        category_id: uuid.UUID,
+        crawl_job_id: uuid.UUID | None = None,
+        batch_size: int = INSERT_BATCH_SIZE,
+    ):
+        self.session = session
+        self.source_id = source_id
+        self.category_id = category_id
+        self.crawl_job_id = crawl_job_id
+        self.batch_size = batch_size
+        self._pending: dict[str, dict[str, Any]] = {}
+        self.round_trips = 0
+        self.documents_new = 0
+        self.documents_existing = 0
+
+    def add(
+        self,
+        *,
+        file_hash: str,
+        original_url: str,
+        document_type: str,
+        title: str | None = None,
+        raw_text: str | None = None,
+        document_date: datetime | None = None,
+        processing_status: ProcessingStatus = ProcessingStatus.PENDING,
+    ) -> bool:
+        """
+        Add a candidate document to the current batch.
+
+        Returns:
+            False if the hash is already part of the batch (first one wins)
+        """
+        if file_hash in self._pending:
+            return False
+        # Every row carries the same keys, as required for a multi-row VALUES clause
+        self._pending[file_hash] = {
+            "id": uuid.uuid4(),
+            "source_id": self.source_id,
+            "category_id": self.category_id,
+            "crawl_job_id": self.crawl_job_id,
+            "document_type": document_type,
+            "original_url": original_url,
+            "title": title,
+            "raw_text": raw_text,
+            "file_hash": file_hash,
+            "file_size": 0,
+            "processing_status": processing_status,
+            "document_date": document_date,
+        }
+        return True
+
+    async def existing_hashes(self, hashes: list[str]) -> set[str]:
+        """Resolve which hashes are already registered for the source (one query)."""
+        if not hashes:
+            return set()
+        result = await self.session.execute(
+            select(Document.file_hash).where(
+                Document.source_id == self.source_id,
+                Document.file_hash == any_(bindparam("file_hashes", hashes, type_=ARRAY(String))),
+            )
+        )
+        self.round_trips += 1
+        return set(result.scalars().all())
+
+    def insert_statement(self, rows: list[dict[str, Any]]):
+        """Build the multi-row insert that skips hashes registered in the meantime."""
+        return (
+            insert(Document)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uq_document_source_hash")
+            .returning(Document.file_hash)
+        )
+
+    async def flush(self) -> int:
+        """
+        Register the pending documents that do not exist yet.
+
+        Returns:
+            Number of inserted documents
+        """
+        pending = list(self._pending.values())
+        self._pending.clear()
+
+        inserted = 0
+        for offset in range(0, len(pending), self.batch_size):
+            batch = pending[offset : offset + self.batch_size]
+            existing = await self.existing_hashes([row["file_hash"] for row in batch])
+            rows = [row for row in batch if row["file_hash"] not in existing]
+            self.documents_existing += len(existing)
+            if not rows:
+                continue
+
+            result = await self.session.execute(self.insert_statement(rows))
+            self.round_trips += 1
+            batch_inserted = len(result.scalars().all())
+            # Rows lost to the conflict clause were registered concurrently
+            self.documents_existing += len(rows) - batch_inserted
+            inserted += batch_inserted
+
+        self.documents_new += inserted
+        if pending:
+            logger.debug(
+                "documents_ingested",
+                source_id=str(self.source_id),
+                candidates=len(pending),
+                inserted=inserted,
+                round_trips=self.round_trips,
+            )
+        return inserted
+
+
+def record_round_trips(source_type: str, round_trips: int) -> None:
+    """Report the document registration round-trips of one crawl."""
+    try:
+        from app.monitoring.metrics import crawler_db_round_trips
+
+        crawler_db_round_trips.labels(source_type=source_type).observe(round_trips)
+    except ImportError:
+        pass
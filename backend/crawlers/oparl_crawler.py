@@ -2,6 +2,7 @@
 
 import asyncio
 import contextlib
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
 
@@ -25,6 +26,7 @@ class OparlCrawler(BaseCrawler):
     def __init__(self):
         super().__init__()
         self.client: httpx.AsyncClient | None = None
+        self.db_round_trips = 0
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
@@ -42,8 +44,11 @@ class OparlCrawler(BaseCrawler):
     async def crawl(self, source, job) -> CrawlResult:
         """Crawl an OParl API endpoint."""
 
+        from crawlers.ingestion import record_round_trips
+
         result = CrawlResult()
         client = await self._get_client()
+        self.db_round_trips = 0
 
         try:
             # Get the OParl system endpoint
@@ -86,7 +91,9 @@ class OparlCrawler(BaseCrawler):
             result.stats = {
                 "endpoint": endpoint,
                 "bodies_found": len(bodies) if bodies_url else 0,
+                "db_round_trips": self.db_round_trips,
             }
+            record_round_trips(source.source_type.value, self.db_round_trips)
 
         except Exception as e:
             self.logger.exception("OParl crawl failed", error=str(e))
@@ -115,84 +122,61 @@ class OparlCrawler(BaseCrawler):
     ):
         """Crawl papers (Drucksachen) from OParl API."""
         from app.database import get_celery_session_context
-        from app.models import Document, ProcessingStatus
+        from crawlers.ingestion import DocumentIngestor
 
         # Add modified filter if we have a last crawl date
         if source.last_crawl:
             separator = "&" if "?" in papers_url else "?"
             papers_url = f"{papers_url}{separator}modified_since={source.last_crawl.isoformat()}"
 
-        papers = await self._fetch_paginated(client, papers_url)
         result.pages_crawled += 1
 
         async with get_celery_session_context() as session:
-            for paper in papers:
-                result.documents_found += 1
-
-                # Extract files from paper
-                files = paper.get("auxiliaryFile", []) + [paper.get("mainFile")]
-                files = [f for f in files if f]  # Remove None
-
-                for file_data in files:
-                    if not file_data:
-                        continue
-
-                    file_url = file_data.get("accessUrl") or file_data.get("downloadUrl")
-                    if not file_url:
-                        continue
-
-                    # Determine document type
-                    mime_type = file_data.get("mimeType", "")
-                    if "pdf" in mime_type.lower():
-                        doc_type = "PDF"
-                    elif "html" in mime_type.lower():
-                        doc_type = "HTML"
-                    else:
-                        doc_type = mime_type.split("/")[-1].upper() or "UNKNOWN"
-
-                    # Create document hash from URL
-                    file_hash = self.compute_text_hash(file_url)
-
-                    # Check if document already exists
-                    from sqlalchemy import select
-
-                    existing = await session.execute(
-                        select(Document).where(
-                            Document.source_id == source.id,
-                            Document.file_hash == file_hash,
-                        )
-                    )
-                    if existing.scalar():
-                        continue  # Skip existing
-
-                    # Create document title including municipality for clustering
-                    base_title = file_data.get("name") or paper.get("name") or "Dokument"
-                    title = f"[{body_name}] {base_title}" if body_name else base_title
-
-                    # Create new document
-                    doc = Document(
-                        source_id=source.id,
-                        category_id=job.category_id,  # Use job's category
-                        crawl_job_id=job.id,
-                        document_type=doc_type,
-                        original_url=file_url,
-                        title=title,
-                        file_hash=file_hash,
-                        processing_status=ProcessingStatus.PENDING,
-                    )
+            ingestor = DocumentIngestor(session, source.id, job.category_id, job.id)
 
-                    # Try to extract date
-                    date_str = paper.get("date") or paper.get("modified")
-                    if date_str:
-                        with contextlib.suppress(ValueError):
-                            doc.document_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            # Register the files page by page: one lookup and one insert per page
+            async for papers in self._iter_pages(client, papers_url):
+                for paper in papers:
+                    result.documents_found += 1
+
+                    # Extract files from paper
+                    files = paper.get("auxiliaryFile", []) + [paper.get("mainFile")]
+                    files = [f for f in files if f]  # Remove None
+
+                    for file_data in files:
+                        file_url = file_data.get("accessUrl") or file_data.get("downloadUrl")
+                        if not file_url:
+                            continue
 
-                    session.add(doc)
-                    result.documents_new += 1
-                    result.documents_processed += 1
+                        # Determine document type
+                        mime_type = file_data.get("mimeType", "")
+                        if "pdf" in mime_type.lower():
+                            doc_type = "PDF"
+                        elif "html" in mime_type.lower():
+                            doc_type = "HTML"
+                        else:
+                            doc_type = mime_type.split("/")[-1].upper() or "UNKNOWN"
+
+                        # Create document title including municipality for clustering
+                        base_title = file_data.get("name") or paper.get("name") or "Dokument"
+                        title = f"[{body_name}] {base_title}" if body_name else base_title
+
+                        ingestor.add(
+                            file_hash=self.compute_text_hash(file_url),
+                            original_url=file_url,
+                            document_type=doc_type,
+                            title=title,
+                            document_date=self._parse_date(paper.get("date") or paper.get("modified")),
+                        )
+
+                new_count = await ingestor.flush()
+                result.documents_new += new_count
+                result.documents_processed += new_count
 
             await session.commit()
 
+        self.db_round_trips += ingestor.round_trips
+
     async def _crawl_meetings(
         self,
         client: httpx.AsyncClient,
@@ -203,79 +187,70 @@ class OparlCrawler(BaseCrawler):
         body_name: str | None = None,
     ):
         """Crawl meetings (Sitzungen) from OParl API."""
-        from sqlalchemy import select
-
         from app.database import get_celery_session_context
-        from app.models import Document, ProcessingStatus
+        from crawlers.ingestion import DocumentIngestor
 
         # Add modified filter if we have a last crawl date
         if source.last_crawl:
             separator = "&" if "?" in meetings_url else "?"
             meetings_url = f"{meetings_url}{separator}modified_since={source.last_crawl.isoformat()}"
 
-        meetings = await self._fetch_paginated(client, meetings_url, max_pages=5)
         result.pages_crawled += 1
 
         async with get_celery_session_context() as session:
-            # Process meeting agenda items and their files
-            for meeting in meetings:
-                meeting_name = meeting.get("name", "Sitzung")
-                meeting_date = meeting.get("start") or meeting.get("date")
-
-                agenda_items = meeting.get("agendaItem", [])
-                for item in agenda_items:
-                    files = item.get("auxiliaryFile", [])
-                    result.documents_found += len(files)
-
-                    for file_data in files:
-                        if not file_data:
-                            continue
-
-                        file_url = file_data.get("accessUrl") or file_data.get("downloadUrl")
-                        if not file_url:
-                            continue
-
-                        # Create hash
-                        file_hash = self.compute_text_hash(file_url)
-
-                        # Check if exists
-                        existing = await session.execute(
-                            select(Document).where(
-                                Document.source_id == source.id,
-                                Document.file_hash == file_hash,
+            ingestor = DocumentIngestor(session, source.id, job.category_id, job.id)
+
+            async for meetings in self._iter_pages(client, meetings_url, max_pages=5):
+                # Process meeting agenda items and their files
+                for meeting in meetings:
+                    meeting_name = meeting.get("name", "Sitzung")
+                    document_date = self._parse_date(meeting.get("start") or meeting.get("date"))
+
+                    agenda_items = meeting.get("agendaItem", [])
+                    for item in agenda_items:
+                        files = item.get("auxiliaryFile", [])
+                        result.documents_found += len(files)
+
+                        for file_data in files:
+                            if not file_data:
+                                continue
+
+                            file_url = file_data.get("accessUrl") or file_data.get("downloadUrl")
+                            if not file_url:
+                                continue
+
+                            # Create title with municipality
+                            base_title = file_data.get("name") or item.get("name") or meeting_name
+                            title = f"[{body_name}] {base_title}" if body_name else base_title
+
+                            # Determine document type
+                            mime_type = file_data.get("mimeType", "")
+                            doc_type = "PDF" if "pdf" in mime_type.lower() else "HTML"
+
+                            ingestor.add(
+                                file_hash=self.compute_text_hash(file_url),
+                                original_url=file_url,
+                                document_type=doc_type,
+                                title=title,
+                                document_date=document_date,
                             )
-                        )
-                        if existing.scalar():
-                            continue
-
-                        # Create title with municipality
-                        base_title = file_data.get("name") or item.get("name") or meeting_name
-                        title = f"[{body_name}] {base_title}" if body_name else base_title
 
-                        # Determine document type
-                        mime_type = file_data.get("mimeType", "")
-                        doc_type = "PDF" if "pdf" in mime_type.lower() else "HTML"
+                new_count = await ingestor.flush()
+                result.documents_new += new_count
+                result.documents_processed += new_count
 
-                        doc = Document(
-                            source_id=source.id,
-                            category_id=job.category_id,  # Use job's category
-                            crawl_job_id=job.id,
-                            document_type=doc_type,
-                            original_url=file_url,
-                            title=title,
-                            file_hash=file_hash,
-                            processing_status=ProcessingStatus.PENDING,
-                        )
-
-                        if meeting_date:
-                            with contextlib.suppress(ValueError):
-                                doc.document_date = datetime.fromisoformat(meeting_date.replace("Z", "+00:00"))
+            await session.commit()
 
-                        session.add(doc)
-                        result.documents_new += 1
-                        result.documents_processed += 1
+        self.db_round_trips += ingestor.round_trips
 
-            await session.commit()
+    @staticmethod
+    def _parse_date(date_str: str | None) -> datetime | None:
+        """Parse an OParl ISO 8601 date, None if missing or invalid."""
+        if not date_str:
+            return None
+        with contextlib.suppress(ValueError):
+            return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        return None
 
     async def _fetch_json(
         self,
@@ -299,6 +274,17 @@ class OparlCrawler(BaseCrawler):
     ) -> list[dict[str, Any]]:
         """Fetch paginated OParl data."""
         items = []
+        async for page in self._iter_pages(client, url, max_pages):
+            items.extend(page)
+        return items
+
+    async def _iter_pages(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        max_pages: int = 10,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the items of a paginated OParl list page by page."""
         current_url = url
         pages_fetched = 0
 
@@ -308,10 +294,10 @@ class OparlCrawler(BaseCrawler):
                 break
 
             # OParl uses "data" key for items
-            if "data" in data:
-                items.extend(data["data"])
-            elif isinstance(data, list):
-                items.extend(data)
+            if isinstance(data, list):
+                yield data
+                break
+            yield data.get("data", [])
 
             # Get next page URL
             links = data.get("links", {})
@@ -321,8 +307,6 @@ class OparlCrawler(BaseCrawler):
             # Rate limiting
             await asyncio.sleep(settings.crawler_default_delay)
 
-        return items
-
     async def detect_changes(self, source) -> bool:
         """Detect changes by checking modified timestamps."""
         client = await self._get_client()
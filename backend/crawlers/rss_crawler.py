@@ -138,10 +138,9 @@ class RSSCrawler(BaseCrawler):
 
     async def crawl(self, source, job) -> CrawlResult:
         """Crawl RSS/Atom feed from a data source."""
-        from sqlalchemy import select
-
         from app.database import get_session_context
-        from app.models import Document, ProcessingStatus
+        from app.models import ProcessingStatus
+        from crawlers.ingestion import DocumentIngestor, record_round_trips
 
         result = CrawlResult()
 
@@ -158,20 +157,8 @@ class RSSCrawler(BaseCrawler):
             result.documents_found = len(feed.items)
 
             async with get_session_context() as session:
+                ingestor = DocumentIngestor(session, source.id, job.category_id, job.id)
                 for item in feed.items:
-                    # Compute content hash
-                    content_hash = self._compute_item_hash(item)
-
-                    # Check if document already exists
-                    existing = await session.execute(
-                        select(Document).where(
-                            Document.source_id == source.id,
-                            Document.file_hash == content_hash,
-                        )
-                    )
-                    if existing.scalar():
-                        continue
-
                     # Find PDF or document attachments
                     file_url = None
                     for enc in item.enclosures:
@@ -182,32 +169,30 @@ class RSSCrawler(BaseCrawler):
                         elif not file_url:
                             file_url = enc.get("url")
 
-                    # Create document
-                    doc = Document(
-                        source_id=source.id,
-                        category_id=job.category_id,  # Use job's category
-                        crawl_job_id=job.id,
-                        document_type="RSS_ITEM",
+                    ingestor.add(
+                        file_hash=self._compute_item_hash(item),
                         original_url=item.link,
+                        document_type="RSS_ITEM",
                         title=item.title,
                         raw_text=item.content or item.description,
-                        file_hash=content_hash,
+                        document_date=item.published,
                         processing_status=ProcessingStatus.PENDING if file_url else ProcessingStatus.COMPLETED,
                     )
 
-                    if item.published:
-                        doc.document_date = item.published
-
-                    session.add(doc)
-                    result.documents_new += 1
-                    result.documents_processed += 1
+                # Existence check and insert for the whole feed
+                new_count = await ingestor.flush()
+                result.documents_new += new_count
+                result.documents_processed += new_count
 
                 await session.commit()
 
+            record_round_trips(source.source_type.value, ingestor.round_trips)
+
             result.stats = {
                 "feed_title": feed.title,
                 "feed_type": feed.feed_type,
                 "items_count": len(feed.items),
+                "db_round_trips": ingestor.round_trips,
             }
 
         except Exception as e:
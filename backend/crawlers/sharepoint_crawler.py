@@ -8,19 +8,23 @@ import fnmatch
 import hashlib
 import os
 import re
+import uuid
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-import aiofiles
 import structlog
 
 from app.config import settings
 from crawlers.base import BaseCrawler, CrawlResult
 from external_apis.clients.sharepoint_client import (
     SharePointClient,
+    SharePointDelta,
+    SharePointDrive,
     SharePointFile,
     SharePointNotFoundError,
+    SharePointResyncRequiredError,
+    SharePointSite,
     parse_sharepoint_site_url,
 )
 
@@ -33,6 +37,35 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+# Key in DataSource.extra_data holding the delta sync state of the library
+DELTA_STATE_KEY = "sharepoint_delta"
+
+
+class ByteBudget:
+    """Limits the number of bytes being downloaded concurrently.
+
+    A download reserves its expected size before it starts. Small files run
+    in parallel, large files wait until enough budget is free. A file larger
+    than the whole budget runs alone instead of waiting forever.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size: int) -> None:
+        """Wait until `size` bytes fit into the budget and reserve them."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight == 0 or self.in_flight + size <= self.limit)
+            self.in_flight += size
+
+    async def release(self, size: int) -> None:
+        """Return reserved bytes to the budget."""
+        async with self._condition:
+            self.in_flight -= size
+            self._condition.notify_all()
+
 
 class SharePointCrawler(BaseCrawler):
     """Crawler for SharePoint Online document libraries.
@@ -48,6 +81,10 @@ class SharePointCrawler(BaseCrawler):
         recursive: Whether to include subfolders (default: true)
         exclude_patterns: Patterns to exclude (e.g., ["~$*", "*.tmp"])
         max_files: Maximum number of files to crawl (default: 1000)
+
+    Folder listing uses the Graph delta query: the first crawl enumerates the
+    whole library, later crawls only receive created, modified and deleted
+    items since the delta token stored in the source's extra_data.
     """
 
     # Document types we can process
@@ -66,8 +103,9 @@ class SharePointCrawler(BaseCrawler):
     }
 
     # Batch processing settings
-    BATCH_SIZE = 10  # Number of files to download in parallel
-    MAX_CONCURRENT_DOWNLOADS = 5  # Semaphore limit for concurrent downloads
+    BATCH_SIZE = 20  # Number of files scheduled together
+    MAX_CONCURRENT_DOWNLOADS = 10  # Upper bound for open download connections
+    MAX_BYTES_IN_FLIGHT = 64 * 1024 * 1024  # Concurrent downloads are bounded by their total size
 
     async def crawl(self, source: "DataSource", job: "CrawlJob") -> CrawlResult:
         """Crawl a SharePoint document library."""
@@ -75,6 +113,8 @@ class SharePointCrawler(BaseCrawler):
 
         crawl_config = source.crawl_config or {}
         result = CrawlResult()
+        self._files_unchanged = 0
+        self._bytes_downloaded = 0
 
         # Parse configuration
         site_url = crawl_config.get("site_url", settings.sharepoint_default_site_url)
@@ -165,11 +205,16 @@ class SharePointCrawler(BaseCrawler):
                                 }
                             )
 
-                # List files from folder (if folder_path is set or no explicit files)
+                # List changed files via delta query (if folder_path is set or no explicit files)
+                deleted_ids: list[str] = []
+                delta_state: dict[str, Any] | None = None
+                incremental = False
                 if folder_path or not explicit_file_paths:
-                    folder_files = await client.list_files(
-                        site_id=site.id,
-                        drive_id=drive.id,
+                    folder_files, deleted_ids, delta_state, incremental = await self._list_changed_files(
+                        client=client,
+                        site=site,
+                        drive=drive,
+                        source=source,
                         folder_path=folder_path,
                         recursive=recursive,
                         file_extensions=file_extensions,
@@ -181,7 +226,16 @@ class SharePointCrawler(BaseCrawler):
                             files.append(f)
 
                 # Filter out excluded patterns and limit
-                files = self._filter_files(files, exclude_patterns)[:max_files]
+                files = self._filter_files(files, exclude_patterns)
+                if len(files) > max_files:
+                    # Keep the old token so the remaining changes are listed again
+                    self.logger.warning(
+                        "SharePoint changes exceed max_files, delta token not advanced",
+                        files=len(files),
+                        max_files=max_files,
+                    )
+                    files = files[:max_files]
+                    delta_state = None
 
                 result.pages_crawled = 1
                 result.documents_found = len(files)
@@ -189,12 +243,20 @@ class SharePointCrawler(BaseCrawler):
                 self.logger.info(
                     "Found SharePoint files",
                     total_files=len(files),
+                    deleted_files=len(deleted_ids),
+                    incremental=incremental,
                     explicit_files=len(explicit_file_paths) if explicit_file_paths else 0,
                 )
 
+                failed_files = 0
+                files_deleted = 0
+
                 # Process files in batches with parallel downloads
                 async with get_celery_session_context() as session:
                     semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_DOWNLOADS)
+                    budget = ByteBudget(self.MAX_BYTES_IN_FLIGHT)
+                    # Downloads run in parallel, the shared session is used by one task at a time
+                    db_lock = asyncio.Lock()
 
                     for batch_start in range(0, len(files), self.BATCH_SIZE):
                         batch = files[batch_start : batch_start + self.BATCH_SIZE]
@@ -208,8 +270,10 @@ class SharePointCrawler(BaseCrawler):
 
                         # Process batch in parallel
                         tasks = [
-                            self._process_file_with_semaphore(
+                            self._process_file_with_limits(
                                 semaphore=semaphore,
+                                budget=budget,
+                                db_lock=db_lock,
                                 session=session,
                                 client=client,
                                 source=source,
@@ -224,6 +288,7 @@ class SharePointCrawler(BaseCrawler):
                         # Collect results
                         for file, file_result in zip(batch, batch_results, strict=False):
                             if isinstance(file_result, Exception):
+                                failed_files += 1
                                 self.logger.warning(
                                     "Failed to process SharePoint file",
                                     file_name=file.name,
@@ -246,6 +311,22 @@ class SharePointCrawler(BaseCrawler):
                                         result.documents_updated += 1
                                     result.documents_processed += 1
 
+                    if deleted_ids:
+                        files_deleted = await self._mark_deleted_files(session, source, deleted_ids)
+
+                # Advance the delta token only when every change was processed;
+                # the crawl task commits the source after the crawl
+                if delta_state is not None and failed_files == 0:
+                    source.extra_data = {**(source.extra_data or {}), DELTA_STATE_KEY: delta_state}
+
+                result.stats = {
+                    "delta_sync": "incremental" if incremental else "full",
+                    "files_changed": len(files),
+                    "files_deleted": files_deleted,
+                    "files_unchanged": self._files_unchanged,
+                    "bytes_downloaded": self._bytes_downloaded,
+                }
+
         except Exception as e:
             self.logger.exception("SharePoint crawl failed", error=str(e))
             result.errors.append(
@@ -265,19 +346,23 @@ class SharePointCrawler(BaseCrawler):
 
         return result
 
-    async def _process_file_with_semaphore(
+    async def _process_file_with_limits(
         self,
         semaphore: asyncio.Semaphore,
+        budget: ByteBudget,
+        db_lock: asyncio.Lock,
         session: "AsyncSession",
         client: SharePointClient,
         source: "DataSource",
         job: "CrawlJob",
         file: SharePointFile,
     ) -> tuple[bool, bool]:
-        """Process a file with semaphore for concurrency control.
+        """Process a file within the connection and bytes-in-flight limits.
 
         Args:
-            semaphore: Semaphore for limiting concurrent downloads.
+            semaphore: Semaphore limiting open download connections.
+            budget: Byte budget limiting the total size of running downloads.
+            db_lock: Lock serializing use of the shared database session.
             session: Database session.
             client: SharePoint client.
             source: Data source.
@@ -288,13 +373,123 @@ class SharePointCrawler(BaseCrawler):
             Tuple of (is_new, success).
         """
         async with semaphore:
-            return await self._process_file(
-                session=session,
-                client=client,
-                source=source,
-                job=job,
-                file=file,
-            )
+            await budget.acquire(file.size)
+            try:
+                return await self._process_file(
+                    session=session,
+                    db_lock=db_lock,
+                    client=client,
+                    source=source,
+                    job=job,
+                    file=file,
+                )
+            finally:
+                await budget.release(file.size)
+
+    async def _list_changed_files(
+        self,
+        client: SharePointClient,
+        site: SharePointSite,
+        drive: SharePointDrive,
+        source: "DataSource",
+        folder_path: str,
+        recursive: bool,
+        file_extensions: list[str],
+    ) -> tuple[list[SharePointFile], list[str], dict[str, Any], bool]:
+        """List files changed since the last crawl using the delta query.
+
+        The stored token is only reused for the same library and folder
+        settings. Without a usable token (first crawl, changed settings,
+        expired token) the whole library is enumerated.
+
+        Args:
+            client: SharePoint client.
+            site: SharePoint site.
+            drive: Document library.
+            source: Data source holding the stored delta state.
+            folder_path: Folder within the drive (empty for root).
+            recursive: Whether to include subfolders.
+            file_extensions: Extensions to include.
+
+        Returns:
+            Tuple of (changed files, deleted item IDs, new delta state, incremental).
+        """
+        settings_key = {"drive_id": drive.id, "folder_path": folder_path.strip("/"), "recursive": recursive}
+        previous = (source.extra_data or {}).get(DELTA_STATE_KEY) or {}
+        if not all(previous.get(key) == value for key, value in settings_key.items()):
+            previous = {}
+
+        token = previous.get("token")
+        try:
+            delta = await client.get_delta_changes(site.id, drive.id, token)
+        except SharePointResyncRequiredError:
+            self.logger.info("SharePoint delta token expired, full resync", source_id=str(source.id))
+            token, previous = None, {}
+            delta = await client.get_delta_changes(site.id, drive.id)
+
+        folder_id, folder_ids = await self._resolve_folder_scope(
+            client, site, drive, delta, previous, folder_path, recursive
+        )
+
+        extensions = {e.lower() for e in file_extensions}
+        files = []
+        for file in delta.files:
+            if folder_ids is not None and file.parent_id not in folder_ids:
+                continue
+            ext = "." + file.name.rsplit(".", 1)[-1].lower() if "." in file.name else ""
+            if extensions and ext not in extensions:
+                continue
+            files.append(file)
+
+        new_state = {
+            **settings_key,
+            "token": delta.delta_token,
+            "folder_id": folder_id,
+            "folder_ids": sorted(folder_ids) if folder_ids is not None else None,
+        }
+        return files, delta.deleted_ids, new_state, token is not None
+
+    async def _resolve_folder_scope(
+        self,
+        client: SharePointClient,
+        site: SharePointSite,
+        drive: SharePointDrive,
+        delta: SharePointDelta,
+        previous: dict[str, Any],
+        folder_path: str,
+        recursive: bool,
+    ) -> tuple[str | None, set[str] | None]:
+        """Determine the folders whose files belong to the crawl.
+
+        Delta items carry no parent path in SharePoint, so the folder tree
+        below the configured folder is tracked by ID: the folders known from
+        the previous crawl plus new folders whose parent is in scope, minus
+        deleted folders and folders moved elsewhere.
+
+        Returns:
+            Tuple of (configured folder ID, folder IDs in scope); (None, None)
+            if the whole library is crawled.
+        """
+        if not folder_path.strip("/") and recursive:
+            return None, None
+
+        folder_id = previous.get("folder_id") or await client.get_item_id(site.id, drive.id, folder_path)
+        scope = {folder_id, *(previous.get("folder_ids") or [])}
+
+        if recursive:
+            added = True
+            while added:
+                added = False
+                for child_id, parent_id in delta.folders.items():
+                    if child_id not in scope and parent_id in scope:
+                        scope.add(child_id)
+                        added = True
+            for child_id, parent_id in delta.folders.items():
+                if child_id != folder_id and parent_id not in scope:
+                    scope.discard(child_id)
+
+        scope.difference_update(delta.deleted_ids)
+        return folder_id, scope
 
     def _filter_files(
         self,
@@ -322,6 +517,7 @@ class SharePointCrawler(BaseCrawler):
     async def _process_file(
         self,
         session: "AsyncSession",
+        db_lock: asyncio.Lock,
         client: SharePointClient,
         source: "DataSource",
         job: "CrawlJob",
@@ -329,10 +525,13 @@ class SharePointCrawler(BaseCrawler):
     ) -> tuple[bool, bool]:
         """Process a single SharePoint file.
 
-        Downloads the file and creates/updates the Document record.
+        Streams the file to storage and creates/updates the Document record.
+        Files whose stored document has the same modification time and size
+        are not downloaded again (e.g. on a full resync).
 
         Args:
             session: Database session.
+            db_lock: Lock serializing use of the shared session.
             client: SharePoint client.
             source: Data source.
             job: Crawl job.
@@ -351,104 +550,108 @@ class SharePointCrawler(BaseCrawler):
         file_hash = hashlib.sha256(content_for_hash.encode()).hexdigest()
 
         # Check if document already exists
-        result = await session.execute(
-            select(Document).where(
-                Document.source_id == source.id,
-                Document.file_hash == file_hash,
+        async with db_lock:
+            result = await session.execute(
+                select(Document).where(
+                    Document.source_id == source.id,
+                    Document.file_hash == file_hash,
+                )
             )
-        )
-        existing = result.scalar_one_or_none()
+            existing = result.scalar_one_or_none()
+
+        if (
+            existing
+            and existing.file_path
+            and file.modified_at is not None
+            and existing.document_date == file.modified_at
+            and existing.file_size == file.size
+        ):
+            self._files_unchanged += 1
+            return (False, False)
 
         # Determine document type from extension
         ext = os.path.splitext(file.name)[1].lower()
         doc_type = self.SUPPORTED_EXTENSIONS.get(ext, "UNKNOWN")
 
-        # Download file
-        if file.download_url:
-            # Use pre-authenticated URL (faster)
-            content = await client.download_file_by_url(file.download_url)
-        else:
-            # Use API download
-            content = await client.download_file(
-                site_id=file.site_id,
-                drive_id=file.drive_id,
-                item_id=file.id,
-            )
-
-        # Save file to storage
-        file_path = await self._save_file(
-            source_id=source.id,
+        # Stream file to storage
+        file_path, file_size = await self._download_to_storage(
+            client=client,
             category_id=job.category_id,
-            file_name=file.name,
-            content=content,
+            file=file,
         )
-
-        if existing:
-            # Update existing document
-            existing.title = file.name
-            existing.file_path = file_path
-            existing.file_size = len(content)
-            existing.document_date = file.modified_at
-            existing.original_url = file.web_url
-            existing.processing_status = ProcessingStatus.PENDING  # Re-process
-            existing.updated_at = datetime.now(UTC)
-            await session.commit()
-            return (False, True)  # Not new, but successful
-        else:
-            # Create new document
-            doc = Document(
-                source_id=source.id,
-                category_id=job.category_id,
-                title=file.name,
-                original_url=file.web_url,
-                document_type=doc_type,
-                file_path=file_path,
-                file_hash=file_hash,
-                file_size=len(content),
-                processing_status=ProcessingStatus.PENDING,
-                document_date=file.modified_at,
-            )
-            session.add(doc)
-
-            try:
+        self._bytes_downloaded += file_size
+
+        async with db_lock:
+            if existing:
+                # Update existing document
+                existing.title = file.name
+                existing.file_path = file_path
+                existing.file_size = file_size
+                existing.document_date = file.modified_at
+                existing.original_url = file.web_url
+                existing.processing_status = ProcessingStatus.PENDING  # Re-process
+                existing.updated_at = datetime.now(UTC)
                 await session.commit()
-                return (True, True)  # New and successful
-            except Exception as e:
-                await session.rollback()
-                self.logger.debug(
-                    "Document already exists or insert failed",
-                    file_hash=file_hash[:16],
-                    error=str(e)[:100],
+                return (False, True)  # Not new, but successful
+            else:
+                # Create new document
+                doc = Document(
+                    source_id=source.id,
+                    category_id=job.category_id,
+                    title=file.name,
+                    original_url=file.web_url,
+                    document_type=doc_type,
+                    file_path=file_path,
+                    file_hash=file_hash,
+                    file_size=file_size,
+                    processing_status=ProcessingStatus.PENDING,
+                    document_date=file.modified_at,
                 )
-                return (False, False)  # Not new, not successful
+                session.add(doc)
+
+                try:
+                    await session.commit()
+                    return (True, True)  # New and successful
+                except Exception as e:
+                    await session.rollback()
+                    self.logger.debug(
+                        "Document already exists or insert failed",
+                        file_hash=file_hash[:16],
+                        error=str(e)[:100],
+                    )
+                    return (False, False)  # Not new, not successful
 
-    async def _save_file(
+    async def _download_to_storage(
         self,
-        source_id: "UUID",
+        client: SharePointClient,
         category_id: "UUID",
-        file_name: str,
-        content: bytes,
-    ) -> str:
-        """Save file content to storage.
+        file: SharePointFile,
+    ) -> tuple[str, int]:
+        """Stream a file into storage without holding it in memory.
+
+        The file is written to a temporary name first and renamed to its
+        content-addressed name once complete.
 
         Args:
-            source_id: Data source ID.
+            client: SharePoint client.
             category_id: Category ID for organizing files.
-            file_name: Original file name.
-            content: File content as bytes.
+            file: SharePoint file to download.
 
         Returns:
-            Relative file path within storage.
+            Tuple of (relative file path within storage, file size).
         """
         # Create storage path
         storage_base = Path(settings.document_storage_path)
         category_dir = storage_base / str(category_id)
         category_dir.mkdir(parents=True, exist_ok=True)
 
+        partial_path = category_dir / f".{uuid.uuid4().hex}.part"
+        size, content_hash = await client.download_file_to_path(file, partial_path)
+
         # Generate unique filename
-        file_hash = hashlib.sha256(content).hexdigest()[:12]
-        ext = os.path.splitext(file_name)[1]
-        safe_name = re.sub(r"[^\w\-.]", "_", file_name)
+        file_hash = content_hash[:12]
+        ext = os.path.splitext(file.name)[1]
+        safe_name = re.sub(r"[^\w\-.]", "_", file.name)
         unique_name = f"{file_hash}_{safe_name}"
 
         # Ensure path doesn't exceed filesystem limits
@@ -456,20 +659,58 @@ class SharePointCrawler(BaseCrawler):
             unique_name = f"{file_hash}{ext}"
 
         file_path = category_dir / unique_name
-
-        # Write file
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(content)
+        os.replace(partial_path, file_path)
 
         self.logger.debug(
             "Saved SharePoint file",
-            file_name=file_name,
+            file_name=file.name,
             file_path=str(file_path),
-            size=len(content),
+            size=size,
         )
 
         # Return relative path
-        return str(file_path.relative_to(storage_base))
+        return str(file_path.relative_to(storage_base)), size
+
+    async def _mark_deleted_files(
+        self,
+        session: "AsyncSession",
+        source: "DataSource",
+        item_ids: list[str],
+    ) -> int:
+        """Mark documents of files deleted in SharePoint as skipped.
+
+        Documents and their extracted data are kept; they are only excluded
+        from further processing.
+
+        Args:
+            session: Database session.
+            source: Data source.
+            item_ids: Deleted SharePoint item IDs (may include folders).
+
+        Returns:
+            Number of documents marked.
+        """
+        from sqlalchemy import update
+
+        from app.models import Document, ProcessingStatus
+
+        file_hashes = [hashlib.sha256(f"sharepoint:{source.id}:{item_id}".encode()).hexdigest() for item_id in item_ids]
+        result = await session.execute(
+            update(Document)
+            .where(
+                Document.source_id == source.id,
+                Document.file_hash.in_(file_hashes),
+            )
+            .values(
+                processing_status=ProcessingStatus.SKIPPED,
+                processing_error="File was deleted in SharePoint",
+            )
+        )
+        await session.commit()
+
+        if result.rowcount:
+            self.logger.info("Marked deleted SharePoint files", count=result.rowcount)
+        return result.rowcount
 
     async def detect_changes(self, source: "DataSource") -> bool:
         """Detect if there are changes in the SharePoint library.
@@ -500,22 +741,17 @@ class SharePointCrawler(BaseCrawler):
 
                 drive = drives[0]
 
-                # Get delta token from previous crawl (stored in extra_data)
-                delta_token = source.extra_data.get("sharepoint_delta_token") if source.extra_data else None
+                # Delta token of the previous crawl, only valid for the same library
+                state = (source.extra_data or {}).get(DELTA_STATE_KEY) or {}
+                delta_token = state.get("token") if state.get("drive_id") == drive.id else None
 
-                # Check for changes
-                changed_files, new_token = await client.get_delta(
+                # Check for changes (the token is advanced by the crawl, not here)
+                changed_files, _ = await client.get_delta(
                     site_id=site.id,
                     drive_id=drive.id,
                     delta_token=delta_token,
                 )
 
-                # Store new token (will be persisted on next crawl)
-                if new_token:
-                    if not source.extra_data:
-                        source.extra_data = {}
-                    source.extra_data["sharepoint_delta_token"] = new_token
-
                 return len(changed_files) > 0
 
         except Exception as e:
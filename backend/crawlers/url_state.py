@@ -0,0 +1,267 @@
+"""Per-URL fetch state for incremental website recrawls.
+
+The store is loaded once per crawl (one query), consulted in memory while
+the crawler traverses the site and written back with a bulk upsert in the
+session that registers the found documents.
+
+Features:
+- Conditional request headers (If-None-Match / If-Modified-Since) per page
+- Stored links so the traversal continues below pages answered with 304
+- Content hash comparison for servers that do not send validators
+- A fingerprint of the capture settings per page: pages processed with
+  other settings are fetched and checked again
+- Check and change counters as change frequency per URL
+"""
+
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import httpx
+import structlog
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CrawlUrlState
+
+logger = structlog.get_logger()
+
+# Rows per upsert statement (asyncpg allows at most 32767 bind parameters)
+UPSERT_BATCH_SIZE = 1000
+
+
+def url_hash(url: str) -> str:
+    """Compute the SHA256 key of a URL."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def config_fingerprint(settings: dict) -> str:
+    """Compute the SHA256 fingerprint of the settings a page is processed with."""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class UrlState:
+    """In-memory fetch state of one URL."""
+
+    url: str
+    is_document: bool = False
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    config_fingerprint: str | None = None
+    links: list[str] = field(default_factory=list)
+    last_changed_at: datetime | None = None
+    check_count: int = 0
+    change_count: int = 0
+
+    @property
+    def can_revalidate(self) -> bool:
+        """True if a 304 response can be answered from this state."""
+        return not self.is_document and bool(self.etag or self.last_modified) and self.content_hash is not None
+
+
+class UrlStateStore:
+    """
+    Fetch state of all URLs of one data source and category.
+
+    Page states recorded with another config_fingerprint are not used for
+    revalidation or the unchanged-content shortcut, so the page is fetched
+    and checked for capture again.
+
+    Usage:
+        store = UrlStateStore(source.id, job.category_id, fingerprint)
+        await store.load(session)
+        headers = store.conditional_headers(url)
+        ...
+        await store.save(session)
+    """
+
+    def __init__(self, source_id: uuid.UUID, category_id: uuid.UUID, config_fingerprint: str | None = None):
+        self.source_id = source_id
+        self.category_id = category_id
+        self.config_fingerprint = config_fingerprint
+        self._states: dict[str, UrlState] = {}
+        self._dirty: set[str] = set()
+
+    async def load(self, session: AsyncSession) -> int:
+        """Load the stored state of the source/category. Returns the number of URLs."""
+        result = await session.execute(
+            select(
+                CrawlUrlState.url,
+                CrawlUrlState.is_document,
+                CrawlUrlState.etag,
+                CrawlUrlState.last_modified,
+                CrawlUrlState.content_hash,
+                CrawlUrlState.config_fingerprint,
+                CrawlUrlState.links,
+                CrawlUrlState.last_changed_at,
+                CrawlUrlState.check_count,
+                CrawlUrlState.change_count,
+            ).where(
+                CrawlUrlState.source_id == self.source_id,
+                CrawlUrlState.category_id == self.category_id,
+            )
+        )
+        for row in result.all():
+            self._states[row.url] = UrlState(
+                url=row.url,
+                is_document=row.is_document,
+                etag=row.etag,
+                last_modified=row.last_modified,
+                content_hash=row.content_hash,
+                config_fingerprint=row.config_fingerprint,
+                links=list(row.links or []),
+                last_changed_at=row.last_changed_at,
+                check_count=row.check_count,
+                change_count=row.change_count,
+            )
+        return len(self._states)
+
+    def get(self, url: str) -> UrlState | None:
+        """Get the state of a URL, if known."""
+        return self._states.get(url)
+
+    def _is_current(self, state: UrlState | None) -> bool:
+        return state is not None and state.config_fingerprint == self.config_fingerprint
+
+    def unchanged_state(self, url: str, content_hash: str) -> UrlState | None:
+        """Get the state of a page whose content and capture settings are unchanged."""
+        state = self._states.get(url)
+        if self._is_current(state) and state.content_hash == content_hash:
+            return state
+        return None
+
+    def is_known_document(self, url: str) -> bool:
+        """True if the document URL was registered by an earlier crawl."""
+        state = self._states.get(url)
+        return state is not None and state.is_document
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Build revalidation headers for a page, empty if it cannot be revalidated."""
+        state = self._states.get(url)
+        if not self._is_current(state) or not state.can_revalidate:
+            return {}
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    def record_not_modified(self, url: str) -> list[str]:
+        """Record a 304 response and return the links stored for the page."""
+        state = self._states[url]
+        state.check_count += 1
+        self._dirty.add(url)
+        return state.links
+
+    def record_page(self, url: str, response: httpx.Response, content_hash: str, links: list[str]) -> bool:
+        """
+        Record a fetched page.
+
+        Returns:
+            True if the content changed (or the page is new), False if the
+            content hash equals the stored one
+        """
+        state = self._states.get(url)
+        if state is None:
+            state = UrlState(url=url)
+            self._states[url] = state
+        changed = state.content_hash != content_hash
+        state.etag = response.headers.get("etag")
+        state.last_modified = response.headers.get("last-modified")
+        state.config_fingerprint = self.config_fingerprint
+        state.links = links
+        state.check_count += 1
+        if changed:
+            if state.content_hash is not None:
+                state.change_count += 1
+            state.content_hash = content_hash
+            state.last_changed_at = datetime.now(UTC)
+        self._dirty.add(url)
+        return changed
+
+    def record_document(self, url: str) -> None:
+        """Record a registered document URL."""
+        state = self._states.get(url)
+        if state is None:
+            state = UrlState(url=url, is_document=True, last_changed_at=datetime.now(UTC))
+            self._states[url] = state
+        state.check_count += 1
+        self._dirty.add(url)
+
+    def upsert_statements(self) -> list:
+        """Build bulk upsert statements for all URLs touched in this crawl."""
+        now = datetime.now(UTC)
+        rows = []
+        for url in sorted(self._dirty):
+            state = self._states[url]
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "source_id": self.source_id,
+                    "category_id": self.category_id,
+                    "url": url,
+                    "url_hash": url_hash(url),
+                    "is_document": state.is_document,
+                    "etag": state.etag,
+                    "last_modified": state.last_modified,
+                    "content_hash": state.content_hash,
+                    "config_fingerprint": state.config_fingerprint,
+                    "links": state.links or None,
+                    "first_seen_at": now,
+                    "last_seen_at": now,
+                    "last_changed_at": state.last_changed_at,
+                    "check_count": state.check_count,
+                    "change_count": state.change_count,
+                }
+            )
+
+        statements = []
+        for offset in range(0, len(rows), UPSERT_BATCH_SIZE):
+            stmt = insert(CrawlUrlState).values(rows[offset : offset + UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_crawl_url_state",
+                set_={
+                    "is_document": stmt.excluded.is_document,
+                    "etag": stmt.excluded.etag,
+                    "last_modified": stmt.excluded.last_modified,
+                    "content_hash": stmt.excluded.content_hash,
+                    "config_fingerprint": stmt.excluded.config_fingerprint,
+                    "links": stmt.excluded.links,
+                    "last_seen_at": stmt.excluded.last_seen_at,
+                    "last_changed_at": stmt.excluded.last_changed_at,
+                    "check_count": stmt.excluded.check_count,
+                    "change_count": stmt.excluded.change_count,
+                },
+            )
+            statements.append(stmt)
+        return statements
+
+    async def save(self, session: AsyncSession) -> int:
+        """
+        Write the touched URLs back. Returns the number of rows.
+
+        Runs in a savepoint of the caller's session (the caller commits);
+        failures are logged and never break the document registration.
+        """
+        count = len(self._dirty)
+        try:
+            async with session.begin_nested():
+                for stmt in self.upsert_statements():
+                    await session.execute(stmt)
+        except Exception as e:
+            logger.warning("crawl_url_states_save_failed", source_id=str(self.source_id), error=str(e))
+            return 0
+        self._dirty.clear()
+        logger.debug(
+            "crawl_url_states_saved",
+            source_id=str(self.source_id),
+            category_id=str(self.category_id),
+            urls=count,
+        )
+        return count
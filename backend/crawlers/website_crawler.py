@@ -23,10 +23,14 @@ from app.config import settings
 from app.services.crawler_progress import crawler_progress
 from crawlers.base import BaseCrawler, CrawlResult
 from crawlers.robots_txt import RobotsTxtChecker
+from crawlers.url_state import UrlStateStore, config_fingerprint
 from services.relevance_checker import check_relevance
 
 logger = structlog.get_logger()
 
+# Document URLs per file_hash IN query when registering found documents
+DOCUMENT_LOOKUP_BATCH_SIZE = 5000
+
 # Module-level HTTP client storage with loop tracking
 _http_client: httpx.AsyncClient | None = None
 _http_client_loop_id: int | None = None
@@ -39,7 +43,9 @@ async def get_shared_http_client() -> httpx.AsyncClient:
     improving performance by avoiding TCP handshake overhead.
 
     IMPORTANT: Tracks the event loop ID and recreates the client if the loop
-    changes (e.g., when running in Celery tasks with new event loops).
+    changes (e.g., Celery tasks with celery_persistent_event_loop disabled
+    run each in a new event loop). On the persistent worker loop the client
+    is kept for the lifetime of the worker process.
     """
     global _http_client, _http_client_loop_id
 
@@ -113,6 +119,12 @@ class WebsiteCrawler(BaseCrawler):
         self.capture_html_content: bool = True  # Enable HTML content capture by default
         self.html_min_relevance_score: float = 0.2  # Minimum relevance score to capture
 
+        # Incremental recrawl state (loaded per crawl for the job's source and category)
+        self.url_states: UrlStateStore | None = None
+        self.pages_not_modified_count: int = 0
+        self.pages_unchanged_count: int = 0
+        self.documents_skipped_count: int = 0
+
         # robots.txt compliance
         self.respect_robots = respect_robots
         self.robots_checker = RobotsTxtChecker(
@@ -126,7 +138,12 @@ class WebsiteCrawler(BaseCrawler):
         retry=retry_if_exception_type((httpx.ConnectError, httpx.TimeoutException)),
         reraise=True,
     )
-    async def _fetch_with_retry(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+    async def _fetch_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
         """Fetch URL with automatic retry on transient errors.
 
         Retries up to 3 times with exponential backoff (1s, 2s, 4s) on:
@@ -135,8 +152,13 @@ class WebsiteCrawler(BaseCrawler):
 
         Does NOT retry on HTTP errors (4xx, 5xx) as those are typically
         permanent failures that won't resolve with retry.
+
+        A 304 Not Modified answer to a conditional request (headers) is
+        returned as is.
         """
-        response = await client.get(url)
+        response = await client.get(url, headers=headers) if headers else await client.get(url)
+        if response.status_code == 304:
+            return response
         response.raise_for_status()
         return response
 
@@ -290,6 +312,16 @@ class WebsiteCrawler(BaseCrawler):
 
         return False
 
+    def _capture_fingerprint(self, category) -> str:
+        """Fingerprint of the settings that decide whether a page is captured."""
+        return config_fingerprint(
+            {
+                "capture_html_content": self.capture_html_content,
+                "html_min_relevance_score": self.html_min_relevance_score,
+                "search_terms": category.search_terms if category else None,
+            }
+        )
+
     async def crawl(self, source, job) -> CrawlResult:
         """Crawl a website for documents."""
         from app.database import get_session_context
@@ -311,6 +343,9 @@ class WebsiteCrawler(BaseCrawler):
         self.html_documents = []
         self.filtered_urls_count = 0
         self.robots_blocked_count = 0
+        self.pages_not_modified_count = 0
+        self.pages_unchanged_count = 0
+        self.documents_skipped_count = 0
 
         # Config for HTML content capture
         self.capture_html_content = config.get("capture_html_content", True)
@@ -322,9 +357,12 @@ class WebsiteCrawler(BaseCrawler):
 
         # Load category for URL patterns and document storage
         # Use job.category_id - each job crawls with its own category's patterns
+        # Also load the URL fetch state of earlier crawls for incremental recrawls
         category = None
         async with get_session_context() as session:
             category = await session.get(Category, job.category_id)
+            self.url_states = UrlStateStore(source.id, job.category_id, self._capture_fingerprint(category))
+            known_urls = await self.url_states.load(session)
 
         # Compile URL filter patterns from job's category
         self._compile_url_patterns(config, category)
@@ -335,6 +373,7 @@ class WebsiteCrawler(BaseCrawler):
                 url=source.base_url,
                 max_depth=max_depth,
                 render_js=render_javascript,
+                known_urls=known_urls,
                 include_patterns=len(self.url_include_patterns),
                 exclude_patterns=len(self.url_exclude_patterns),
             )
@@ -354,7 +393,34 @@ class WebsiteCrawler(BaseCrawler):
             from sqlalchemy import select
 
             async with get_session_context() as session:
-                for doc_url in self.document_urls:
+                # Existing documents are looked up in batched file_hash IN queries - also the
+                # ones known from the URL state, their Document row may have been deleted
+                document_urls = sorted(self.document_urls)
+                existing_hashes: set[str] = set()
+                for offset in range(0, len(document_urls), DOCUMENT_LOOKUP_BATCH_SIZE):
+                    batch = document_urls[offset : offset + DOCUMENT_LOOKUP_BATCH_SIZE]
+                    existing = await session.execute(
+                        select(Document.file_hash).where(
+                            Document.source_id == source.id,
+                            Document.category_id == job.category_id,
+                            Document.file_hash.in_([self.compute_text_hash(u) for u in batch]),
+                        )
+                    )
+                    existing_hashes.update(existing.scalars().all())
+
+                for doc_url in document_urls:
+                    known = self.url_states.is_known_document(doc_url)
+                    self.url_states.record_document(doc_url)
+
+                    # Create hash from URL
+                    file_hash = self.compute_text_hash(doc_url)
+
+                    # Check if exists for this category (same doc can exist for different categories)
+                    if file_hash in existing_hashes:
+                        if known:
+                            self.documents_skipped_count += 1
+                        continue
+
                     # Determine document type from URL
                     ext = doc_url.split(".")[-1].lower().split("?")[0]
                     doc_type = ext.upper() if ext in download_extensions else "HTML"
@@ -369,20 +435,6 @@ class WebsiteCrawler(BaseCrawler):
                     # If title is empty or just whitespace, use None
                     title = title if title else None
 
-                    # Create hash from URL
-                    file_hash = self.compute_text_hash(doc_url)
-
-                    # Check if exists for this category (same doc can exist for different categories)
-                    existing = await session.execute(
-                        select(Document).where(
-                            Document.source_id == source.id,
-                            Document.category_id == job.category_id,
-                            Document.file_hash == file_hash,
-                        )
-                    )
-                    if existing.scalar():
-                        continue
-
                     doc = Document(
                         source_id=source.id,
                         category_id=job.category_id,  # Use job's category, not source's
@@ -454,6 +506,7 @@ class WebsiteCrawler(BaseCrawler):
                         document_id=str(doc.id),
                     )
 
+                await self.url_states.save(session)
                 await session.commit()
 
             result.documents_found = len(self.document_urls) + len(self.html_documents)
@@ -464,6 +517,9 @@ class WebsiteCrawler(BaseCrawler):
                 "html_pages_captured": len(self.html_documents),
                 "urls_filtered": self.filtered_urls_count,
                 "urls_blocked_by_robots": self.robots_blocked_count,
+                "pages_not_modified": self.pages_not_modified_count,
+                "pages_unchanged": self.pages_unchanged_count,
+                "documents_skipped_unchanged": self.documents_skipped_count,
             }
 
         except Exception as e:
@@ -523,32 +579,44 @@ class WebsiteCrawler(BaseCrawler):
                 continue
 
             try:
-                # Use retry-enabled fetch method
-                response = await self._fetch_with_retry(client, url)
+                # Revalidate pages known from earlier crawls with a conditional request
+                headers = self.url_states.conditional_headers(url) if self.url_states is not None else {}
+                response = await self._fetch_with_retry(client, url, headers=headers)
                 self.visited_urls.add(url)
                 result.pages_crawled += 1
 
-                # Log the URL being crawled and update live stats
-                await crawler_progress.log_url(job.id, url, status="fetched")
-                await crawler_progress.increment_pages(job.id)
+                if response.status_code == 304 and headers:
+                    # Not modified: nothing to capture, continue with the stored links
+                    self.pages_not_modified_count += 1
+                    await crawler_progress.log_url(job.id, url, status="not_modified")
+                    await crawler_progress.increment_pages(job.id)
+                    links = self.url_states.record_not_modified(url)
+                else:
+                    # Log the URL being crawled and update live stats
+                    await crawler_progress.log_url(job.id, url, status="fetched")
+                    await crawler_progress.increment_pages(job.id)
 
-                # Parse HTML
-                html_content = response.text
-                soup = BeautifulSoup(html_content, "lxml")
+                    content_hash = self.compute_hash(response.content)
+                    state = self.url_states.unchanged_state(url, content_hash) if self.url_states is not None else None
+                    if state is not None:
+                        # Server sent no validators but the content and capture settings are unchanged
+                        self.pages_unchanged_count += 1
+                        links = state.links
+                    else:
+                        # Parse HTML
+                        html_content = response.text
+                        soup = BeautifulSoup(html_content, "lxml")
 
-                # Check and capture HTML content if relevant
-                if self.capture_html_content:
-                    await self._check_and_capture_html(url, html_content, soup, category)
+                        # Check and capture HTML content if relevant
+                        if self.capture_html_content:
+                            await self._check_and_capture_html(url, html_content, soup, category)
 
-                # Find all links
-                for link in soup.find_all("a", href=True):
-                    href = link["href"]
-                    full_url = urljoin(url, href)
+                        links = self._extract_same_domain_links(soup, url, base_domain)
 
-                    # Check if same domain
-                    if urlparse(full_url).netloc != base_domain:
-                        continue
+                    if self.url_states is not None:
+                        self.url_states.record_page(url, response, content_hash, links)
 
+                for full_url in links:
                     # Check if document (PDF, DOC, etc.) - always collect these
                     link_ext = full_url.split(".")[-1].lower().split("?")[0]
                     if link_ext in download_extensions:
@@ -573,6 +641,16 @@ class WebsiteCrawler(BaseCrawler):
                 self.logger.warning("Failed to fetch page", url=url, error=str(e))
                 await crawler_progress.log_url(job.id, url, status="error")
 
+    @staticmethod
+    def _extract_same_domain_links(soup: BeautifulSoup, url: str, base_domain: str) -> list[str]:
+        """Collect the absolute same-domain links of a page in document order, without duplicates."""
+        links: dict[str, None] = {}
+        for link in soup.find_all("a", href=True):
+            full_url = urljoin(url, link["href"])
+            if urlparse(full_url).netloc == base_domain:
+                links[full_url] = None
+        return list(links)
+
     async def _crawl_with_playwright(
         self,
         start_url: str,
@@ -9,6 +9,7 @@ from external_apis.clients.sharepoint_client import (
     SharePointNotFoundError,
     SharePointPermissionError,
     SharePointRateLimitError,
+    SharePointResyncRequiredError,
     parse_sharepoint_site_url,
 )
 
@@ -21,5 +22,6 @@ __all__ = [
     "SharePointNotFoundError",
     "SharePointPermissionError",
     "SharePointRateLimitError",
+    "SharePointResyncRequiredError",
     "parse_sharepoint_site_url",
 ]
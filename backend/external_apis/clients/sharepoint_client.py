@@ -5,11 +5,14 @@ via the Microsoft Graph API with Azure AD authentication.
 """
 
 import asyncio
-from dataclasses import dataclass
+import hashlib
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
+import aiofiles
 import httpx
 import structlog
 
@@ -65,6 +68,12 @@ class SharePointConfigError(SharePointError):
     pass
 
 
+class SharePointResyncRequiredError(SharePointError):
+    """Delta token expired or invalid (410 Gone), a full resync is required."""
+
+    pass
+
+
 # =============================================================================
 # URL Parsing Utility
 # =============================================================================
@@ -137,6 +146,17 @@ class SharePointFile:
     parent_path: str
     site_id: str
     drive_id: str
+    parent_id: str | None = None
+
+
+@dataclass
+class SharePointDelta:
+    """Changes of a drive since a delta token (all items for an initial sync)."""
+
+    files: list[SharePointFile] = field(default_factory=list)
+    folders: dict[str, str | None] = field(default_factory=dict)  # folder ID -> parent folder ID
+    deleted_ids: list[str] = field(default_factory=list)
+    delta_token: str | None = None
 
 
 @dataclass
@@ -176,6 +196,7 @@ class SharePointClient(BaseExternalAPIClient):
     GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
     DEFAULT_DELAY = 0.2  # Graph API has generous rate limits
     DEFAULT_TIMEOUT = 60
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes held in memory per streamed download
 
     def __init__(
         self,
@@ -353,6 +374,11 @@ class SharePointClient(BaseExternalAPIClient):
                         f"Access denied: {endpoint}",
                         details=response.json() if response.content else {},
                     )
+                elif response.status_code == 410:
+                    raise SharePointResyncRequiredError(
+                        f"Resync required: {endpoint}",
+                        details=response.json() if response.content else {},
+                    )
                 elif response.status_code == 429:
                     retry_after = int(response.headers.get("Retry-After", 60))
                     if attempt < max_retries:
@@ -527,6 +553,9 @@ class SharePointClient(BaseExternalAPIClient):
                 headers["Authorization"] = f"Bearer {token}"
                 response = await self._client.get(url, headers=headers)
 
+                if response.status_code == 410:
+                    raise SharePointResyncRequiredError(f"Resync required: {url[:100]}")
+
                 if response.status_code == 429:
                     retry_after = int(response.headers.get("Retry-After", 60))
                     if attempt < max_retries:
@@ -802,6 +831,7 @@ class SharePointClient(BaseExternalAPIClient):
             parent_path=parent_path,
             site_id=site_id,
             drive_id=drive_id,
+            parent_id=parent_ref.get("id"),
         )
 
     def _parse_timestamp(self, value: str | None) -> datetime | None:
@@ -837,6 +867,31 @@ class SharePointClient(BaseExternalAPIClient):
 
         return self._parse_file_item(data, site_id, drive_id)
 
+    async def get_item_id(
+        self,
+        site_id: str,
+        drive_id: str,
+        item_path: str = "",
+    ) -> str:
+        """Get the ID of a drive item (e.g., a folder) by its path.
+
+        Args:
+            site_id: SharePoint site ID.
+            drive_id: Drive ID.
+            item_path: Path within the drive (empty for the root folder).
+
+        Returns:
+            Item ID.
+        """
+        clean_path = item_path.strip("/")
+        if clean_path:
+            endpoint = f"/sites/{site_id}/drives/{drive_id}/root:/{quote(clean_path, safe='/')}"
+        else:
+            endpoint = f"/sites/{site_id}/drives/{drive_id}/root"
+
+        data = await self._graph_request("GET", endpoint)
+        return data["id"]
+
     async def get_file_by_path(
         self,
         site_id: str,
@@ -978,19 +1033,130 @@ class SharePointClient(BaseExternalAPIClient):
 
         raise SharePointError("Download failed after retries")
 
+    async def download_file_to_path(
+        self,
+        file: SharePointFile,
+        destination: Path,
+        chunk_size: int | None = None,
+        max_retries: int = 3,
+    ) -> tuple[int, str]:
+        """Stream a file to disk in chunks with retry logic.
+
+        Uses the pre-authenticated download URL when available, otherwise the
+        Graph content endpoint. Only one chunk is held in memory at a time and
+        the content hash is computed while writing. A failed download removes
+        the partially written destination.
+
+        Args:
+            file: SharePoint file to download.
+            destination: Target path (overwritten if it exists).
+            chunk_size: Chunk size in bytes (default: DOWNLOAD_CHUNK_SIZE).
+            max_retries: Maximum number of retries for transient errors.
+
+        Returns:
+            Tuple of (bytes written, SHA256 hex digest of the content).
+
+        Raises:
+            SharePointNotFoundError: If the file no longer exists (404).
+            SharePointPermissionError: If access denied (403).
+            SharePointError: If download fails after retries.
+        """
+        if not self._client:
+            raise RuntimeError("Client not initialized. Use async context manager.")
+
+        if file.download_url:
+            # Pre-authenticated URL (no Graph round trip, no token)
+            url = file.download_url
+        else:
+            url = f"{self.GRAPH_BASE_URL}/sites/{file.site_id}/drives/{file.drive_id}/items/{file.id}/content"
+
+        try:
+            for attempt in range(max_retries + 1):
+                try:
+                    headers = {}
+                    if not file.download_url:
+                        headers = self._get_headers()
+                        headers["Authorization"] = f"Bearer {await self._get_access_token()}"
+
+                    async with self._client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+                        if response.status_code == 404:
+                            raise SharePointNotFoundError(f"File not found: {file.name}")
+                        elif response.status_code == 403:
+                            raise SharePointPermissionError(f"Access denied: {file.name}")
+                        elif response.status_code == 429:
+                            retry_after = int(response.headers.get("Retry-After", 60))
+                            if attempt < max_retries:
+                                logger.warning(
+                                    "download_stream_rate_limited",
+                                    retry_after=retry_after,
+                                    attempt=attempt + 1,
+                                )
+                                await asyncio.sleep(retry_after)
+                                continue
+                            raise SharePointRateLimitError("Rate limit exceeded", retry_after=retry_after)
+                        elif response.status_code >= 500 and attempt < max_retries:
+                            wait_time = (2**attempt) + 0.5
+                            logger.warning(
+                                "download_stream_server_error",
+                                status=response.status_code,
+                                retry_in=wait_time,
+                                attempt=attempt + 1,
+                            )
+                            await asyncio.sleep(wait_time)
+                            continue
+
+                        response.raise_for_status()
+
+                        digest = hashlib.sha256()
+                        size = 0
+                        async with aiofiles.open(destination, "wb") as f:
+                            async for chunk in response.aiter_bytes(chunk_size or self.DOWNLOAD_CHUNK_SIZE):
+                                digest.update(chunk)
+                                size += len(chunk)
+                                await f.write(chunk)
+
+                    logger.debug(
+                        "sharepoint_file_streamed",
+                        file_name=file.name,
+                        size=size,
+                        attempt=attempt + 1,
+                    )
+                    return size, digest.hexdigest()
+
+                except (httpx.TimeoutException, httpx.ConnectError) as e:
+                    if attempt < max_retries:
+                        wait_time = (2**attempt) + 0.5
+                        logger.warning(
+                            "download_stream_connection_error",
+                            error=str(e),
+                            retry_in=wait_time,
+                            attempt=attempt + 1,
+                        )
+                        await asyncio.sleep(wait_time)
+                        continue
+                    raise SharePointError(f"Download failed: {e}") from None
+
+            raise SharePointError("Download failed after retries")
+
+        except BaseException:
+            destination.unlink(missing_ok=True)
+            raise
+
     # -------------------------------------------------------------------------
     # Delta (Change Detection)
     # -------------------------------------------------------------------------
 
-    async def get_delta(
+    async def get_delta_changes(
         self,
         site_id: str,
         drive_id: str,
         delta_token: str | None = None,
-    ) -> tuple[list[SharePointFile], str | None]:
-        """Get changed files using delta query.
+    ) -> SharePointDelta:
+        """Get created, modified and deleted items using delta query.
 
-        This is more efficient than listing all files when checking for changes.
+        Without a token all items of the drive are returned (initial sync).
+        Delta is only supported on the drive root for SharePoint, and items do
+        not carry a parent path, so folder scoping has to use the folder IDs.
 
         Args:
             site_id: SharePoint site ID.
@@ -998,26 +1164,32 @@ class SharePointClient(BaseExternalAPIClient):
             delta_token: Previous delta token (None for initial sync).
 
         Returns:
-            Tuple of (changed files, new delta token).
+            SharePointDelta with changed files, folders, deleted item IDs and the new token.
+
+        Raises:
+            SharePointResyncRequiredError: If the delta token expired (410).
         """
         if delta_token:
             endpoint = f"/sites/{site_id}/drives/{drive_id}/root/delta?token={delta_token}"
         else:
             endpoint = f"/sites/{site_id}/drives/{drive_id}/root/delta"
 
-        files: list[SharePointFile] = []
+        delta = SharePointDelta()
+        files: dict[str, SharePointFile] = {}
         next_link: str | None = endpoint
-        new_delta_token: str | None = None
 
         while next_link:
             data = await self._fetch_paginated_url(next_link)
 
             for item in data.get("value", []):
-                # Skip deleted items and folders
-                if "deleted" in item or "folder" in item:
-                    continue
-                if "file" in item:
-                    files.append(self._parse_file_item(item, site_id, drive_id))
+                if "deleted" in item:
+                    delta.deleted_ids.append(item["id"])
+                    files.pop(item["id"], None)
+                elif "folder" in item:
+                    delta.folders[item["id"]] = item.get("parentReference", {}).get("id")
+                elif "file" in item:
+                    # The same item can appear more than once, the last state wins
+                    files[item["id"]] = self._parse_file_item(item, site_id, drive_id)
 
             # Get next page or delta link
             next_link = data.get("@odata.nextLink")
@@ -1025,9 +1197,38 @@ class SharePointClient(BaseExternalAPIClient):
                 # Extract token from delta link
                 delta_link = data["@odata.deltaLink"]
                 if "token=" in delta_link:
-                    new_delta_token = delta_link.split("token=")[-1]
+                    delta.delta_token = delta_link.split("token=")[-1]
+
+        delta.files = list(files.values())
+        logger.info(
+            "sharepoint_delta_fetched",
+            incremental=delta_token is not None,
+            files=len(delta.files),
+            folders=len(delta.folders),
+            deleted=len(delta.deleted_ids),
+        )
+        return delta
+
+    async def get_delta(
+        self,
+        site_id: str,
+        drive_id: str,
+        delta_token: str | None = None,
+    ) -> tuple[list[SharePointFile], str | None]:
+        """Get changed files using delta query.
+
+        This is more efficient than listing all files when checking for changes.
 
-        return files, new_delta_token
+        Args:
+            site_id: SharePoint site ID.
+            drive_id: Drive ID.
+            delta_token: Previous delta token (None for initial sync).
+
+        Returns:
+            Tuple of (changed files, new delta token).
+        """
+        delta = await self.get_delta_changes(site_id, drive_id, delta_token)
+        return delta.files, delta.delta_token
 
     # -------------------------------------------------------------------------
     # BaseExternalAPIClient Interface
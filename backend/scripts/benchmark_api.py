@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the HTTP request path of the API.
+
+Drives the full ASGI application (middleware stack, routing, validation and
+serialization) in-process via httpx and reports requests/sec for the health
+check, list_entities and get_entity. The database session is replaced by an
+in-memory fake returning prebuilt entities, so the numbers isolate framework
+overhead from query time.
+
+Usage:
+    python -m scripts.benchmark_api
+    python -m scripts.benchmark_api --requests 2000 --per-page 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.database import get_session
+from app.main import create_app
+from app.models import Entity, EntityType
+
+
+class _FakeScalars:
+    def __init__(self, rows: list):
+        self._rows = rows
+
+    def all(self) -> list:
+        return self._rows
+
+
+class _FakeResult:
+    def __init__(self, rows: list, total: int):
+        self._rows = rows
+        self._total = total
+
+    def scalar(self) -> int:
+        return self._total
+
+    def scalars(self) -> _FakeScalars:
+        return _FakeScalars(self._rows)
+
+    def fetchall(self) -> list:
+        return []
+
+    def scalar_one_or_none(self):
+        return None
+
+
+class _FakeSession:
+    """Serves the entity endpoints from memory."""
+
+    def __init__(self, entity_type: EntityType, entities: list[Entity]):
+        self.entity_type = entity_type
+        self.entities = entities
+        self.by_id = {entity.id: entity for entity in entities}
+
+    async def execute(self, statement):
+        selected = statement.column_descriptions[0].get("entity")
+        if selected is EntityType:
+            return _FakeResult([self.entity_type], 1)
+        if selected is Entity and statement.column_descriptions[0].get("expr") is Entity:
+            return _FakeResult(self.entities, len(self.entities))
+        return _FakeResult([], len(self.entities))
+
+    async def get(self, model, ident):
+        if model is EntityType:
+            return self.entity_type
+        return self.by_id.get(ident)
+
+
+def _build_entities(count: int) -> tuple[EntityType, list[Entity]]:
+    now = datetime.now(UTC)
+    entity_type = EntityType(id=uuid.uuid4(), name="Gemeinde", slug="gemeinde")
+    entities = []
+    for i in range(count):
+        name = f"Gemeinde {i:04d}"
+        entities.append(
+            Entity(
+                id=uuid.uuid4(),
+                entity_type_id=entity_type.id,
+                name=name,
+                name_normalized=name.lower(),
+                slug=f"gemeinde-{i:04d}",
+                external_id=f"05{i:06d}",
+                hierarchy_path=f"/de/nrw/gemeinde-{i:04d}",
+                hierarchy_level=3,
+                country="DE",
+                admin_level_1="Nordrhein-Westfalen",
+                admin_level_2="Oberbergischer Kreis",
+                core_attributes={"population": 1000 + i, "area_km2": 12.5 + i, "locality_type": "Gemeinde"},
+                latitude=51.0 + i / 1000,
+                longitude=7.5 + i / 1000,
+                is_active=True,
+                created_at=now,
+                updated_at=now,
+                created_by=None,
+                owner=None,
+            )
+        )
+    return entity_type, entities
+
+
+async def _measure(client: httpx.AsyncClient, url: str, requests: int, concurrency: int) -> float:
+    """Issue ``requests`` GETs with bounded concurrency and return requests/sec."""
+    for _ in range(20):
+        response = await client.get(url)
+        response.raise_for_status()
+
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await client.get(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    """Run the benchmark and print requests/sec per endpoint."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--per-page", type=int, default=50, help="Entities per list_entities page")
+    args = parser.parse_args()
+
+    entity_type, entities = _build_entities(args.per_page)
+    session = _FakeSession(entity_type, entities)
+
+    async def fake_session():
+        yield session
+
+    app = create_app()
+    app.dependency_overrides[get_session] = fake_session
+    transport = httpx.ASGITransport(app=app)
+    prefix = f"{settings.api_v1_prefix}/entities"
+    endpoints = {
+        "health": "/health",
+        "list_entities": f"{prefix}?per_page={args.per_page}",
+        "get_entity": f"{prefix}/{entities[0].id}",
+    }
+
+    print("\n" + "=" * 70)
+    print("API Request Path Benchmark")
+    print("=" * 70)
+    print(f"requests={args.requests} concurrency={args.concurrency} per_page={args.per_page}\n")
+
+    headers = {"Accept-Encoding": "gzip", "Accept-Language": "de-DE,de;q=0.9"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", headers=headers) as client:
+        for name, url in endpoints.items():
+            rate = await _measure(client, url, args.requests, args.concurrency)
+            print(f"  {name:<15} {rate:>8.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
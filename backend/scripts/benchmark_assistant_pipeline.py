@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark the latency of the streaming assistant pipeline.
+
+Runs AssistantService.process_message_stream end-to-end against a fake LLM
+(no database, no network) with and without speculative execution and
+reports time to the intent event and to the complete response.
+
+Usage:
+    python -m scripts.benchmark_assistant_pipeline
+    python -m scripts.benchmark_assistant_pipeline --classify-delay 1.5 --query-delay 2.5 --runs 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.schemas.assistant import AssistantContext, IntentType, ViewMode
+from services.assistant.intent_classifier import IntentMatch
+from services.assistant_service import AssistantService
+
+MESSAGE = "Welche Gemeinden in NRW haben Windkraft-Projekte?"
+QUERY_RESULT = {
+    "query_type": "count",
+    "total": 42,
+    "message": "Gefunden: 42 Gemeinden",
+    "query_interpretation": {"primary_entity_type": "Gemeinden"},
+}
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield MagicMock()
+
+
+async def _run_once(args: argparse.Namespace, speculation: bool) -> tuple[float, float]:
+    """Stream one message and return (seconds to intent event, seconds to complete)."""
+
+    async def embed(session, message):
+        await asyncio.sleep(args.embedding_delay)
+        return IntentMatch(intent=IntentType.QUERY, data={}, confidence=0.6, tier="knn")
+
+    async def classify(message, context):
+        await asyncio.sleep(args.classify_delay)
+        return IntentType.QUERY, {"query_text": message}
+
+    def smart_query_service(session):
+        async def smart_query(question, allow_write=False):
+            await asyncio.sleep(args.query_delay)
+            return QUERY_RESULT
+
+        return MagicMock(smart_query=smart_query)
+
+    service = AssistantService(MagicMock())
+    service._classify_intent_llm = AsyncMock(side_effect=classify)
+    context = AssistantContext(current_route="/", view_mode=ViewMode.DASHBOARD)
+
+    with (
+        patch("services.assistant_service.settings.assistant_speculation_enabled", speculation),
+        patch("services.assistant_service.nearest_intent", embed),
+        patch("services.assistant_service.get_session_context", _fake_session),
+        patch("services.assistant_service.SmartQueryService", side_effect=smart_query_service),
+        patch("services.assistant.query_handler.SmartQueryService", side_effect=smart_query_service),
+    ):
+        start = time.perf_counter()
+        to_intent = to_complete = 0.0
+        async for event in service.process_message_stream(MESSAGE, context, []):
+            if event["type"] == "intent":
+                to_intent = time.perf_counter() - start
+            elif event["type"] == "complete":
+                to_complete = time.perf_counter() - start
+    return to_intent, to_complete
+
+
+async def main() -> None:
+    """Run the benchmark and print median/max latencies."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--embedding-delay", type=float, default=0.1, help="Seconds per message embedding")
+    parser.add_argument("--classify-delay", type=float, default=1.2, help="Seconds per LLM intent classification")
+    parser.add_argument("--query-delay", type=float, default=2.0, help="Seconds per smart query (LLM + DB)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("Assistant Streaming Pipeline Benchmark")
+    print("=" * 70)
+    print(
+        f"embedding={args.embedding_delay}s classify={args.classify_delay}s "
+        f"smart_query={args.query_delay}s runs={args.runs}"
+    )
+
+    medians = {}
+    for label, speculation in (("sequentiell", False), ("spekulativ", True)):
+        timings = [await _run_once(args, speculation) for _ in range(args.runs)]
+        to_intent = [t[0] for t in timings]
+        to_complete = [t[1] for t in timings]
+        medians[label] = statistics.median(to_complete)
+        print(f"\n{label}:")
+        print(f"  bis Intent:   median {statistics.median(to_intent):.3f}s")
+        print(f"  bis Antwort:  median {medians[label]:.3f}s, max {max(to_complete):.3f}s")
+
+    saved = medians["sequentiell"] - medians["spekulativ"]
+    print(f"\nErsparnis: {saved:.3f}s ({saved / medians['sequentiell'] * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
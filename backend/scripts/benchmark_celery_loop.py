@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Compare a new event loop per task with the persistent worker loop.
+
+Runs the same task body ``--tasks`` times through run_async, once in each
+mode, in this process (like one prefork worker process):
+
+- per-task:    a fresh event loop and database engine for every task (the
+               previous behaviour and celery_persistent_event_loop=False)
+- persistent:  start_worker_loop / stop_worker_loop around all tasks
+
+The task body opens a Celery session and runs a small query. For each mode
+the script reports tasks/sec and new database connections per 1000 tasks
+(from celery_db_connections_opened_total). Requires a reachable database
+(DATABASE_URL).
+
+Usage:
+    python -m scripts.benchmark_celery_loop
+    python -m scripts.benchmark_celery_loop --tasks 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from app.database import get_celery_session_context
+from workers.async_runner import run_async, start_worker_loop, stop_worker_loop
+
+
+async def _task_body() -> None:
+    async with get_celery_session_context() as session:
+        await session.execute(text("SELECT 1"))
+
+
+def _connections_opened() -> float:
+    return REGISTRY.get_sample_value("celery_db_connections_opened_total") or 0
+
+
+def _run(label: str, tasks: int, persistent: bool) -> None:
+    connections = _connections_opened()
+    start = time.perf_counter()
+    if persistent:
+        start_worker_loop()
+    try:
+        for _ in range(tasks):
+            run_async(_task_body())
+    finally:
+        if persistent:
+            stop_worker_loop()
+    elapsed = time.perf_counter() - start
+    opened = _connections_opened() - connections
+    print(f"  {label:<11} {tasks / elapsed:9.1f} tasks/s   {opened * 1000 / tasks:8.1f} connections / 1000 tasks")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("Celery Event Loop Benchmark")
+    print("=" * 70)
+    print(f"tasks={args.tasks}\n")
+
+    _run("per-task", args.tasks, persistent=False)
+    _run("persistent", args.tasks, persistent=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Benchmark the latency of one crawl scheduler tick.
+
+Seeds categories and data sources inside a transaction that is rolled back
+at the end, then times the database work of a check_scheduled_crawls tick:
+
+- legacy: load every scheduled category, one source query per category and
+  a croniter evaluation per category in Python (the previous implementation)
+- indexed: collect_due_crawls (partial index on next_run_at, SKIP LOCKED,
+  a single source query for all due categories)
+
+Each variant is measured for an idle tick (nothing due, the common case)
+and a tick where every category is due. Celery publishing is not included.
+Requires a migrated PostgreSQL database (DATABASE_URL).
+
+Usage:
+    python -m scripts.benchmark_crawl_scheduler
+    python -m scripts.benchmark_crawl_scheduler --sources 10000 --categories 50 --runs 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.models import Category, DataSource, DataSourceCategory, SourceStatus, SourceType, User
+from app.utils.cron import croniter_for_expression, get_schedule_timezone
+from workers.crawl_tasks import collect_due_crawls
+
+
+async def _legacy_tick(session: AsyncSession, now: datetime) -> int:
+    """Database work of the previous check_scheduled_crawls implementation."""
+    result = await session.execute(
+        select(Category).where(
+            Category.schedule_enabled.is_(True),
+            Category.schedule_owner_id.isnot(None),
+        )
+    )
+    due = 0
+    for category in result.scalars().all():
+        prev_run = croniter_for_expression(category.schedule_cron, now).get_prev(datetime)
+        source_result = await session.execute(
+            select(DataSource)
+            .join(DataSourceCategory, DataSource.id == DataSourceCategory.data_source_id)
+            .where(
+                DataSourceCategory.category_id == category.id,
+                DataSource.status.in_([SourceStatus.ACTIVE, SourceStatus.PENDING]),
+            )
+        )
+        for source in source_result.scalars().all():
+            if source.last_crawl and source.last_crawl < prev_run:
+                due += 1
+    return due
+
+
+async def _indexed_tick(session: AsyncSession, now: datetime) -> int:
+    """Database work of the indexed scheduler; schedule updates are rolled back."""
+    async with session.begin_nested() as savepoint:
+        due = await collect_due_crawls(session, now)
+        await session.flush()
+        await savepoint.rollback()
+    return len(due)
+
+
+async def _seed(session: AsyncSession, sources: int, categories: int, last_crawl: datetime) -> None:
+    owner_id = uuid.uuid4()
+    await session.execute(
+        insert(User).values(
+            id=owner_id,
+            email=f"benchmark-{owner_id}@example.com",
+            password_hash="x",
+            full_name="Benchmark",
+        )
+    )
+    category_ids = [uuid.uuid4() for _ in range(categories)]
+    await session.execute(
+        insert(Category),
+        [
+            {
+                "id": category_id,
+                "name": f"Benchmark {category_id}",
+                "slug": f"benchmark-{category_id}",
+                "purpose": "Benchmark",
+                "schedule_cron": "0 2 * * *",
+                "schedule_enabled": True,
+                "schedule_owner_id": owner_id,
+            }
+            for category_id in category_ids
+        ],
+    )
+    source_ids = [uuid.uuid4() for _ in range(sources)]
+    for offset in range(0, sources, 2000):
+        chunk = source_ids[offset : offset + 2000]
+        await session.execute(
+            insert(DataSource),
+            [
+                {
+                    "id": source_id,
+                    "name": f"Quelle {source_id}",
+                    "source_type": SourceType.WEBSITE,
+                    "base_url": f"https://benchmark.example.com/{source_id}",
+                    "status": SourceStatus.ACTIVE,
+                    "last_crawl": last_crawl,
+                }
+                for source_id in chunk
+            ],
+        )
+        await session.execute(
+            insert(DataSourceCategory),
+            [
+                {"data_source_id": source_id, "category_id": category_ids[(offset + i) % categories]}
+                for i, source_id in enumerate(chunk)
+            ],
+        )
+    await session.flush()
+
+
+async def _measure(label: str, tick, session: AsyncSession, now: datetime, runs: int) -> None:
+    timings = []
+    due = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        due = await tick(session, now)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"  {label:<20} median {statistics.median(timings):8.1f} ms   max {max(timings):8.1f} ms   due={due}")
+
+
+async def main() -> None:
+    """Seed, measure both scenarios and roll everything back."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    now = datetime.now(get_schedule_timezone())
+
+    print("\n" + "=" * 70)
+    print("Crawl Scheduler Tick Benchmark")
+    print("=" * 70)
+    print(f"sources={args.sources} categories={args.categories} runs={args.runs}")
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            # Crawled after the last 02:00 run: nothing is due
+            await _seed(session, args.sources, args.categories, last_crawl=now - timedelta(minutes=1))
+            await session.execute(
+                update(Category).where(Category.purpose == "Benchmark").values(next_run_at=now + timedelta(hours=1))
+            )
+
+            print("\nLeerlauf (nichts fällig):")
+            await _measure("legacy", _legacy_tick, session, now, args.runs)
+            await _measure("indexed", _indexed_tick, session, now, args.runs)
+
+            await session.execute(
+                update(DataSource)
+                .where(DataSource.base_url.like("https://benchmark.example.com/%"))
+                .values(last_crawl=now - timedelta(days=2))
+            )
+            await session.execute(update(Category).where(Category.purpose == "Benchmark").values(next_run_at=None))
+
+            print("\nAlle Kategorien fällig:")
+            await _measure("legacy", _legacy_tick, session, now, args.runs)
+            await _measure("indexed", _indexed_tick, session, now, args.runs)
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Benchmark facet value search latency (p50/p95) on a seeded corpus.
+
+Seeds an entity type, a facet type, entities and facet values with
+generated German text inside a transaction that is rolled back at the end.
+A share of the values gets a random embedding. Then every query term is
+searched with:
+
+- legacy:   ts_rank and ts_headline for every match, OFFSET pagination and
+            a separate COUNT (the previous implementation)
+- ranked:   search_facet_values in full-text mode (rank first, headlines
+            for the page only, total via window function)
+- keyset:   the page reached by following next_cursor, compared with the
+            same page via OFFSET in legacy mode
+- hybrid:   search_facet_values with semantic=True (RRF over ts_rank and
+            pgvector similarity, random query embedding)
+
+Seeding 1M values takes several minutes. Requires a migrated PostgreSQL
+database with pgvector (DATABASE_URL).
+
+Usage:
+    python -m scripts.benchmark_facet_search
+    python -m scripts.benchmark_facet_search --values 1000000 --embedded 20000 --runs 20 --page 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.facets.facet_search import HEADLINE_OPTIONS, search_facet_values
+from app.database import engine
+from app.models import Entity, EntityType, FacetType, FacetValue
+
+VOCABULARY = [
+    "Windpark",
+    "Windkraftanlage",
+    "Repowering",
+    "Flächennutzungsplan",
+    "Bebauungsplan",
+    "Gemeinderat",
+    "Beschluss",
+    "Artenschutz",
+    "Rotmilan",
+    "Abstandsfläche",
+    "Genehmigung",
+    "Immissionsschutz",
+    "Lärmgutachten",
+    "Bürgerbeteiligung",
+    "Solarpark",
+    "Freiflächenanlage",
+    "Netzanschluss",
+    "Umspannwerk",
+    "Pachtvertrag",
+    "Konzentrationszone",
+    "Regionalplan",
+    "Stellungnahme",
+    "Einwendung",
+    "Klage",
+    "Verwaltungsgericht",
+    "Waldfläche",
+    "Landschaftsschutzgebiet",
+    "Vogelzug",
+    "Schattenwurf",
+    "Infraschall",
+    "Kommune",
+    "Ortschaftsrat",
+    "Haushalt",
+    "Förderung",
+    "Energiewende",
+    "Akzeptanz",
+]
+QUERIES = ["Windpark", "Rotmilan Artenschutz", "Bebauungsplan", "Solarpark Netzanschluss", "Klage", "Infraschall"]
+EMBEDDING_DIMENSIONS = 1536
+SEED_BATCH_SIZE = 5000
+
+
+def _random_embedding(rng: random.Random) -> list[float]:
+    vector = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+    norm = sum(x * x for x in vector) ** 0.5
+    return [x / norm for x in vector]
+
+
+async def _seed(session: AsyncSession, values: int, embedded: int, entities: int, rng: random.Random) -> None:
+    entity_type_id, facet_type_id = uuid.uuid4(), uuid.uuid4()
+    suffix = entity_type_id.hex[:8]
+    await session.execute(
+        insert(EntityType).values(
+            id=entity_type_id, slug=f"benchmark-{suffix}", name=f"Benchmark {suffix}", name_plural="Benchmarks"
+        )
+    )
+    await session.execute(
+        insert(FacetType).values(
+            id=facet_type_id, slug=f"benchmark-{suffix}", name=f"Benchmark {suffix}", name_plural="Benchmarks"
+        )
+    )
+    entity_ids = [uuid.uuid4() for _ in range(entities)]
+    await session.execute(
+        insert(Entity),
+        [
+            {
+                "id": entity_id,
+                "entity_type_id": entity_type_id,
+                "name": f"Gemeinde {i}",
+                "name_normalized": f"gemeinde {i}",
+                "slug": f"benchmark-{suffix}-{i}",
+            }
+            for i, entity_id in enumerate(entity_ids)
+        ],
+    )
+
+    for offset in range(0, values, SEED_BATCH_SIZE):
+        rows = []
+        for i in range(offset, min(offset + SEED_BATCH_SIZE, values)):
+            text_representation = " ".join(rng.choices(VOCABULARY, k=rng.randint(20, 80)))
+            rows.append(
+                {
+                    "entity_id": entity_ids[i % entities],
+                    "facet_type_id": facet_type_id,
+                    "value": {"text": text_representation},
+                    "text_representation": text_representation,
+                    "text_embedding": _random_embedding(rng) if i < embedded else None,
+                }
+            )
+        await session.execute(insert(FacetValue), rows)
+        print(f"\r  {min(offset + SEED_BATCH_SIZE, values):>9} / {values} Werte", end="", flush=True)
+    print()
+    await session.execute(text("ANALYZE facet_values"))
+
+
+async def _legacy_search(session: AsyncSession, q: str, page: int, per_page: int) -> int:
+    """Database work of the previous search implementation."""
+    search_query = func.plainto_tsquery("german", q)
+    rank = func.ts_rank(FacetValue.search_vector, search_query)
+    result = await session.execute(
+        select(
+            FacetValue,
+            rank.label("rank"),
+            func.ts_headline("german", FacetValue.text_representation, search_query, HEADLINE_OPTIONS),
+        )
+        .where(FacetValue.search_vector.op("@@")(search_query), FacetValue.is_active.is_(True))
+        .order_by(rank.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    rows = result.all()
+    await session.execute(
+        select(func.count())
+        .select_from(FacetValue)
+        .where(FacetValue.search_vector.op("@@")(search_query), FacetValue.is_active.is_(True))
+    )
+    return len(rows)
+
+
+async def _search(session: AsyncSession, q: str, per_page: int, cursor: str | None = None, semantic: bool = False):
+    return await search_facet_values(
+        q=q,
+        entity_id=None,
+        facet_type_slug=None,
+        page=1,
+        per_page=per_page,
+        cursor=cursor,
+        semantic=semantic,
+        session=session,
+    )
+
+
+async def _cursor_for_page(session: AsyncSession, q: str, page: int, per_page: int) -> str | None:
+    cursor = None
+    for _ in range(page - 1):
+        cursor = (await _search(session, q, per_page, cursor)).next_cursor
+        if cursor is None:
+            break
+    return cursor
+
+
+async def _measure(label: str, search, runs: int) -> None:
+    timings = []
+    for _ in range(runs):
+        for q in QUERIES:
+            start = time.perf_counter()
+            await search(q)
+            timings.append((time.perf_counter() - start) * 1000)
+    quantiles = statistics.quantiles(timings, n=20)
+    print(f"  {label:<20} p50 {statistics.median(timings):8.1f} ms   p95 {quantiles[18]:8.1f} ms")
+
+
+async def main() -> None:
+    """Seed, measure all variants and roll everything back."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--values", type=int, default=1_000_000)
+    parser.add_argument("--embedded", type=int, default=20_000, help="Values with a random embedding")
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--page", type=int, default=5, help="Page for the OFFSET/keyset comparison")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)  # noqa: S311
+
+    print("\n" + "=" * 70)
+    print("Facet Search Benchmark")
+    print("=" * 70)
+    print(f"values={args.values} embedded={args.embedded} runs={args.runs} queries={len(QUERIES)}\n")
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            await _seed(session, args.values, args.embedded, args.entities, rng)
+
+            print("\nErste Seite:")
+            await _measure("legacy", lambda q: _legacy_search(session, q, 1, args.per_page), args.runs)
+            await _measure("ranked", lambda q: _search(session, q, args.per_page), args.runs)
+
+            print(f"\nSeite {args.page}:")
+            cursors = {q: await _cursor_for_page(session, q, args.page, args.per_page) for q in QUERIES}
+            await _measure("legacy (OFFSET)", lambda q: _legacy_search(session, q, args.page, args.per_page), args.runs)
+            await _measure("ranked (keyset)", lambda q: _search(session, q, args.per_page, cursors[q]), args.runs)
+
+            print("\nHybrid (RRF):")
+            embedding = AsyncMock(side_effect=lambda *a, **kw: _random_embedding(rng))
+            with patch("app.utils.similarity.generate_embedding", embedding):
+                await _measure("hybrid", lambda q: _search(session, q, args.per_page, semantic=True), args.runs)
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
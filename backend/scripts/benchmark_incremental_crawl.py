@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Measure incremental website recrawls against a local fixture site.
+
+Serves a generated municipal website (section pages, news pages, linked
+PDF documents) from an in-process httpx transport that sends ETags and
+honours If-None-Match. The httpx crawl path of WebsiteCrawler runs three
+times with one persistent URL state store:
+
+- cold:   empty state, every page is downloaded
+- warm:   nothing changed, pages are revalidated with conditional requests
+- change: a share of the pages changed since the last run
+
+For each run the script reports the response status distribution, the
+transferred body bytes, the file_hash queries of the save stage and how
+many linked documents were already known. Database and Redis are not used.
+
+Usage:
+    python -m scripts.benchmark_incremental_crawl
+    python -m scripts.benchmark_incremental_crawl --pages 500 --docs-per-page 4 --change-rate 0.05
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from crawlers.url_state import UrlStateStore
+from crawlers.website_crawler import DOCUMENT_LOOKUP_BATCH_SIZE, WebsiteCrawler
+
+BASE_URL = "https://gemeinde.example.com"
+
+
+class FixtureSite:
+    """Generated website with ETag support and request accounting."""
+
+    def __init__(self, pages: int, docs_per_page: int):
+        self.pages: dict[str, str] = {}
+        self.revisions: dict[str, int] = {}
+        self.statuses: Counter = Counter()
+        self.body_bytes = 0
+
+        paths = [f"/aktuelles/{i}" for i in range(pages)]
+        self.section_size = 50
+        sections = [paths[i : i + self.section_size] for i in range(0, len(paths), self.section_size)]
+        self.pages["/"] = "".join(f'<a href="/bereich/{i}">Bereich {i}</a>' for i in range(len(sections)))
+        for i, section in enumerate(sections):
+            self.pages[f"/bereich/{i}"] = "".join(f'<a href="{path}">{path}</a>' for path in section)
+        for path in paths:
+            docs = "".join(
+                f'<a href="/dokumente{path.replace("/aktuelles", "")}-{d}.pdf">Anlage {d}</a>'
+                for d in range(docs_per_page)
+            )
+            self.pages[path] = f'<a href="/">Start</a><h1>Beschluss {path}</h1><p>{"Text " * 300}</p>{docs}'
+        self.revisions = dict.fromkeys(self.pages, 0)
+
+    def change(self, share: float, rng: random.Random) -> int:
+        """Change a share of the content pages, returns the number changed."""
+        candidates = [path for path in self.pages if path.startswith("/aktuelles/")]
+        changed = rng.sample(candidates, int(len(candidates) * share))
+        for path in changed:
+            self.revisions[path] += 1
+        return len(changed)
+
+    def reset_counters(self) -> None:
+        self.statuses = Counter()
+        self.body_bytes = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path not in self.pages:
+            response = httpx.Response(404)
+        else:
+            body = f"<html><body>{self.pages[path]}<!-- rev {self.revisions[path]} --></body></html>".encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            if request.headers.get("if-none-match") == etag:
+                response = httpx.Response(304, headers={"ETag": etag})
+            else:
+                response = httpx.Response(200, content=body, headers={"ETag": etag, "Content-Type": "text/html"})
+        self.statuses[response.status_code] += 1
+        self.body_bytes += len(response.content)
+        return response
+
+
+async def _crawl(site: FixtureSite, store: UrlStateStore, client: httpx.AsyncClient, max_pages: int) -> dict:
+    """Run the httpx crawl path once and simulate the document save stage."""
+    crawler = WebsiteCrawler(respect_robots=False)
+    crawler.capture_html_content = False
+    crawler.url_states = store
+    crawler._compile_url_patterns({}, None)
+    job = MagicMock(id=uuid.uuid4())
+
+    site.reset_counters()
+    start = time.perf_counter()
+    await crawler._crawl_with_httpx(BASE_URL + "/", 3, max_pages, ["pdf"], MagicMock(pages_crawled=0), job)
+    elapsed = time.perf_counter() - start
+
+    known = 0
+    for url in crawler.document_urls:
+        known += store.is_known_document(url)
+        store.record_document(url)
+
+    return {
+        "seconds": elapsed,
+        "statuses": dict(site.statuses),
+        "kib": site.body_bytes / 1024,
+        "document_queries": -(-len(crawler.document_urls) // DOCUMENT_LOOKUP_BATCH_SIZE),
+        "documents_known": known,
+        "pages_not_modified": crawler.pages_not_modified_count,
+    }
+
+
+def _print(label: str, run: dict) -> None:
+    statuses = ", ".join(f"{code}: {count}" for code, count in sorted(run["statuses"].items()))
+    print(
+        f"  {label:<8} {statuses:<22} {run['kib']:9.1f} KiB   "
+        f"Dokument-Abfragen {run['document_queries']:3d} / bekannt {run['documents_known']:5d}   "
+        f"{run['seconds'] * 1000:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    """Run the cold, warm and partially changed recrawl."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--docs-per-page", type=int, default=4)
+    parser.add_argument("--change-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    site = FixtureSite(args.pages, args.docs_per_page)
+    store = UrlStateStore(uuid.uuid4(), uuid.uuid4())
+    max_pages = len(site.pages) * 2
+    progress = MagicMock(log_url=AsyncMock(), increment_pages=AsyncMock(), increment_documents=AsyncMock())
+
+    print("\n" + "=" * 70)
+    print("Incremental Recrawl Benchmark")
+    print("=" * 70)
+    print(f"pages={len(site.pages)} docs_per_page={args.docs_per_page} change_rate={args.change_rate}\n")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(site.handler)) as client:
+        with (
+            patch("crawlers.website_crawler.get_shared_http_client", AsyncMock(return_value=client)),
+            patch("crawlers.website_crawler.crawler_progress", progress),
+            patch.object(settings, "crawler_default_delay", 0),
+        ):
+            _print("cold", await _crawl(site, store, client, max_pages))
+            _print("warm", await _crawl(site, store, client, max_pages))
+            changed = site.change(args.change_rate, random.Random(args.seed))  # noqa: S311
+            _print("change", await _crawl(site, store, client, max_pages))
+
+    print(f"\n{changed} Seiten vor dem letzten Lauf geändert")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
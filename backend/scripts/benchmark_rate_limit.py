@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Measure rate limit checks/sec and memory per key for many distinct clients.
+
+Every client sends ``--requests`` checks against a limit of ``--limit``
+requests per minute, in shuffled order. Compared are:
+
+- legacy:  sliding window (a list of timestamps per key in memory, a ZSET
+           with ZREMRANGEBYSCORE/ZCARD/ZADD/EXPIRE in Redis; the previous
+           implementation)
+- gcra:    LocalTokenBucket in memory, GCRA_SCRIPT via EVALSHA in Redis
+
+Memory per key is measured with tracemalloc for the local limiters and with
+MEMORY USAGE on a sample of keys in Redis. The Redis part runs only if the
+server is reachable; its keys are deleted afterwards.
+
+Usage:
+    python -m scripts.benchmark_rate_limit
+    python -m scripts.benchmark_rate_limit --clients 100000 --requests 5 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import redis.asyncio as redis
+
+from app.config import settings
+from app.core.rate_limiter import GCRA_SCRIPT, LocalTokenBucket
+
+WINDOW_SECONDS = 60
+MEMORY_SAMPLE = 1000
+
+
+class LegacySlidingWindow:
+    """In-memory sliding window of the previous implementation."""
+
+    def __init__(self):
+        self._storage: dict[str, list[float]] = {}
+
+    def acquire(self, key: str, max_requests: int, window: int) -> bool:
+        now = time.time()
+        window_start = now - window
+        if key not in self._storage:
+            self._storage[key] = []
+        self._storage[key] = [ts for ts in self._storage[key] if ts > window_start]
+        if len(self._storage[key]) >= max_requests:
+            return False
+        self._storage[key].append(now)
+        return True
+
+
+def _workload(clients: int, requests: int, seed: int) -> list[str]:
+    keys = [f"ratelimit:api:ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(clients)]
+    checks = keys * requests
+    random.Random(seed).shuffle(checks)  # noqa: S311
+    return checks
+
+
+def _report(label: str, checks: int, elapsed: float, keys: int, memory: float) -> None:
+    print(f"  {label:<8} {checks / elapsed:>12,.0f} checks/s   {memory / keys:>7.0f} B/key   {keys:>7} keys")
+
+
+def _measure_local(label: str, limiter, checks: list[str], limit: int) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for key in checks:
+        limiter.acquire(key, limit, WINDOW_SECONDS)
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _report(label, len(checks), elapsed, len(set(checks)), memory)
+
+
+async def _measure_redis(label: str, client, check, checks: list[str], prefix: str, concurrency: int) -> None:
+    queue = iter(checks)
+
+    async def worker() -> None:
+        for key in queue:
+            await check(f"{prefix}{key}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    sample = random.sample(sorted(set(checks)), min(MEMORY_SAMPLE, len(checks)))  # noqa: S311
+    usage = [await client.memory_usage(f"{prefix}{key}") or 0 for key in sample]
+    _report(label, len(checks), elapsed, len(sample), sum(usage))
+
+
+async def _delete(client, prefix: str) -> None:
+    async for keys in _batches(client.scan_iter(match=f"{prefix}*", count=10_000)):
+        await client.unlink(*keys)
+
+
+async def _batches(iterator, size: int = 10_000):
+    batch = []
+    async for item in iterator:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _run_redis(args: argparse.Namespace, checks: list[str]) -> None:
+    client = redis.from_url(args.redis_url, socket_connect_timeout=2)
+    try:
+        await client.ping()
+    except Exception as e:
+        print(f"  Redis nicht erreichbar ({e}), übersprungen")
+        await client.aclose()
+        return
+
+    script = client.register_script(GCRA_SCRIPT)
+    legacy_prefix, gcra_prefix = f"bench:{uuid.uuid4().hex[:8]}:", f"bench:{uuid.uuid4().hex[:8]}:"
+
+    async def legacy(key: str) -> None:
+        now = time.time()
+        pipeline = client.pipeline()
+        pipeline.zremrangebyscore(key, "-inf", now - WINDOW_SECONDS)
+        pipeline.zcard(key)
+        pipeline.zadd(key, {str(now): now})
+        pipeline.expire(key, WINDOW_SECONDS)
+        await pipeline.execute()
+
+    async def gcra(key: str) -> None:
+        await script(keys=[key], args=[WINDOW_SECONDS * 1000, args.limit, 1])
+
+    try:
+        await _measure_redis("legacy", client, legacy, checks, legacy_prefix, args.concurrency)
+        await _measure_redis("gcra", client, gcra, checks, gcra_prefix, args.concurrency)
+    finally:
+        await _delete(client, legacy_prefix)
+        await _delete(client, gcra_prefix)
+        await client.aclose()
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=5, help="Checks per client")
+    parser.add_argument("--limit", type=int, default=100, help="Requests per minute")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent checks against Redis")
+    parser.add_argument("--redis-url", default=settings.redis_url)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    checks = _workload(args.clients, args.requests, args.seed)
+
+    print("\n" + "=" * 70)
+    print("Rate Limit Benchmark")
+    print("=" * 70)
+    print(f"clients={args.clients} requests={args.requests} limit={args.limit}/min\n")
+
+    print("Lokal (ein Prozess):")
+    _measure_local("legacy", LegacySlidingWindow(), checks, args.limit)
+    _measure_local("gcra", LocalTokenBucket(max_keys=args.clients), checks, args.limit)
+
+    print(f"\nRedis (concurrency={args.concurrency}):")
+    await _run_redis(args, checks)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Measure email throughput with pooled SMTP sessions.
+
+Starts a local aiosmtpd server and sends the same number of messages
+twice:
+
+- per-message: ``aiosmtplib.send`` with a new session per message (the
+  previous behaviour of the email channel)
+- pooled:      SmtpConnectionPool with kept-open sessions
+
+``--handshake-ms`` delays the EHLO answer to stand in for the TLS and AUTH
+round-trips of a remote provider. For each run the script reports
+messages/sec and the number of connections the server accepted.
+
+Usage:
+    python -m scripts.benchmark_smtp_pool
+    python -m scripts.benchmark_smtp_pool --messages 1000 --pool-size 5 --handshake-ms 50
+"""
+
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from email.message import EmailMessage
+from pathlib import Path
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.notifications.channels.smtp_pool import SmtpConnectionPool, SmtpServer
+
+
+class CountingHandler:
+    """Accepts every message and counts connections."""
+
+    def __init__(self, handshake_delay: float):
+        self.handshake_delay = handshake_delay
+        self.connections = 0
+        self.messages = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 Message accepted"
+
+
+def _message(i: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@example.com"
+    message["To"] = f"user{i}@example.com"
+    message["Subject"] = f"Neue Dokumente ({i})"
+    message.set_content("Es liegen neue Dokumente vor.\n" * 20)
+    return message
+
+
+async def _per_message(server: SmtpServer, messages: int, concurrency: int) -> None:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send(i: int) -> None:
+        async with slots:
+            await aiosmtplib.send(_message(i), hostname=server.hostname, port=server.port)
+
+    await asyncio.gather(*(send(i) for i in range(messages)))
+
+
+async def _pooled(server: SmtpServer, messages: int, pool_size: int) -> None:
+    pool = SmtpConnectionPool(server, size=pool_size, max_messages_per_connection=100, max_messages_per_second=0)
+    await asyncio.gather(*(pool.send_message(_message(i)) for i in range(messages)))
+    await pool.close()
+
+
+async def _run(label: str, handler: CountingHandler, coro) -> None:
+    handler.connections = handler.messages = 0
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<13} {handler.messages:>6} messages  {elapsed:7.2f}s  "
+        f"{handler.messages / elapsed:8.1f} msg/s  {handler.connections:>5} connections"
+    )
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=3)
+    parser.add_argument("--handshake-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = CountingHandler(args.handshake_ms / 1000)
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    server = SmtpServer(hostname="127.0.0.1", port=port)
+
+    print("\n" + "=" * 70)
+    print("SMTP Pool Benchmark")
+    print("=" * 70)
+    print(f"messages={args.messages} pool_size={args.pool_size} handshake_ms={args.handshake_ms}\n")
+
+    try:
+        # Same concurrency for both runs: pool_size messages in flight
+        await _run("per-message", handler, _per_message(server, args.messages, args.pool_size))
+        await _run("pooled", handler, _pooled(server, args.messages, args.pool_size))
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
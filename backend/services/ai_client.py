@@ -499,7 +499,7 @@ def create_async_client_for_user(azure_config: dict[str, Any]) -> AsyncAzureOpen
             - embeddings_deployment: Embeddings deployment name (optional)
 
     Returns:
-        Configured AsyncAzureOpenAI client
+        Pooled AsyncAzureOpenAI client (shared per process - do not close)
 
     Raises:
         ValueError: If required config keys are missing
@@ -516,11 +516,9 @@ def create_async_client_for_user(azure_config: dict[str, Any]) -> AsyncAzureOpen
     if missing_keys:
         raise ValueError(f"Azure OpenAI Konfiguration unvollständig. Fehlende Felder: {', '.join(missing_keys)}")
 
-    return AsyncAzureOpenAI(
-        azure_endpoint=azure_config["endpoint"],
-        api_key=azure_config["api_key"],
-        api_version=azure_config["api_version"],
-    )
+    from services.llm_client_service import get_pooled_client
+
+    return get_pooled_client({**azure_config, "type": "azure"})
 
 
 def get_deployment_name(azure_config: dict[str, Any]) -> str:
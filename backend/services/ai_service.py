@@ -30,7 +30,8 @@ from app.utils.security import (
     sanitize_for_prompt,
     should_block_request,
 )
-from services.llm_usage_tracker import record_llm_usage, track_llm_usage
+from services.llm_rate_governor import governed_llm_call
+from services.llm_usage_tracker import estimate_tokens, record_llm_usage, track_llm_usage
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -308,13 +309,13 @@ class AIService:
         return service.get_model_name(self._config, for_embeddings=False)
 
     async def close(self):
-        """Close the client."""
-        if self._client:
-            await self._client.close()
-            self._client = None
-        if self._embeddings_client:
-            await self._embeddings_client.close()
-            self._embeddings_client = None
+        """Release the clients.
+
+        Clients come from the process-wide pool (see llm_client_service) and
+        stay open for reuse by other callers.
+        """
+        self._client = None
+        self._embeddings_client = None
 
     # === Embeddings ===
 
@@ -359,11 +360,13 @@ class AIService:
                 metadata={"batch_size": len(batch), "dimensions": dimensions},
             ) as usage_ctx:
                 try:
-                    response = await client.embeddings.create(
-                        model=self.embeddings_deployment,
-                        input=batch,
-                        dimensions=dimensions,
-                    )
+                    estimated = sum(estimate_tokens(text) for text in batch)
+                    async with governed_llm_call(self.embeddings_deployment, estimated):
+                        response = await client.embeddings.create(
+                            model=self.embeddings_deployment,
+                            input=batch,
+                            dimensions=dimensions,
+                        )
 
                     # Record token usage - Azure sometimes doesn't return usage, so estimate
                     if response.usage and response.usage.prompt_tokens:
@@ -763,16 +766,18 @@ DOKUMENT:
                 json_system_prompt = f"{system_prompt}\n\nAntworte ausschließlich im JSON-Format."
 
                 # Use response_format for structured output
-                response = await client.chat.completions.create(
-                    model=deployment,
-                    messages=[
-                        {"role": "system", "content": json_system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    response_format={"type": "json_object"},
-                    temperature=0.1,  # Lower temperature for more consistent extraction
-                    max_tokens=self.max_output_tokens,
-                )
+                estimated = estimate_tokens(json_system_prompt) + estimate_tokens(user_prompt) + self.max_output_tokens
+                async with governed_llm_call(deployment, estimated):
+                    response = await client.chat.completions.create(
+                        model=deployment,
+                        messages=[
+                            {"role": "system", "content": json_system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        response_format={"type": "json_object"},
+                        temperature=0.1,  # Lower temperature for more consistent extraction
+                        max_tokens=self.max_output_tokens,
+                    )
 
                 # Record token usage
                 if response.usage:
@@ -15,6 +15,8 @@ The module is split into:
 - utils.py: Utility functions
 - context_actions.py: Context action handlers (PySis, crawl, facets)
 - context_builder.py: Context building and entity data collection
+- intent_classifier.py: Local intent classification tiers (rules, example kNN)
+- pipeline.py: Speculative branches of the streaming pipeline
 - query_handler.py: Query and search handlers
 - action_executor.py: Action execution handlers
 - response_formatter.py: Response formatting and presentation
@@ -0,0 +1,410 @@
+"""Tiered local intent classification for the assistant.
+
+The LLM intent classification costs one to several seconds per chat turn.
+Most turns are navigation, help or plain questions that can be recognized
+without it, so classification runs in tiers (cheapest first):
+
+1. rules - unambiguous phrasings (regex, no I/O)
+2. knn   - nearest labeled example utterances by embedding similarity
+           (one embedding request, the example matrix is kept in memory)
+3. llm   - INTENT_CLASSIFICATION_PROMPT completion in AssistantService
+
+The kNN tier only answers intents whose handlers work with the raw message
+(no extracted fields needed) and defers to the LLM below
+settings.assistant_intent_knn_threshold. Examples of the other intents are
+part of the matrix so that, e.g., a batch action is never answered as a query.
+"""
+
+import asyncio
+import math
+import operator
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.schemas.assistant import AssistantContext, IntentType
+
+logger = structlog.get_logger()
+
+# Messages longer than this are left to the LLM (documents, e-mails, notes)
+KNN_MAX_MESSAGE_LENGTH = 300
+
+# Retry building the example index after a failed embedding request
+INDEX_RETRY_SECONDS = 300
+
+# Softmax temperature of the neighbour vote (lower = closest example dominates)
+KNN_VOTE_TEMPERATURE = 0.05
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    """Result of a local classification tier."""
+
+    intent: IntentType
+    data: dict[str, Any]
+    confidence: float
+    tier: str
+
+
+# =============================================================================
+# Tier 1: Rules
+# =============================================================================
+
+_TARGET = r"(?P<target>.+?)"
+_END = r"\s*[.!?]*$"
+
+
+def _target_data(match: re.Match) -> dict[str, Any]:
+    return {"target_entity": match.group("target").strip(" \"'")}
+
+
+def _no_data(match: re.Match) -> dict[str, Any]:
+    return {}
+
+
+RULES: list[tuple[re.Pattern, IntentType, Callable[[re.Match], dict[str, Any]]]] = [
+    # Only-navigation phrasings ("Geh zu Gummersbach", "Öffne Max Mueller")
+    (
+        re.compile(rf"^(?:geh(?:e)?|wechsle|spring(?:e)?)\s+(?:zu[mr]?|nach)\s+{_TARGET}{_END}", re.IGNORECASE),
+        IntentType.NAVIGATION,
+        _target_data,
+    ),
+    (
+        re.compile(rf"^(?:navigiere|navigier)\s+(?:zu[mr]?\s+|nach\s+)?{_TARGET}{_END}", re.IGNORECASE),
+        IntentType.NAVIGATION,
+        _target_data,
+    ),
+    (
+        re.compile(rf"^(?:go to|navigate to|open)\s+{_TARGET}{_END}", re.IGNORECASE),
+        IntentType.NAVIGATION,
+        _target_data,
+    ),
+    # Information about a named entity ("Was weißt du über Bad Rodach?")
+    (
+        re.compile(rf"^was weißt du (?:alles )?(?:über|zu)\s+{_TARGET}{_END}", re.IGNORECASE),
+        IntentType.ENTITY_INFO,
+        _target_data,
+    ),
+    (
+        re.compile(rf"^(?:erzähl|erzähle) mir (?:etwas |was |mehr )?(?:über|zu)\s+{_TARGET}{_END}", re.IGNORECASE),
+        IntentType.ENTITY_INFO,
+        _target_data,
+    ),
+    (
+        re.compile(rf"^was kannst du mir (?:über|zu)\s+{_TARGET}\s+sagen{_END}", re.IGNORECASE),
+        IntentType.ENTITY_INFO,
+        _target_data,
+    ),
+    (
+        re.compile(rf"^zeig(?:e)? mir alles (?:über|zu)\s+{_TARGET}{_END}", re.IGNORECASE),
+        IntentType.ENTITY_INFO,
+        _target_data,
+    ),
+    # App help
+    (
+        re.compile(
+            rf"^(?:hilfe|help|wie funktioniert (?:das|diese seite|die seite)|was kann ich hier (?:tun|machen)){_END}",
+            re.IGNORECASE,
+        ),
+        IntentType.HELP,
+        _no_data,
+    ),
+    # Summary of the current page / entity
+    (
+        re.compile(
+            rf"^(?:fass(?:e)? (?:das |dies |alles |es )?zusammen|zusammenfassung|"
+            rf"gib mir (?:einen überblick|eine zusammenfassung)){_END}",
+            re.IGNORECASE,
+        ),
+        IntentType.SUMMARIZE,
+        _no_data,
+    ),
+]
+
+
+def classify_by_rules(message: str) -> IntentMatch | None:
+    """Classify unambiguous phrasings.
+
+    Slash commands never get here: AssistantService handles them before
+    intent classification.
+
+    Args:
+        message: User message
+
+    Returns:
+        IntentMatch or None if no rule matches
+    """
+    text = message.strip()
+    for pattern, intent, extract in RULES:
+        match = pattern.match(text)
+        if match:
+            return IntentMatch(intent=intent, data=extract(match), confidence=1.0, tier="rules")
+    return None
+
+
+# =============================================================================
+# Tier 2: kNN over example embeddings
+# =============================================================================
+
+# Labeled example utterances (all intents, so neighbours of non-resolvable
+# intents make the kNN tier defer to the LLM)
+EXAMPLE_UTTERANCES: dict[IntentType, tuple[str, ...]] = {
+    IntentType.QUERY: (
+        "Zeige Pain Points",
+        "Welche Events gibt es?",
+        "Zeige alle Gemeinden in Bayern",
+        "Welche Gemeinden haben negative Signale zur Windkraft?",
+        "Liste alle Personen mit Position Bürgermeister",
+        "Suche nach Windparks in Niedersachsen",
+        "Wie viele Entities vom Typ Gemeinde gibt es?",
+        "Welche Dokumente wurden diese Woche gefunden?",
+    ),
+    IntentType.CONTEXT_QUERY: (
+        "Was sind die Details?",
+        "Zeig mir mehr",
+        "Welche Pain Points hat diese Gemeinde?",
+        "Wer ist hier der Ansprechpartner?",
+        "Welche Dokumente gehören zu dieser Entity?",
+        "Welche Relationen hat diese Entity?",
+    ),
+    IntentType.SUMMARIZE: (
+        "Fasse die wichtigsten Punkte zusammen",
+        "Gib mir eine kurze Übersicht über diese Gemeinde",
+        "Was ist der aktuelle Stand hier?",
+        "Kurzfassung bitte",
+    ),
+    IntentType.HELP: (
+        "Wie funktioniert diese Seite?",
+        "Was kann ich hier tun?",
+        "Wie lege ich einen Filter an?",
+        "Wofür ist die Smart Query da?",
+        "Erkläre mir die Funktionen",
+        "Wie exportiere ich die Daten?",
+    ),
+    IntentType.FACET_MANAGEMENT: (
+        "Welche Facets gibt es für Gemeinden?",
+        "Zeige alle Facet-Typen",
+        "Welche Facet-Typen sind verfügbar?",
+    ),
+    IntentType.DISCUSSION: (
+        "Was meinst du dazu?",
+        "Kannst du mir bei der Planung helfen?",
+        "Hier sind meine Notizen zum Termin",
+        "Lass uns über die Anforderungen sprechen",
+    ),
+    IntentType.NAVIGATION: (
+        "Bring mich zur Gemeinde Gummersbach",
+        "Zeige die Seite von Max Mueller",
+        "Wechsle zur Übersicht",
+    ),
+    IntentType.ENTITY_INFO: (
+        "Welche Infos gibt es zu Bad Rodach?",
+        "Was ist über Gummersbach bekannt?",
+    ),
+    IntentType.INLINE_EDIT: (
+        "Ändere den Namen zu Neustadt",
+        "Setze die Position auf Bürgermeister",
+        "Korrigiere die Einwohnerzahl auf 12000",
+    ),
+    IntentType.COMPLEX_WRITE: (
+        "Erstelle eine neue Kategorie",
+        "Lege einen neuen EntityType an",
+        "Importiere alle Gemeinden aus Hessen",
+    ),
+    IntentType.BATCH_ACTION: (
+        "Füge allen Gemeinden in NRW einen Pain Point hinzu",
+        "Aktualisiere alle Entities vom Typ Gemeinde",
+        "Entferne bei allen ausgewählten Einträgen das Facet",
+    ),
+    IntentType.CONTEXT_ACTION: (
+        "Analysiere PySis",
+        "Reichere die Facets an",
+        "Zeig den PySis-Status",
+        "Starte einen Crawl für diese Gemeinde",
+        "Füge einen Pain Point hinzu",
+        "Zeige den Verlauf",
+    ),
+    IntentType.SOURCE_MANAGEMENT: (
+        "Welche Tags gibt es?",
+        "Zeige Quellen mit Tag nrw",
+        "Finde Datenquellen für Bundesliga-Vereine",
+    ),
+}
+
+# Intents the kNN tier may answer: their handlers only need the message
+KNN_RESOLVABLE_INTENTS: dict[IntentType, Callable[[str], dict[str, Any]]] = {
+    IntentType.QUERY: lambda message: {"query_text": message},
+    IntentType.CONTEXT_QUERY: lambda message: {},
+    IntentType.SUMMARIZE: lambda message: {},
+    IntentType.HELP: lambda message: {"help_topic": message},
+    IntentType.FACET_MANAGEMENT: lambda message: {"facet_action": "list_facet_types"},
+    IntentType.DISCUSSION: lambda message: {},
+}
+
+# Intents about the current entity need an entity context
+ENTITY_CONTEXT_INTENTS = {IntentType.CONTEXT_QUERY, IntentType.SUMMARIZE}
+
+
+def _normalize(vector: list[float]) -> tuple[float, ...]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return tuple(vector)
+    return tuple(v / norm for v in vector)
+
+
+class IntentExampleIndex:
+    """In-memory matrix of normalized example embeddings."""
+
+    def __init__(self, vectors: list[list[float]], labels: list[IntentType]):
+        self.vectors = [_normalize(v) for v in vectors]
+        self.labels = labels
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def nearest(self, vector: list[float], k: int) -> list[tuple[float, IntentType]]:
+        """Get the k most similar examples as (cosine similarity, intent)."""
+        query = _normalize(vector)
+        scores = [
+            (sum(map(operator.mul, query, row)), label) for row, label in zip(self.vectors, self.labels, strict=True)
+        ]
+        scores.sort(key=operator.itemgetter(0), reverse=True)
+        return scores[:k]
+
+    def classify(self, vector: list[float], k: int) -> tuple[IntentType, float]:
+        """
+        Softmax-weighted vote of the k nearest examples.
+
+        Returns:
+            Tuple of (intent, confidence) - confidence is the vote share of
+            the winning intent times its best similarity
+        """
+        neighbours = self.nearest(vector, k)
+        top_score = neighbours[0][0]
+        votes: dict[IntentType, float] = {}
+        best: dict[IntentType, float] = {}
+        for score, label in neighbours:
+            weight = math.exp((score - top_score) / KNN_VOTE_TEMPERATURE)
+            votes[label] = votes.get(label, 0.0) + weight
+            best[label] = max(best.get(label, -1.0), score)
+
+        intent = max(votes, key=votes.get)
+        share = votes[intent] / sum(votes.values())
+        return intent, share * max(best[intent], 0.0)
+
+
+_example_index: IntentExampleIndex | None = None
+_index_failed_at: float | None = None
+_index_lock: asyncio.Lock | None = None
+
+
+def reset_example_index() -> None:
+    """Drop the example index (e.g. after changing the embedding model)."""
+    global _example_index, _index_failed_at, _index_lock
+    _example_index = None
+    _index_failed_at = None
+    _index_lock = None
+
+
+async def get_example_index(session: AsyncSession) -> IntentExampleIndex | None:
+    """Get the example index, embedding the examples on first use.
+
+    Returns:
+        IntentExampleIndex or None if embeddings are unavailable
+    """
+    global _example_index, _index_failed_at, _index_lock
+    if _example_index is not None:
+        return _example_index
+    if _index_failed_at is not None and time.monotonic() - _index_failed_at < INDEX_RETRY_SECONDS:
+        return None
+
+    if _index_lock is None:
+        _index_lock = asyncio.Lock()
+    async with _index_lock:
+        if _example_index is not None:
+            return _example_index
+
+        from app.utils.similarity import generate_embeddings_batch
+
+        texts = [text for examples in EXAMPLE_UTTERANCES.values() for text in examples]
+        labels = [intent for intent, examples in EXAMPLE_UTTERANCES.items() for _ in examples]
+        embeddings = await generate_embeddings_batch(texts, session=session)
+
+        pairs = [(e, label) for e, label in zip(embeddings, labels, strict=True) if e]
+        if len(pairs) < len(texts):
+            logger.warning("intent_example_index_unavailable", embedded=len(pairs), examples=len(texts))
+            _index_failed_at = time.monotonic()
+            return None
+
+        _example_index = IntentExampleIndex([e for e, _ in pairs], [label for _, label in pairs])
+        logger.info("intent_example_index_built", examples=len(_example_index))
+        return _example_index
+
+
+async def nearest_intent(session: AsyncSession, message: str) -> IntentMatch | None:
+    """Vote of the nearest labeled examples, without any threshold.
+
+    Also used as a cheap hint for speculative work while the LLM classifies.
+
+    Returns:
+        IntentMatch (without data) or None if the tier is unavailable
+    """
+    if len(message) > KNN_MAX_MESSAGE_LENGTH:
+        return None
+
+    index = await get_example_index(session)
+    if index is None:
+        return None
+
+    from app.utils.similarity import generate_embedding
+
+    vector = await generate_embedding(message, session=session)
+    if not vector:
+        return None
+
+    intent, confidence = index.classify(vector, settings.assistant_intent_knn_k)
+    return IntentMatch(intent=intent, data={}, confidence=confidence, tier="knn")
+
+
+def accept_example_match(match: IntentMatch, message: str, context: AssistantContext) -> IntentMatch | None:
+    """Accept a kNN vote if it is confident and its handler needs no extracted fields.
+
+    Returns:
+        IntentMatch with handler data or None (LLM fallback)
+    """
+    data_builder = KNN_RESOLVABLE_INTENTS.get(match.intent)
+    if (
+        data_builder is None
+        or match.confidence < settings.assistant_intent_knn_threshold
+        or (match.intent in ENTITY_CONTEXT_INTENTS and not context.current_entity_id)
+    ):
+        logger.debug("intent_knn_deferred", intent=match.intent.value, confidence=round(match.confidence, 3))
+        return None
+
+    return IntentMatch(intent=match.intent, data=data_builder(message), confidence=match.confidence, tier="knn")
+
+
+async def classify_by_examples(session: AsyncSession, message: str, context: AssistantContext) -> IntentMatch | None:
+    """Classify a message by its nearest labeled examples.
+
+    Returns:
+        IntentMatch or None if the tier is not confident (LLM fallback)
+    """
+    match = await nearest_intent(session, message)
+    if match is None:
+        return None
+    return accept_example_match(match, message, context)
+
+
+def record_intent_classification(tier: str, intent: IntentType, duration_seconds: float) -> None:
+    """Export the tier hit and latency of a classification."""
+    from app.monitoring.metrics import assistant_intent_classification_seconds, assistant_intent_classifications_total
+
+    assistant_intent_classifications_total.labels(tier=tier, intent=intent.value).inc()
+    assistant_intent_classification_seconds.labels(tier=tier).observe(duration_seconds)
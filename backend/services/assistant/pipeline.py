@@ -0,0 +1,126 @@
+"""Speculative branches for the streaming assistant pipeline.
+
+Intent classification by LLM takes one to several seconds, and the handler
+work (smart query, entity context) only starts afterwards. The pipeline
+starts the *likely* downstream work concurrently with the classification
+and cancels the branches that turn out to be unneeded:
+
+    pipeline = SpeculativePipeline()
+    pipeline.start("smart_query", lambda: run_query(message))
+    intent, data = await classify(...)
+    if intent != IntentType.QUERY:
+        pipeline.cancel("smart_query")
+    result = await pipeline.take("smart_query")  # None if failed/cancelled
+
+Branches must not share the request's AsyncSession (not concurrency-safe);
+they open their own session and return plain data. Status events pushed
+with emit() are streamed by run() as soon as they are produced.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class SpeculativePipeline:
+    """Runs named speculative branches and streams their events."""
+
+    def __init__(self):
+        self.events: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.result: Any = None
+        self._branches: dict[str, asyncio.Task] = {}
+        self._started_at: dict[str, float] = {}
+
+    def emit(self, event: dict[str, Any]) -> None:
+        """Queue an event for the stream."""
+        self.events.put_nowait(event)
+
+    def start(self, name: str, factory: Callable[[], Coroutine[Any, Any, Any]]) -> None:
+        """Start a speculative branch (no-op if it is already running)."""
+        if name in self._branches:
+            return
+        self._branches[name] = asyncio.create_task(factory(), name=f"speculative:{name}")
+        self._started_at[name] = time.perf_counter()
+
+    def is_running(self, name: str) -> bool:
+        """Check whether a branch was started and not yet taken or cancelled."""
+        return name in self._branches
+
+    def cancel(self, name: str) -> None:
+        """Cancel an unneeded branch."""
+        task = self._branches.pop(name, None)
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        self._record(name, "cancelled")
+
+    async def take(self, name: str) -> Any | None:
+        """Wait for a branch and return its result.
+
+        Returns:
+            Branch result, or None if the branch was not started or failed
+        """
+        task = self._branches.pop(name, None)
+        if task is None:
+            return None
+        try:
+            result = await task
+        except Exception as e:
+            logger.warning("speculative_branch_failed", branch=name, error=str(e))
+            self._record(name, "failed")
+            return None
+        self._record(name, "used")
+        return result
+
+    async def close(self) -> None:
+        """Cancel and await all remaining branches."""
+        tasks = list(self._branches.values())
+        for name in list(self._branches):
+            self.cancel(name)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, main: Awaitable[Any]) -> AsyncIterator[dict[str, Any]]:
+        """Run the main coroutine and yield queued events while it runs.
+
+        The result of main is stored in self.result. Remaining branches are
+        cancelled when main finishes or the consumer stops iterating.
+        """
+        main_task = asyncio.ensure_future(main)
+        try:
+            while True:
+                get_event = asyncio.ensure_future(self.events.get())
+                done, _ = await asyncio.wait({main_task, get_event}, return_when=asyncio.FIRST_COMPLETED)
+                if get_event in done:
+                    yield get_event.result()
+                    continue
+                get_event.cancel()
+                break
+
+            while not self.events.empty():
+                yield self.events.get_nowait()
+            self.result = main_task.result()
+        finally:
+            if not main_task.done():
+                main_task.cancel()
+                await asyncio.gather(main_task, return_exceptions=True)
+            await self.close()
+
+    def _record(self, name: str, outcome: str) -> None:
+        from app.monitoring.metrics import assistant_speculative_branches_total
+
+        assistant_speculative_branches_total.labels(branch=name, outcome=outcome).inc()
+        started_at = self._started_at.pop(name, None)
+        if started_at is not None:
+            logger.debug(
+                "speculative_branch_finished",
+                branch=name,
+                outcome=outcome,
+                duration_ms=int((time.perf_counter() - started_at) * 1000),
+            )
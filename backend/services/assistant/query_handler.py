@@ -50,7 +50,12 @@ logger = structlog.get_logger()
 
 
 async def handle_query(
-    db: AsyncSession, message: str, context: AssistantContext, intent_data: dict[str, Any], translator: Translator
+    db: AsyncSession,
+    message: str,
+    context: AssistantContext,
+    intent_data: dict[str, Any],
+    translator: Translator,
+    query_result: dict[str, Any] | None = None,
 ) -> tuple[QueryResponse, list[SuggestedAction]]:
     """Handle a database query intent using SmartQueryService.
 
@@ -60,6 +65,7 @@ async def handle_query(
         context: Application context
         intent_data: Extracted intent data
         translator: Translator instance
+        query_result: Smart query result computed speculatively for this query text
 
     Returns:
         Tuple of (QueryResponse, suggested_actions)
@@ -68,8 +74,10 @@ async def handle_query(
     smart_query_service = SmartQueryService(db)
 
     try:
-        # Execute query
-        result = await smart_query_service.smart_query(query_text, allow_write=False)
+        # Execute query (unless it already ran speculatively)
+        result = query_result
+        if result is None:
+            result = await smart_query_service.smart_query(query_text, allow_write=False)
 
         # Check for errors
         if result.get("error"):
@@ -148,7 +156,12 @@ async def handle_query(
 
 
 async def handle_context_query(
-    db: AsyncSession, message: str, context: AssistantContext, intent_data: dict[str, Any], translator: Translator
+    db: AsyncSession,
+    message: str,
+    context: AssistantContext,
+    intent_data: dict[str, Any],
+    translator: Translator,
+    entity_data: dict[str, Any] | None = None,
 ) -> tuple[QueryResponse, list[SuggestedAction]]:
     """Handle a query about the current entity using AI.
 
@@ -158,6 +171,7 @@ async def handle_context_query(
         context: Application context
         intent_data: Extracted intent data
         translator: Translator instance
+        entity_data: Entity context prefetched while the intent was classified
 
     Returns:
         Tuple of (QueryResponse, suggested_actions)
@@ -172,9 +186,10 @@ async def handle_context_query(
         entity_id = UUID(context.current_entity_id)
 
         # Build entity context with all data
-        entity_data = await build_entity_context(
-            db, entity_id, include_facets=True, include_pysis=True, include_relations=True
-        )
+        if entity_data is None:
+            entity_data = await build_entity_context(
+                db, entity_id, include_facets=True, include_pysis=True, include_relations=True
+            )
 
         # Use AI to generate intelligent response
         ai_response = await generate_context_response_with_ai(db, user_question=message, entity_data=entity_data)
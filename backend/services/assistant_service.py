@@ -14,12 +14,16 @@ The service maintains backward compatibility with existing imports.
 
 import json
 import time
+from collections.abc import Callable
 from typing import Any
+from uuid import UUID
 
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.database import get_session_context
 from app.models import FacetType
 from app.models.llm_usage import LLMTaskType
 from app.models.user_api_credentials import LLMPurpose
@@ -46,6 +50,15 @@ from services.assistant.action_executor import (
     preview_inline_edit,
 )
 from services.assistant.context_actions import handle_context_action
+from services.assistant.context_builder import build_entity_context
+from services.assistant.intent_classifier import (
+    IntentMatch,
+    accept_example_match,
+    classify_by_rules,
+    nearest_intent,
+    record_intent_classification,
+)
+from services.assistant.pipeline import SpeculativePipeline
 from services.assistant.prompts import INTENT_CLASSIFICATION_PROMPT, get_page_documentation
 from services.assistant.query_handler import handle_context_query, handle_entity_info, handle_query
 from services.assistant.response_formatter import (
@@ -57,7 +70,8 @@ from services.assistant.response_formatter import (
     suggest_smart_query_redirect,
 )
 from services.llm_client_service import LLMClientService
-from services.llm_usage_tracker import record_llm_usage
+from services.llm_rate_governor import LLMPriority, governed_llm_call
+from services.llm_usage_tracker import estimate_tokens, record_llm_usage
 from services.smart_query import SmartQueryService
 from services.translations import Translator
 
@@ -134,10 +148,28 @@ class AssistantService:
         # Initialize translator for this request
         self.tr = Translator(language)
 
+        message, early_response = await self._prepare_message(message, context, language, attachments)
+        if early_response is not None:
+            return early_response
+
+        return await self._respond(message, context, mode)
+
+    async def _prepare_message(
+        self,
+        message: str,
+        context: AssistantContext,
+        language: str,
+        attachments: list[dict[str, Any]] | None,
+    ) -> tuple[str, AssistantChatResponse | None]:
+        """Validate and sanitize a message, answering image attachments directly.
+
+        Returns:
+            Tuple of (sanitized message, response if no further processing is needed)
+        """
         # === Security: Input validation and sanitization ===
         is_valid, error_msg = validate_message_length(message, SecurityConstants.MAX_MESSAGE_LENGTH)
         if not is_valid:
-            return AssistantChatResponse(
+            return message, AssistantChatResponse(
                 message=error_msg,
                 response_data=ErrorResponseData(message=error_msg, error_code="message_too_long"),
                 suggested_actions=[],
@@ -156,7 +188,7 @@ class AssistantService:
                     "message_preview": message[:100] if message else "",
                 },
             )
-            return AssistantChatResponse(
+            return message, AssistantChatResponse(
                 message=self.tr.t("security_blocked")
                 if hasattr(self.tr, "t")
                 else "Ihre Anfrage konnte aus Sicherheitsgründen nicht verarbeitet werden.",
@@ -174,23 +206,59 @@ class AssistantService:
             image_attachments = [a for a in attachments if a.get("content_type", "").startswith("image/")]
             if image_attachments:
                 result = await handle_image_analysis(self.db, message, context, image_attachments, language)
-                return AssistantChatResponse(
+                return message, AssistantChatResponse(
                     success=result.get("success", False),
                     response=result.get("response"),
                     suggested_actions=result.get("suggested_actions", []),
                 )
 
+        return message, None
+
+    async def _respond(
+        self,
+        message: str,
+        context: AssistantContext,
+        mode: str,
+        pipeline: SpeculativePipeline | None = None,
+    ) -> AssistantChatResponse:
+        """Classify a sanitized message and route it to its handler.
+
+        Args:
+            message: Sanitized user message
+            context: Application context
+            mode: 'read' or 'write' mode
+            pipeline: Speculative pipeline of a streaming request (likely
+                handler work then runs concurrently with the classification)
+
+        Returns:
+            AssistantChatResponse
+        """
         try:
             # Check for slash commands first
             if message.startswith("/"):
                 return await self._handle_slash_command(message, context)
 
+            speculate = pipeline is not None and settings.assistant_speculation_enabled
+            if speculate:
+                self._speculate_entity_context(pipeline, context)
+
             # Classify intent
-            intent, intent_data = await self._classify_intent(message, context)
+            intent, intent_data = await self._classify_intent(
+                message,
+                context,
+                before_llm=(lambda hint: self._speculate_query(pipeline, message, hint)) if speculate else None,
+            )
             logger.info("intent_classified", intent=intent, data=intent_data)
 
+            prefetched = None
+            if pipeline is not None:
+                pipeline.emit({"type": "intent", "intent": intent.value})
+                prefetched = await self._collect_speculation(pipeline, intent, message, intent_data)
+
             # Route to appropriate handler
-            response_data, suggested_actions = await self._route_intent(intent, message, context, intent_data, mode)
+            response_data, suggested_actions = await self._route_intent(
+                intent, message, context, intent_data, mode, prefetched
+            )
 
             return AssistantChatResponse(success=True, response=response_data, suggested_actions=suggested_actions)
 
@@ -203,7 +271,108 @@ class AssistantService:
                 ),
             )
 
-    async def _classify_intent(self, message: str, context: AssistantContext) -> tuple[IntentType, dict[str, Any]]:
+    # === Speculative execution (streaming) ===
+
+    def _speculate_entity_context(self, pipeline: SpeculativePipeline, context: AssistantContext) -> None:
+        """Load the current entity's context while the intent is classified."""
+        if not context.current_entity_id:
+            return
+        try:
+            entity_id = UUID(context.current_entity_id)
+        except ValueError:
+            return
+
+        async def load() -> dict[str, Any]:
+            async with get_session_context() as session:
+                return await build_entity_context(
+                    session, entity_id, include_facets=True, include_pysis=True, include_relations=True
+                )
+
+        pipeline.start("entity_context", load)
+
+    def _speculate_query(self, pipeline: SpeculativePipeline, message: str, hint: IntentMatch | None) -> None:
+        """Start the smart query while the LLM classifies, if the examples lean towards QUERY."""
+        if hint is None or hint.intent != IntentType.QUERY:
+            return
+
+        async def run() -> dict[str, Any]:
+            pipeline.emit({"type": "status", "message": self.tr.t("streaming_searching")})
+            async with get_session_context() as session:
+                return await SmartQueryService(session).smart_query(message, allow_write=False)
+
+        pipeline.start("smart_query", run)
+
+    async def _collect_speculation(
+        self, pipeline: SpeculativePipeline, intent: IntentType, message: str, intent_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Take the speculative results the classified intent needs and cancel the rest.
+
+        Returns:
+            Dict with optional 'query_result' and 'entity_data'
+        """
+        prefetched: dict[str, Any] = {}
+
+        # The speculative query ran on the raw message - only valid if the
+        # classification did not rewrite the query text
+        if intent == IntentType.QUERY and intent_data.get("query_text", message) in (message, None, ""):
+            prefetched["query_result"] = await pipeline.take("smart_query")
+        else:
+            pipeline.cancel("smart_query")
+
+        if intent == IntentType.CONTEXT_QUERY:
+            prefetched["entity_data"] = await pipeline.take("entity_context")
+        else:
+            pipeline.cancel("entity_context")
+
+        return prefetched
+
+    async def _classify_intent(
+        self,
+        message: str,
+        context: AssistantContext,
+        before_llm: Callable[[IntentMatch | None], None] | None = None,
+    ) -> tuple[IntentType, dict[str, Any]]:
+        """Classify the user's intent: rules, then example kNN, then LLM.
+
+        The local tiers answer obvious requests without an LLM round trip;
+        uncertain messages fall through to the LLM classification.
+
+        Args:
+            message: User message
+            context: Application context
+            before_llm: Called with the (unconfident) kNN vote before the
+                LLM fallback, e.g. to start speculative work
+
+        Returns:
+            Tuple of (IntentType, extracted_data)
+
+        Raises:
+            ValueError: If LLM not configured or classification fails
+        """
+        start_time = time.perf_counter()
+
+        hint = None
+        if settings.assistant_intent_local_enabled:
+            match = classify_by_rules(message)
+            if match is None:
+                try:
+                    hint = await nearest_intent(self.db, message)
+                    match = accept_example_match(hint, message, context) if hint else None
+                except Exception as e:
+                    logger.warning("intent_knn_failed", error=str(e))
+            if match is not None:
+                record_intent_classification(match.tier, match.intent, time.perf_counter() - start_time)
+                logger.debug("intent_classified_locally", tier=match.tier, confidence=round(match.confidence, 3))
+                return match.intent, match.data
+
+        if before_llm is not None:
+            before_llm(hint)
+
+        intent, extracted_data = await self._classify_intent_llm(message, context)
+        record_intent_classification("llm", intent, time.perf_counter() - start_time)
+        return intent, extracted_data
+
+    async def _classify_intent_llm(self, message: str, context: AssistantContext) -> tuple[IntentType, dict[str, Any]]:
         """Classify the user's intent using LLM.
 
         Args:
@@ -253,16 +422,17 @@ class AssistantService:
 
         try:
             start_time = time.time()
-            response = await client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": "Du bist ein Intent-Classifier. Antworte nur mit JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
-                max_tokens=500,
-                response_format={"type": "json_object"},
-            )
+            async with governed_llm_call(model_name, estimate_tokens(prompt) + 500, LLMPriority.INTERACTIVE):
+                response = await client.chat.completions.create(
+                    model=model_name,
+                    messages=[
+                        {"role": "system", "content": "Du bist ein Intent-Classifier. Antworte nur mit JSON."},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.1,
+                    max_tokens=500,
+                    response_format={"type": "json_object"},
+                )
 
             if response.usage:
                 await record_llm_usage(
@@ -289,7 +459,13 @@ class AssistantService:
             raise ValueError(f"KI-Klassifizierung fehlgeschlagen: {str(e)}") from None
 
     async def _route_intent(
-        self, intent: IntentType, message: str, context: AssistantContext, intent_data: dict[str, Any], mode: str
+        self,
+        intent: IntentType,
+        message: str,
+        context: AssistantContext,
+        intent_data: dict[str, Any],
+        mode: str,
+        prefetched: dict[str, Any] | None = None,
     ) -> tuple[AssistantResponseData, list[SuggestedAction]]:
         """Route intent to appropriate handler.
 
@@ -299,15 +475,22 @@ class AssistantService:
             context: Application context
             intent_data: Extracted intent data
             mode: Read or write mode
+            prefetched: Results of speculative branches ('query_result', 'entity_data')
 
         Returns:
             Tuple of (response_data, suggested_actions)
         """
+        prefetched = prefetched or {}
+
         if intent == IntentType.QUERY:
-            return await handle_query(self.db, message, context, intent_data, self.tr)
+            return await handle_query(
+                self.db, message, context, intent_data, self.tr, query_result=prefetched.get("query_result")
+            )
 
         elif intent == IntentType.CONTEXT_QUERY:
-            return await handle_context_query(self.db, message, context, intent_data, self.tr)
+            return await handle_context_query(
+                self.db, message, context, intent_data, self.tr, entity_data=prefetched.get("entity_data")
+            )
 
         elif intent == IntentType.INLINE_EDIT:
             if mode == "read":
@@ -477,9 +660,9 @@ class AssistantService:
     ):
         """Process a user message and yield streaming response chunks.
 
-        This is a simplified streaming implementation that wraps the main
-        process_message method. For full streaming support, implement
-        streaming in individual handlers.
+        Likely handler work (smart query, entity context) runs speculatively
+        while the intent is classified; unneeded branches are cancelled.
+        Status and intent events are streamed as soon as they are produced.
 
         Args:
             message: The user's text message
@@ -499,8 +682,12 @@ class AssistantService:
             # Send initial status
             yield {"type": "status", "message": self.tr.t("streaming_processing")}
 
-            # Process message normally
-            response = await self.process_message(message, context, conversation_history, mode, language, attachments)
+            message, response = await self._prepare_message(message, context, language, attachments)
+            if response is None:
+                pipeline = SpeculativePipeline()
+                async for event in pipeline.run(self._respond(message, context, mode, pipeline)):
+                    yield event
+                response = pipeline.result
 
             # Convert to streaming format
             yield {"type": "complete", "data": response.model_dump()}
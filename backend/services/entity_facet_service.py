@@ -758,23 +758,36 @@ async def check_duplicate_facet(
     for existing_text in existing_texts:
         if not existing_text:
             continue
-        existing_normalized = normalize_name(existing_text)
-        # Simple substring check
-        if normalized in existing_normalized or existing_normalized in normalized:
+        if is_similar_facet_text(normalized, normalize_name(existing_text), similarity_threshold):
             return True
-        # Check for high similarity (Jaccard-like) only for longer text
-        if len(normalized) > 10 and len(existing_normalized) > 10:
-            set1 = set(normalized.split())
-            set2 = set(existing_normalized.split())
-            if set1 and set2:
-                intersection = len(set1 & set2)
-                union = len(set1 | set2)
-                if union > 0 and intersection / union >= similarity_threshold:
-                    return True
 
     return False
 
 
+def is_similar_facet_text(normalized: str, existing_normalized: str, similarity_threshold: float = 0.9) -> bool:
+    """
+    Check whether two normalized facet texts describe the same value.
+
+    Args:
+        normalized: normalize_name() of the new text
+        existing_normalized: normalize_name() of the existing text
+        similarity_threshold: Minimum word overlap (Jaccard) for longer texts
+    """
+    # Simple substring check
+    if normalized in existing_normalized or existing_normalized in normalized:
+        return True
+    # Check for high similarity (Jaccard-like) only for longer text
+    if len(normalized) > 10 and len(existing_normalized) > 10:
+        set1 = set(normalized.split())
+        set2 = set(existing_normalized.split())
+        if set1 and set2:
+            intersection = len(set1 & set2)
+            union = len(set1 | set2)
+            if union > 0 and intersection / union >= similarity_threshold:
+                return True
+    return False
+
+
 # Fallback mapping for critical fields when similarity matching fails
 FALLBACK_FIELD_MAPPINGS = {
     "pain_points": "pain_point",
@@ -1095,7 +1108,7 @@ async def _process_single_facet_value(
         value = _normalize_facet_value_fields(value)
 
         # Extract text representation from common fields, using labels from schema
-        text_repr = _extract_text_representation(value, primary_field, facet_type.value_schema)
+        text_repr = extract_text_representation(value, primary_field, facet_type.value_schema)
 
         if not text_repr or len(text_repr) < 3:
             # Try to create a representation from all non-null values
@@ -1360,7 +1373,7 @@ def _normalize_facet_value_fields(value: dict[str, Any]) -> dict[str, Any]:
     return normalized
 
 
-def _extract_text_representation(
+def extract_text_representation(
     value: dict[str, Any],
     primary_field: str,
     value_schema: dict[str, Any] | None = None,
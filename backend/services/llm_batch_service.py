@@ -0,0 +1,466 @@
+"""
+Offline LLM batch inference.
+
+Bulk jobs (batch_analyze, reanalyze_low_confidence, PySis FacetValue
+enrichment) don't need an answer within seconds. Their chat completion
+requests are written to a JSONL file and submitted to the provider batch
+endpoint (OpenAI / Azure OpenAI "/chat/completions" batches, 24h completion
+window, separate quota and reduced price), so they stop competing with
+interactive requests for the deployment quota.
+
+    submit_batch()         -> JSONL file + LLMBatchJob row (custom_id -> item metadata)
+    poll_pending_batches() -> retrieves finished batches and passes the parsed
+                              results to the handler registered for the job purpose
+
+Backends:
+    OpenAIBatchBackend     - files.create(purpose="batch") + batches.create()
+    LocalFileBatchBackend  - completes batches locally from a responder function
+                             (tests and development without a batch deployment)
+
+Result handlers are registered per purpose with register_batch_handler() and
+also receive the items without a result (failed / expired batches), so they
+can fall back to the synchronous path. The JSONL files of a batch are
+deleted once its results are handled and committed.
+"""
+
+import json
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.llm_batch_job import LLMBatchJob
+
+logger = structlog.get_logger(__name__)
+
+BATCH_ENDPOINT = "/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Provider status -> LLMBatchJob.status
+_PROVIDER_STATUS = {
+    "validating": "in_progress",
+    "in_progress": "in_progress",
+    "finalizing": "in_progress",
+    "cancelling": "in_progress",
+    "completed": "completed",
+    "failed": "failed",
+    "expired": "expired",
+    "cancelled": "cancelled",
+}
+
+# LLMBatchJob states that poll_pending_batches checks
+_OPEN_STATUSES = ("submitted", "in_progress")
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    """One chat completion request of a batch."""
+
+    custom_id: str
+    body: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Parsed result line of a batch."""
+
+    custom_id: str
+    content: str | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchState:
+    """Provider state of a submitted batch."""
+
+    status: str
+    output_file_id: str | None = None
+    error_file_id: str | None = None
+    error: str | None = None
+
+
+def write_batch_file(path: Path, requests: Sequence[BatchRequest]) -> None:
+    """Write requests in the OpenAI batch input format (one JSON object per line)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for request in requests:
+            line = {"custom_id": request.custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": request.body}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def parse_result_line(line: dict[str, Any]) -> BatchResult:
+    """Parse one line of a batch output or error file."""
+    custom_id = line.get("custom_id", "")
+    if line.get("error"):
+        error = line["error"]
+        return BatchResult(custom_id=custom_id, error=error.get("message") if isinstance(error, dict) else str(error))
+
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code") != 200:
+        message = (body.get("error") or {}).get("message") or f"HTTP {response.get('status_code')}"
+        return BatchResult(custom_id=custom_id, error=message)
+
+    try:
+        content = body["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return BatchResult(custom_id=custom_id, error="Antwort ohne Inhalt")
+    usage = body.get("usage") or {}
+    return BatchResult(
+        custom_id=custom_id,
+        content=content,
+        prompt_tokens=usage.get("prompt_tokens", 0),
+        completion_tokens=usage.get("completion_tokens", 0),
+    )
+
+
+def _parse_jsonl(text: str) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+
+class BatchBackend(ABC):
+    """Interface of a batch inference backend."""
+
+    name = "base"
+
+    @abstractmethod
+    async def submit(self, input_path: Path) -> str:
+        """Submit a JSONL file and return the provider batch id."""
+        pass
+
+    @abstractmethod
+    async def retrieve(self, batch_id: str) -> BatchState:
+        """Get the current state of a batch."""
+        pass
+
+    @abstractmethod
+    async def fetch_lines(self, file_id: str) -> list[dict[str, Any]]:
+        """Download an output or error file as parsed JSONL lines."""
+        pass
+
+    @abstractmethod
+    def remove_files(self, batch_id: str) -> None:
+        """Remove the local files the backend keeps for a handled batch."""
+        pass
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Batch API of OpenAI / Azure OpenAI (Azure needs a GlobalBatch deployment)."""
+
+    name = "openai"
+
+    def __init__(self, client):
+        self.client = client
+
+    async def submit(self, input_path: Path) -> str:
+        with input_path.open("rb") as f:
+            uploaded = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    async def retrieve(self, batch_id: str) -> BatchState:
+        batch = await self.client.batches.retrieve(batch_id)
+        error = None
+        if batch.errors and batch.errors.data:
+            error = "; ".join(e.message or e.code or "" for e in batch.errors.data)
+        return BatchState(
+            status=_PROVIDER_STATUS.get(batch.status, "in_progress"),
+            output_file_id=batch.output_file_id,
+            error_file_id=batch.error_file_id,
+            error=error,
+        )
+
+    async def fetch_lines(self, file_id: str) -> list[dict[str, Any]]:
+        content = await self.client.files.content(file_id)
+        return _parse_jsonl(content.text)
+
+    def remove_files(self, batch_id: str) -> None:
+        # The provider keeps no local files (the input file is removed by the caller)
+        return None
+
+
+BatchResponder = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+class LocalFileBatchBackend(BatchBackend):
+    """
+    File-based stand-in for the provider batch API.
+
+    Batches are completed on the first retrieve() by passing every request
+    body to the responder, which returns a chat completion body (or raises).
+    Output and error files use the provider format, so the result handling
+    is identical to the real backend.
+    """
+
+    name = "local"
+
+    def __init__(self, storage_path: Path, responder: BatchResponder | None = None):
+        self.storage_path = storage_path
+        self.responder = responder
+
+    def _path(self, batch_id: str, kind: str) -> Path:
+        return self.storage_path / f"{batch_id}.{kind}.jsonl"
+
+    async def submit(self, input_path: Path) -> str:
+        batch_id = f"local-{uuid.uuid4().hex}"
+        target = self._path(batch_id, "input")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(input_path.read_text(encoding="utf-8"), encoding="utf-8")
+        return batch_id
+
+    async def retrieve(self, batch_id: str) -> BatchState:
+        input_path = self._path(batch_id, "input")
+        output_path = self._path(batch_id, "output")
+        error_path = self._path(batch_id, "error")
+        if not input_path.exists():
+            return BatchState(status="failed", error=f"Batch {batch_id} nicht gefunden")
+        if not output_path.exists():
+            if self.responder is None:
+                return BatchState(status="in_progress")
+            await self._complete(input_path, output_path, error_path)
+        return BatchState(
+            status="completed",
+            output_file_id=str(output_path),
+            error_file_id=str(error_path) if error_path.exists() else None,
+        )
+
+    async def _complete(self, input_path: Path, output_path: Path, error_path: Path) -> None:
+        outputs, errors = [], []
+        for request in _parse_jsonl(input_path.read_text(encoding="utf-8")):
+            try:
+                body = await self.responder(request["body"])
+                outputs.append(
+                    {"custom_id": request["custom_id"], "response": {"status_code": 200, "body": body}, "error": None}
+                )
+            except Exception as e:
+                errors.append({"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}})
+        if errors:
+            error_path.write_text("".join(json.dumps(line) + "\n" for line in errors), encoding="utf-8")
+        output_path.write_text("".join(json.dumps(line) + "\n" for line in outputs), encoding="utf-8")
+
+    async def fetch_lines(self, file_id: str) -> list[dict[str, Any]]:
+        return _parse_jsonl(Path(file_id).read_text(encoding="utf-8"))
+
+    def remove_files(self, batch_id: str) -> None:
+        for kind in ("input", "output", "error"):
+            self._path(batch_id, kind).unlink(missing_ok=True)
+
+
+_local_responder: BatchResponder | None = None
+
+
+def set_local_batch_responder(responder: BatchResponder | None) -> None:
+    """Set the responder of the local backend (tests / development)."""
+    global _local_responder
+    _local_responder = responder
+
+
+async def get_batch_backend(session: AsyncSession) -> BatchBackend:
+    """
+    Get the configured batch backend.
+
+    Raises:
+        ValueError: If the OpenAI backend has no document analysis credentials
+    """
+    if settings.llm_batch_backend == "local":
+        return LocalFileBatchBackend(Path(settings.llm_batch_storage_path) / "local", _local_responder)
+
+    from app.models.user_api_credentials import LLMPurpose
+    from services.llm_client_service import LLMClientService
+
+    client, config = await LLMClientService(session).get_system_client(LLMPurpose.DOCUMENT_ANALYSIS)
+    if not client or not config:
+        raise ValueError("Keine LLM-Credentials für Batch-Verarbeitung konfiguriert.")
+    return OpenAIBatchBackend(client)
+
+
+# =============================================================================
+# Result Handlers
+# =============================================================================
+
+# handler(session, job, results) - results contains an entry for every item of
+# the job; items without a result line (failed / expired batch) map to None.
+BatchHandler = Callable[[AsyncSession, LLMBatchJob, dict[str, BatchResult | None]], Awaitable[None]]
+
+_handlers: dict[str, BatchHandler] = {}
+
+
+def register_batch_handler(purpose: str, handler: BatchHandler) -> None:
+    """Register the result handler of a batch purpose."""
+    _handlers[purpose] = handler
+
+
+def get_batch_handler(purpose: str) -> BatchHandler | None:
+    """Get the result handler of a batch purpose."""
+    return _handlers.get(purpose)
+
+
+# =============================================================================
+# Submit / Poll
+# =============================================================================
+
+
+async def submit_batch(
+    session: AsyncSession,
+    backend: BatchBackend,
+    purpose: str,
+    model: str,
+    requests: Sequence[BatchRequest],
+    items: dict[str, dict[str, Any]],
+) -> LLMBatchJob:
+    """
+    Write the requests to a JSONL file and submit it.
+
+    Args:
+        session: Database session (the caller commits)
+        backend: Batch backend
+        purpose: Purpose of the registered result handler
+        model: Model / batch deployment name
+        requests: Chat completion requests
+        items: custom_id -> metadata for the result handler
+
+    Returns:
+        Submitted LLMBatchJob
+    """
+    job = LLMBatchJob(
+        id=uuid.uuid4(),
+        purpose=purpose,
+        backend=backend.name,
+        model=model,
+        status="pending",
+        items=items,
+        request_count=len(requests),
+    )
+    input_path = Path(settings.llm_batch_storage_path) / f"{job.id}.jsonl"
+    write_batch_file(input_path, requests)
+    job.input_file_path = str(input_path)
+
+    try:
+        job.provider_batch_id = await backend.submit(input_path)
+    except Exception:
+        input_path.unlink(missing_ok=True)
+        raise
+    job.status = "submitted"
+    job.submitted_at = datetime.now(UTC)
+    session.add(job)
+    await session.flush()
+
+    logger.info(
+        "llm_batch_submitted",
+        batch_job_id=str(job.id),
+        provider_batch_id=job.provider_batch_id,
+        purpose=purpose,
+        requests=len(requests),
+    )
+    return job
+
+
+async def poll_batch(session: AsyncSession, backend: BatchBackend, job: LLMBatchJob) -> bool:
+    """
+    Check a submitted batch and process its results once it is finished.
+
+    Returns:
+        True if the job reached a terminal state
+    """
+    state = await backend.retrieve(job.provider_batch_id)
+    if state.status == "in_progress":
+        job.status = "in_progress"
+        return False
+
+    results: dict[str, BatchResult | None] = dict.fromkeys(job.items)
+    for file_id in (state.output_file_id, state.error_file_id):
+        if not file_id:
+            continue
+        for line in await backend.fetch_lines(file_id):
+            result = parse_result_line(line)
+            if result.custom_id in results:
+                results[result.custom_id] = result
+
+    job.status = state.status
+    job.output_file_id = state.output_file_id
+    job.error_file_id = state.error_file_id
+    job.error_message = state.error
+    job.completed_count = sum(1 for r in results.values() if r is not None and r.error is None)
+    job.failed_count = sum(1 for r in results.values() if r is not None and r.error is not None)
+    job.completed_at = datetime.now(UTC)
+
+    handler = get_batch_handler(job.purpose)
+    if handler is None:
+        logger.error("llm_batch_handler_missing", batch_job_id=str(job.id), purpose=job.purpose)
+    else:
+        await handler(session, job, results)
+
+    logger.info(
+        "llm_batch_finished",
+        batch_job_id=str(job.id),
+        status=job.status,
+        completed=job.completed_count,
+        failed=job.failed_count,
+        missing=job.request_count - job.completed_count - job.failed_count,
+    )
+    return True
+
+
+def _remove_batch_files(backend: BatchBackend, job: LLMBatchJob) -> None:
+    """Delete the files of a handled batch (best effort)."""
+    try:
+        if job.input_file_path:
+            Path(job.input_file_path).unlink(missing_ok=True)
+        backend.remove_files(job.provider_batch_id)
+    except OSError as e:
+        logger.warning("llm_batch_file_cleanup_failed", batch_job_id=str(job.id), error=str(e))
+
+
+async def poll_pending_batches(session: AsyncSession, backend: BatchBackend | None = None) -> dict[str, int]:
+    """
+    Poll all submitted batches (oldest first) and commit after each job.
+
+    Jobs are loaded one at a time by id: a rollback after a failed job
+    expires every loaded instance, so none are kept across jobs.
+
+    Returns:
+        Dict with checked and finished counts
+    """
+    result = await session.execute(
+        select(LLMBatchJob.id).where(LLMBatchJob.status.in_(_OPEN_STATUSES)).order_by(LLMBatchJob.created_at)
+    )
+    job_ids = list(result.scalars().all())
+    if not job_ids:
+        return {"checked": 0, "finished": 0}
+
+    backend = backend or await get_batch_backend(session)
+    finished = 0
+    for job_id in job_ids:
+        try:
+            job = await session.get(LLMBatchJob, job_id, populate_existing=True)
+            if job is None or job.status not in _OPEN_STATUSES:
+                continue
+            done = await poll_batch(session, backend, job)
+            await session.commit()
+            if done:
+                finished += 1
+                _remove_batch_files(backend, job)
+        except Exception as e:
+            await session.rollback()
+            logger.exception("llm_batch_poll_failed", batch_job_id=str(job_id), error=str(e))
+
+    return {"checked": len(job_ids), "finished": finished}
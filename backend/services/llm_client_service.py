@@ -16,16 +16,36 @@ Usage:
 
     # Or for system-wide operations (uses first available admin config)
     client, config = await client_service.get_system_client(LLMPurpose.EMBEDDINGS)
+
+Performance:
+- Clients are pooled per process (and event loop), keyed by a hash of the
+  resolved config. Calls reuse the client's keep-alive HTTP connections
+  instead of paying a new TLS handshake each time.
+- The purpose -> config resolution (admin lookup + decryption) is cached
+  for CONFIG_CACHE_TTL seconds. Commits that change LLM configs or API
+  credentials bump the llm_config data version (app.core.data_versions);
+  every process compares it at most every CONFIG_VERSION_CHECK_SECONDS and
+  drops its cache when it moved. invalidate_llm_config_cache() clears the
+  cache of the calling process right away.
+
+Pooled clients are shared: callers must not close them.
 """
 
+import asyncio
+import hashlib
+import json
+import time
 import uuid
+import weakref
 from typing import Any
 
+import httpx
 import structlog
-from openai import AsyncAzureOpenAI, AsyncOpenAI
+from openai import AsyncAzureOpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.data_versions import SCOPE_LLM_CONFIG, read_data_versions
 from app.models.user import User
 from app.models.user_api_credentials import LLMProvider, LLMPurpose
 
@@ -33,13 +53,141 @@ from .credentials_resolver import get_openai_compatible_config
 
 logger = structlog.get_logger(__name__)
 
+# Seconds a resolved purpose config is reused without hitting the database
+# (safety net if Redis is unavailable)
+CONFIG_CACHE_TTL = 60
+
+# Minimum seconds between two reads of the llm_config data version. Other
+# processes pick up credential changes after at most this delay.
+CONFIG_VERSION_CHECK_SECONDS = 5
+
+# Keep-alive connection pool of each pooled client
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+# (user_id or "system", purpose) -> (expires_at, config or None)
+_config_cache: dict[tuple[str, str], tuple[float, dict[str, Any] | None]] = {}
+# llm_config data version the cached configs belong to, and when it was read
+_config_version: int | None = None
+_config_version_checked_at = 0.0
+
+# Event loop -> {config hash -> client}. httpx connections are bound to the
+# loop they were opened in, so Celery tasks running in their own loop get
+# their own clients; pools of closed loops are garbage collected.
+_client_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, AsyncOpenAI | AsyncAzureOpenAI]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def config_fingerprint(config: dict[str, Any]) -> str:
+    """Hash of a resolved LLM config (includes the API key, so rotation yields a new client)."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _get_cached_config(key: tuple[str, str]) -> tuple[bool, dict[str, Any] | None]:
+    entry = _config_cache.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return False, None
+    return True, entry[1]
+
+
+def _set_cached_config(key: tuple[str, str], config: dict[str, Any] | None) -> None:
+    _config_cache[key] = (time.monotonic() + CONFIG_CACHE_TTL, config)
+
+
+def invalidate_llm_config_cache() -> None:
+    """Drop all cached purpose configs of this process (call after credentials or LLM configs change)."""
+    _config_cache.clear()
+    logger.info("llm_config_cache_invalidated")
+
+
+async def _check_config_version() -> None:
+    """Drop the cached configs if another process changed LLM configs or credentials."""
+    global _config_version, _config_version_checked_at
+    now = time.monotonic()
+    if now - _config_version_checked_at < CONFIG_VERSION_CHECK_SECONDS:
+        return
+    _config_version_checked_at = now
+
+    versions = await read_data_versions([SCOPE_LLM_CONFIG])
+    if versions is None:
+        return
+    version = versions[SCOPE_LLM_CONFIG]
+    if _config_version is not None and version != _config_version and _config_cache:
+        invalidate_llm_config_cache()
+    _config_version = version
+
+
+def _build_client(config: dict[str, Any]) -> AsyncOpenAI | AsyncAzureOpenAI:
+    """Create the appropriate client based on config type, with a keep-alive HTTP pool."""
+    provider_type = config.get("type", "azure")
+
+    if provider_type == "azure":
+        # Check if this is Azure Claude (Anthropic on Azure)
+        azure_provider = config.get("azure_provider", "openai")
+        if azure_provider == "anthropic":
+            raise ValueError(
+                "Azure Claude (Anthropic on Azure) is not supported via the OpenAI client. "
+                "Please use standard Azure OpenAI URLs for this feature, or configure "
+                "direct Anthropic API credentials for Plan-Mode/API-Discovery purposes."
+            )
+
+        return AsyncAzureOpenAI(
+            azure_endpoint=config["endpoint"],
+            api_key=config["api_key"],
+            api_version=config.get("api_version", "2025-04-01-preview"),
+            http_client=DefaultAsyncHttpxClient(limits=LLM_HTTP_LIMITS),
+        )
+    elif provider_type == "openai":
+        return AsyncOpenAI(
+            api_key=config["api_key"],
+            organization=config.get("organization"),
+            http_client=DefaultAsyncHttpxClient(limits=LLM_HTTP_LIMITS),
+        )
+    else:
+        raise ValueError(f"Unknown LLM provider type: {provider_type}")
+
+
+def get_pooled_client(config: dict[str, Any]) -> AsyncOpenAI | AsyncAzureOpenAI:
+    """
+    Get the shared client for a resolved config (created on first use).
+
+    Args:
+        config: Resolved OpenAI-compatible config
+
+    Returns:
+        Pooled client - do not close it
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop (sync context): nothing to pool connections for
+        return _build_client(config)
+
+    pool = _client_pools.setdefault(loop, {})
+    key = config_fingerprint(config)
+    client = pool.get(key)
+    if client is None:
+        client = _build_client(config)
+        pool[key] = client
+        logger.debug("llm_client_created", provider=config.get("type", "azure"), pool_size=len(pool))
+    return client
+
+
+async def close_llm_client_pool() -> None:
+    """Close the pooled clients of the current event loop (call on shutdown)."""
+    pool = _client_pools.pop(asyncio.get_running_loop(), {})
+    for client in pool.values():
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning("llm_client_close_failed", error=str(e))
+
 
 class LLMClientService:
     """Service for creating LLM clients using database-stored credentials."""
 
     def __init__(self, session: AsyncSession):
         self.session = session
-        self._client_cache: dict[str, tuple[Any, dict]] = {}
 
     async def get_client_for_purpose(
         self,
@@ -56,7 +204,7 @@ class LLMClientService:
         Returns:
             Tuple of (client, config) or (None, None) if no credentials configured
         """
-        config = await get_openai_compatible_config(self.session, user_id, purpose)
+        config = await self._resolve_config(str(user_id), purpose, user_id)
         if not config:
             logger.warning(
                 "No LLM credentials configured for user",
@@ -65,8 +213,30 @@ class LLMClientService:
             )
             return None, None
 
-        client = self._create_client(config)
-        return client, config
+        return get_pooled_client(config), config
+
+    async def _resolve_config(
+        self,
+        cache_owner: str,
+        purpose: LLMPurpose,
+        user_id: uuid.UUID | None,
+    ) -> dict[str, Any] | None:
+        """Resolve the config of a purpose, served from the short-TTL cache if possible."""
+        cache_key = (cache_owner, purpose.value)
+        await _check_config_version()
+        found, config = _get_cached_config(cache_key)
+        if found:
+            return config
+
+        if user_id is None:
+            # System operation: first admin user with credentials
+            admin_user = await self._get_admin_with_credentials()
+            config = await get_openai_compatible_config(self.session, admin_user.id, purpose) if admin_user else None
+        else:
+            config = await get_openai_compatible_config(self.session, user_id, purpose)
+
+        _set_cached_config(cache_key, config)
+        return config
 
     async def get_system_client(
         self,
@@ -84,13 +254,12 @@ class LLMClientService:
         Returns:
             Tuple of (client, config) or (None, None) if no credentials configured
         """
-        # Find first admin user with credentials
-        admin_user = await self._get_admin_with_credentials()
-        if not admin_user:
-            logger.error("No admin user with LLM credentials found for system operation")
+        config = await self._resolve_config("system", purpose, None)
+        if not config:
+            logger.error("No admin user with LLM credentials found for system operation", purpose=purpose.value)
             return None, None
 
-        return await self.get_client_for_purpose(admin_user.id, purpose)
+        return get_pooled_client(config), config
 
     async def _get_admin_with_credentials(self) -> User | None:
         """Find an admin user who has LLM credentials configured."""
@@ -110,31 +279,8 @@ class LLMClientService:
         return result.scalar_one_or_none()
 
     def _create_client(self, config: dict[str, Any]) -> AsyncOpenAI | AsyncAzureOpenAI:
-        """Create the appropriate client based on config type."""
-        provider_type = config.get("type", "azure")
-
-        if provider_type == "azure":
-            # Check if this is Azure Claude (Anthropic on Azure)
-            azure_provider = config.get("azure_provider", "openai")
-            if azure_provider == "anthropic":
-                raise ValueError(
-                    "Azure Claude (Anthropic on Azure) is not supported via the OpenAI client. "
-                    "Please use standard Azure OpenAI URLs for this feature, or configure "
-                    "direct Anthropic API credentials for Plan-Mode/API-Discovery purposes."
-                )
-
-            return AsyncAzureOpenAI(
-                azure_endpoint=config["endpoint"],
-                api_key=config["api_key"],
-                api_version=config.get("api_version", "2025-04-01-preview"),
-            )
-        elif provider_type == "openai":
-            return AsyncOpenAI(
-                api_key=config["api_key"],
-                organization=config.get("organization"),
-            )
-        else:
-            raise ValueError(f"Unknown LLM provider type: {provider_type}")
+        """Get the (pooled) client for a config."""
+        return get_pooled_client(config)
 
     def get_model_name(self, config: dict[str, Any], for_embeddings: bool = False) -> str:
         """Get the model/deployment name from config."""
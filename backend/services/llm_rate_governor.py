@@ -0,0 +1,300 @@
+"""
+Cluster-wide LLM Rate Governor.
+
+All API processes and Celery workers share one token bucket per model /
+deployment in Redis, sized to the deployment quota (tokens and requests per
+minute). Every LLM call acquires its estimated tokens before it is sent, so
+bursts (e.g. after a large crawl) queue up in the workers instead of producing
+waves of 429 responses.
+
+Features:
+- Atomic token bucket (TPM + RPM) in a single Lua script per acquire
+- AIMD: a 429 halves the effective rate and empties the bucket, every
+  successful call increases it again by a small step
+- Priorities: background calls may only use the bucket down to a reserve,
+  so interactive calls (assistant, API requests) go first
+- Metrics: waiting callers, wait time and throttling events
+
+If Redis is unavailable the governor fails open (calls are not delayed).
+
+Usage:
+    from services.llm_rate_governor import governed_llm_call
+
+    async with governed_llm_call(model_name, estimated_tokens):
+        response = await client.chat.completions.create(...)
+"""
+
+import asyncio
+import contextvars
+import enum
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import structlog
+from openai import RateLimitError
+
+from app.config import settings
+from app.monitoring.metrics import (
+    llm_governor_throttled_total,
+    llm_governor_wait_seconds,
+    llm_governor_waiting,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Redis key prefix of the buckets
+BUCKET_PREFIX = "llmgov:"
+
+# Share of the bucket reserved for interactive calls
+INTERACTIVE_RESERVE = 0.2
+
+# AIMD parameters
+DECREASE_FACTOR = 0.5
+INCREASE_STEP = 0.02
+MIN_RATE_FACTOR = 0.05
+
+# Polling bounds while waiting for tokens (seconds)
+MIN_WAIT = 0.05
+MAX_WAIT = 5.0
+
+
+class LLMPriority(enum.IntEnum):
+    """Priority of an LLM call (lower value goes first)."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Default priority of the process (the API sets INTERACTIVE on startup)
+_default_priority = LLMPriority.BACKGROUND
+_priority_override: contextvars.ContextVar[LLMPriority | None] = contextvars.ContextVar("llm_priority", default=None)
+
+
+def set_default_llm_priority(priority: LLMPriority) -> None:
+    """Set the default priority of all LLM calls in this process."""
+    global _default_priority
+    _default_priority = priority
+
+
+def get_llm_priority() -> LLMPriority:
+    """Get the priority of LLM calls in the current context."""
+    priority = _priority_override.get()
+    return _default_priority if priority is None else priority
+
+
+@asynccontextmanager
+async def llm_priority(priority: LLMPriority) -> AsyncIterator[None]:
+    """Run LLM calls inside the block with the given priority."""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+# KEYS[1]: bucket hash
+# ARGV: now_ms, tokens_per_minute, requests_per_minute, requested_tokens, reserve
+# Returns {granted (0/1), wait_ms, rate_factor * 1000}
+_ACQUIRE_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'requests', 'ts', 'factor')
+local now = tonumber(ARGV[1])
+local factor = tonumber(bucket[4]) or 1
+local token_capacity = tonumber(ARGV[2]) * factor
+local request_capacity = tonumber(ARGV[3]) * factor
+local tokens = tonumber(bucket[1]) or token_capacity
+local requests = tonumber(bucket[2]) or request_capacity
+local last = tonumber(bucket[3]) or now
+local elapsed = math.max(0, now - last) / 60000
+tokens = math.min(token_capacity, tokens + elapsed * token_capacity)
+requests = math.min(request_capacity, requests + elapsed * request_capacity)
+
+-- A single call larger than the bucket may run once the bucket is full
+local needed = math.min(tonumber(ARGV[4]), token_capacity)
+-- The reserve never exceeds what a full bucket leaves after this call, so a
+-- background call as large as the bucket still runs once it is full
+local token_floor = math.min(token_capacity * tonumber(ARGV[5]), token_capacity - needed)
+local request_floor = math.min(request_capacity * tonumber(ARGV[5]), request_capacity - 1)
+
+local granted = 0
+local wait = 0
+if tokens - needed >= token_floor and requests - 1 >= request_floor then
+    tokens = tokens - needed
+    requests = requests - 1
+    granted = 1
+else
+    local token_wait = (needed + token_floor - tokens) / token_capacity
+    local request_wait = (1 + request_floor - requests) / request_capacity
+    wait = math.ceil(math.max(token_wait, request_wait) * 60000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'requests', requests, 'ts', now, 'factor', factor)
+redis.call('PEXPIRE', KEYS[1], 300000)
+return {granted, wait, math.floor(factor * 1000)}
+"""
+
+# KEYS[1]: bucket hash; ARGV: factor multiplier, additive step, minimum, empty bucket (0/1)
+_ADJUST_SCRIPT = """
+local factor = tonumber(redis.call('HGET', KEYS[1], 'factor')) or 1
+factor = math.max(tonumber(ARGV[3]), math.min(1, factor * tonumber(ARGV[1]) + tonumber(ARGV[2])))
+redis.call('HSET', KEYS[1], 'factor', factor)
+if ARGV[4] == '1' then
+    redis.call('HSET', KEYS[1], 'tokens', 0, 'requests', 0)
+end
+redis.call('PEXPIRE', KEYS[1], 300000)
+return tostring(factor)
+"""
+
+
+class LLMRateGovernor:
+    """Redis-backed token bucket per model / deployment."""
+
+    def __init__(self, redis_url: str | None = None):
+        self.redis_url = redis_url or settings.redis_url
+        # Redis connections are bound to the event loop they were opened in
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object] = weakref.WeakKeyDictionary()
+        self._rate_factors: dict[str, float] = {}
+
+    def _get_redis(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(self.redis_url, socket_timeout=2, socket_connect_timeout=2)
+            self._clients[loop] = client
+        return client
+
+    @staticmethod
+    def get_limits(model: str) -> tuple[int, int]:
+        """Return (tokens_per_minute, requests_per_minute) of a model / deployment."""
+        limits = settings.llm_governor_model_limits.get(model)
+        if limits:
+            return int(limits[0]), int(limits[1])
+        return settings.llm_governor_tokens_per_minute, settings.llm_governor_requests_per_minute
+
+    async def acquire(self, model: str, tokens: int, priority: LLMPriority | None = None) -> float:
+        """
+        Wait until the bucket of a model grants the requested tokens.
+
+        Args:
+            model: Model / deployment name
+            tokens: Estimated tokens of the call (prompt + completion)
+            priority: Call priority (defaults to the context priority)
+
+        Returns:
+            Seconds waited
+        """
+        if not settings.llm_governor_enabled:
+            return 0.0
+
+        priority = priority if priority is not None else get_llm_priority()
+        tokens_per_minute, requests_per_minute = self.get_limits(model)
+        reserve = 0.0 if priority == LLMPriority.INTERACTIVE else INTERACTIVE_RESERVE
+        key = f"{BUCKET_PREFIX}{model}"
+        labels = {"model": model, "priority": priority.name.lower()}
+
+        start = time.monotonic()
+        deadline = start + settings.llm_governor_max_wait_seconds
+        waiting = False
+        try:
+            while True:
+                try:
+                    granted, wait_ms, factor = await self._get_redis().eval(
+                        _ACQUIRE_SCRIPT,
+                        1,
+                        key,
+                        int(time.time() * 1000),
+                        tokens_per_minute,
+                        requests_per_minute,
+                        tokens,
+                        reserve,
+                    )
+                except Exception as e:
+                    # Fail open: never block LLM calls because Redis is down
+                    logger.warning("llm_governor_unavailable", model=model, error=str(e))
+                    return time.monotonic() - start
+
+                self._rate_factors[model] = int(factor) / 1000
+                if granted:
+                    break
+                if time.monotonic() >= deadline:
+                    logger.warning("llm_governor_wait_timeout", model=model, tokens=tokens, priority=priority.name)
+                    break
+                if not waiting:
+                    waiting = True
+                    llm_governor_waiting.labels(**labels).inc()
+                await asyncio.sleep(min(MAX_WAIT, max(MIN_WAIT, int(wait_ms) / 1000)))
+        finally:
+            if waiting:
+                llm_governor_waiting.labels(**labels).dec()
+
+        waited = time.monotonic() - start
+        llm_governor_wait_seconds.labels(**labels).observe(waited)
+        if waited > 1:
+            logger.info("llm_governor_waited", model=model, tokens=tokens, priority=priority.name, waited_s=waited)
+        return waited
+
+    async def _adjust(self, model: str, multiplier: float, step: float, empty_bucket: bool) -> None:
+        try:
+            factor = await self._get_redis().eval(
+                _ADJUST_SCRIPT,
+                1,
+                f"{BUCKET_PREFIX}{model}",
+                multiplier,
+                step,
+                MIN_RATE_FACTOR,
+                "1" if empty_bucket else "0",
+            )
+            self._rate_factors[model] = float(factor)
+        except Exception as e:
+            logger.warning("llm_governor_adjust_failed", model=model, error=str(e))
+
+    async def report_throttled(self, model: str) -> None:
+        """Multiplicative decrease after a 429: halve the rate and pause all callers."""
+        llm_governor_throttled_total.labels(model=model).inc()
+        await self._adjust(model, DECREASE_FACTOR, 0.0, empty_bucket=True)
+        logger.warning("llm_governor_throttled", model=model, rate_factor=self._rate_factors.get(model))
+
+    async def report_success(self, model: str) -> None:
+        """Additive increase after a successful call (only while below the full rate)."""
+        if self._rate_factors.get(model, 1.0) < 1.0:
+            await self._adjust(model, 1.0, INCREASE_STEP, empty_bucket=False)
+
+
+_governor: LLMRateGovernor | None = None
+
+
+def get_rate_governor() -> LLMRateGovernor:
+    """Get the process-wide rate governor."""
+    global _governor
+    if _governor is None:
+        _governor = LLMRateGovernor()
+    return _governor
+
+
+@asynccontextmanager
+async def governed_llm_call(
+    model: str,
+    estimated_tokens: int,
+    priority: LLMPriority | None = None,
+) -> AsyncIterator[None]:
+    """
+    Acquire rate limit tokens for an LLM call and report its outcome.
+
+    Args:
+        model: Model / deployment name
+        estimated_tokens: Estimated prompt + completion tokens
+        priority: Call priority (defaults to the context priority)
+
+    Raises:
+        Whatever the wrapped call raises (429s are reported to the governor first)
+    """
+    governor = get_rate_governor()
+    await governor.acquire(model, estimated_tokens, priority)
+    try:
+        yield
+    except RateLimitError:
+        await governor.report_throttled(model)
+        raise
+    await governor.report_success(model)
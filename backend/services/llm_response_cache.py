@@ -0,0 +1,212 @@
+"""
+Content-addressed LLM response cache.
+
+Document analysis is deterministic enough (low temperature, JSON output) that
+re-sending identical text with an identical prompt - mirrored PDFs on several
+council portals, reanalyze_low_confidence, category re-runs - only costs
+money. Responses are stored in the database under a hash of everything that
+determines the completion:
+
+    cache_key   = sha256(model, sha256(prompt), sha256(text), temperature, response_format)
+    content_key = sha256(model, sha256(prompt), document file hash, page selection,
+                         temperature, response_format)
+
+The content key lets duplicate documents (same file hash) share one
+extraction even if their extracted text differs slightly (e.g. OCR runs).
+
+Changing the category prompt or the model changes the key, so stale entries
+are never served; they expire via cleanup_llm_response_cache.
+"""
+
+import hashlib
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.llm_response_cache import LLMResponseCache
+
+logger = structlog.get_logger(__name__)
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _key(parts: dict[str, Any]) -> str:
+    return _sha256(json.dumps(parts, sort_keys=True, separators=(",", ":")))
+
+
+@dataclass(frozen=True)
+class LLMCacheKeys:
+    """Keys of one LLM request."""
+
+    cache_key: str
+    content_key: str | None
+    prompt_hash: str
+
+
+def build_cache_keys(
+    model: str,
+    prompt: str,
+    text: str,
+    temperature: float,
+    response_format: dict[str, Any] | None = None,
+    content_hash: str | None = None,
+    page_numbers: Sequence[int] | None = None,
+) -> LLMCacheKeys:
+    """
+    Build the cache keys of an LLM request.
+
+    Args:
+        model: Model / deployment name
+        prompt: System prompt
+        text: Analyzed text (user message)
+        temperature: Sampling temperature
+        response_format: OpenAI response_format parameter
+        content_hash: Document file hash (enables sharing between duplicates)
+        page_numbers: Analyzed pages (part of the content key)
+
+    Returns:
+        LLMCacheKeys
+    """
+    prompt_hash = _sha256(prompt)
+    params = {
+        "model": model,
+        "prompt": prompt_hash,
+        "temperature": temperature,
+        "response_format": response_format,
+    }
+    cache_key = _key({**params, "text": _sha256(text)})
+    content_key = None
+    if content_hash:
+        content_key = _key({**params, "content": content_hash, "pages": sorted(page_numbers or [])})
+    return LLMCacheKeys(cache_key=cache_key, content_key=content_key, prompt_hash=prompt_hash)
+
+
+async def get_cached_response(session: AsyncSession, keys: LLMCacheKeys) -> LLMResponseCache | None:
+    """
+    Look up a cached response by request or content key.
+
+    Expired entries are ignored. A hit updates the hit statistics.
+
+    Returns:
+        Cache entry or None
+    """
+    if not settings.llm_response_cache_enabled:
+        return None
+
+    key_filter = LLMResponseCache.cache_key == keys.cache_key
+    if keys.content_key:
+        key_filter = or_(key_filter, LLMResponseCache.content_key == keys.content_key)
+    cutoff = datetime.now(UTC) - timedelta(days=settings.llm_response_cache_ttl_days)
+
+    try:
+        async with session.begin_nested():
+            result = await session.execute(
+                select(LLMResponseCache)
+                .where(key_filter, LLMResponseCache.created_at >= cutoff)
+                # Prefer the exact request match over the content match
+                .order_by((LLMResponseCache.cache_key == keys.cache_key).desc())
+                .limit(1)
+            )
+            entry = result.scalar_one_or_none()
+            if entry is None:
+                return None
+
+            await session.execute(
+                update(LLMResponseCache)
+                .where(LLMResponseCache.cache_key == entry.cache_key)
+                .values(hit_count=LLMResponseCache.hit_count + 1, last_hit_at=datetime.now(UTC))
+            )
+        return entry
+    except Exception as e:
+        logger.warning("llm_response_cache_lookup_failed", error=str(e))
+        return None
+
+
+async def get_cached_responses(session: AsyncSession, keys: Sequence[LLMCacheKeys]) -> dict[str, LLMResponseCache]:
+    """
+    Look up several requests by request key in one query (e.g. chunks of a document).
+
+    Returns:
+        Dict of cache_key -> entry for all hits
+    """
+    if not settings.llm_response_cache_enabled or not keys:
+        return {}
+
+    cache_keys = [k.cache_key for k in keys]
+    cutoff = datetime.now(UTC) - timedelta(days=settings.llm_response_cache_ttl_days)
+    try:
+        async with session.begin_nested():
+            result = await session.execute(
+                select(LLMResponseCache).where(
+                    LLMResponseCache.cache_key.in_(cache_keys),
+                    LLMResponseCache.created_at >= cutoff,
+                )
+            )
+            entries = {entry.cache_key: entry for entry in result.scalars().all()}
+            if entries:
+                await session.execute(
+                    update(LLMResponseCache)
+                    .where(LLMResponseCache.cache_key.in_(list(entries)))
+                    .values(hit_count=LLMResponseCache.hit_count + 1, last_hit_at=datetime.now(UTC))
+                )
+        return entries
+    except Exception as e:
+        logger.warning("llm_response_cache_lookup_failed", error=str(e))
+        return {}
+
+
+async def store_response(
+    session: AsyncSession,
+    keys: LLMCacheKeys,
+    model: str,
+    temperature: float,
+    response: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+) -> None:
+    """
+    Store an LLM response (replaces an existing entry with the same key).
+
+    The caller commits; failures are logged and never break the analysis.
+    """
+    if not settings.llm_response_cache_enabled:
+        return
+
+    values = {
+        "cache_key": keys.cache_key,
+        "content_key": keys.content_key,
+        "model": model,
+        "prompt_hash": keys.prompt_hash,
+        "temperature": temperature,
+        "response": response,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "hit_count": 0,
+        "created_at": datetime.now(UTC),
+    }
+    stmt = insert(LLMResponseCache).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["cache_key"],
+        set_={
+            "content_key": stmt.excluded.content_key,
+            "response": stmt.excluded.response,
+            "prompt_tokens": stmt.excluded.prompt_tokens,
+            "completion_tokens": stmt.excluded.completion_tokens,
+            "created_at": stmt.excluded.created_at,
+        },
+    )
+    try:
+        async with session.begin_nested():
+            await session.execute(stmt)
+    except Exception as e:
+        logger.warning("llm_response_cache_store_failed", error=str(e))
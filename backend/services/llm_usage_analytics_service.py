@@ -96,6 +96,8 @@ class LLMUsageAnalyticsService:
             func.coalesce(func.sum(LLMUsageRecord.completion_tokens), 0).label("total_completion_tokens"),
             func.coalesce(func.avg(LLMUsageRecord.duration_ms), 0).label("avg_duration_ms"),
             func.sum(case((LLMUsageRecord.is_error, 1), else_=0)).label("error_count"),
+            func.count().filter(LLMUsageRecord.cache_hit.is_(True)).label("cache_hits"),
+            func.count().filter(LLMUsageRecord.cache_hit.is_(False)).label("cache_misses"),
         ).where(base_filter)
 
         result = await self.session.execute(basic_query)
@@ -138,6 +140,8 @@ class LLMUsageAnalyticsService:
             avg_duration_ms=float(row.avg_duration_ms or 0),
             error_count=error_count,
             error_rate=error_rate,
+            cache_hits=int(row.cache_hits or 0),
+            cache_misses=int(row.cache_misses or 0),
         )
 
     async def _get_by_model(self, base_filter) -> list[LLMUsageByModel]:
@@ -387,6 +387,7 @@ class LLMUsageContext:
     total_tokens: int = 0
     is_error: bool = False
     error_message: str | None = None
+    cache_hit: bool | None = None
 
 
 class LLMUsageTracker:
@@ -518,6 +519,7 @@ class LLMUsageTracker:
             extra_metadata=ctx.metadata,
             is_error=ctx.is_error,
             error_message=ctx.error_message[:500] if ctx.error_message else None,
+            cache_hit=ctx.cache_hit,
             created_at=datetime.now(UTC),
         )
 
@@ -686,6 +688,7 @@ async def record_llm_usage(
     is_error: bool = False,
     error_message: str | None = None,
     metadata: dict[str, Any] | None = None,
+    cache_hit: bool | None = None,
 ) -> None:
     """
     Record LLM usage directly without context manager.
@@ -709,6 +712,7 @@ async def record_llm_usage(
         is_error: Whether the request failed
         error_message: Optional error message
         metadata: Optional additional metadata
+        cache_hit: Whether the response came from the response cache (None = not cached)
     """
     ctx = LLMUsageContext(
         provider=provider,
@@ -730,6 +734,7 @@ async def record_llm_usage(
     # Set error info
     ctx.is_error = is_error
     ctx.error_message = error_message
+    ctx.cache_hit = cache_hit
 
     # Override start time if duration is provided
     if duration_ms is not None:
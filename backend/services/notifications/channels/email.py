@@ -10,12 +10,17 @@ import aiosmtplib
 from app.config import settings
 from app.models.notification import Notification, NotificationChannel
 from services.notifications.channels.base import NotificationChannelBase
+from services.notifications.channels.smtp_pool import get_smtp_pool
 
 logger = logging.getLogger(__name__)
 
 
 class EmailChannel(NotificationChannelBase):
-    """Email notification channel using SMTP."""
+    """Email notification channel using SMTP.
+
+    Messages are sent over the pooled SMTP sessions of the worker process
+    (see smtp_pool), not over a new connection per message.
+    """
 
     channel_type = NotificationChannel.EMAIL
 
@@ -37,16 +42,7 @@ class EmailChannel(NotificationChannelBase):
         message = self._create_message(notification, recipients)
 
         try:
-            await aiosmtplib.send(
-                message,
-                hostname=settings.smtp_host,
-                port=settings.smtp_port,
-                username=settings.smtp_username or None,
-                password=settings.smtp_password or None,
-                use_tls=settings.smtp_use_tls,
-                start_tls=settings.smtp_use_tls and not settings.smtp_use_ssl,
-                timeout=settings.smtp_timeout,
-            )
+            await get_smtp_pool().send_message(message)
             logger.info(f"Email sent for notification {notification.id} to {recipients}")
             return True
         except aiosmtplib.SMTPException as e:
@@ -516,16 +512,7 @@ CaeliCrawler - Automatische Datenquellen-Überwachung
     message.attach(MIMEText(html_content, "html", "utf-8"))
 
     try:
-        await aiosmtplib.send(
-            message,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username or None,
-            password=settings.smtp_password or None,
-            use_tls=settings.smtp_use_tls,
-            start_tls=settings.smtp_use_tls and not settings.smtp_use_ssl,
-            timeout=settings.smtp_timeout,
-        )
+        await get_smtp_pool().send_message(message)
         logger.info(f"Verification email sent to {email}")
         return True
     except aiosmtplib.SMTPException as e:
@@ -0,0 +1,231 @@
+"""Pooled SMTP sessions for email delivery.
+
+``aiosmtplib.send`` opens a new session (TCP, TLS, AUTH) for every message.
+The pool keeps up to ``smtp_pool_size`` authenticated sessions per SMTP
+server open and sends consecutive messages over them:
+
+- Idle sessions are reused last-in-first-out, so the warmest one goes first
+- A session is closed with QUIT after ``smtp_max_messages_per_connection``
+  messages (provider limits per session)
+- A reused session that the server closed in the meantime (idle timeout)
+  is replaced transparently, the message is sent once more on a new one
+- ``smtp_max_messages_per_second`` is enforced per server with a token
+  bucket before a session is taken
+
+Pools are kept per worker process, server and event loop: asyncio
+connections cannot outlive the loop they were opened in.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from email.message import Message
+
+import aiosmtplib
+
+from app.config import settings
+from app.monitoring.metrics import smtp_connections_opened_total, smtp_messages_total
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SmtpServer:
+    """Connection settings of one SMTP server."""
+
+    hostname: str
+    port: int
+    username: str | None = None
+    password: str | None = None
+    use_tls: bool = False  # Implicit TLS (SMTPS, usually port 465)
+    start_tls: bool = False  # STARTTLS upgrade after connect (usually port 587)
+    timeout: float = 30
+
+    @classmethod
+    def from_settings(cls) -> "SmtpServer":
+        """SMTP server from the application settings."""
+        return cls(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_username or None,
+            password=settings.smtp_password or None,
+            use_tls=settings.smtp_use_ssl,
+            start_tls=settings.smtp_use_tls and not settings.smtp_use_ssl,
+            timeout=settings.smtp_timeout,
+        )
+
+    @property
+    def name(self) -> str:
+        """Server label for logs and metrics."""
+        return f"{self.hostname}:{self.port}"
+
+
+class SmtpRateLimiter:
+    """Token bucket limiting the messages per second sent to one server."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Wait for a token. Returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        # Waiting callers queue on the lock, so tokens are handed out in order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+@dataclass
+class _Session:
+    client: aiosmtplib.SMTP
+    messages: int = 0
+
+
+class SmtpConnectionPool:
+    """Authenticated SMTP sessions to one server, shared by all senders of an event loop."""
+
+    def __init__(
+        self,
+        server: SmtpServer,
+        size: int,
+        max_messages_per_connection: int,
+        max_messages_per_second: float,
+    ):
+        self.server = server
+        self.size = max(1, size)
+        self.max_messages_per_connection = max(1, max_messages_per_connection)
+        self.limiter = SmtpRateLimiter(max_messages_per_second)
+        self.loop = asyncio.get_running_loop()
+        self._idle: list[_Session] = []
+        self._slots = asyncio.Semaphore(self.size)
+        self.connections_opened = 0
+        self.messages_sent = 0
+
+    async def _connect(self) -> _Session:
+        client = aiosmtplib.SMTP(
+            hostname=self.server.hostname,
+            port=self.server.port,
+            username=self.server.username,
+            password=self.server.password,
+            use_tls=self.server.use_tls,
+            start_tls=self.server.start_tls,
+            timeout=self.server.timeout,
+        )
+        # Connects, upgrades to TLS and logs in
+        await client.connect()
+        self.connections_opened += 1
+        smtp_connections_opened_total.labels(server=self.server.name).inc()
+        return _Session(client)
+
+    async def _release(self, session: _Session) -> None:
+        session.messages += 1
+        if session.messages < self.max_messages_per_connection:
+            self._idle.append(session)
+            return
+        try:
+            await session.client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            session.client.close()
+
+    async def send_message(self, message: Message) -> None:
+        """
+        Send a message over a pooled session.
+
+        Raises:
+            aiosmtplib.SMTPException: The server rejected the message or
+                the connection failed
+        """
+        await self.limiter.acquire()
+        async with self._slots:
+            session = self._idle.pop() if self._idle else None
+            if session is not None and not session.client.is_connected:
+                session = None
+
+            try:
+                if session is None:
+                    session = await self._connect()
+                    await session.client.send_message(message)
+                else:
+                    try:
+                        await session.client.send_message(message)
+                    except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+                        # The server closed the idle session, retry once on a new one
+                        session.client.close()
+                        session = await self._connect()
+                        await session.client.send_message(message)
+            except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPResponseException):
+                # Rejected message (the session was reset and stays usable) or failed login
+                usable = session is not None and session.client.is_connected
+                smtp_messages_total.labels(server=self.server.name, result="rejected" if usable else "error").inc()
+                if usable:
+                    await self._release(session)
+                raise
+            except BaseException:
+                smtp_messages_total.labels(server=self.server.name, result="error").inc()
+                if session is not None:
+                    session.client.close()
+                raise
+
+            self.messages_sent += 1
+            smtp_messages_total.labels(server=self.server.name, result="sent").inc()
+            await self._release(session)
+
+    async def close(self) -> None:
+        """Close all idle sessions with QUIT."""
+        idle, self._idle = self._idle, []
+        for session in idle:
+            try:
+                await session.client.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                session.client.close()
+
+
+# Pools of this process by server (replaced when the event loop changes)
+_pools: dict[SmtpServer, SmtpConnectionPool] = {}
+
+
+def get_smtp_pool(server: SmtpServer | None = None) -> SmtpConnectionPool:
+    """
+    Get the pool of an SMTP server for the running event loop.
+
+    Args:
+        server: SMTP server (default: from settings)
+
+    Returns:
+        Connection pool
+    """
+    server = server or SmtpServer.from_settings()
+    pool = _pools.get(server)
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        pool = SmtpConnectionPool(
+            server,
+            size=settings.smtp_pool_size,
+            max_messages_per_connection=settings.smtp_max_messages_per_connection,
+            max_messages_per_second=settings.smtp_max_messages_per_second,
+        )
+        _pools[server] = pool
+    return pool
+
+
+async def close_smtp_pools() -> None:
+    """Close the sessions of all pools opened in the running event loop."""
+    loop = asyncio.get_running_loop()
+    for server, pool in list(_pools.items()):
+        if pool.loop is loop:
+            await pool.close()
+            del _pools[server]
@@ -1,13 +1,13 @@
 """Event dispatcher for matching events to notification rules."""
 
 import logging
+import time
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models.notification import (
     Notification,
@@ -15,8 +15,9 @@ from app.models.notification import (
     NotificationStatus,
 )
 from app.models.notification_rule import NotificationRule
-from app.models.user import User
+from app.monitoring.metrics import notification_dispatch_seconds
 from app.services.notification_broadcast import notification_broadcaster
+from services.notifications.rule_index import CompiledRule, get_rule_index
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +26,8 @@ class NotificationEventDispatcher:
     """Dispatches events to matching notification rules.
 
     This service is responsible for:
-    1. Finding all active rules that match an event type
-    2. Evaluating rule conditions against event payload
+    1. Finding all active rules that match an event type (compiled rule index)
+    2. Evaluating the remaining rule conditions against event payload
     3. Creating notification records for matching rules
     """
 
@@ -46,8 +47,22 @@ class NotificationEventDispatcher:
         Returns:
             List of created notification IDs
         """
-        # Find all active rules matching this event type
-        rules = await self._find_matching_rules(session, event_type)
+        start = time.perf_counter()
+        try:
+            return await self._dispatch(session, event_type, payload)
+        finally:
+            notification_dispatch_seconds.labels(event_type=event_type.value).observe(time.perf_counter() - start)
+
+    async def _dispatch(
+        self,
+        session: AsyncSession,
+        event_type: NotificationEventType,
+        payload: dict[str, Any],
+    ) -> list[str]:
+        """Match the event against the rule index and create the notifications."""
+        # Event type, category, source and keywords are resolved by the index
+        index = await get_rule_index(session)
+        rules = [rule for rule in index.match(event_type, payload) if self._matches_conditions(rule, payload)]
 
         if not rules:
             logger.debug(f"No matching rules for event {event_type.value}")
@@ -57,18 +72,19 @@ class NotificationEventDispatcher:
         created_notifications: list[Notification] = []
 
         for rule in rules:
-            # Check if payload matches rule conditions
-            if not self._matches_conditions(rule, payload):
-                continue
-
             # Create notification
             notification = await self._create_notification(session, rule, event_type, payload)
             notification_ids.append(str(notification.id))
             created_notifications.append(notification)
 
-            # Update rule statistics
-            rule.trigger_count += 1
-            rule.last_triggered = datetime.now(UTC)
+        # Update rule statistics. A Core statement on the table: statistics
+        # must not bump the rule version and force an index rebuild.
+        rules_table = NotificationRule.__table__
+        await session.execute(
+            update(rules_table)
+            .where(rules_table.c.id.in_([rule.id for rule in rules]))
+            .values(trigger_count=rules_table.c.trigger_count + 1, last_triggered=datetime.now(UTC))
+        )
 
         await session.commit()
 
@@ -100,35 +116,7 @@ class NotificationEventDispatcher:
             "created_at": notification.created_at.isoformat() if notification.created_at else None,
         }
 
-    async def _find_matching_rules(
-        self,
-        session: AsyncSession,
-        event_type: NotificationEventType,
-    ) -> list[NotificationRule]:
-        """Find all active rules matching the event type.
-
-        Args:
-            session: Database session
-            event_type: Event type to match
-
-        Returns:
-            List of matching rules
-        """
-        query = (
-            select(NotificationRule)
-            .options(selectinload(NotificationRule.user))
-            .where(
-                NotificationRule.event_type == event_type,
-                NotificationRule.is_active.is_(True),
-            )
-            .join(User)
-            .where(User.notifications_enabled.is_(True), User.is_active.is_(True))
-        )
-
-        result = await session.execute(query)
-        return list(result.scalars().all())
-
-    def _matches_conditions(self, rule: NotificationRule, payload: dict[str, Any]) -> bool:
+    def _matches_conditions(self, rule: NotificationRule | CompiledRule, payload: dict[str, Any]) -> bool:
         """Check if payload matches rule conditions.
 
         Args:
@@ -213,7 +201,7 @@ class NotificationEventDispatcher:
     async def _create_notification(
         self,
         session: AsyncSession,
-        rule: NotificationRule,
+        rule: CompiledRule,
         event_type: NotificationEventType,
         payload: dict[str, Any],
     ) -> Notification:
@@ -1,5 +1,6 @@
 """Main notification service for managing notifications."""
 
+import asyncio
 import logging
 from datetime import UTC, datetime
 from typing import Any
@@ -108,7 +109,92 @@ class NotificationService:
 
         # Send via channel
         success = await channel.send(notification, config)
+        self._apply_send_result(notification, success)
 
+        await self.session.commit()
+
+        logger.info(f"Notification {notification_id} send {'succeeded' if success else 'failed'}")
+        return success
+
+    async def send_notifications(
+        self,
+        notification_ids: list[str] | None = None,
+        limit: int | None = None,
+    ) -> dict[str, int]:
+        """Send a batch of pending notifications.
+
+        The batch is claimed with one locking query (rows locked by another
+        worker are skipped) and marked as queued in one commit. All messages
+        are then sent concurrently, emails over the pooled SMTP sessions, and
+        the results are stored in a second commit.
+
+        Args:
+            notification_ids: IDs to send (None: the oldest pending notifications
+                without failed attempts)
+            limit: Maximum number of notifications (default: notification_batch_size)
+
+        Returns:
+            Counts of sent and failed notifications
+        """
+        if notification_ids is not None and not notification_ids:
+            return {"sent": 0, "failed": 0}
+
+        query = (
+            select(Notification)
+            .options(selectinload(Notification.rule))
+            .where(Notification.status == NotificationStatus.PENDING)
+            .order_by(Notification.created_at.asc())
+            .limit(limit or (len(notification_ids) if notification_ids else settings.notification_batch_size))
+            .with_for_update(skip_locked=True, of=Notification)
+        )
+        if notification_ids:
+            query = query.where(Notification.id.in_([UUID(nid) for nid in notification_ids]))
+        else:
+            # Failed attempts are retried after a delay by get_failed_for_retry
+            query = query.where(Notification.retry_count == 0)
+
+        result = await self.session.execute(query)
+        notifications = list(result.scalars().all())
+        if not notifications:
+            return {"sent": 0, "failed": 0}
+
+        deliveries = []
+        failed = 0
+        for notification in notifications:
+            channel = self.channel_registry.get(notification.channel)
+            if not channel:
+                notification.status = NotificationStatus.FAILED
+                notification.error_message = f"Unknown channel: {notification.channel}"
+                failed += 1
+                continue
+            config = await self._build_channel_config(notification)
+            notification.status = NotificationStatus.QUEUED
+            deliveries.append((notification, channel, config))
+
+        # Release the row locks before talking to external servers
+        await self.session.commit()
+
+        results = await asyncio.gather(
+            *(channel.send(notification, config) for notification, channel, config in deliveries),
+            return_exceptions=True,
+        )
+
+        sent = 0
+        for (notification, _, _), outcome in zip(deliveries, results, strict=True):
+            success = outcome is True
+            if isinstance(outcome, BaseException):
+                logger.error(f"Failed to send notification {notification.id}: {outcome}")
+            self._apply_send_result(notification, success)
+            sent += success
+            failed += not success
+
+        await self.session.commit()
+
+        logger.info(f"Notification batch sent: {sent} sent, {failed} failed")
+        return {"sent": sent, "failed": failed}
+
+    def _apply_send_result(self, notification: Notification, success: bool) -> None:
+        """Store the outcome of a send attempt (retry until notification_retry_max)."""
         if success:
             notification.status = NotificationStatus.SENT
             notification.sent_at = datetime.now(UTC)
@@ -121,11 +207,6 @@ class NotificationService:
             else:
                 notification.status = NotificationStatus.PENDING
 
-        await self.session.commit()
-
-        logger.info(f"Notification {notification_id} send {'succeeded' if success else 'failed'}")
-        return success
-
     async def _build_channel_config(self, notification: Notification) -> dict[str, Any]:
         """Build channel-specific configuration for notification.
 
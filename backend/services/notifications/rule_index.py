@@ -0,0 +1,267 @@
+"""Compiled in-process index of the active notification rules.
+
+Dispatching an event used to load the rules of its event type from the
+database and check every keyword of every rule as a substring. The index
+replaces both:
+
+- Rules of active users with notifications enabled are loaded once and
+  bucketed by event type, then by category and source restriction.
+- The keywords of all rules are compiled into one Aho-Corasick automaton,
+  so the event text is scanned once regardless of the number of keywords.
+
+The index is stamped with the ``notification_rules`` data version (see
+app.core.data_versions), which is bumped in Redis after every commit that
+changes a rule or the notification settings of a user. A dispatch reads
+the version with the async client of its event loop (one non-blocking
+MGET) and rebuilds the index when it moved. Without Redis rule changes
+cannot be detected, so the index is built per event.
+"""
+
+import logging
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.data_versions import SCOPE_NOTIFICATION_RULES, read_data_versions
+from app.models.notification import NotificationChannel, NotificationEventType
+from app.models.notification_rule import NotificationRule
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Conditions resolved by the index; the remaining ones are checked per rule
+INDEXED_CONDITIONS = frozenset({"category_ids", "source_ids", "keywords"})
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton for case-insensitive substring matching of many keywords."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[str, ...]] = [()]
+
+        for keyword in {k.lower() for k in keywords if k}:
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = next_node
+            self._output[node] = (*self._output[node], keyword)
+
+        # Breadth-first: failure links point to the longest proper suffix in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> set[str]:
+        """Return all keywords occurring in the text (single pass)."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: set[str] = set()
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Snapshot of an active rule as needed to create its notifications."""
+
+    id: UUID
+    user_id: UUID
+    channel: NotificationChannel
+    # Conditions not resolved by the index (entity, confidence, location, status)
+    conditions: dict[str, Any]
+    # Lowercased keywords, empty if the rule has no keyword filter
+    keywords: frozenset[str]
+
+
+class _EventBucket:
+    """Rules of one event type with their category and source restrictions."""
+
+    def __init__(self):
+        self.rules: list[CompiledRule] = []
+        self.any_category: set[UUID] = set()
+        self.by_category: dict[str, set[UUID]] = defaultdict(set)
+        self.any_source: set[UUID] = set()
+        self.by_source: dict[str, set[UUID]] = defaultdict(set)
+        self.keyword_rules: set[UUID] = set()
+
+    def add(self, rule: CompiledRule, conditions: dict[str, Any]) -> None:
+        self.rules.append(rule)
+        for key, unrestricted, restricted in (
+            ("category_ids", self.any_category, self.by_category),
+            ("source_ids", self.any_source, self.by_source),
+        ):
+            if key in conditions:
+                # An empty list matches no event that names a category/source
+                for value in conditions[key] or ():
+                    restricted[str(value)].add(rule.id)
+            else:
+                unrestricted.add(rule.id)
+        if rule.keywords:
+            self.keyword_rules.add(rule.id)
+
+    def candidates(self, category_id: Any, source_id: Any) -> set[UUID]:
+        """Rules whose category and source restrictions admit the event."""
+        candidates = {rule.id for rule in self.rules}
+        # Events without a category/source pass every restriction
+        if category_id:
+            candidates &= self.any_category | self.by_category.get(str(category_id), set())
+        if source_id:
+            candidates &= self.any_source | self.by_source.get(str(source_id), set())
+        return candidates
+
+
+class NotificationRuleIndex:
+    """Active notification rules bucketed by event type with a shared keyword automaton."""
+
+    def __init__(
+        self, rules: Iterable[tuple[NotificationEventType, dict[str, Any], CompiledRule]], version: int | None
+    ):
+        self.version = version
+        self._buckets: dict[NotificationEventType, _EventBucket] = defaultdict(_EventBucket)
+        self._keyword_rules: dict[str, set[UUID]] = defaultdict(set)
+        self.rule_count = 0
+
+        for event_type, conditions, rule in rules:
+            self._buckets[event_type].add(rule, conditions)
+            for keyword in rule.keywords:
+                self._keyword_rules[keyword].add(rule.id)
+            self.rule_count += 1
+
+        self._automaton = KeywordAutomaton(self._keyword_rules)
+
+    @staticmethod
+    def compile_rule(
+        rule_id: UUID, user_id: UUID, channel: NotificationChannel, conditions: dict | None
+    ) -> CompiledRule:
+        """Split the conditions of a rule into indexed and residual ones."""
+        conditions = conditions or {}
+        keywords = frozenset(str(keyword).lower() for keyword in conditions.get("keywords") or ())
+        if "" in keywords:
+            # An empty keyword occurs in every text
+            keywords = frozenset()
+        return CompiledRule(
+            id=rule_id,
+            user_id=user_id,
+            channel=channel,
+            conditions={key: value for key, value in conditions.items() if key not in INDEXED_CONDITIONS},
+            keywords=keywords,
+        )
+
+    @classmethod
+    async def load(cls, session: AsyncSession, version: int | None) -> "NotificationRuleIndex":
+        """Build the index from all active rules of enabled, active users (one query)."""
+        result = await session.execute(
+            select(
+                NotificationRule.id,
+                NotificationRule.user_id,
+                NotificationRule.event_type,
+                NotificationRule.channel,
+                NotificationRule.conditions,
+            )
+            .join(User)
+            .where(
+                NotificationRule.is_active.is_(True),
+                User.notifications_enabled.is_(True),
+                User.is_active.is_(True),
+            )
+            .order_by(NotificationRule.created_at)
+        )
+        return cls(
+            (
+                (
+                    row.event_type,
+                    row.conditions or {},
+                    cls.compile_rule(row.id, row.user_id, row.channel, row.conditions),
+                )
+                for row in result.all()
+            ),
+            version,
+        )
+
+    def match(self, event_type: NotificationEventType, payload: dict[str, Any]) -> list[CompiledRule]:
+        """
+        Find the rules whose event type, category, source and keyword conditions match.
+
+        The residual conditions of the returned rules still have to be checked.
+        """
+        bucket = self._buckets.get(event_type)
+        if bucket is None:
+            return []
+
+        candidates = bucket.candidates(payload.get("category_id"), payload.get("source_id"))
+        keyword_candidates = candidates & bucket.keyword_rules
+        if keyword_candidates:
+            text = " ".join(
+                [
+                    str(payload.get("title", "")),
+                    str(payload.get("text", "")),
+                    str(payload.get("summary", "")),
+                ]
+            )
+            hits: set[UUID] = set()
+            for keyword in self._automaton.find(text):
+                hits |= self._keyword_rules[keyword]
+            candidates -= keyword_candidates - hits
+
+        return [rule for rule in bucket.rules if rule.id in candidates]
+
+
+# Global index instance (rebuilt when the rule version changes)
+_rule_index: NotificationRuleIndex | None = None
+
+
+def set_rule_index(index: NotificationRuleIndex | None) -> None:
+    """Set the global rule index (None forces a rebuild on the next dispatch)."""
+    global _rule_index
+    _rule_index = index
+
+
+async def get_rule_index(session: AsyncSession) -> NotificationRuleIndex:
+    """
+    Get the rule index, rebuilding it if the rules changed.
+
+    Args:
+        session: Database session used for a rebuild
+
+    Returns:
+        Current rule index
+    """
+    global _rule_index
+
+    # Read the version before loading: a change during the rebuild moves it again
+    versions = await read_data_versions([SCOPE_NOTIFICATION_RULES])
+    if versions is None:
+        return await NotificationRuleIndex.load(session, None)
+    version = versions[SCOPE_NOTIFICATION_RULES]
+
+    index = _rule_index
+    if index is None or index.version != version:
+        index = await NotificationRuleIndex.load(session, version)
+        _rule_index = index
+        logger.info(f"Notification rule index built: {index.rule_count} rules (version {version})")
+    return index
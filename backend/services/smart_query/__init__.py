@@ -28,7 +28,18 @@ from uuid import UUID, uuid4
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.query_cache import get_cached_query, set_cached_query
+from app.core.query_cache import (
+    build_result_cache_key,
+    get_cached_plan,
+    get_cached_result,
+    get_query_cache_client,
+    get_similar_cached_plan,
+    may_have_similar_plan,
+    result_cache_ttl,
+    set_cached_plan,
+    set_cached_result,
+)
+from app.utils.similarity import generate_embedding
 
 from .ai_generation import (
     ai_generate_category_config,
@@ -57,7 +68,7 @@ from .geographic_utils import (
     expand_search_terms,
     resolve_geographic_alias,
 )
-from .query_executor import execute_smart_query
+from .query_executor import execute_smart_query, get_query_data_scopes
 from .query_interpreter import (
     detect_compound_query,
     interpret_plan_query,
@@ -321,7 +332,10 @@ async def smart_query(
     4. If read: interprets the question and executes the query
     5. Returns structured results
 
-    Performance: Read-only queries are cached in Redis for 5 minutes.
+    Performance: Read-only queries use a two-level Redis cache (see
+    app.core.query_cache): interpretations are cached per normalized or
+    paraphrased question (skipping the LLM), results per interpretation and
+    data version (invalidated exactly by writes).
 
     Args:
         session: Database session
@@ -331,12 +345,19 @@ async def smart_query(
         mode: Optional mode override ("plan" for Plan Mode)
         conversation_history: Optional conversation history for Plan Mode
     """
-    # Check Redis cache for read-only queries (not plan mode, not write)
-    if mode != "plan" and not allow_write:
-        cached_result = await get_cached_query(question)
-        if cached_result:
-            logger.info("Smart query cache hit", question=question[:50])
-            return cached_result
+    # Read-only queries (not plan mode, not write) use the plan and result cache
+    use_cache = mode != "plan" and not allow_write and get_query_cache_client() is not None
+    query_params = None
+    question_embedding = None
+    if use_cache:
+        query_params = await get_cached_plan(question)
+        # Embed only if a known question shares the numbers, regions and names
+        if query_params is None and may_have_similar_plan(question):
+            question_embedding = await generate_embedding(question, session=session)
+            query_params = await get_similar_cached_plan(question, question_embedding)
+        if query_params is not None:
+            logger.info("Smart query plan cache hit", question=question[:50])
+            return await _execute_read_query(session, question, query_params, use_cache=True)
 
     # Plan Mode - interactive assistant for prompt formulation
     if mode == "plan":
@@ -409,6 +430,30 @@ async def smart_query(
         interpretation=query_params,
     )
 
+    if use_cache:
+        if question_embedding is None:
+            question_embedding = await generate_embedding(question, session=session)
+        await set_cached_plan(question, query_params, question_embedding)
+
+    return await _execute_read_query(session, question, query_params, use_cache=use_cache)
+
+
+async def _execute_read_query(
+    session: AsyncSession,
+    question: str,
+    query_params: dict[str, Any],
+    use_cache: bool,
+) -> dict[str, Any]:
+    """Execute an interpreted read query (served from the result cache if possible)."""
+    result_key = None
+    if use_cache:
+        result_key = await build_result_cache_key(query_params, await get_query_data_scopes(session, query_params))
+        cached_result = await get_cached_result(result_key)
+        if cached_result:
+            logger.info("Smart query result cache hit", question=question[:50])
+            cached_result["original_question"] = question
+            return cached_result
+
     # Execute the single query
     results = await execute_smart_query(session, query_params)
 
@@ -442,7 +487,9 @@ async def smart_query(
     entity_type = query_params.get("primary_entity_type", "Ergebnisse")
 
     if total == 0:
-        results["message"] = f"Keine Ergebnisse gefunden für: {explanation}" if explanation else "Keine Ergebnisse gefunden."
+        results["message"] = (
+            f"Keine Ergebnisse gefunden für: {explanation}" if explanation else "Keine Ergebnisse gefunden."
+        )
     elif total == 1:
         # Single result - show item details if available
         first_item = items[0] if items else {}
@@ -456,8 +503,8 @@ async def smart_query(
         results["message"] = f"{total} Ergebnisse gefunden."
 
     # Cache successful read-only queries
-    if not allow_write and mode != "plan":
-        await set_cached_query(question, results)
+    if use_cache:
+        await set_cached_result(result_key, results, ttl=result_cache_ttl(query_params))
 
     return results
 
@@ -7,9 +7,19 @@ from typing import Any
 from uuid import UUID
 
 import structlog
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.data_versions import (
+    SCOPE_ALL_ENTITY_TYPES,
+    SCOPE_ALL_FACET_TYPES,
+    SCOPE_ENTITIES,
+    SCOPE_FACET_VALUES,
+    SCOPE_RELATIONS,
+    SCOPE_SCHEMA,
+    entity_type_scope,
+    facet_type_scope,
+)
 from app.models import (
     Entity,
     EntityRelation,
@@ -27,6 +37,64 @@ from .relation_resolver import (
 logger = structlog.get_logger()
 
 
+def _reads_works_for(query_params: dict[str, Any]) -> bool:
+    """Whether a list query enriches its items with works_for relations."""
+    return query_params.get("primary_entity_type", "person") == "person" or (
+        query_params.get("result_grouping") == "by_event"
+    )
+
+
+async def get_query_data_scopes(
+    session: AsyncSession,
+    query_params: dict[str, Any],
+) -> set[str]:
+    """
+    Determine the data version scopes read by execute_smart_query().
+
+    Used to key cached results (see app.core.query_cache): a cached result is
+    valid as long as none of these scopes received a write.
+
+    - always: schema and the primary entity type
+    - facet types: each requested facet type (incl. negative facets)
+    - list queries of persons or grouped by event: all entities and relations
+      (works_for enrichment with the target entity)
+    - aggregates: all facet values (facet counts / group by facet type)
+    - relation chains: all entities, relations and facet values (hop filters)
+    """
+    scopes = {SCOPE_SCHEMA, SCOPE_ALL_ENTITY_TYPES}
+
+    facet_slugs = {
+        *query_params.get("facet_types", []),
+        *query_params.get("negative_facet_types", []),
+        *query_params.get("target_facets_at_chain_end", []),
+        *query_params.get("negative_facets_at_chain_end", []),
+    }
+    if facet_slugs:
+        scopes.add(SCOPE_ALL_FACET_TYPES)
+
+    query_type = query_params.get("query_type", "list")
+    if query_type == "aggregate":
+        scopes.add(SCOPE_FACET_VALUES)
+    elif query_type != "count" and _reads_works_for(query_params):
+        scopes.update({SCOPE_ENTITIES, SCOPE_RELATIONS})
+
+    if parse_relation_chain_from_query(query_params):
+        scopes.update({SCOPE_ENTITIES, SCOPE_RELATIONS, SCOPE_FACET_VALUES})
+
+    # Resolve slugs to IDs (versions are tracked per type ID) in one round trip
+    primary_type = query_params.get("primary_entity_type", "person")
+    type_ids = select(literal("entity_type").label("kind"), EntityType.id).where(EntityType.slug == primary_type)
+    if facet_slugs:
+        type_ids = type_ids.union_all(
+            select(literal("facet_type").label("kind"), FacetType.id).where(FacetType.slug.in_(facet_slugs))
+        )
+    result = await session.execute(type_ids)
+    for kind, type_id in result.all():
+        scopes.add(entity_type_scope(type_id) if kind == "entity_type" else facet_type_scope(type_id))
+
+    return scopes
+
+
 async def execute_smart_query(
     session: AsyncSession,
     query_params: dict[str, Any],
@@ -319,9 +387,11 @@ async def execute_smart_query(
     # Calculate time boundary (use timezone-aware UTC)
     now = datetime.now(UTC)
 
-    # Get relation types for enrichment
-    works_for_result = await session.execute(select(RelationType).where(RelationType.slug == "works_for"))
-    works_for_type = works_for_result.scalar_one_or_none()
+    # Get relation types for enrichment (only read where items show them, see get_query_data_scopes)
+    works_for_type = None
+    if _reads_works_for(query_params):
+        works_for_result = await session.execute(select(RelationType).where(RelationType.slug == "works_for"))
+        works_for_type = works_for_result.scalar_one_or_none()
 
     # ==========================================================================
     # BULK LOADING - Avoid N+1 queries by loading all data upfront
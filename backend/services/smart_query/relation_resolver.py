@@ -6,15 +6,18 @@ Enables complex queries like:
 - "Organisationen mit Mitarbeitern die Events besucht haben"
 """
 
+import time
 from collections import defaultdict
-from datetime import datetime
+from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
 
 import structlog
-from sqlalchemy import or_, select
+from sqlalchemy import ColumnElement, literal, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.core.data_versions import SCOPE_SCHEMA, read_data_versions
 from app.core.exceptions import RelationDepthError
 from app.models import (
     Entity,
@@ -30,9 +33,12 @@ logger = structlog.get_logger()
 # Maximum depth for relation traversal (prevents infinite loops and performance issues)
 MAX_RELATION_DEPTH = 3
 
-# Cache TTL in seconds (5 minutes)
+# Cache TTL in seconds (5 minutes, safety net if Redis is unavailable)
 CACHE_TTL = 300
 
+# Seconds between checks of the schema data version
+SCHEMA_VERSION_CHECK_SECONDS = 5
+
 
 class RelationHop:
     """Represents a single hop in a relation chain."""
@@ -69,259 +75,257 @@ class RelationChain:
         return f"RelationChain({' -> '.join(str(h) for h in self.hops)})"
 
 
-class RelationResolver:
-    """Service for resolving multi-hop relations in queries."""
+@dataclass(frozen=True)
+class CatalogType:
+    """Lightweight, session-independent entry of the type catalog."""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
-        self._relation_type_cache: dict[str, RelationType] = {}
-        self._facet_type_cache: dict[str, FacetType] = {}
-        self._entity_type_cache: dict[str, EntityType] = {}
-        self._cache_timestamp: datetime | None = None
+    id: UUID
+    slug: str
+    name: str
 
-    async def _ensure_cache(self) -> None:
-        """Ensure caches are populated and not stale."""
-        now = datetime.utcnow()
-        if self._cache_timestamp and (now - self._cache_timestamp).seconds < CACHE_TTL:
-            return
 
-        # Load relation types
-        result = await self.session.execute(select(RelationType).where(RelationType.is_active.is_(True)))
-        self._relation_type_cache = {rt.slug: rt for rt in result.scalars().all()}
+class TypeCatalog:
+    """
+    Process-wide catalog of active relation, facet and entity types.
 
-        # Load facet types
-        result = await self.session.execute(select(FacetType).where(FacetType.is_active.is_(True)))
-        self._facet_type_cache = {ft.slug: ft for ft in result.scalars().all()}
+    Loaded in a single query and shared by all RelationResolver instances,
+    so resolving a chain does not reload the types on every request. Type
+    changes in any process bump the schema data version, which is checked
+    at most every SCHEMA_VERSION_CHECK_SECONDS.
+    """
 
-        # Load entity types
-        result = await self.session.execute(select(EntityType).where(EntityType.is_active.is_(True)))
-        self._entity_type_cache = {et.slug: et for et in result.scalars().all()}
+    def __init__(self, ttl_seconds: int = CACHE_TTL):
+        self.ttl_seconds = ttl_seconds
+        self.relation_types: dict[str, CatalogType] = {}
+        self.facet_types: dict[str, CatalogType] = {}
+        self.entity_types: dict[str, CatalogType] = {}
+        self._loaded_at: float | None = None
+        self._schema_version: int | None = None
+        self._version_checked_at: float | None = None
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def _schema_changed(self) -> bool:
+        now = time.monotonic()
+        if now - max(self._version_checked_at or 0, self._loaded_at or 0) < SCHEMA_VERSION_CHECK_SECONDS:
+            return False
+        self._version_checked_at = now
+        versions = await read_data_versions([SCOPE_SCHEMA])
+        # Without Redis the TTL applies
+        return versions is not None and versions[SCOPE_SCHEMA] != self._schema_version
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        """Load the catalog if it is empty, expired or the schema changed."""
+        if self.is_fresh() and not await self._schema_changed():
+            return
 
-        self._cache_timestamp = now
+        # Read before loading: a type change during the load triggers the next reload
+        versions = await read_data_versions([SCOPE_SCHEMA])
+
+        catalogs: dict[str, dict[str, CatalogType]] = {"relation_type": {}, "facet_type": {}, "entity_type": {}}
+        statement = union_all(
+            *(
+                select(literal(kind).label("kind"), model.id, model.slug, model.name).where(model.is_active.is_(True))
+                for kind, model in (
+                    ("relation_type", RelationType),
+                    ("facet_type", FacetType),
+                    ("entity_type", EntityType),
+                )
+            )
+        )
+        result = await session.execute(statement)
+        for kind, type_id, slug, name in result.all():
+            catalogs[kind][slug] = CatalogType(id=type_id, slug=slug, name=name)
+
+        self.relation_types = catalogs["relation_type"]
+        self.facet_types = catalogs["facet_type"]
+        self.entity_types = catalogs["entity_type"]
+        self._schema_version = versions[SCOPE_SCHEMA] if versions is not None else None
+        self._loaded_at = self._version_checked_at = time.monotonic()
         logger.debug(
-            "Relation resolver cache refreshed",
-            relation_types=len(self._relation_type_cache),
-            facet_types=len(self._facet_type_cache),
-            entity_types=len(self._entity_type_cache),
+            "Relation resolver type catalog refreshed",
+            relation_types=len(self.relation_types),
+            facet_types=len(self.facet_types),
+            entity_types=len(self.entity_types),
         )
 
-    async def resolve_relation_chain(
-        self,
-        starting_entity_ids: list[UUID],
-        chain: RelationChain,
-    ) -> tuple[list[UUID], dict[UUID, list[dict[str, Any]]]]:
-        """Resolve a relation chain starting from a set of entities.
+    def invalidate(self) -> None:
+        self._loaded_at = None
 
-        Args:
-            starting_entity_ids: List of entity IDs to start from
-            chain: The relation chain to follow
 
-        Returns:
-            Tuple of:
-            - List of final entity IDs after traversing the chain
-            - Dict mapping each final entity ID to its traversal path
-        """
-        await self._ensure_cache()
+# Global catalog instance
+_type_catalog = TypeCatalog()
 
-        if not starting_entity_ids:
-            return [], {}
 
-        current_ids = set(starting_entity_ids)
-        paths: dict[UUID, list[dict[str, Any]]] = {eid: [{"entity_id": eid, "hop": 0}] for eid in starting_entity_ids}
+def get_type_catalog() -> TypeCatalog:
+    """Get the process-wide type catalog."""
+    return _type_catalog
 
-        for hop_index, hop in enumerate(chain.hops):
-            logger.debug(
-                "Processing relation hop",
-                hop_index=hop_index,
-                hop=str(hop),
-                current_count=len(current_ids),
-            )
 
-            next_ids, new_paths = await self._resolve_single_hop(current_ids, hop, paths, hop_index + 1)
+def invalidate_type_catalog() -> None:
+    """Invalidate the type catalog of this process.
 
-            if not next_ids:
-                logger.debug("No entities found after hop", hop_index=hop_index)
-                return [], {}
+    Type changes reach all processes through the schema data version; this
+    forces the reload without waiting for the next version check.
+    """
+    _type_catalog.invalidate()
 
-            current_ids = next_ids
-            paths = new_paths
 
-        return list(current_ids), paths
+def _facet_exists(entity_id: ColumnElement, facet_type_ids: list[UUID]) -> ColumnElement[bool]:
+    """EXISTS condition: entity has an active facet value of one of the facet types."""
+    return (
+        select(FacetValue.id)
+        .where(
+            FacetValue.entity_id == entity_id,
+            FacetValue.facet_type_id.in_(facet_type_ids),
+            FacetValue.is_active.is_(True),
+        )
+        .exists()
+    )
 
-    async def _resolve_single_hop(
-        self,
-        entity_ids: set[UUID],
-        hop: RelationHop,
-        current_paths: dict[UUID, list[dict[str, Any]]],
-        hop_number: int,
-    ) -> tuple[set[UUID], dict[UUID, list[dict[str, Any]]]]:
-        """Resolve a single hop in the relation chain.
 
-        Args:
-            entity_ids: Current set of entity IDs
-            hop: The hop to resolve
-            current_paths: Current traversal paths
-            hop_number: The hop number (1-based)
+class RelationResolver:
+    """Service for resolving multi-hop relations in queries.
 
-        Returns:
-            Tuple of new entity IDs and updated paths
+    A relation chain is compiled into one statement: every hop joins another
+    alias of entity_relations onto the previous hop, and hop filters are pushed
+    into the join as EXISTS conditions. Postgres resolves the whole chain in a
+    single round trip.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._relation_type_cache: dict[str, CatalogType] = {}
+        self._facet_type_cache: dict[str, CatalogType] = {}
+        self._entity_type_cache: dict[str, CatalogType] = {}
+
+    async def _ensure_cache(self) -> None:
+        """Ensure the process-wide type catalog is loaded and bind it to this resolver."""
+        catalog = get_type_catalog()
+        await catalog.ensure_loaded(self.session)
+        self._relation_type_cache = catalog.relation_types
+        self._facet_type_cache = catalog.facet_types
+        self._entity_type_cache = catalog.entity_types
+
+    def _facet_type_ids(self, slugs: list[str]) -> list[UUID]:
+        """Map facet type slugs to IDs (unknown slugs are ignored)."""
+        return [self._facet_type_cache[slug].id for slug in slugs if slug in self._facet_type_cache]
+
+    def _hop_conditions(self, entity_id: ColumnElement, hop: RelationHop) -> list[ColumnElement[bool]]:
+        """Build the filter conditions of a hop for the entity reached by it.
+
+        The reached entity must be active, whatever filters the hop has.
         """
-        relation_type = self._relation_type_cache.get(hop.relation_type_slug)
-        if not relation_type:
-            logger.warning(
-                "Unknown relation type",
-                relation_type_slug=hop.relation_type_slug,
-            )
-            return set(), {}
-
-        # Build query based on direction
-        if hop.direction == "source":
-            # Following from source to target: entity_ids are sources, we want targets
-            query = select(EntityRelation).where(
-                EntityRelation.relation_type_id == relation_type.id,
-                EntityRelation.source_entity_id.in_(entity_ids),
-                EntityRelation.is_active.is_(True),
-            )
-            source_field = "source_entity_id"
-            target_field = "target_entity_id"
-        else:
-            # Following from target to source: entity_ids are targets, we want sources
-            query = select(EntityRelation).where(
-                EntityRelation.relation_type_id == relation_type.id,
-                EntityRelation.target_entity_id.in_(entity_ids),
-                EntityRelation.is_active.is_(True),
-            )
-            source_field = "target_entity_id"
-            target_field = "source_entity_id"
-
-        result = await self.session.execute(query)
-        relations = result.scalars().all()
-
-        if not relations:
-            return set(), {}
-
-        # Collect next entity IDs
-        next_ids: set[UUID] = set()
-        entity_mapping: dict[UUID, set[UUID]] = defaultdict(set)  # source -> targets
-
-        for rel in relations:
-            source_id = getattr(rel, source_field)
-            target_id = getattr(rel, target_field)
-            entity_mapping[source_id].add(target_id)
-            next_ids.add(target_id)
-
-        # Apply filters to next entities if specified
-        if hop.facet_filter or hop.negative_facet_filter or hop.position_filter or hop.location_filter:
-            next_ids = await self._apply_hop_filters(
-                next_ids,
-                facet_filter=hop.facet_filter,
-                negative_facet_filter=hop.negative_facet_filter,
-                position_filter=hop.position_filter,
-                location_filter=hop.location_filter,
+        hop_entity = aliased(Entity)
+        entity_conditions = [hop_entity.id == entity_id, hop_entity.is_active.is_(True)]
+        if hop.location_filter:
+            entity_conditions.append(hop_entity.admin_level_1 == hop.location_filter)
+        if hop.position_filter:
+            entity_conditions.append(
+                or_(*[hop_entity.core_attributes["position"].astext.ilike(f"%{pos}%") for pos in hop.position_filter])
             )
+        conditions: list[ColumnElement[bool]] = [select(hop_entity.id).where(*entity_conditions).exists()]
 
-        # Update paths
-        new_paths: dict[UUID, list[dict[str, Any]]] = {}
-        for source_id, targets in entity_mapping.items():
-            if source_id not in current_paths:
-                continue
-            for target_id in targets:
-                if target_id not in next_ids:
-                    continue  # Filtered out
-                if target_id not in new_paths:
-                    new_paths[target_id] = []
-                for path in current_paths[source_id]:
-                    new_path = path.copy()
-                    new_path.append(
-                        {
-                            "entity_id": target_id,
-                            "hop": hop_number,
-                            "relation_type": hop.relation_type_slug,
-                            "from_entity": source_id,
-                        }
-                    )
-                    new_paths[target_id].append(new_path)
+        if hop.facet_filter:
+            facet_type_ids = self._facet_type_ids([hop.facet_filter])
+            if facet_type_ids:
+                conditions.append(_facet_exists(entity_id, facet_type_ids))
+
+        if hop.negative_facet_filter:
+            facet_type_ids = self._facet_type_ids([hop.negative_facet_filter])
+            if facet_type_ids:
+                conditions.append(~_facet_exists(entity_id, facet_type_ids))
 
-        return next_ids, new_paths
+        return conditions
 
-    async def _apply_hop_filters(
+    def _compile_chain(self, chain: RelationChain) -> tuple[list[ColumnElement], list[ColumnElement[bool]]] | None:
+        """Compile a relation chain into join conditions.
+
+        Args:
+            chain: The relation chain to follow
+
+        Returns:
+            Tuple of (entity ID column per position - index 0 is the start entity,
+            WHERE conditions), or None if a relation type is unknown
+        """
+        entity_columns: list[ColumnElement] = []
+        conditions: list[ColumnElement[bool]] = []
+
+        for hop in chain.hops:
+            relation_type = self._relation_type_cache.get(hop.relation_type_slug)
+            if not relation_type:
+                logger.warning(
+                    "Unknown relation type",
+                    relation_type_slug=hop.relation_type_slug,
+                )
+                return None
+
+            relation = aliased(EntityRelation)
+            if hop.direction == "source":
+                # Following from source to target
+                from_column, to_column = relation.source_entity_id, relation.target_entity_id
+            else:
+                # Following from target to source
+                from_column, to_column = relation.target_entity_id, relation.source_entity_id
+
+            conditions.append(relation.relation_type_id == relation_type.id)
+            conditions.append(relation.is_active.is_(True))
+            if entity_columns:
+                conditions.append(from_column == entity_columns[-1])
+            else:
+                entity_columns.append(from_column)
+            entity_columns.append(to_column)
+            conditions.extend(self._hop_conditions(to_column, hop))
+
+        return entity_columns, conditions
+
+    async def resolve_relation_chain(
         self,
-        entity_ids: set[UUID],
-        facet_filter: str | None = None,
-        negative_facet_filter: str | None = None,
-        position_filter: list[str] | None = None,
-        location_filter: str | None = None,
-    ) -> set[UUID]:
-        """Apply additional filters to entities at a hop.
+        starting_entity_ids: list[UUID],
+        chain: RelationChain,
+    ) -> tuple[list[UUID], dict[UUID, list[dict[str, Any]]]]:
+        """Resolve a relation chain starting from a set of entities (one query).
 
         Args:
-            entity_ids: Current entity IDs
-            facet_filter: Only include entities with this facet type
-            negative_facet_filter: Exclude entities with this facet type
-            position_filter: Only include entities with one of these positions
-            location_filter: Only include entities in this admin_level_1
+            starting_entity_ids: List of entity IDs to start from
+            chain: The relation chain to follow
 
         Returns:
-            Filtered set of entity IDs
+            Tuple of:
+            - List of final entity IDs after traversing the chain
+            - Dict mapping each final entity ID to its traversal paths
         """
-        if not entity_ids:
-            return set()
+        await self._ensure_cache()
 
-        # Start with all entities
-        conditions = [
-            Entity.id.in_(entity_ids),
-            Entity.is_active.is_(True),
-        ]
+        if not starting_entity_ids or not chain.hops:
+            return [], {}
 
-        # Apply location filter
-        if location_filter:
-            conditions.append(Entity.admin_level_1 == location_filter)
-
-        # Apply position filter
-        if position_filter:
-            position_conditions = []
-            for pos in position_filter:
-                position_conditions.append(Entity.core_attributes["position"].astext.ilike(f"%{pos}%"))
-            if position_conditions:
-                conditions.append(or_(*position_conditions))
-
-        # Execute base query
-        query = select(Entity.id).where(*conditions)
-        result = await self.session.execute(query)
-        filtered_ids = {row[0] for row in result.fetchall()}
-
-        # Apply positive facet filter
-        if facet_filter and filtered_ids:
-            facet_type = self._facet_type_cache.get(facet_filter)
-            if facet_type:
-                fv_result = await self.session.execute(
-                    select(FacetValue.entity_id)
-                    .distinct()
-                    .where(
-                        FacetValue.entity_id.in_(filtered_ids),
-                        FacetValue.facet_type_id == facet_type.id,
-                        FacetValue.is_active.is_(True),
-                    )
-                )
-                filtered_ids = {row[0] for row in fv_result.fetchall()}
-
-        # Apply negative facet filter
-        if negative_facet_filter and filtered_ids:
-            neg_facet_type = self._facet_type_cache.get(negative_facet_filter)
-            if neg_facet_type:
-                neg_result = await self.session.execute(
-                    select(FacetValue.entity_id)
-                    .distinct()
-                    .where(
-                        FacetValue.entity_id.in_(filtered_ids),
-                        FacetValue.facet_type_id == neg_facet_type.id,
-                        FacetValue.is_active.is_(True),
-                    )
+        compiled = self._compile_chain(chain)
+        if compiled is None:
+            return [], {}
+        entity_columns, conditions = compiled
+
+        result = await self.session.execute(
+            select(*entity_columns).distinct().where(entity_columns[0].in_(starting_entity_ids), *conditions)
+        )
+
+        paths: dict[UUID, list[list[dict[str, Any]]]] = defaultdict(list)
+        for row in result.all():
+            path: list[dict[str, Any]] = [{"entity_id": row[0], "hop": 0}]
+            for hop_number, hop in enumerate(chain.hops, start=1):
+                path.append(
+                    {
+                        "entity_id": row[hop_number],
+                        "hop": hop_number,
+                        "relation_type": hop.relation_type_slug,
+                        "from_entity": row[hop_number - 1],
+                    }
                 )
-                exclude_ids = {row[0] for row in neg_result.fetchall()}
-                filtered_ids = filtered_ids - exclude_ids
+            paths[row[-1]].append(path)
 
-        return filtered_ids
+        logger.debug("Relation chain resolved", chain=str(chain), final_count=len(paths))
+        return list(paths), dict(paths)
 
     async def resolve_entities_with_related_facets(
         self,
@@ -382,24 +386,9 @@ class RelationResolver:
                 if pos_conditions:
                     conditions.append(or_(*pos_conditions))
 
-        # Get all primary entities
-        primary_result = await self.session.execute(select(Entity.id).where(*conditions))
-        primary_ids = [row[0] for row in primary_result.fetchall()]
-
-        if not primary_ids:
-            return []
-
-        logger.debug(
-            "Starting multi-hop resolution",
-            primary_type=primary_entity_type_slug,
-            primary_count=len(primary_ids),
-            hops=len(relation_chain),
-        )
-
-        # Build and resolve the relation chain
-        hops = []
-        for hop_config in relation_chain:
-            hop = RelationHop(
+        # Build the relation chain
+        hops = [
+            RelationHop(
                 relation_type_slug=hop_config.get("type", ""),
                 direction=hop_config.get("direction", "source"),
                 facet_filter=hop_config.get("facet_filter"),
@@ -407,76 +396,36 @@ class RelationResolver:
                 position_filter=hop_config.get("position_filter"),
                 location_filter=hop_config.get("location_filter"),
             )
-            hops.append(hop)
-
+            for hop_config in relation_chain
+        ]
         chain = RelationChain(hops)
 
-        # Resolve the chain to get final (related) entity IDs
-        final_ids, paths = await self.resolve_relation_chain(primary_ids, chain)
-
-        if not final_ids:
-            return []
-
-        # Filter final entities by facet requirements
-        if target_facet_types:
-            facet_type_ids = [
-                self._facet_type_cache[ft].id for ft in target_facet_types if ft in self._facet_type_cache
-            ]
-            if facet_type_ids:
-                fv_result = await self.session.execute(
-                    select(FacetValue.entity_id)
-                    .distinct()
-                    .where(
-                        FacetValue.entity_id.in_(final_ids),
-                        FacetValue.facet_type_id.in_(facet_type_ids),
-                        FacetValue.is_active.is_(True),
-                    )
-                )
-                final_ids = [row[0] for row in fv_result.fetchall()]
-
-        if negative_facet_types and final_ids:
-            neg_facet_type_ids = [
-                self._facet_type_cache[ft].id for ft in negative_facet_types if ft in self._facet_type_cache
-            ]
-            if neg_facet_type_ids:
-                neg_result = await self.session.execute(
-                    select(FacetValue.entity_id)
-                    .distinct()
-                    .where(
-                        FacetValue.entity_id.in_(final_ids),
-                        FacetValue.facet_type_id.in_(neg_facet_type_ids),
-                        FacetValue.is_active.is_(True),
-                    )
-                )
-                exclude_ids = {row[0] for row in neg_result.fetchall()}
-                final_ids = [eid for eid in final_ids if eid not in exclude_ids]
-
-        if not final_ids:
+        compiled = self._compile_chain(chain)
+        if compiled is None or not hops:
             return []
-
-        # Reverse-map: Find which primary entities lead to the qualifying final entities
-        final_ids_set = set(final_ids)
-        matching_primary_ids = []
-
-        for primary_id, path_list in paths.items():
-            # Check if any path ends at a qualifying final entity
-            for path in path_list:
-                if len(path) > 0:
-                    # The last entry in the path is the final entity
-                    last_hop = path[-1] if isinstance(path[-1], dict) else path
-                    final_entity_id = last_hop.get("entity_id") if isinstance(last_hop, dict) else path[-1]
-                    if final_entity_id in final_ids_set:
-                        matching_primary_ids.append(primary_id)
-                        break
-
-        # Deduplicate
-        matching_primary_ids = list(set(matching_primary_ids))
+        entity_columns, chain_conditions = compiled
+
+        # Facet requirements of the final (related) entities
+        final_entity = entity_columns[-1]
+        facet_type_ids = self._facet_type_ids(target_facet_types)
+        if facet_type_ids:
+            chain_conditions.append(_facet_exists(final_entity, facet_type_ids))
+        neg_facet_type_ids = self._facet_type_ids(negative_facet_types or [])
+        if neg_facet_type_ids:
+            chain_conditions.append(~_facet_exists(final_entity, neg_facet_type_ids))
+
+        # Primary entities, the chain and all filters in one statement
+        primary_entities = select(Entity.id).where(*conditions)
+        result = await self.session.execute(
+            select(entity_columns[0]).distinct().where(entity_columns[0].in_(primary_entities), *chain_conditions)
+        )
+        matching_primary_ids = [row[0] for row in result.all()]
 
         logger.info(
             "Multi-hop resolution complete",
             primary_type=primary_entity_type_slug,
+            hops=len(hops),
             matching_count=len(matching_primary_ids),
-            final_entities_with_facets=len(final_ids),
         )
 
         return matching_primary_ids
@@ -2,6 +2,7 @@
 
 This module provides services for managing user-defined dashboard summaries:
 - SummaryExecutor: Executes widget queries and caches results
+- WidgetExecutionPlanner: Deduplicates and parallelizes widget queries
 - SummaryExportService: Exports summaries to PDF and Excel
 - interpret_summary_prompt: Interprets prompts into widget configurations
 - check_relevance: Checks if updates are meaningful
@@ -32,9 +33,12 @@ from services.summaries.source_resolver import (
     resolve_all_sources_for_summary,
     resolve_sources_for_summary,
 )
+from services.summaries.widget_planner import WidgetExecutionPlanner, widget_query_fingerprint
 
 __all__ = [
     "SummaryExecutor",
+    "WidgetExecutionPlanner",
+    "widget_query_fingerprint",
     "SummaryExportService",
     "interpret_summary_prompt",
     "suggest_widgets_for_entity_type",
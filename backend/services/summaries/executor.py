@@ -4,16 +4,16 @@ Executes custom summaries by running queries for each widget
 and caching the results.
 """
 
-import asyncio
 import hashlib
 import json
+from collections import Counter
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
 import structlog
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
 from app.models import (
@@ -26,6 +26,13 @@ from app.models import (
     SummaryWidget,
 )
 from app.models.summary_execution import ExecutionStatus
+from services.summaries.input_fingerprint import compute_input_fingerprint
+from services.summaries.widget_planner import (
+    MAX_CONCURRENT_WIDGET_QUERIES,
+    WidgetExecutionPlanner,
+    WidgetQueryCache,
+    entity_scope_key,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -71,28 +78,55 @@ ALLOWED_SORT_FIELDS = frozenset(
 # Maximum limits for query execution to prevent resource exhaustion
 MAX_QUERY_LIMIT = 1000  # Maximum entities per widget query
 DEFAULT_QUERY_LIMIT = 100  # Default if not specified
-MAX_FACET_VALUES_PER_QUERY = 5000  # Maximum facet values per query
+MAX_FACET_VALUES_PER_QUERY = 5000  # Maximum facet values per facet type and query
 MAX_CACHED_DATA_SIZE_BYTES = 10_000_000  # 10MB limit for cached data
 
 # Query timeout settings (in seconds)
 QUERY_TIMEOUT_SECONDS = 30  # Individual query timeout
 WIDGET_EXECUTION_TIMEOUT_SECONDS = 60  # Total widget execution timeout
 
+# Entity columns of widget results (plain rows can be shared between sessions)
+ENTITY_RESULT_COLUMNS = (
+    Entity.id,
+    Entity.name,
+    Entity.core_attributes,
+    Entity.admin_level_1,
+    Entity.country,
+    Entity.latitude,
+    Entity.longitude,
+    Entity.parent_id,
+)
+
 
 class SummaryExecutor:
     """
     Executes custom summaries and caches results.
 
     The executor:
-    1. Loads the summary with all widgets
-    2. Executes queries for each widget
+    1. Loads the summary with all widgets and skips execution if its
+       input fingerprint is unchanged
+    2. Executes widget queries as a deduplicated, concurrent plan
     3. Optionally checks relevance (if enabled)
     4. Caches results in SummaryExecution
     5. Updates summary statistics
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        query_cache: WidgetQueryCache | None = None,
+    ):
+        """
+        Args:
+            session: Session for the execution record and sequential queries
+            session_factory: Optional factory for pooled sessions. When given,
+                independent widget queries run concurrently, each on its own session.
+            query_cache: Shared cache of entity scopes and facet values
+        """
         self.session = session
+        self.session_factory = session_factory
+        self.query_cache = query_cache
 
     async def execute_summary(
         self,
@@ -176,6 +210,38 @@ class SummaryExecutor:
                 return skipped_execution
             raise ValueError(f"Summary {summary_id} not found")
 
+        # Cheap input check: skip all widget queries if nothing they read has changed
+        input_fingerprint = await self._compute_input_fingerprint(summary)
+        if (
+            not force
+            and triggered_by != "manual"
+            and input_fingerprint is not None
+            and summary.last_data_hash is not None
+            and summary.last_input_fingerprint == input_fingerprint
+        ):
+            now = datetime.now(UTC)
+            skipped_execution = SummaryExecution(
+                summary_id=summary_id,
+                status=ExecutionStatus.SKIPPED,
+                triggered_by=triggered_by,
+                trigger_details=trigger_details,
+                relevance_score=0.0,
+                relevance_reason="Übersprungen: Keine Änderungen an Entitäten oder Facetten seit letzter Ausführung",
+                data_hash=summary.last_data_hash,
+                has_changes=False,
+                started_at=now,
+                completed_at=now,
+                duration_ms=0,
+            )
+            self.session.add(skipped_execution)
+            await self.session.commit()
+            logger.info(
+                "summary_execution_skipped_unchanged_inputs",
+                summary_id=str(summary_id),
+                triggered_by=triggered_by,
+            )
+            return skipped_execution
+
         # Create execution record
         execution = SummaryExecution(
             summary_id=summary_id,
@@ -188,41 +254,13 @@ class SummaryExecutor:
         await self.session.flush()
 
         try:
-            # Execute queries for all widgets
-            cached_data: dict[str, Any] = {}
-
-            for widget in summary.widgets:
-                widget_key = f"widget_{widget.id}"
-                try:
-                    # Execute with timeout to prevent long-running queries
-                    widget_data = await asyncio.wait_for(
-                        self._execute_widget_query(widget),
-                        timeout=WIDGET_EXECUTION_TIMEOUT_SECONDS,
-                    )
-                    cached_data[widget_key] = widget_data
-                except TimeoutError:
-                    logger.warning(
-                        "widget_query_timeout",
-                        widget_id=str(widget.id),
-                        timeout_seconds=WIDGET_EXECUTION_TIMEOUT_SECONDS,
-                    )
-                    cached_data[widget_key] = {
-                        "data": [],
-                        "total": 0,
-                        "error": f"Query timeout after {WIDGET_EXECUTION_TIMEOUT_SECONDS}s",
-                        "timeout": True,
-                    }
-                except Exception as e:
-                    logger.warning(
-                        "widget_query_failed",
-                        widget_id=str(widget.id),
-                        error=str(e),
-                    )
-                    cached_data[widget_key] = {
-                        "data": [],
-                        "total": 0,
-                        "error": str(e),
-                    }
+            # Execute widget queries as a deduplicated, concurrent plan
+            planner = WidgetExecutionPlanner(
+                run_query=self._run_planned_widget_query,
+                max_concurrency=MAX_CONCURRENT_WIDGET_QUERIES if self.session_factory else 1,
+                timeout_seconds=WIDGET_EXECUTION_TIMEOUT_SECONDS,
+            )
+            cached_data: dict[str, Any] = await planner.execute(summary.widgets)
 
             # Check cached_data size to prevent memory/storage issues
             cached_data_size = len(json.dumps(cached_data, default=str).encode("utf-8"))
@@ -255,6 +293,12 @@ class SummaryExecutor:
                     execution.has_changes = False
                     execution.completed_at = datetime.now(UTC)
                     execution.duration_ms = self._calculate_duration(execution)
+                    # Remember the inputs so unchanged follow-up runs skip the queries
+                    await self.session.execute(
+                        update(CustomSummary)
+                        .where(CustomSummary.id == summary_id)
+                        .values(last_input_fingerprint=input_fingerprint)
+                    )
                     await self.session.commit()
 
                     logger.info(
@@ -284,6 +328,7 @@ class SummaryExecutor:
                     last_executed_at=execution.completed_at,
                     execution_count=CustomSummary.execution_count + 1,
                     last_data_hash=data_hash,
+                    last_input_fingerprint=input_fingerprint,
                 )
             )
 
@@ -367,6 +412,18 @@ class SummaryExecutor:
             )
             raise
 
+    async def _compute_input_fingerprint(self, summary: CustomSummary) -> str | None:
+        """Calculate the summary's input fingerprint, or None if it can't be determined."""
+        try:
+            return await compute_input_fingerprint(self.session, summary)
+        except Exception as e:
+            logger.warning(
+                "summary_input_fingerprint_failed",
+                summary_id=str(summary.id),
+                error=str(e),
+            )
+            return None
+
     async def _safe_commit(self, summary_id: UUID) -> None:
         """Safely commit, rolling back on failure."""
         try:
@@ -379,6 +436,29 @@ class SummaryExecutor:
             )
             await self.session.rollback()
 
+    async def _run_planned_widget_query(
+        self,
+        widget: SummaryWidget,
+        query_cache: WidgetQueryCache,
+    ) -> dict[str, Any]:
+        """Run a planned widget query, on its own pooled session if available.
+
+        AsyncSession is not safe for concurrent use, so concurrent widget
+        queries each get a session from the factory. Without a factory the
+        planner runs sequentially on the executor's session.
+        """
+        if self.session_factory is None:
+            return await SummaryExecutor(self.session, query_cache=query_cache)._execute_widget_query(widget)
+
+        async with self.session_factory() as session:
+            return await SummaryExecutor(session, query_cache=query_cache)._execute_widget_query(widget)
+
+    async def _cached(self, key: tuple, loader) -> Any:
+        """Load a value through the shared widget query cache, if any."""
+        if self.query_cache is None:
+            return await loader()
+        return await self.query_cache.get_or_load(key, loader)
+
     async def _execute_widget_query(
         self,
         widget: SummaryWidget,
@@ -400,7 +480,7 @@ class SummaryExecutor:
         query_config = widget.query_config
 
         entity_type_slug = query_config.get("entity_type")
-        facet_types = query_config.get("facet_types", [])
+        facet_types = query_config.get("facet_types") or []
         filters = query_config.get("filters", {})
         sort_by = query_config.get("sort_by")
         sort_order = query_config.get("sort_order", "desc")
@@ -420,40 +500,60 @@ class SummaryExecutor:
                 "query_time_ms": query_time,
             }
 
-        # Get entity type
-        entity_type = await self._get_entity_type(entity_type_slug)
-        if not entity_type:
+        # Get entity type (the cache is shared across sessions: keep plain values only)
+        async def load_entity_type_id() -> UUID | None:
+            entity_type = await self._get_entity_type(entity_type_slug)
+            return entity_type.id if entity_type else None
+
+        entity_type_id = await self._cached(("entity_type", entity_type_slug), load_entity_type_id)
+        if not entity_type_id:
             return {"data": [], "total": 0, "error": f"Entity type '{entity_type_slug}' not found"}
 
-        # Build entity query
-        query = select(Entity).where(
-            Entity.entity_type_id == entity_type.id,
-            Entity.is_active,
-        )
+        # Widgets with the same entity type and filters share entities and facet values
+        scope = entity_scope_key(entity_type_slug, filters)
 
-        # Apply filters
-        query = self._apply_filters(query, filters)
+        async def load_entities() -> list[Any]:
+            # Build entity query (column rows, not instances bound to this session)
+            query = select(*ENTITY_RESULT_COLUMNS).where(
+                Entity.entity_type_id == entity_type_id,
+                Entity.is_active,
+            )
 
-        # Execute query
-        result = await self.session.execute(query)
-        entities = result.scalars().all()
+            # Apply filters
+            query = self._apply_filters(query, filters)
+
+            # Execute query
+            result = await self.session.execute(query)
+            return list(result.all())
+
+        entities = await self._cached(("entities", scope), load_entities)
 
         if not entities:
             query_time = int((time.time() - start_time) * 1000)
             return {"data": [], "total": 0, "query_time_ms": query_time}
 
-        # Load facet values
+        # Load facet values (the union of all facet types requested on this scope)
         entity_ids = [e.id for e in entities]
-        facet_data = await self._load_facet_values(entity_ids, facet_types)
+        facet_slugs = self.query_cache.facet_slugs_for(scope, facet_types) if self.query_cache else facet_types
+        facet_data = await self._cached(
+            ("facet_values", scope, tuple(facet_slugs)),
+            lambda: self._load_facet_values(entity_ids, facet_slugs),
+        )
 
         # Load parent entities for coordinates fallback
-        parent_ids = [e.parent_id for e in entities if e.parent_id and e.latitude is None]
-        parent_coords = {}
-        if parent_ids:
-            parent_result = await self.session.execute(select(Entity).where(Entity.id.in_(parent_ids)))
-            for parent in parent_result.scalars():
-                if parent.latitude is not None and parent.longitude is not None:
-                    parent_coords[parent.id] = (float(parent.latitude), float(parent.longitude))
+        async def load_parent_coords() -> dict[UUID, tuple[float, float]]:
+            parent_ids = [e.parent_id for e in entities if e.parent_id and e.latitude is None]
+            parent_coords = {}
+            if parent_ids:
+                parent_result = await self.session.execute(
+                    select(Entity.id, Entity.latitude, Entity.longitude).where(Entity.id.in_(parent_ids))
+                )
+                for parent in parent_result:
+                    if parent.latitude is not None and parent.longitude is not None:
+                        parent_coords[parent.id] = (float(parent.latitude), float(parent.longitude))
+            return parent_coords
+
+        parent_coords = await self._cached(("parent_coords", scope), load_parent_coords)
 
         # Build result data
         data = []
@@ -483,8 +583,9 @@ class SummaryExecutor:
                 entity_data["longitude"] = lng
                 entity_data["coords_from_parent"] = True  # Flag to indicate fallback
 
-            # Add facet values
-            entity_data["facets"] = facet_data.get(entity.id, {})
+            # Add facet values (only the ones requested by this widget)
+            entity_facets = facet_data.get(entity.id, {})
+            entity_data["facets"] = {slug: value for slug, value in entity_facets.items() if slug in facet_types}
 
             data.append(entity_data)
 
@@ -593,50 +694,61 @@ class SummaryExecutor:
         entity_ids: list[UUID],
         facet_type_slugs: list[str],
     ) -> dict[UUID, dict[str, Any]]:
-        """Load facet values for entities."""
+        """Load facet values for entities.
+
+        The limit applies per facet type: widgets sharing the load of their
+        scope must not lose values to the rows of another widget's facet type.
+        """
         if not entity_ids or not facet_type_slugs:
             return {}
 
         # Get facet types
-        ft_result = await self.session.execute(select(FacetType).where(FacetType.slug.in_(facet_type_slugs)))
-        facet_types = {ft.id: ft for ft in ft_result.scalars().all()}
+        ft_result = await self.session.execute(
+            select(FacetType.id, FacetType.slug).where(FacetType.slug.in_(facet_type_slugs))
+        )
+        facet_types = {row.id: row.slug for row in ft_result}
 
         if not facet_types:
             return {}
 
         # Get facet values with limit to prevent resource exhaustion
-        fv_result = await self.session.execute(
-            select(FacetValue)
+        ranked = (
+            select(
+                FacetValue.entity_id,
+                FacetValue.facet_type_id,
+                FacetValue.value,
+                FacetValue.confidence_score,
+                FacetValue.source_type,
+                func.row_number().over(partition_by=FacetValue.facet_type_id).label("position"),
+            )
             .where(
                 FacetValue.entity_id.in_(entity_ids),
                 FacetValue.facet_type_id.in_(facet_types.keys()),
             )
-            .limit(MAX_FACET_VALUES_PER_QUERY)
+            .subquery("ranked")
         )
-        facet_values = fv_result.scalars().all()
+        fv_result = await self.session.execute(select(ranked).where(ranked.c.position <= MAX_FACET_VALUES_PER_QUERY))
+        facet_values = fv_result.all()
 
-        # Warn if limit was hit
-        if len(facet_values) >= MAX_FACET_VALUES_PER_QUERY:
-            logger.warning(
-                "facet_values_limit_reached",
-                entity_count=len(entity_ids),
-                facet_types=facet_type_slugs,
-                limit=MAX_FACET_VALUES_PER_QUERY,
-            )
+        # Warn per facet type whose limit was hit
+        counts = Counter(fv.facet_type_id for fv in facet_values)
+        for facet_type_id, slug in facet_types.items():
+            if counts[facet_type_id] >= MAX_FACET_VALUES_PER_QUERY:
+                logger.warning(
+                    "facet_values_limit_reached",
+                    entity_count=len(entity_ids),
+                    facet_type=slug,
+                    limit=MAX_FACET_VALUES_PER_QUERY,
+                )
 
         # Build result dict
         result: dict[UUID, dict[str, Any]] = {}
         for fv in facet_values:
-            if fv.entity_id not in result:
-                result[fv.entity_id] = {}
-
-            ft = facet_types.get(fv.facet_type_id)
-            if ft:
-                result[fv.entity_id][ft.slug] = {
-                    "value": fv.value,
-                    "confidence": fv.confidence,
-                    "source_type": fv.source_type.value if fv.source_type else None,
-                }
+            result.setdefault(fv.entity_id, {})[facet_types[fv.facet_type_id]] = {
+                "value": fv.value,
+                "confidence": fv.confidence_score,
+                "source_type": fv.source_type.value if fv.source_type else None,
+            }
 
         return result
 
@@ -1,9 +1,12 @@
 """Summary Export Service.
 
 Handles export of custom summaries to PDF and Excel formats.
-Uses WeasyPrint for PDF generation and openpyxl for Excel.
+Uses WeasyPrint for PDF generation (in the render process pool) and
+openpyxl for Excel. Finished files are cached by the render service.
 """
 
+import base64
+import importlib.util
 import io
 import re
 import unicodedata
@@ -66,6 +69,8 @@ from sqlalchemy.orm import selectinload  # noqa: E402
 
 from app.models import CustomSummary, SummaryExecution, SummaryWidget  # noqa: E402
 from app.models.summary_execution import ExecutionStatus  # noqa: E402
+from services.summaries.render_service import get_export_cache, make_export_cache_key, render_pdf  # noqa: E402
+from services.summaries.static_map import render_static_map_svg  # noqa: E402
 
 logger = structlog.get_logger(__name__)
 
@@ -503,7 +508,7 @@ def render_map_image(data: list[dict], total: int, pregenerated_image: str | Non
     Args:
         data: List of data rows with latitude/longitude
         total: Total number of data points
-        pregenerated_image: Base64-encoded PNG image of the map (pre-generated asynchronously)
+        pregenerated_image: Base64-encoded SVG image of the map (see static_map.render_static_map_svg)
     """
     if not data:
         return '<div class="no-data">Keine Standortdaten</div>'
@@ -535,7 +540,7 @@ def render_map_image(data: list[dict], total: int, pregenerated_image: str | Non
     if pregenerated_image:
         # Map image - exactly 700px wide, centered
         html_parts.append(
-            f'<img src="data:image/png;base64,{pregenerated_image}" '
+            f'<img src="data:image/svg+xml;base64,{pregenerated_image}" '
             f'style="width: 700px; height: auto; border-radius: 8px; display: block;" />'
         )
 
@@ -585,117 +590,6 @@ def render_map_image(data: list[dict], total: int, pregenerated_image: str | Non
     return "".join(html_parts)
 
 
-async def _generate_map_screenshot_async(points: list[dict], status_config: dict, default_color: str) -> str:
-    """Generate a map screenshot using Playwright async API and Leaflet.
-
-    Uses CartoDB Positron tiles and Caeli brand colors to match the website styling.
-    """
-    import base64
-    import json
-    import os
-    import tempfile
-
-    from playwright.async_api import async_playwright
-
-    # Calculate bounds with padding
-    lats = [p["lat"] for p in points]
-    lngs = [p["lng"] for p in points]
-    min_lat, max_lat = min(lats), max(lats)
-    min_lng, max_lng = min(lngs), max(lngs)
-
-    # Add some padding to bounds
-    lat_padding = (max_lat - min_lat) * 0.1 or 0.01
-    lng_padding = (max_lng - min_lng) * 0.1 or 0.01
-    min_lat -= lat_padding
-    max_lat += lat_padding
-    min_lng -= lng_padding
-    max_lng += lng_padding
-
-    # Prepare markers JSON - use Caeli green for all markers (like website)
-    caeli_green = "#2E7D32"
-    markers_data = []
-    for p in points[:500]:  # Limit markers
-        markers_data.append(
-            {
-                "lat": p["lat"],
-                "lng": p["lng"],
-                "name": p["name"][:50] if p["name"] else "",
-            }
-        )
-
-    # Create HTML with Leaflet map using CartoDB Positron tiles (like website)
-    html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-    <style>
-        body {{ margin: 0; padding: 0; }}
-        #map {{ width: 700px; height: 400px; }}
-    </style>
-</head>
-<body>
-    <div id="map"></div>
-    <script>
-        var map = L.map('map', {{ zoomControl: false, attributionControl: false }});
-
-        // Use CartoDB Positron tiles (same as website light mode)
-        L.tileLayer('https://{{s}}.basemaps.cartocdn.com/light_all/{{z}}/{{x}}/{{y}}{{r}}.png', {{
-            maxZoom: 19,
-            subdomains: 'abcd'
-        }}).addTo(map);
-
-        var bounds = [[{min_lat}, {min_lng}], [{max_lat}, {max_lng}]];
-        map.fitBounds(bounds, {{ padding: [30, 30] }});
-
-        var markers = {json.dumps(markers_data)};
-
-        // Caeli brand colors
-        var markerColor = '{caeli_green}';
-
-        markers.forEach(function(m) {{
-            L.circleMarker([m.lat, m.lng], {{
-                radius: 8,
-                fillColor: markerColor,
-                color: '#ffffff',
-                weight: 2,
-                opacity: 1,
-                fillOpacity: 0.9
-            }}).addTo(map);
-        }});
-
-        // Signal that map is ready after tiles loaded
-        setTimeout(function() {{
-            window.mapReady = true;
-        }}, 2500);
-    </script>
-</body>
-</html>"""
-
-    # Write HTML to temp file and take screenshot
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".html", delete=False) as f:
-        f.write(html_content)
-        html_path = f.name
-
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page(viewport={"width": 700, "height": 400})
-            await page.goto(f"file://{html_path}")
-
-            # Wait for map tiles to load
-            await page.wait_for_function("window.mapReady === true", timeout=15000)
-            await page.wait_for_timeout(1000)  # Extra time for tiles
-
-            # Take screenshot
-            screenshot_bytes = await page.screenshot(type="png")
-            await browser.close()
-
-        return base64.b64encode(screenshot_bytes).decode("utf-8")
-    finally:
-        os.unlink(html_path)
-
-
 def render_map_table(data: list[dict], total: int) -> str:
     """Render a map data table with coordinates and all attributes."""
     if not data:
@@ -832,13 +726,9 @@ class SummaryExportService:
             execution_id=str(execution_id) if execution_id else None,
         )
 
-        try:
-            from weasyprint import HTML
-        except ImportError:
+        if importlib.util.find_spec("weasyprint") is None:
             logger.error("WeasyPrint not installed")
-            raise ImportError(
-                "WeasyPrint is required for PDF export. Install it with: pip install weasyprint"
-            ) from None
+            raise ImportError("WeasyPrint is required for PDF export. Install it with: pip install weasyprint")
 
         # Load summary with widgets
         result = await self.session.execute(
@@ -853,11 +743,19 @@ class SummaryExportService:
         execution = await self._get_execution(summary_id, execution_id)
         cached_data = execution.cached_data if execution else {}
 
+        # Serve repeat downloads from the export cache
+        export_cache = get_export_cache()
+        cache_key = make_export_cache_key(summary, execution, "pdf")
+        cached_pdf = await export_cache.get(cache_key, "pdf")
+        if cached_pdf is not None:
+            logger.info("summary_export_cache_hit", summary_id=str(summary_id), format="pdf")
+            return cached_pdf
+
         # Sort widgets by position
         widgets = sorted(summary.widgets, key=lambda w: (w.position_y or 0, w.position_x or 0))
 
-        # Pre-generate map images asynchronously
-        map_images = await self._generate_map_images(widgets, cached_data)
+        # Render map images offline
+        map_images = self._generate_map_images(widgets, cached_data)
 
         # Render template
         template = self.jinja_env.from_string(PDF_TEMPLATE)
@@ -872,9 +770,9 @@ class SummaryExportService:
             else None,
         )
 
-        # Generate PDF
-        html = HTML(string=html_content)
-        pdf_bytes = html.write_pdf()
+        # Generate PDF in the render process pool (keeps the event loop responsive)
+        pdf_bytes = await render_pdf(html_content)
+        await export_cache.set(cache_key, "pdf", pdf_bytes)
 
         logger.info(
             "summary_exported_pdf",
@@ -932,6 +830,14 @@ class SummaryExportService:
         execution = await self._get_execution(summary_id, execution_id)
         cached_data = execution.cached_data if execution else {}
 
+        # Serve repeat downloads from the export cache
+        export_cache = get_export_cache()
+        cache_key = make_export_cache_key(summary, execution, "xlsx")
+        cached_excel = await export_cache.get(cache_key, "xlsx")
+        if cached_excel is not None:
+            logger.info("summary_export_cache_hit", summary_id=str(summary_id), format="xlsx")
+            return cached_excel
+
         # Create workbook
         wb = Workbook()
 
@@ -1084,6 +990,7 @@ class SummaryExportService:
         output.seek(0)
 
         excel_bytes = output.getvalue()
+        await export_cache.set(cache_key, "xlsx", excel_bytes)
 
         logger.info(
             "summary_exported_excel",
@@ -1234,37 +1141,25 @@ class SummaryExportService:
 
         return row_data.get(key)
 
-    async def _generate_map_images(
+    def _generate_map_images(
         self,
         widgets: list[SummaryWidget],
         cached_data: dict[str, Any],
     ) -> dict[str, str]:
         """
-        Pre-generate map screenshots for all map widgets.
+        Render static map images for all map widgets.
+
+        Maps are rendered offline as SVG (no browser, no tile server).
 
         Args:
             widgets: List of widgets to process
             cached_data: Cached widget data from execution
 
         Returns:
-            Dict mapping widget_id to base64-encoded PNG image
+            Dict mapping widget_id to base64-encoded SVG image
         """
         map_images: dict[str, str] = {}
 
-        # Status colors
-        status_config = {
-            "active": "#22c55e",
-            "operational": "#22c55e",
-            "operating": "#22c55e",
-            "planned": "#3b82f6",
-            "approved": "#a855f7",
-            "construction": "#f97316",
-            "under construction": "#f97316",
-            "decommissioned": "#6b7280",
-            "inactive": "#6b7280",
-        }
-        default_color = "#ef4444"
-
         for widget in widgets:
             if widget.widget_type != "map":
                 continue
@@ -1283,13 +1178,11 @@ class SummaryExportService:
                 lng = row.get("longitude")
                 if lat is not None and lng is not None:
                     try:
-                        status = str(row.get("status", "")).lower().strip()
                         points.append(
                             {
                                 "lat": float(lat),
                                 "lng": float(lng),
                                 "name": row.get("name", ""),
-                                "status": status,
                             }
                         )
                     except (ValueError, TypeError):
@@ -1298,18 +1191,17 @@ class SummaryExportService:
             if not points:
                 continue
 
-            # Generate screenshot asynchronously
             try:
-                image_data = await _generate_map_screenshot_async(points, status_config, default_color)
-                map_images[widget_key] = image_data
+                svg = render_static_map_svg(points)
+                map_images[widget_key] = base64.b64encode(svg.encode("utf-8")).decode("ascii")
                 logger.info(
-                    "map_screenshot_generated",
+                    "map_image_rendered",
                     widget_id=str(widget.id),
                     points=len(points),
                 )
             except Exception as e:
                 logger.warning(
-                    "map_screenshot_failed",
+                    "map_image_failed",
                     widget_id=str(widget.id),
                     error=str(e),
                 )
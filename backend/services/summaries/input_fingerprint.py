@@ -0,0 +1,103 @@
+"""Input Fingerprints for Custom Summaries.
+
+A summary's widget data can only change when the entities or facet values it
+reads change (or when its widgets are edited). The input fingerprint captures
+exactly that in one cheap, index-backed query:
+
+- per referenced entity type: row count and max(updated_at) of its entities
+- per referenced facet type: row count and max(updated_at) of its facet values
+- the query fingerprint of every widget
+
+If the fingerprint equals the one stored on the last execution, no widget
+query has to run at all.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+import structlog
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CustomSummary, Entity, EntityType, FacetType, FacetValue
+from services.summaries.widget_planner import widget_query_fingerprint
+
+logger = structlog.get_logger(__name__)
+
+
+def get_summary_inputs(summary: CustomSummary) -> tuple[list[str], list[str]]:
+    """Collect the entity type and facet type slugs referenced by a summary's widgets.
+
+    Args:
+        summary: Summary with loaded widgets
+
+    Returns:
+        Tuple of (entity_type_slugs, facet_type_slugs), both sorted
+    """
+    entity_types: set[str] = set()
+    facet_types: set[str] = set()
+    for widget in summary.widgets:
+        query_config = widget.query_config or {}
+        if query_config.get("entity_type"):
+            entity_types.add(query_config["entity_type"])
+        facet_types.update(query_config.get("facet_types") or [])
+    return sorted(entity_types), sorted(facet_types)
+
+
+async def compute_input_fingerprint(session: AsyncSession, summary: CustomSummary) -> str:
+    """Calculate the input fingerprint of a summary in a single query.
+
+    Args:
+        session: Database session
+        summary: Summary with loaded widgets
+
+    Returns:
+        Hex digest of SHA256 hash
+    """
+    entity_type_slugs, facet_type_slugs = get_summary_inputs(summary)
+
+    stats: dict[str, Any] = {}
+    subqueries = []
+    if entity_type_slugs:
+        subqueries.append(
+            select(
+                literal("entity_type").label("kind"),
+                EntityType.slug.label("slug"),
+                func.count(Entity.id).label("row_count"),
+                func.max(Entity.updated_at).label("max_updated_at"),
+            )
+            .select_from(EntityType)
+            .outerjoin(Entity, Entity.entity_type_id == EntityType.id)
+            .where(EntityType.slug.in_(entity_type_slugs))
+            .group_by(EntityType.slug)
+        )
+    if facet_type_slugs:
+        subqueries.append(
+            select(
+                literal("facet_type").label("kind"),
+                FacetType.slug.label("slug"),
+                func.count(FacetValue.id).label("row_count"),
+                func.max(FacetValue.updated_at).label("max_updated_at"),
+            )
+            .select_from(FacetType)
+            .outerjoin(FacetValue, FacetValue.facet_type_id == FacetType.id)
+            .where(FacetType.slug.in_(facet_type_slugs))
+            .group_by(FacetType.slug)
+        )
+
+    if subqueries:
+        statement = subqueries[0] if len(subqueries) == 1 else union_all(*subqueries)
+        result = await session.execute(statement)
+        for row in result.all():
+            stats[f"{row.kind}:{row.slug}"] = [
+                row.row_count,
+                row.max_updated_at.isoformat() if row.max_updated_at else None,
+            ]
+
+    fingerprint_input = {
+        "widgets": sorted(f"{widget.id}:{widget_query_fingerprint(widget.query_config)}" for widget in summary.widgets),
+        "stats": stats,
+    }
+    json_str = json.dumps(fingerprint_input, sort_keys=True, default=str)
+    return hashlib.sha256(json_str.encode()).hexdigest()
@@ -0,0 +1,224 @@
+"""Render Service for Summary Exports.
+
+Keeps CPU-heavy export rendering off the API event loop and avoids
+rendering the same export twice:
+
+- render_pdf(): runs WeasyPrint in a per-process ProcessPoolExecutor
+- ExportCache: file-based cache of finished PDF/XLSX files, keyed by
+  summary, execution, data hash and widget presentation
+
+Repeat downloads of an unchanged summary are served straight from disk.
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import structlog
+
+from app.config import settings
+from app.models import CustomSummary, SummaryExecution
+
+logger = structlog.get_logger(__name__)
+
+# Bump when the export layout changes to invalidate all cached files
+EXPORT_RENDER_VERSION = 1
+
+# Minimum seconds between two sweeps of expired cache entries by one process
+EXPORT_CACHE_CLEANUP_INTERVAL_SECONDS = 3600
+
+_render_pool: ProcessPoolExecutor | None = None
+
+
+def _write_pdf(html_content: str) -> bytes:
+    """Render HTML to PDF (runs inside a render pool process)."""
+    from weasyprint import HTML
+
+    return HTML(string=html_content).write_pdf()
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Get or create the render process pool for this process.
+
+    Uses the spawn start method: forking a process that runs an event loop
+    and database pools is unsafe.
+    """
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.export_render_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """Shut down the render pool (call on application shutdown)."""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+async def render_pdf(html_content: str) -> bytes:
+    """
+    Render HTML to PDF without blocking the event loop.
+
+    Args:
+        html_content: Complete HTML document
+
+    Returns:
+        PDF file as bytes
+    """
+    global _render_pool
+    loop = asyncio.get_running_loop()
+    start_time = time.monotonic()
+    try:
+        pdf_bytes = await loop.run_in_executor(get_render_pool(), _write_pdf, html_content)
+    except BrokenProcessPool:
+        # A render process died (e.g. OOM) - recreate the pool and retry once
+        logger.warning("pdf_render_pool_broken")
+        _render_pool = None
+        pdf_bytes = await loop.run_in_executor(get_render_pool(), _write_pdf, html_content)
+
+    logger.debug(
+        "pdf_rendered",
+        render_ms=int((time.monotonic() - start_time) * 1000),
+        size_bytes=len(pdf_bytes),
+    )
+    return pdf_bytes
+
+
+def make_export_cache_key(
+    summary: CustomSummary,
+    execution: SummaryExecution | None,
+    export_format: str,
+) -> str:
+    """
+    Build the cache key of an export.
+
+    The key covers everything rendered into the file: the execution and its
+    data hash, the summary's descriptive fields and each widget's presentation.
+
+    Args:
+        summary: Summary with loaded widgets
+        execution: Exported execution (None if the summary never ran)
+        export_format: 'pdf' or 'xlsx'
+
+    Returns:
+        Hex digest of SHA256 hash
+    """
+    key_data = {
+        "version": EXPORT_RENDER_VERSION,
+        "format": export_format,
+        "summary_id": summary.id,
+        "summary": [summary.name, summary.description, summary.status, summary.updated_at],
+        "execution_id": execution.id if execution else None,
+        "data_hash": execution.data_hash if execution else None,
+        "widgets": sorted(
+            [
+                str(widget.id),
+                widget.widget_type,
+                widget.title,
+                widget.subtitle,
+                widget.position_x,
+                widget.position_y,
+                widget.visualization_config,
+            ]
+            for widget in summary.widgets
+        ),
+    }
+    json_str = json.dumps(key_data, sort_keys=True, default=str)
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+class ExportCache:
+    """
+    File-based cache of rendered exports.
+
+    Files are written atomically (temp file + rename) so concurrent API
+    processes never serve partial files. Entries expire after ``ttl`` seconds.
+    The process writing the files (the API) also removes them: a write sweeps
+    expired entries at most every EXPORT_CACHE_CLEANUP_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, base_path: str, ttl: int):
+        self.base_path = Path(base_path)
+        self.ttl = ttl
+        self._last_cleanup = 0.0
+
+    def _path(self, key: str, export_format: str) -> Path:
+        return self.base_path / f"{key}.{export_format}"
+
+    async def get(self, key: str, export_format: str) -> bytes | None:
+        """Return the cached export, or None if missing or expired."""
+        return await asyncio.to_thread(self._get_sync, key, export_format)
+
+    async def set(self, key: str, export_format: str, content: bytes) -> None:
+        """Store a rendered export."""
+        try:
+            await asyncio.to_thread(self._set_sync, key, export_format, content)
+        except OSError as e:
+            # Caching is best effort - the export itself succeeded
+            logger.warning("export_cache_write_failed", key=key, error=str(e))
+
+    def _get_sync(self, key: str, export_format: str) -> bytes | None:
+        path = self._path(key, export_format)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def _set_sync(self, key: str, export_format: str, content: bytes) -> None:
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, self._path(key, export_format))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        now = time.time()
+        if now - self._last_cleanup >= EXPORT_CACHE_CLEANUP_INTERVAL_SECONDS:
+            self._last_cleanup = now
+            removed = self.cleanup()
+            if removed:
+                logger.info("export_cache_cleaned", removed=removed)
+
+    def cleanup(self) -> int:
+        """Remove expired entries. Returns the number of removed files."""
+        removed = 0
+        if not self.base_path.exists():
+            return 0
+        cutoff = time.time() - self.ttl
+        for path in self.base_path.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+_export_cache: ExportCache | None = None
+
+
+def get_export_cache() -> ExportCache:
+    """Get the process-wide export cache."""
+    global _export_cache
+    if _export_cache is None:
+        _export_cache = ExportCache(settings.export_cache_path, settings.export_cache_ttl_seconds)
+    return _export_cache
@@ -0,0 +1,193 @@
+"""Offline Static Map Renderer for Summary Exports.
+
+Renders map widgets as SVG on the server, without a browser and without
+loading tiles from the internet. Points are projected with Web Mercator
+(like the Leaflet map on the website) and drawn on a light background in
+Caeli brand colors. Region boundaries are drawn from GeoJSON, either passed
+in directly or loaded from the file configured in
+``settings.export_map_boundaries_path``.
+
+WeasyPrint embeds the resulting SVG natively, so exports work offline and
+take milliseconds instead of launching Chromium.
+"""
+
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from xml.sax.saxutils import escape
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Map dimensions (matching the previous screenshot size)
+MAP_WIDTH = 700
+MAP_HEIGHT = 400
+MAP_PADDING = 30
+
+# Maximum markers drawn (same limit as the website map export)
+MAX_MARKERS = 500
+
+# Caeli brand colors / CartoDB Positron-like palette
+BACKGROUND_COLOR = "#f2f3f0"
+GRID_COLOR = "#e2e4e0"
+BOUNDARY_FILL = "#fafaf8"
+BOUNDARY_STROKE = "#c3c7c2"
+MARKER_COLOR = "#2E7D32"
+
+# Web Mercator latitude limit
+MAX_LATITUDE = 85.05112878
+
+
+def _project(lat: float, lng: float) -> tuple[float, float]:
+    """Project WGS84 coordinates to normalized Web Mercator (0..1)."""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = (lng + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+class _Viewport:
+    """Maps projected coordinates into the SVG pixel space, preserving aspect ratio."""
+
+    def __init__(self, points: list[tuple[float, float]], width: int, height: int, padding: int):
+        projected = [_project(lat, lng) for lat, lng in points]
+        xs = [p[0] for p in projected]
+        ys = [p[1] for p in projected]
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+
+        # Add 10% padding around the data (as the Leaflet export did), at least a small span
+        span_x = max(max_x - min_x, 1e-5)
+        span_y = max(max_y - min_y, 1e-5)
+        min_x -= span_x * 0.1
+        max_x += span_x * 0.1
+        min_y -= span_y * 0.1
+        max_y += span_y * 0.1
+
+        inner_width = width - 2 * padding
+        inner_height = height - 2 * padding
+        self.scale = min(inner_width / (max_x - min_x), inner_height / (max_y - min_y))
+        # Center the data
+        self.offset_x = padding + (inner_width - (max_x - min_x) * self.scale) / 2 - min_x * self.scale
+        self.offset_y = padding + (inner_height - (max_y - min_y) * self.scale) / 2 - min_y * self.scale
+
+    def to_pixel(self, lat: float, lng: float) -> tuple[float, float]:
+        x, y = _project(lat, lng)
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+
+def _iter_rings(geometry: dict[str, Any]) -> list[list[list[float]]]:
+    """Return all polygon rings / line strings of a GeoJSON geometry."""
+    geometry_type = geometry.get("type")
+    coordinates = geometry.get("coordinates") or []
+    if geometry_type == "Polygon":
+        return list(coordinates)
+    if geometry_type == "MultiPolygon":
+        return [ring for polygon in coordinates for ring in polygon]
+    if geometry_type == "LineString":
+        return [coordinates]
+    if geometry_type == "MultiLineString":
+        return list(coordinates)
+    if geometry_type == "GeometryCollection":
+        return [ring for part in geometry.get("geometries", []) for ring in _iter_rings(part)]
+    return []
+
+
+def _geometries_from_geojson(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Extract geometries from a FeatureCollection, Feature or bare geometry."""
+    if data.get("type") == "FeatureCollection":
+        return [f["geometry"] for f in data.get("features", []) if f.get("geometry")]
+    if data.get("type") == "Feature":
+        return [data["geometry"]] if data.get("geometry") else []
+    return [data]
+
+
+@lru_cache(maxsize=4)
+def _load_boundaries_file(path: str) -> tuple[dict[str, Any], ...]:
+    try:
+        with Path(path).open(encoding="utf-8") as f:
+            return tuple(_geometries_from_geojson(json.load(f)))
+    except (OSError, ValueError) as e:
+        logger.warning("map_boundaries_load_failed", path=path, error=str(e))
+        return ()
+
+
+def load_default_boundaries() -> list[dict[str, Any]]:
+    """Load the configured boundary GeoJSON (cached per process)."""
+    if not settings.export_map_boundaries_path:
+        return []
+    return list(_load_boundaries_file(settings.export_map_boundaries_path))
+
+
+def render_static_map_svg(
+    points: list[dict[str, Any]],
+    boundaries: list[dict[str, Any]] | None = None,
+    width: int = MAP_WIDTH,
+    height: int = MAP_HEIGHT,
+) -> str:
+    """
+    Render points (and optional boundaries) as a standalone SVG map.
+
+    Args:
+        points: List of dicts with 'lat', 'lng' and optional 'name'
+        boundaries: GeoJSON geometries to draw beneath the points
+            (defaults to the configured boundary file)
+        width: SVG width in pixels
+        height: SVG height in pixels
+
+    Returns:
+        SVG document as string
+
+    Raises:
+        ValueError: If no points are given
+    """
+    if not points:
+        raise ValueError("At least one point is required to render a map")
+
+    markers = points[:MAX_MARKERS]
+    viewport = _Viewport([(p["lat"], p["lng"]) for p in markers], width, height, MAP_PADDING)
+    if boundaries is None:
+        boundaries = load_default_boundaries()
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        f'<rect width="{width}" height="{height}" fill="{BACKGROUND_COLOR}"/>',
+    ]
+
+    # Light grid as orientation (replaces the tile background)
+    grid_step = 50
+    grid = [f"M{x} 0V{height}" for x in range(grid_step, width, grid_step)]
+    grid += [f"M0 {y}H{width}" for y in range(grid_step, height, grid_step)]
+    parts.append(f'<path d="{"".join(grid)}" stroke="{GRID_COLOR}" stroke-width="1" fill="none"/>')
+
+    # Boundaries
+    path_data = []
+    for geometry in boundaries:
+        for ring in _iter_rings(geometry):
+            if len(ring) < 2:
+                continue
+            coords = [viewport.to_pixel(lat, lng) for lng, lat, *_ in ring]
+            path_data.append("M" + "L".join(f"{x:.1f} {y:.1f}" for x, y in coords) + "Z")
+    if path_data:
+        parts.append(
+            f'<path d="{"".join(path_data)}" fill="{BOUNDARY_FILL}" fill-rule="evenodd" '
+            f'stroke="{BOUNDARY_STROKE}" stroke-width="1"/>'
+        )
+
+    # Markers
+    for point in markers:
+        x, y = viewport.to_pixel(point["lat"], point["lng"])
+        name = escape((point.get("name") or "")[:50])
+        parts.append(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="8" fill="{MARKER_COLOR}" fill-opacity="0.9" '
+            f'stroke="#ffffff" stroke-width="2"><title>{name}</title></circle>'
+        )
+
+    parts.append("</svg>")
+    return "".join(parts)
@@ -0,0 +1,255 @@
+"""Widget Execution Planner for Custom Summaries.
+
+Summaries with many widgets often repeat the same entity/facet query with a
+different presentation (table, bar chart, map, ...). The planner:
+
+1. Fingerprints every widget's query_config (presentation is ignored)
+2. Groups widgets with identical fingerprints so each query runs only once
+3. Runs the remaining independent queries concurrently, capped by a semaphore
+4. Shares loaded entity scopes and facet values between widgets through
+   a single-flight cache (WidgetQueryCache)
+
+Total execution time approaches the slowest widget instead of the sum of all.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from app.models import SummaryWidget
+
+logger = structlog.get_logger(__name__)
+
+# Maximum number of widget queries running at the same time.
+# Each concurrent query holds its own pooled session, so this must stay well
+# below the pool size of the API (5 + 10 overflow) and workers (3 + 5 overflow).
+MAX_CONCURRENT_WIDGET_QUERIES = 4
+
+# query_config keys that influence the query result. Anything else
+# (titles, colors, chart options) is presentation and ignored for dedup.
+QUERY_FINGERPRINT_KEYS = (
+    "entity_type",
+    "facet_types",
+    "filters",
+    "sort_by",
+    "sort_order",
+    "limit",
+    "aggregate",
+)
+
+# Sentinel set on an in-flight load whose owner failed or was cancelled,
+# telling waiters to retry the load themselves.
+_RETRY = object()
+
+
+def widget_query_fingerprint(query_config: dict[str, Any] | None) -> str:
+    """Calculate a deterministic fingerprint of a widget's data query.
+
+    Two widgets with the same fingerprint produce identical query results,
+    regardless of key order or facet_types order.
+
+    Args:
+        query_config: The widget's query configuration
+
+    Returns:
+        Hex digest of SHA256 hash
+    """
+    query_config = query_config or {}
+    normalized = {key: query_config.get(key) for key in QUERY_FINGERPRINT_KEYS}
+    if isinstance(normalized["facet_types"], list):
+        normalized["facet_types"] = sorted(set(normalized["facet_types"]))
+    if not normalized["sort_order"]:
+        normalized["sort_order"] = "desc"
+
+    json_str = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+def entity_scope_key(entity_type_slug: str | None, filters: dict[str, Any] | None) -> str:
+    """Build the cache key for the set of entities a widget operates on."""
+    json_str = json.dumps({"entity_type": entity_type_slug, "filters": filters or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+@dataclass
+class WidgetExecutionGroup:
+    """Widgets sharing one query fingerprint, executed once."""
+
+    fingerprint: str
+    widgets: list[SummaryWidget] = field(default_factory=list)
+
+    @property
+    def representative(self) -> SummaryWidget:
+        """The widget whose query_config is executed for the whole group."""
+        return self.widgets[0]
+
+    @property
+    def widget_keys(self) -> list[str]:
+        return [f"widget_{widget.id}" for widget in self.widgets]
+
+
+def plan_widget_execution(widgets: Sequence[SummaryWidget]) -> list[WidgetExecutionGroup]:
+    """Group widgets by query fingerprint, preserving widget order.
+
+    Args:
+        widgets: Widgets of a summary
+
+    Returns:
+        One WidgetExecutionGroup per distinct query
+    """
+    groups: dict[str, WidgetExecutionGroup] = {}
+    for widget in widgets:
+        fingerprint = widget_query_fingerprint(widget.query_config)
+        if fingerprint not in groups:
+            groups[fingerprint] = WidgetExecutionGroup(fingerprint=fingerprint)
+        groups[fingerprint].widgets.append(widget)
+    return list(groups.values())
+
+
+class WidgetQueryCache:
+    """Single-flight cache shared by all widget queries of one execution.
+
+    Concurrent requests for the same key wait for the first loader instead
+    of issuing their own query. Values live only for one summary execution,
+    so there is no invalidation.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[Any, asyncio.Future] = {}
+        self._facet_slugs_by_scope: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def register_widgets(self, widgets: Sequence[SummaryWidget]) -> None:
+        """Collect the facet types needed per entity scope.
+
+        Widgets on the same entity scope then share one facet value load
+        covering the union of their facet types.
+        """
+        for widget in widgets:
+            query_config = widget.query_config or {}
+            scope = entity_scope_key(query_config.get("entity_type"), query_config.get("filters", {}))
+            self._facet_slugs_by_scope.setdefault(scope, set()).update(query_config.get("facet_types") or [])
+
+    def facet_slugs_for(self, scope: str, facet_type_slugs: Sequence[str]) -> list[str]:
+        """Return the facet types to load for a scope (at least the requested ones)."""
+        return sorted(self._facet_slugs_by_scope.get(scope, set()) | set(facet_type_slugs))
+
+    async def get_or_load(self, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, loading it at most once.
+
+        If the loading widget fails or times out, waiting widgets retry the
+        load themselves instead of inheriting the failure.
+        """
+        while True:
+            future = self._values.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._values[key] = future
+                self.misses += 1
+                try:
+                    value = await loader()
+                except BaseException:
+                    del self._values[key]
+                    future.set_result(_RETRY)
+                    raise
+                future.set_result(value)
+                return value
+
+            value = await asyncio.shield(future)
+            if value is _RETRY:
+                continue
+            self.hits += 1
+            return value
+
+
+class WidgetExecutionPlanner:
+    """Executes the widgets of a summary as a deduplicated, concurrent plan.
+
+    The planner only schedules work; the actual query is provided by the
+    caller as ``run_query(widget, cache)``, which is responsible for using
+    its own session when running concurrently.
+    """
+
+    def __init__(
+        self,
+        run_query: Callable[[SummaryWidget, WidgetQueryCache], Awaitable[dict[str, Any]]],
+        max_concurrency: int = MAX_CONCURRENT_WIDGET_QUERIES,
+        timeout_seconds: float | None = None,
+    ):
+        self.run_query = run_query
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.cache = WidgetQueryCache()
+
+    async def execute(self, widgets: Sequence[SummaryWidget]) -> dict[str, Any]:
+        """Execute all widgets and return cached_data keyed by widget key.
+
+        Widget failures and timeouts are reported per widget and never
+        abort the other widgets.
+        """
+        groups = plan_widget_execution(widgets)
+        self.cache.register_widgets(widgets)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_group(group: WidgetExecutionGroup) -> dict[str, Any]:
+            async with semaphore:
+                return await self._run_group(group)
+
+        results = await asyncio.gather(*(run_group(group) for group in groups))
+
+        cached_data: dict[str, Any] = {}
+        for group, group_result in zip(groups, results, strict=True):
+            for widget_key in group.widget_keys:
+                # Shallow copy so later truncation of one widget doesn't affect others
+                cached_data[widget_key] = dict(group_result)
+
+        # Keep the widget order of the summary
+        ordered = {f"widget_{widget.id}": cached_data[f"widget_{widget.id}"] for widget in widgets}
+
+        logger.debug(
+            "summary_widget_plan_executed",
+            widget_count=len(widgets),
+            query_count=len(groups),
+            deduplicated=len(widgets) - len(groups),
+            cache_hits=self.cache.hits,
+            cache_misses=self.cache.misses,
+        )
+        return ordered
+
+    async def _run_group(self, group: WidgetExecutionGroup) -> dict[str, Any]:
+        widget = group.representative
+        try:
+            if self.timeout_seconds:
+                return await asyncio.wait_for(self.run_query(widget, self.cache), timeout=self.timeout_seconds)
+            return await self.run_query(widget, self.cache)
+        except TimeoutError:
+            logger.warning(
+                "widget_query_timeout",
+                widget_id=str(widget.id),
+                shared_with=len(group.widgets) - 1,
+                timeout_seconds=self.timeout_seconds,
+            )
+            return {
+                "data": [],
+                "total": 0,
+                "error": f"Query timeout after {self.timeout_seconds}s",
+                "timeout": True,
+            }
+        except Exception as e:
+            logger.warning(
+                "widget_query_failed",
+                widget_id=str(widget.id),
+                shared_with=len(group.widgets) - 1,
+                error=str(e),
+            )
+            return {
+                "data": [],
+                "total": 0,
+                "error": str(e),
+            }
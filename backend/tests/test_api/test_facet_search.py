@@ -0,0 +1,224 @@
+"""Tests for ranked facet value search with deferred headlines and keyset pagination."""
+
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.facets.facet_search import (
+    count_query,
+    decode_cursor,
+    encode_cursor,
+    fulltext_ranking,
+    hybrid_ranking,
+    page_query,
+    search_facet_values,
+)
+from app.core.exceptions import ValidationError
+
+SEARCH_QUERY = func.plainto_tsquery("german", "Windpark")
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _facet_value() -> MagicMock:
+    facet_value = MagicMock(
+        id=uuid.uuid4(),
+        entity_id=uuid.uuid4(),
+        facet_type_id=uuid.uuid4(),
+        value={"text": "Windpark"},
+        text_representation="Windpark Nord",
+        confidence_score=0.9,
+        human_verified=False,
+        created_at=datetime(2026, 10, 1, tzinfo=UTC),
+    )
+    facet_value.entity.name = "Gemeinde"
+    facet_value.facet_type.slug = "pain_point"
+    facet_value.facet_type.name = "Pain Point"
+    facet_value.source_type.value = "DOCUMENT"
+    return facet_value
+
+
+class Row(tuple):
+    """Result row with positional and attribute access."""
+
+    @property
+    def total(self):
+        return self[3]
+
+
+def _rows(scores: list[float], total: int | None) -> list[Row]:
+    return [Row((_facet_value(), score, "<mark>Windpark</mark>", total)) for score in scores]
+
+
+def _session(rows: list[Row], count: int = 0) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    return MagicMock(execute=AsyncMock(return_value=result), scalar=AsyncMock(return_value=count))
+
+
+class TestCursor:
+    """Tests for the opaque keyset cursor."""
+
+    def test_round_trip(self):
+        """Test that score and id survive encoding exactly."""
+        facet_value_id = uuid.uuid4()
+        score = 0.060792710632085800
+
+        assert decode_cursor(encode_cursor(score, facet_value_id)) == (score, facet_value_id)
+
+    @pytest.mark.parametrize("cursor", ["kein-cursor", "e30", encode_cursor(0.1, uuid.uuid4())[:-4]])
+    def test_invalid_cursor(self, cursor):
+        """Test that malformed cursors are rejected as validation errors."""
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor)
+
+
+class TestSearchStatements:
+    """Tests for the generated SQL."""
+
+    def test_headline_only_for_page(self):
+        """Test that ts_headline is evaluated outside the ranked and limited subquery."""
+        sql = _sql(page_query(fulltext_ranking(SEARCH_QUERY, [], None, with_total=True), SEARCH_QUERY, 21))
+
+        ranked = sql[sql.index("JOIN (") : sql.index(") AS ranked")]
+        assert "ts_headline" not in ranked
+        assert "ts_rank" in ranked and "LIMIT" in ranked
+        assert "count(*) OVER ()" in ranked
+        assert sql.index("ts_headline") < sql.index("JOIN (")
+
+    def test_keyset_condition(self):
+        """Test that a cursor becomes a row comparison on (rank, id) instead of an offset."""
+        sql = _sql(fulltext_ranking(SEARCH_QUERY, [], (0.5, uuid.uuid4()), with_total=False))
+
+        assert "(ts_rank(facet_values.search_vector" in sql
+        assert "facet_values.id) < (" in sql
+        assert "count(*)" not in sql
+
+    def test_hybrid_fuses_both_rankings(self):
+        """Test that the hybrid ranking unites ts_rank and cosine distance positions."""
+        sql = _sql(hybrid_ranking(SEARCH_QUERY, [0.1] * 3, [], (0.03, uuid.uuid4()), with_total=False))
+
+        assert "UNION ALL" in sql
+        assert "facet_values.text_embedding <=>" in sql
+        assert "row_number() OVER" in sql
+        assert "GROUP BY candidates.id" in sql and "HAVING" in sql
+
+    def test_count_query_counts_whole_ranking(self):
+        """Test that the count runs over the unpaged ranking without its ordering."""
+        sql = _sql(count_query(fulltext_ranking(SEARCH_QUERY, [], None, with_total=False)))
+
+        assert sql.startswith("SELECT count(*) AS count_1")
+        assert "LIMIT" not in sql and "ORDER BY" not in sql
+
+
+class TestSearchEndpoint:
+    """Tests for pagination and mode selection of the endpoint."""
+
+    async def test_first_page_has_total_and_cursor(self):
+        """Test that the first page reports the total and a cursor to the next page."""
+        rows = _rows([0.9, 0.8, 0.7], total=7)
+        session = _session(rows)
+
+        response = await search_facet_values(
+            q="Windpark",
+            entity_id=None,
+            facet_type_slug=None,
+            page=1,
+            per_page=2,
+            cursor=None,
+            semantic=False,
+            session=session,
+        )
+
+        assert [item.rank for item in response.items] == [0.9, 0.8]
+        assert response.total == 7 and response.pages == 4
+        assert response.mode == "fulltext"
+        assert decode_cursor(response.next_cursor) == (0.8, rows[1][0].id)
+        session.execute.assert_awaited_once()
+
+    async def test_cursor_page_skips_total(self):
+        """Test that a cursor page has no total and the last page no cursor."""
+        session = _session(_rows([0.6], total=None))
+
+        response = await search_facet_values(
+            q="Windpark",
+            entity_id=None,
+            facet_type_slug=None,
+            page=1,
+            per_page=2,
+            cursor=encode_cursor(0.7, uuid.uuid4()),
+            semantic=False,
+            session=session,
+        )
+
+        assert response.total is None and response.pages is None
+        assert response.next_cursor is None
+        assert "count(*)" not in _sql(session.execute.await_args.args[0])
+        session.scalar.assert_not_awaited()
+
+    async def test_page_past_last_counts_total(self):
+        """Test that an empty page behind the last one still reports the total."""
+        session = _session([], count=7)
+
+        response = await search_facet_values(
+            q="Windpark",
+            entity_id=None,
+            facet_type_slug=None,
+            page=9,
+            per_page=2,
+            cursor=None,
+            semantic=False,
+            session=session,
+        )
+
+        assert response.items == []
+        assert response.total == 7 and response.pages == 4
+        assert response.next_cursor is None
+        session.scalar.assert_awaited_once()
+
+    async def test_semantic_without_embedding_falls_back(self):
+        """Test that hybrid search falls back to full-text ranking without a query embedding."""
+        session = _session([])
+
+        with patch("app.utils.similarity.generate_embedding", AsyncMock(return_value=None)):
+            response = await search_facet_values(
+                q="Windpark",
+                entity_id=None,
+                facet_type_slug=None,
+                page=1,
+                per_page=20,
+                cursor=None,
+                semantic=True,
+                session=session,
+            )
+
+        assert response.mode == "fulltext"
+        assert response.total == 0
+        assert "UNION ALL" not in _sql(session.execute.await_args.args[0])
+
+    async def test_semantic_search_uses_fusion(self):
+        """Test that hybrid search raises ef_search and runs the fused ranking."""
+        session = _session(_rows([0.032], total=1))
+
+        with patch("app.utils.similarity.generate_embedding", AsyncMock(return_value=[0.1] * 3)):
+            response = await search_facet_values(
+                q="Windpark",
+                entity_id=None,
+                facet_type_slug=None,
+                page=1,
+                per_page=20,
+                cursor=None,
+                semantic=True,
+                session=session,
+            )
+
+        assert response.mode == "hybrid"
+        set_ef_search, search = (call.args[0] for call in session.execute.await_args_list)
+        assert "hnsw.ef_search" in str(set_ef_search)
+        assert "UNION ALL" in _sql(search)
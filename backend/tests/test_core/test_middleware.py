@@ -0,0 +1,176 @@
+"""Tests for the ASGI middleware stack and the JSON response path."""
+
+import asyncio
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.core.cache_headers import generate_etag
+from app.core.compression import StreamingAwareGZipMiddleware
+from app.core.i18n_middleware import I18nMiddleware
+from app.core.responses import ModelResponse
+from app.core.security_headers import SecurityHeadersMiddleware, get_csp_nonce
+from app.i18n import get_locale, set_locale
+
+LARGE_PAYLOAD = {"text": "Windkraft " * 500}
+
+
+class Item(BaseModel):
+    name: str
+    created_at: datetime
+
+
+def _app() -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(SecurityHeadersMiddleware, csp_report_uri="/csp-report")
+    app.add_middleware(I18nMiddleware)
+    app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=2000)
+
+    @app.get("/large")
+    async def large():
+        return LARGE_PAYLOAD
+
+    @app.get("/frame")
+    async def frame(response: Response):
+        response.headers["X-Frame-Options"] = "SAMEORIGIN"
+        return {"nonce": get_csp_nonce()}
+
+    @app.get("/override")
+    async def override():
+        set_locale("en")
+        return {"locale": get_locale()}
+
+    @app.get("/events")
+    async def events():
+        async def generate():
+            for i in range(3):
+                yield f"data: {'x' * 1500} {i}\n\n"
+                await asyncio.sleep(0)
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    return app
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestSecurityHeadersMiddleware:
+    """Tests for the pure ASGI security headers middleware."""
+
+    async def test_headers_are_added(self, client):
+        """Test that every response carries the security headers and CSP."""
+        response = await client.get("/large")
+
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert response.headers["Cross-Origin-Opener-Policy"] == "same-origin"
+        assert "Strict-Transport-Security" not in response.headers
+        assert response.headers["Content-Security-Policy"].endswith("report-uri /csp-report")
+
+    async def test_headers_override_endpoint_values(self, client):
+        """Test that endpoint headers are replaced instead of duplicated."""
+        response = await client.get("/frame")
+
+        assert response.headers.get_list("X-Frame-Options") == ["DENY"]
+        assert response.json()["nonce"]
+
+    def test_production_variant(self):
+        """Test HSTS and report-only CSP in production configuration."""
+        middleware = SecurityHeadersMiddleware(None, enable_hsts=True, csp_report_only=True)
+        headers = dict(middleware._raw_headers)
+
+        assert b"preload" in headers[b"strict-transport-security"]
+        assert b"upgrade-insecure-requests" in headers[b"content-security-policy-report-only"]
+        assert b"content-security-policy" not in headers
+
+
+class TestI18nMiddleware:
+    """Tests for locale detection."""
+
+    @pytest.mark.parametrize(
+        ("headers", "expected"),
+        [
+            ({"X-Language": "en", "Accept-Language": "de"}, "en"),
+            ({"Accept-Language": "fr-FR, en-GB;q=0.8"}, "en"),
+            ({}, "de"),
+        ],
+    )
+    async def test_content_language(self, client, headers, expected):
+        """Test the header priority for the request locale."""
+        response = await client.get("/large", headers=headers)
+
+        assert response.headers["Content-Language"] == expected
+
+    async def test_endpoint_override_is_reported(self, client):
+        """Test that a locale set by the endpoint ends up in Content-Language."""
+        response = await client.get("/override", headers={"Accept-Language": "de"})
+
+        assert response.headers["Content-Language"] == "en"
+
+
+class TestCompression:
+    """Tests for GZip compression with streaming responses."""
+
+    async def test_json_is_compressed(self, client):
+        """Test that large JSON responses are still compressed."""
+        response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.json() == LARGE_PAYLOAD
+
+    async def test_event_stream_is_not_compressed(self):
+        """Test that Server-Sent Events pass through uncompressed, one message per event."""
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/events",
+            "raw_path": b"/events",
+            "query_string": b"",
+            "headers": [(b"accept-encoding", b"gzip")],
+        }
+        messages = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        await _app()(scope, receive, send)
+
+        headers = dict(messages[0]["headers"])
+        bodies = [m["body"] for m in messages[1:] if m["body"]]
+        assert b"content-encoding" not in headers
+        assert len(bodies) == 3
+        assert all(body.startswith(b"data: ") for body in bodies)
+
+
+class TestModelResponse:
+    """Tests for direct Pydantic serialization."""
+
+    def test_matches_default_serialization(self):
+        """Test that the body equals FastAPI's JSON encoding of the model."""
+        item = Item(name="Gummersbach", created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC))
+
+        response = ModelResponse(item)
+
+        assert response.media_type == "application/json"
+        assert response.body == ORJSONResponse(item.model_dump(mode="json")).body
+
+    def test_etag_from_body(self):
+        """Test that a rendered body is hashed without serializing it again."""
+        etag = generate_etag(b'{"a":1}')
+
+        assert etag.startswith('"') and len(etag) == 18
+        assert etag == generate_etag(b'{"a":1}')
+        assert etag != generate_etag(b'{"a":2}')
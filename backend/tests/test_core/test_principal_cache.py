@@ -0,0 +1,347 @@
+"""Unit tests for the authenticated principal cache."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import principal_cache
+from app.core.principal_cache import (
+    INVALIDATION_CHANNEL,
+    PrincipalCache,
+    PrincipalInvalidationListener,
+    is_token_revoked,
+    load_principal,
+    publish_user_invalidations,
+)
+from app.core.security import create_access_token, decode_access_token
+from app.core.token_blacklist import TokenBlacklist, get_token_id
+from app.models.user import User, UserRole
+
+
+class FakePubSub:
+    """Pub/sub subscription of FakeRedis."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.append(self)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=min(timeout, 0.05))
+        except TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.redis.subscribers.remove(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = []
+
+    def ttl(self, key):
+        self.keys.append(key)
+
+    async def execute(self):
+        return [self.redis.ttls[key] for key in self.keys]
+
+
+class FakeRedis:
+    """Minimal in-memory Redis with pub/sub."""
+
+    def __init__(self):
+        self.ttls: dict[str, int] = {}
+        self.subscribers: list[FakePubSub] = []
+
+    async def setex(self, key, ttl, value):
+        self.ttls[key] = ttl
+
+    async def exists(self, key):
+        return int(key in self.ttls)
+
+    async def publish(self, channel, message):
+        for subscriber in self.subscribers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+
+    async def scan_iter(self, match, count=1000):
+        for key in list(self.ttls):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+def _user(**overrides) -> User:
+    values = {
+        "id": uuid4(),
+        "email": "anna@example.com",
+        "password_hash": "hash",
+        "full_name": "Anna Beispiel",
+        "role": UserRole.EDITOR,
+        "is_active": True,
+        "is_superuser": False,
+        "email_verified": True,
+        "language": "de",
+        "notifications_enabled": True,
+    }
+    values.update(overrides)
+    return User(**values)
+
+
+@pytest.fixture
+def cache():
+    cache = PrincipalCache(ttl_seconds=30, max_size=100)
+    cache.synced = True
+    principal_cache.set_principal_cache(cache)
+    yield cache
+    principal_cache.set_principal_cache(None)
+
+
+@pytest.fixture
+def publish_client():
+    client = MagicMock()
+    client.publish = AsyncMock()
+    principal_cache.set_principal_publish_client(client)
+    yield client
+    principal_cache.set_principal_publish_client(None)
+
+
+class TestPrincipalCache:
+    """Tests for the LRU and revocation set."""
+
+    def test_ttl_and_lru(self):
+        """Test that entries expire and the least recently used entry is evicted."""
+        cache = PrincipalCache(ttl_seconds=30, max_size=2)
+        cache.put("a", "editor", {"n": 1}, cache.epoch)
+        cache.put("b", "editor", {"n": 2}, cache.epoch)
+        cache.get("a", "editor")
+        cache.put("c", "editor", {"n": 3}, cache.epoch)
+
+        assert cache.get("b", "editor") is None
+        assert cache.get("a", "editor") == {"n": 1}
+
+        with patch("app.core.principal_cache.time.monotonic", return_value=time.monotonic() + 31):
+            assert cache.get("a", "editor") is None
+
+    def test_invalidation_wins_over_concurrent_load(self):
+        """Test that a user loaded before an invalidation is not cached."""
+        cache = PrincipalCache(ttl_seconds=30, max_size=10)
+        epoch = cache.epoch
+        cache.apply({"type": "user", "id": "a"})
+        cache.put("a", "editor", {"n": 1}, epoch)
+
+        assert cache.get("a", "editor") is None
+
+    def test_invalidate_user_drops_all_roles(self):
+        """Test that a role change drops entries of all role claims."""
+        cache = PrincipalCache(ttl_seconds=30, max_size=10)
+        cache.put("a", "editor", {}, cache.epoch)
+        cache.put("a", "admin", {}, cache.epoch)
+        cache.put("b", "editor", {}, cache.epoch)
+
+        cache.invalidate_user("a")
+
+        assert cache.get("a", "editor") is None
+        assert cache.get("a", "admin") is None
+        assert cache.get("b", "editor") == {}
+
+    def test_revocations_expire(self):
+        """Test that expired token ids are pruned."""
+        cache = PrincipalCache(ttl_seconds=30, max_size=10)
+        cache.apply({"type": "token", "id": "alt", "exp": time.time() - 1})
+        cache.apply({"type": "token", "id": "neu", "exp": time.time() + 600})
+        cache._last_prune = 0
+
+        cache.prune_revocations()
+
+        assert not cache.is_revoked("alt")
+        assert cache.is_revoked("neu")
+
+
+class TestLoadPrincipal:
+    """Tests for serving the current user from the cache."""
+
+    async def test_hit_needs_no_query(self, cache):
+        """Test that the second request is served without a database query."""
+        user = _user()
+        session = AsyncSession()
+        session.get = AsyncMock(return_value=user)
+
+        first = await load_principal(session, user.id, "editor")
+        second_session = AsyncSession()
+        second_session.get = AsyncMock()
+        second = await load_principal(second_session, user.id, "editor")
+
+        assert first is user
+        second_session.get.assert_not_awaited()
+        assert second is not user
+        assert (second.id, second.email, second.role) == (user.id, user.email, UserRole.EDITOR)
+        assert second in second_session
+
+        second.language = "en"
+        assert second_session.is_modified(second)
+
+    async def test_inactive_users_are_not_cached(self, cache):
+        """Test that deactivated users are always loaded from the database."""
+        user = _user(is_active=False)
+        session = MagicMock(get=AsyncMock(return_value=user))
+
+        await load_principal(session, user.id, "editor")
+        await load_principal(session, user.id, "editor")
+
+        assert session.get.await_count == 2
+
+    async def test_unsynced_cache_is_bypassed(self, cache):
+        """Test that the database is used while invalidations may be missed."""
+        cache.mark_unsynced()
+        user = _user()
+        session = MagicMock(get=AsyncMock(return_value=user))
+
+        await load_principal(session, user.id, "editor")
+        await load_principal(session, user.id, "editor")
+
+        assert session.get.await_count == 2
+
+
+class TestRevocation:
+    """Tests for local revocation checks."""
+
+    async def test_local_check_without_redis(self, cache):
+        """Test that synced checks use the local set only."""
+        token = create_access_token(uuid4(), "editor")
+        payload = decode_access_token(token)
+
+        with patch("app.core.token_blacklist.is_token_blacklisted", AsyncMock()) as remote:
+            assert await is_token_revoked(token, payload) is False
+            cache.revoke(get_token_id(token, payload), time.time() + 60)
+            assert await is_token_revoked(token, payload) is True
+
+        remote.assert_not_awaited()
+
+    async def test_fallback_to_redis_when_unsynced(self, cache):
+        """Test that the Redis blacklist is asked while the replica is not synced."""
+        cache.mark_unsynced()
+        token = create_access_token(uuid4(), "editor")
+
+        with patch("app.core.token_blacklist.is_token_blacklisted", AsyncMock(return_value=True)) as remote:
+            assert await is_token_revoked(token, decode_access_token(token)) is True
+
+        remote.assert_awaited_once_with(token)
+
+    async def test_logout_reaches_other_processes(self, cache):
+        """Test that a blacklisted token is replicated via pub/sub."""
+        redis = FakeRedis()
+        other = PrincipalCache(ttl_seconds=30, max_size=10)
+        listener = PrincipalInvalidationListener(redis, other)
+        listener.start()
+        await asyncio.sleep(0.05)
+        token = create_access_token(uuid4(), "editor")
+        token_id = get_token_id(token, decode_access_token(token))
+
+        await TokenBlacklist(redis).add(token)
+        await asyncio.sleep(0.1)
+
+        assert cache.is_revoked(token_id)
+        assert other.synced and other.is_revoked(token_id)
+        await listener.stop()
+        assert not other.synced
+
+    async def test_existing_blacklist_is_loaded(self):
+        """Test that the listener replicates the blacklist before it is trusted."""
+        redis = FakeRedis()
+        redis.ttls[f"{TokenBlacklist.KEY_PREFIX}abc"] = 600
+        cache = PrincipalCache(ttl_seconds=30, max_size=10)
+        listener = PrincipalInvalidationListener(redis, cache)
+
+        listener.start()
+        await asyncio.sleep(0.05)
+
+        assert cache.synced and cache.is_revoked("abc")
+        await listener.stop()
+
+
+class TestUserInvalidation:
+    """Tests for invalidations after user changes."""
+
+    def test_commit_publishes_changed_users(self, cache, publish_client):
+        """Test that committed user changes invalidate this and other processes."""
+        cache.put("a", "editor", {}, cache.epoch)
+        session = MagicMock(info={"changed_user_ids": {"a"}})
+
+        principal_cache._after_commit(session)
+
+        assert cache.get("a", "editor") is None
+        channel, message = publish_client.publish.call_args.args
+        assert channel == INVALIDATION_CHANNEL
+        assert json.loads(message) == {"type": "user", "id": "a"}
+
+    def test_bulk_statement_invalidates_everyone(self, cache, publish_client):
+        """Test that bulk updates on users drop the whole cache."""
+        cache.put("a", "editor", {}, cache.epoch)
+        cache.put("b", "editor", {}, cache.epoch)
+
+        publish_user_invalidations({"a", "*"})
+
+        assert cache.get("a", "editor") is None
+        assert cache.get("b", "editor") is None
+        publish_client.publish.assert_called_once()
+
+    def test_publish_failure_is_tolerated(self, cache, publish_client):
+        """Test that a Redis outage does not break the commit."""
+        publish_client.publish.side_effect = ConnectionError("Redis weg")
+
+        publish_user_invalidations({"a"})
+
+    async def test_commit_publishes_without_blocking(self, cache, publish_client):
+        """Test that the publish runs as a task after the commit hook returned."""
+        from app.core.after_commit import wait_for_after_commit_tasks
+
+        cache.put("a", "editor", {}, cache.epoch)
+        session = MagicMock(info={"changed_user_ids": {"a"}})
+
+        principal_cache._after_commit(session)
+
+        assert cache.get("a", "editor") is None
+        publish_client.publish.assert_not_called()
+        await wait_for_after_commit_tasks()
+        publish_client.publish.assert_awaited_once()
+
+
+class TestGetCurrentUser:
+    """Tests for the authentication dependency with a warm cache."""
+
+    async def test_warm_request_overhead(self, cache):
+        """Test that authenticated requests need no I/O once the principal is cached."""
+        from app.core.deps import get_current_user
+
+        user = _user()
+        token = create_access_token(user.id, UserRole.EDITOR.value)
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        warmup = MagicMock(get=AsyncMock(return_value=user))
+        await get_current_user(credentials, warmup)
+
+        runs = 500
+        start = time.perf_counter()
+        for _ in range(runs):
+            session = AsyncSession()
+            session.get = AsyncMock()
+            current = await get_current_user(credentials, session)
+        per_request = (time.perf_counter() - start) / runs
+
+        session.get.assert_not_awaited()
+        assert current.id == user.id
+        assert per_request < 0.002
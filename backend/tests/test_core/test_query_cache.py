@@ -0,0 +1,292 @@
+"""Unit tests for the two-level smart query cache and data versions."""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.core import data_versions, query_cache
+from app.core.after_commit import wait_for_after_commit_tasks
+from app.core.data_versions import (
+    SCOPE_ENTITIES,
+    SCOPE_FACET_VALUES,
+    SCOPE_LLM_CONFIG,
+    SCOPE_NOTIFICATION_RULES,
+    SCOPE_RELATIONS,
+    SCOPE_SCHEMA,
+    bump_data_versions,
+    entity_type_scope,
+    facet_type_scope,
+    scopes_for_bulk_statement,
+    scopes_for_objects,
+)
+from app.core.query_cache import (
+    PlanEmbeddingIndex,
+    build_result_cache_key,
+    get_cached_plan,
+    get_cached_result,
+    get_similar_cached_plan,
+    may_have_similar_plan,
+    normalize_question,
+    set_cached_plan,
+    set_cached_result,
+)
+from services.smart_query.query_executor import get_query_data_scopes
+
+
+class FakeRedis:
+    """Minimal in-memory async Redis."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = []
+
+    def incr(self, key):
+        self.keys.append(key)
+
+    async def execute(self):
+        for key in self.keys:
+            self.redis.data[key] = str(int(self.redis.data.get(key, 0)) + 1)
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    query_cache.set_query_cache_client(redis)
+    data_versions.set_data_version_client(redis)
+    query_cache.get_plan_index().clear()
+    yield redis
+    query_cache.set_query_cache_client(None)
+    data_versions.set_data_version_client(None)
+    query_cache.get_plan_index().clear()
+
+
+class TestQuestionNormalization:
+    """Tests for plan cache key normalization."""
+
+    def test_rewordings_share_key(self):
+        """Test that case, punctuation and filler words are ignored."""
+        assert normalize_question("Zeige mir bitte alle Gemeinden in NRW!") == normalize_question(
+            "zeige mir  alle Gemeinden in NRW"
+        )
+
+    def test_numbers_are_kept(self):
+        """Test that decimal numbers survive punctuation stripping."""
+        assert normalize_question("Windparks über 2,5 MW.") == "windparks über 2,5 mw"
+
+
+class TestPlanCache:
+    """Tests for level 1 (interpretation plans)."""
+
+    async def test_plan_roundtrip(self, fake_redis):
+        """Test that a plan is found for a reworded question."""
+        plan = {"primary_entity_type": "territorial-entity", "facet_types": ["pain_point"]}
+        assert await set_cached_plan("Alle Gemeinden mit Pain Points?", plan)
+
+        assert await get_cached_plan("alle gemeinden mit pain points bitte") == plan
+
+    async def test_schema_change_invalidates_plans(self, fake_redis):
+        """Test that type changes make old interpretations unreachable."""
+        await set_cached_plan("Alle Gemeinden", {"primary_entity_type": "territorial-entity"})
+
+        await bump_data_versions([SCOPE_SCHEMA])
+
+        assert await get_cached_plan("Alle Gemeinden") is None
+
+    async def test_paraphrase_uses_nearest_plan(self, fake_redis):
+        """Test that a similar question embedding reuses the cached plan."""
+        plan = {"primary_entity_type": "person"}
+        await set_cached_plan("Welche Bürgermeister gibt es?", plan, embedding=[1.0, 0.0, 0.1])
+
+        assert await get_similar_cached_plan("Zeige alle Bürgermeister", [1.0, 0.0, 0.11]) == plan
+        # Now stored under the new wording too
+        assert await get_cached_plan("Zeige alle Bürgermeister") == plan
+
+    async def test_paraphrase_rejects_dissimilar_question(self, fake_redis):
+        """Test that unrelated questions do not reuse a plan."""
+        await set_cached_plan("Welche Bürgermeister gibt es?", {"primary_entity_type": "person"}, [1.0, 0.0, 0.0])
+
+        assert await get_similar_cached_plan("Alle Windparks", [0.0, 1.0, 0.0]) is None
+
+    def test_index_requires_same_numbers(self):
+        """Test that questions with different numbers never match."""
+        index = PlanEmbeddingIndex()
+        index.add("top 5 gemeinden", [1.0, 0.0])
+
+        assert index.find("top 10 gemeinden", [1.0, 0.0]) is None
+        assert index.find("die top 5 gemeinden", [1.0, 0.0]) == "top 5 gemeinden"
+
+    def test_index_requires_same_region(self):
+        """Test that questions naming another region never match, aliases do."""
+        index = PlanEmbeddingIndex()
+        index.add("alle gemeinden in nrw", [1.0, 0.0], {"filters": {"admin_level_1": "Nordrhein-Westfalen"}})
+
+        assert index.find("alle gemeinden in bayern", [1.0, 0.0]) is None
+        assert index.find("alle gemeinden", [1.0, 0.0]) is None
+        assert index.find("zeige gemeinden in nordrhein-westfalen", [1.0, 0.0]) == "alle gemeinden in nrw"
+
+    def test_index_requires_plan_entity_values(self):
+        """Test that a paraphrase must name the entity values of the matched plan."""
+        index = PlanEmbeddingIndex()
+        plan = {"filters": {"location_keywords": ["Bad Münstereifel"]}}
+        index.add("windparks in bad münstereifel", [1.0, 0.0], plan)
+
+        assert index.find("windparks in gummersbach", [1.0, 0.0]) is None
+        assert index.find("welche windparks hat bad muenstereifel", [1.0, 0.0]) == "windparks in bad münstereifel"
+
+    async def test_embedding_skipped_without_candidates(self, fake_redis):
+        """Test that a lookup needs no embedding when no known question is compatible."""
+        plan = {"primary_entity_type": "territorial-entity", "filters": {"admin_level_1": "Bayern"}}
+        await set_cached_plan("Gemeinden in Bayern", plan, embedding=[1.0, 0.0])
+
+        assert may_have_similar_plan("Alle Gemeinden in Bayern")
+        assert not may_have_similar_plan("Alle Gemeinden in Hessen")
+
+
+class TestResultCache:
+    """Tests for level 2 (results keyed by data version)."""
+
+    async def test_write_invalidates_result(self, fake_redis):
+        """Test that bumping a read scope changes the result key."""
+        plan = {"primary_entity_type": "person"}
+        scopes = {SCOPE_SCHEMA, SCOPE_ENTITIES}
+        key = await build_result_cache_key(plan, scopes)
+        assert await set_cached_result(key, {"items": [{"name": "A"}], "total": 1})
+
+        cached = await get_cached_result(await build_result_cache_key(plan, scopes))
+        assert cached["total"] == 1
+        assert cached["_cached"] is True
+
+        await bump_data_versions([SCOPE_ENTITIES])
+
+        assert await get_cached_result(await build_result_cache_key(plan, scopes)) is None
+
+    async def test_unrelated_write_keeps_result(self, fake_redis):
+        """Test that writes to other scopes do not invalidate the result."""
+        plan = {"primary_entity_type": "person"}
+        scopes = {SCOPE_SCHEMA, facet_type_scope("a")}
+        key = await build_result_cache_key(plan, scopes)
+        await set_cached_result(key, {"items": [], "total": 0})
+
+        await bump_data_versions([facet_type_scope("b")])
+
+        assert await get_cached_result(await build_result_cache_key(plan, scopes)) is not None
+
+    async def test_errors_are_not_cached(self, fake_redis):
+        """Test that error results are skipped."""
+        key = await build_result_cache_key({"primary_entity_type": "person"}, {SCOPE_SCHEMA})
+
+        assert not await set_cached_result(key, {"error": True, "items": []})
+
+    async def test_no_client_disables_cache(self):
+        """Test that the cache is a no-op without Redis."""
+        assert await build_result_cache_key({"primary_entity_type": "person"}, {SCOPE_SCHEMA}) is None
+        assert await get_cached_plan("Alle Gemeinden") is None
+
+
+class TestDataVersionScopes:
+    """Tests for mapping writes to data version scopes."""
+
+    def test_scopes_for_objects(self):
+        """Test that ORM objects map to their type scopes."""
+        from app.models import Entity, FacetType, FacetValue
+
+        entity_type_id = uuid4()
+        facet_type_id = uuid4()
+        scopes = scopes_for_objects(
+            [
+                Entity(entity_type_id=entity_type_id, name="Test"),
+                FacetValue(facet_type_id=facet_type_id),
+                FacetType(slug="x"),
+            ]
+        )
+
+        assert scopes == {
+            SCOPE_ENTITIES,
+            entity_type_scope(entity_type_id),
+            SCOPE_FACET_VALUES,
+            facet_type_scope(facet_type_id),
+            SCOPE_SCHEMA,
+        }
+
+    def test_scopes_for_bulk_statement(self):
+        """Test that bulk statements invalidate all types of a table."""
+        from app.models import FacetValue, User
+
+        assert "facet_type:*" in scopes_for_bulk_statement(FacetValue)
+        assert scopes_for_bulk_statement(User) == set()
+
+    def test_notification_rule_scope(self):
+        """Test that rule index changes bump the rule version and statistics do not."""
+        from app.models import NotificationRule, User
+
+        rule = NotificationRule(name="Windkraft", conditions={"keywords": ["Wind"]})
+
+        assert scopes_for_objects([rule]) == {SCOPE_NOTIFICATION_RULES}
+        assert scopes_for_objects([User(email="a@example.com", notifications_enabled=False)]) == {
+            SCOPE_NOTIFICATION_RULES
+        }
+        assert scopes_for_bulk_statement(NotificationRule) == {SCOPE_NOTIFICATION_RULES}
+
+    def test_llm_config_scope(self):
+        """Test that LLM configs and API credentials bump the llm_config version."""
+        from app.models import UserApiCredentials, UserLLMConfig
+
+        assert scopes_for_objects([UserLLMConfig(encrypted_data="x")]) == {SCOPE_LLM_CONFIG}
+        assert scopes_for_objects([UserApiCredentials(encrypted_data="x")]) == {SCOPE_LLM_CONFIG}
+        assert scopes_for_bulk_statement(UserLLMConfig) == {SCOPE_LLM_CONFIG}
+
+    async def test_commit_bumps_without_blocking(self, fake_redis):
+        """Test that the after_commit hook only schedules the bump on the running loop."""
+        session = MagicMock(info={"changed_data_scopes": {SCOPE_ENTITIES}})
+
+        data_versions._after_commit(session)
+
+        assert fake_redis.data == {}
+        await wait_for_after_commit_tasks()
+        assert fake_redis.data == {f"dv:{SCOPE_ENTITIES}": "1"}
+
+
+class TestQueryDataScopes:
+    """Tests for the scopes a smart query result is keyed on."""
+
+    @staticmethod
+    def _session() -> MagicMock:
+        result = MagicMock()
+        result.all.return_value = []
+        return MagicMock(execute=AsyncMock(return_value=result))
+
+    async def test_list_without_relations(self):
+        """Test that a list of organizations does not depend on entity or relation writes."""
+        scopes = await get_query_data_scopes(self._session(), {"primary_entity_type": "organization"})
+
+        assert SCOPE_ENTITIES not in scopes and SCOPE_RELATIONS not in scopes
+
+    async def test_person_list_reads_relations(self):
+        """Test that person lists depend on relations (works_for enrichment)."""
+        scopes = await get_query_data_scopes(self._session(), {"primary_entity_type": "person"})
+
+        assert {SCOPE_ENTITIES, SCOPE_RELATIONS} <= scopes
+
+    async def test_count_without_relations(self):
+        """Test that count queries only depend on their entity type."""
+        scopes = await get_query_data_scopes(self._session(), {"primary_entity_type": "person", "query_type": "count"})
+
+        assert SCOPE_ENTITIES not in scopes and SCOPE_RELATIONS not in scopes
@@ -0,0 +1,198 @@
+"""Unit tests for the GCRA rate limiter and its local token bucket fallback."""
+
+from hashlib import sha1
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from redis._parsers.encoders import Encoder
+from redis.commands.core import AsyncScript
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import NoScriptError
+
+from app.core import rate_limit
+from app.core.rate_limit import InMemoryRateLimiter, RateLimiter, check_rate_limit
+from app.core.rate_limiter import LocalTokenBucket
+
+
+class Clock:
+    """Controllable time.monotonic replacement."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("app.core.rate_limiter.time.monotonic", clock):
+        yield clock
+
+
+class FakeRedis:
+    """Redis stand-in that answers EVALSHA with fixed replies and records commands."""
+
+    def __init__(self, replies=None, error: Exception | None = None):
+        self.replies = list(replies or [])
+        self.error = error
+        self.loaded: set[str] = set()
+        self.commands: list[tuple] = []
+
+    def get_encoder(self):
+        return Encoder(encoding="utf-8", encoding_errors="strict", decode_responses=False)
+
+    def register_script(self, script):
+        return AsyncScript(self, script)
+
+    async def evalsha(self, sha, numkeys, *args):
+        self.commands.append(("EVALSHA", sha, numkeys, *args))
+        if self.error:
+            raise self.error
+        if sha not in self.loaded:
+            raise NoScriptError("No matching script")
+        return self.replies.pop(0)
+
+    async def script_load(self, script):
+        self.commands.append(("SCRIPT LOAD",))
+        sha = sha1(script.encode()).hexdigest()  # noqa: S324
+        self.loaded.add(sha)
+        return sha
+
+
+def _request(host: str = "10.0.0.1") -> MagicMock:
+    request = MagicMock()
+    request.client.host = host
+    return request
+
+
+class TestLocalTokenBucket:
+    """Tests for the per-process token bucket."""
+
+    def test_burst_then_refill(self, clock):
+        """Test that the full bucket allows max_requests at once and refills one token per interval."""
+        bucket = LocalTokenBucket()
+
+        results = [bucket.acquire("login:a", 5, 60) for _ in range(6)]
+
+        assert [allowed for allowed, _, _ in results] == [True] * 5 + [False]
+        assert [remaining for _, remaining, _ in results[:5]] == [4, 3, 2, 1, 0]
+        assert results[5][2] == pytest.approx(12)
+
+        clock.now += 12
+        assert bucket.acquire("login:a", 5, 60)[:2] == (True, 0)
+        assert bucket.acquire("login:a", 5, 60)[0] is False
+
+    def test_rejected_requests_are_not_counted(self, clock):
+        """Test that hammering a full bucket does not extend the wait."""
+        bucket = LocalTokenBucket()
+        for _ in range(3):
+            bucket.acquire("k", 3, 30)
+
+        for _ in range(100):
+            bucket.acquire("k", 3, 30)
+        clock.now += 10
+
+        assert bucket.acquire("k", 3, 30)[0] is True
+
+    def test_keys_are_bounded(self, clock):
+        """Test that the least recently used key is dropped beyond max_keys."""
+        bucket = LocalTokenBucket(max_keys=3)
+        for key in ("a", "b", "c"):
+            bucket.acquire(key, 1, 60)
+        bucket.acquire("a", 1, 60)  # rejected, does not touch the key
+
+        bucket.acquire("d", 1, 60)
+
+        assert len(bucket) == 3
+        assert bucket.acquire("a", 1, 60)[0] is True
+
+    def test_prune_drops_full_buckets(self, clock):
+        """Test that pruning removes only buckets that refilled completely."""
+        bucket = LocalTokenBucket()
+        bucket.acquire("idle", 10, 10)
+        clock.now += 5
+        bucket.acquire("busy", 10, 10)
+        clock.now += 0.5
+
+        assert bucket.prune() == 1
+        assert len(bucket) == 1
+
+
+class TestInMemoryRateLimiter:
+    """Tests for the fallback limiter."""
+
+    def test_rejects_with_retry_after(self, clock):
+        """Test that an empty bucket raises 429 with the time until the next token."""
+        limiter = InMemoryRateLimiter()
+        for _ in range(3):
+            limiter.check("password_change", "u1", max_requests=3, window_seconds=300)
+
+        with pytest.raises(HTTPException) as exc_info:
+            limiter.check("password_change", "u1", max_requests=3, window_seconds=300)
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"Retry-After": "100"}
+
+        limiter.reset("password_change", "u1")
+        assert limiter.check("password_change", "u1", max_requests=3, window_seconds=300) is True
+
+
+class TestRedisRateLimiter:
+    """Tests for the Redis limiter."""
+
+    async def test_one_evalsha_per_check(self):
+        """Test that a check is one EVALSHA and the script is loaded only once."""
+        redis = FakeRedis(replies=[[1, 4, 0, 12000], [1, 3, 0, 24000]])
+        limiter = RateLimiter(redis)
+
+        await limiter.check("login", "10.0.0.1", max_requests=5, window_seconds=60)
+        await limiter.check("login", "10.0.0.1", max_requests=5, window_seconds=60)
+
+        sha = limiter._script.sha
+        assert [command[0] for command in redis.commands] == ["EVALSHA", "SCRIPT LOAD", "EVALSHA", "EVALSHA"]
+        assert redis.commands[-1] == ("EVALSHA", sha, 1, "rate_limit:login:10.0.0.1", 60000, 5, 1)
+
+    async def test_rejected_check_raises_429(self):
+        """Test that the retry time of the script becomes the Retry-After header."""
+        redis = FakeRedis(replies=[[0, 0, 11200, 60000]])
+        limiter = RateLimiter(redis)
+        redis.loaded.add(limiter._script.sha)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter.check("login", "10.0.0.1", max_requests=5, window_seconds=60)
+
+        assert exc_info.value.headers == {"Retry-After": "12"}
+
+    async def test_get_remaining_does_not_take_a_token(self):
+        """Test that get_remaining runs the script with cost 0."""
+        redis = FakeRedis(replies=[[1, 2, 0, 36000]])
+        limiter = RateLimiter(redis)
+        redis.loaded.add(limiter._script.sha)
+
+        assert await limiter.get_remaining("login", "10.0.0.1", max_requests=5) == 2
+        assert redis.commands[-1][-1] == 0
+
+
+class TestCheckRateLimit:
+    """Tests for the fallback from Redis to the local bucket."""
+
+    async def test_falls_back_when_redis_is_down(self):
+        """Test that Redis errors use the in-memory limiter instead of failing the request."""
+        redis = FakeRedis(error=RedisConnectionError("Connection refused"))
+        with (
+            patch.object(rate_limit, "_rate_limiter", RateLimiter(redis)),
+            patch.object(rate_limit, "_fallback_limiter", InMemoryRateLimiter()),
+            patch.object(rate_limit.security_logger, "log_rate_limit_exceeded") as log_exceeded,
+        ):
+            for _ in range(5):
+                assert await check_rate_limit(_request(), "webhook_test") is True
+
+            with pytest.raises(HTTPException) as exc_info:
+                await check_rate_limit(_request(), "webhook_test")
+
+        assert exc_info.value.status_code == 429
+        assert len(redis.commands) == 6
+        log_exceeded.assert_called_once()
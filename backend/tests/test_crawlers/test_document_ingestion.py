@@ -0,0 +1,218 @@
+"""Tests for batched document registration in the feed and OParl crawlers."""
+
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from app.config import settings
+from crawlers.ingestion import DocumentIngestor
+
+OPARL_URL = "https://oparl.example.com/oparl/v1"
+
+
+class FakeSession:
+    """Session that answers existence lookups and inserts from a set of registered hashes."""
+
+    def __init__(self, registered: set[str] | None = None, concurrent: set[str] | None = None):
+        self.registered = set(registered or ())
+        # Hashes registered by another crawl between lookup and insert
+        self.concurrent = set(concurrent or ())
+        self.statements: list[str] = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append(str(compiled))
+        if isinstance(stmt, Insert):
+            hashes = [value for key, value in compiled.params.items() if key.startswith("file_hash_m")]
+            inserted = [h for h in hashes if h not in self.registered | self.concurrent]
+            self.registered.update(hashes)
+            return MagicMock(scalars=lambda: MagicMock(all=lambda: inserted))
+        found = [h for h in compiled.params["file_hashes"] if h in self.registered]
+        return MagicMock(scalars=lambda: MagicMock(all=lambda: found))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _session_context(session: FakeSession):
+    @asynccontextmanager
+    async def context():
+        yield session
+
+    return context
+
+
+class TestDocumentIngestor:
+    """Tests for the bulk existence check and insert."""
+
+    async def test_flush_uses_two_statements(self):
+        """Test that a batch is resolved with one ANY lookup and one multi-row insert."""
+        session = FakeSession(registered={"h1"})
+        ingestor = DocumentIngestor(session, uuid.uuid4(), uuid.uuid4(), uuid.uuid4())
+        for i in range(5):
+            ingestor.add(file_hash=f"h{i}", original_url=f"https://example.com/{i}.pdf", document_type="PDF")
+
+        assert await ingestor.flush() == 4
+
+        assert ingestor.round_trips == 2
+        assert ingestor.documents_existing == 1
+        lookup, insert = session.statements
+        assert "documents.file_hash = ANY (" in lookup
+        assert "VALUES" in insert and "_m3" in insert and "_m4" not in insert
+        assert "ON CONFLICT ON CONSTRAINT uq_document_source_hash DO NOTHING" in insert
+
+    async def test_duplicates_within_batch_are_dropped(self):
+        """Test that a hash added twice is registered once."""
+        session = FakeSession()
+        ingestor = DocumentIngestor(session, uuid.uuid4(), uuid.uuid4())
+
+        assert ingestor.add(file_hash="h", original_url="https://example.com/a", document_type="PDF")
+        assert not ingestor.add(file_hash="h", original_url="https://example.com/b", document_type="PDF")
+        assert await ingestor.flush() == 1
+
+    async def test_nothing_new_skips_insert(self):
+        """Test that a batch of known documents costs only the lookup."""
+        session = FakeSession(registered={"a", "b"})
+        ingestor = DocumentIngestor(session, uuid.uuid4(), uuid.uuid4())
+        ingestor.add(file_hash="a", original_url="https://example.com/a", document_type="PDF")
+        ingestor.add(file_hash="b", original_url="https://example.com/b", document_type="PDF")
+
+        assert await ingestor.flush() == 0
+        assert ingestor.round_trips == 1
+        assert await ingestor.flush() == 0
+        assert ingestor.round_trips == 1
+
+    async def test_concurrent_insert_is_not_counted(self):
+        """Test that rows skipped by the conflict clause count as existing, not new."""
+        session = FakeSession(concurrent={"b"})
+        ingestor = DocumentIngestor(session, uuid.uuid4(), uuid.uuid4())
+        ingestor.add(file_hash="a", original_url="https://example.com/a", document_type="PDF")
+        ingestor.add(file_hash="b", original_url="https://example.com/b", document_type="PDF")
+
+        assert await ingestor.flush() == 1
+        assert ingestor.documents_existing == 1
+
+    async def test_large_flush_is_split_into_batches(self):
+        """Test that the batch size bounds the rows per statement."""
+        session = FakeSession()
+        ingestor = DocumentIngestor(session, uuid.uuid4(), uuid.uuid4(), batch_size=2)
+        for i in range(5):
+            ingestor.add(file_hash=f"h{i}", original_url=f"https://example.com/{i}", document_type="PDF")
+
+        assert await ingestor.flush() == 5
+        assert ingestor.round_trips == 6
+
+
+class TestRSSCrawlerIngestion:
+    """Tests for the feed crawler using the ingestion helper."""
+
+    async def test_feed_is_registered_with_two_round_trips(self):
+        """Test that a feed with many items costs one lookup and one insert."""
+        from crawlers.rss_crawler import Feed, FeedItem, RSSCrawler
+
+        items = [FeedItem(id=str(i), title=f"Meldung {i}", link=f"https://example.com/{i}") for i in range(50)]
+        crawler = RSSCrawler()
+        known = crawler._compute_item_hash(items[0])
+        session = FakeSession(registered={known})
+        crawler.fetch_feed = AsyncMock(return_value=Feed("Feed", "", "", "rss", items=items))
+        source = MagicMock(id=uuid.uuid4(), api_endpoint="https://example.com/feed.xml")
+        source.source_type.value = "RSS"
+
+        with patch("app.database.get_session_context", _session_context(session)):
+            result = await crawler.crawl(source, MagicMock(id=uuid.uuid4(), category_id=uuid.uuid4()))
+
+        assert result.documents_new == 49
+        assert result.stats["db_round_trips"] == 2
+        assert session.commits == 1
+
+
+class FakeOparlServer:
+    """OParl endpoint with one body and two pages of papers."""
+
+    def __init__(self, papers_per_page: int):
+        self.papers_per_page = papers_per_page
+
+    def _paper(self, page: int, i: int) -> dict:
+        return {
+            "id": f"{OPARL_URL}/paper/{page}-{i}",
+            "name": f"Drucksache {page}-{i}",
+            "date": "2026-10-01",
+            "mainFile": {"accessUrl": f"{OPARL_URL}/file/{page}-{i}.pdf", "mimeType": "application/pdf"},
+            "auxiliaryFile": [{"accessUrl": f"{OPARL_URL}/file/{page}-{i}-anlage.pdf", "mimeType": "application/pdf"}],
+        }
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/oparl/v1":
+            return httpx.Response(200, json={"body": f"{OPARL_URL}/bodies"})
+        if path == "/oparl/v1/bodies":
+            return httpx.Response(
+                200, json={"data": [{"id": "b1", "name": "Gemeinde", "paper": f"{OPARL_URL}/papers"}]}
+            )
+        if path == "/oparl/v1/papers":
+            page = int(request.url.params.get("page", "1"))
+            links = {"next": f"{OPARL_URL}/papers?page=2"} if page == 1 else {}
+            papers = [self._paper(page, i) for i in range(self.papers_per_page)]
+            return httpx.Response(200, json={"data": papers, "links": links})
+        return httpx.Response(404)
+
+
+class TestOparlCrawlerIngestion:
+    """Tests for the OParl crawler using the ingestion helper."""
+
+    @pytest.fixture
+    def crawler(self):
+        from crawlers.oparl_crawler import OparlCrawler
+
+        server = FakeOparlServer(papers_per_page=30)
+        crawler = OparlCrawler()
+        crawler.client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+        return crawler
+
+    async def test_papers_are_registered_per_page(self, crawler):
+        """Test that each page of papers costs one lookup and one insert."""
+        session = FakeSession()
+        source = MagicMock(id=uuid.uuid4(), api_endpoint=OPARL_URL, last_crawl=None)
+        source.source_type.value = "OPARL_API"
+
+        with (
+            patch("app.database.get_celery_session_context", _session_context(session)),
+            patch.object(settings, "crawler_default_delay", 0),
+        ):
+            result = await crawler.crawl(source, MagicMock(id=uuid.uuid4(), category_id=uuid.uuid4()))
+
+        assert result.errors == []
+        assert result.documents_found == 60
+        assert result.documents_new == 120
+        assert result.stats["db_round_trips"] == 4
+        assert session.commits == 1
+        assert [("ANY" in stmt, "INSERT" in stmt) for stmt in session.statements] == [
+            (True, False),
+            (False, True),
+        ] * 2
+
+    async def test_recrawl_only_looks_up(self, crawler):
+        """Test that a recrawl without new files issues no inserts."""
+        session = FakeSession()
+        source = MagicMock(id=uuid.uuid4(), api_endpoint=OPARL_URL, last_crawl=None)
+        source.source_type.value = "OPARL_API"
+        job = MagicMock(id=uuid.uuid4(), category_id=uuid.uuid4())
+
+        with (
+            patch("app.database.get_celery_session_context", _session_context(session)),
+            patch.object(settings, "crawler_default_delay", 0),
+        ):
+            await crawler.crawl(source, job)
+            crawler.client = httpx.AsyncClient(transport=httpx.MockTransport(FakeOparlServer(30).handler))
+            session.statements.clear()
+            result = await crawler.crawl(source, job)
+
+        assert result.documents_new == 0
+        assert result.stats["db_round_trips"] == 2
+        assert all("ANY" in stmt for stmt in session.statements)
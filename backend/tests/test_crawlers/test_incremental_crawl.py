@@ -0,0 +1,225 @@
+"""Tests for incremental website recrawls with the URL state store."""
+
+import hashlib
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from crawlers.url_state import UrlStateStore, config_fingerprint
+from crawlers.website_crawler import WebsiteCrawler
+
+BASE_URL = "https://gemeinde.example.com"
+
+
+class FixtureSite:
+    """Small municipal website with ETags; /archiv sends no validators."""
+
+    def __init__(self):
+        self.pages = {
+            "/": '<a href="/aktuelles">Aktuelles</a><a href="/archiv">Archiv</a><a href="https://extern.example.org/">X</a>',
+            "/aktuelles": '<a href="/aktuelles/windpark">Windpark</a><a href="/docs/haushalt.pdf">Haushalt</a>',
+            "/aktuelles/windpark": '<h1>Windpark</h1><a href="/docs/beschluss.pdf">Beschluss</a>',
+            "/archiv": '<a href="/docs/archiv.pdf">Archiv</a>',
+        }
+        self.requests: Counter = Counter()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        body = f"<html><body>{self.pages[path]}</body></html>".encode()
+        if path == "/archiv":
+            status = 200
+            response = httpx.Response(200, content=body)
+        else:
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            status = 304 if request.headers.get("if-none-match") == etag else 200
+            response = httpx.Response(status, content=body if status == 200 else b"", headers={"ETag": etag})
+        self.requests[(path, status)] += 1
+        return response
+
+
+@pytest.fixture
+def site():
+    return FixtureSite()
+
+
+@pytest.fixture
+async def crawl_env(site):
+    progress = MagicMock(log_url=AsyncMock(), increment_pages=AsyncMock(), increment_documents=AsyncMock())
+    async with httpx.AsyncClient(transport=httpx.MockTransport(site.handler)) as client:
+        with (
+            patch("crawlers.website_crawler.get_shared_http_client", AsyncMock(return_value=client)),
+            patch("crawlers.website_crawler.crawler_progress", progress),
+            patch.object(settings, "crawler_default_delay", 0),
+        ):
+            yield progress
+
+
+async def _crawl(store: UrlStateStore) -> WebsiteCrawler:
+    crawler = WebsiteCrawler(respect_robots=False)
+    crawler.url_states = store
+    crawler._compile_url_patterns({}, None)
+    crawler._check_and_capture_html = AsyncMock(return_value=False)
+    await crawler._crawl_with_httpx(BASE_URL + "/", 3, 50, ["pdf"], MagicMock(pages_crawled=0), MagicMock(id="job"))
+    for url in crawler.document_urls:
+        store.record_document(url)
+    return crawler
+
+
+class TestIncrementalHttpxCrawl:
+    """Tests for conditional revalidation during the httpx crawl."""
+
+    async def test_first_crawl_fetches_everything(self, site, crawl_env):
+        """Test that a crawl without state downloads every page without conditional headers."""
+        store = UrlStateStore(uuid.uuid4(), uuid.uuid4())
+
+        crawler = await _crawl(store)
+
+        assert set(site.requests) == {(path, 200) for path in site.pages}
+        assert crawler.pages_not_modified_count == 0
+        assert crawler._check_and_capture_html.await_count == 4
+        assert crawler.document_urls == {
+            f"{BASE_URL}/docs/haushalt.pdf",
+            f"{BASE_URL}/docs/beschluss.pdf",
+            f"{BASE_URL}/docs/archiv.pdf",
+        }
+
+    async def test_recrawl_is_mostly_not_modified(self, site, crawl_env):
+        """Test that an unchanged site is revalidated and traversed via the stored links."""
+        store = UrlStateStore(uuid.uuid4(), uuid.uuid4())
+        first = await _crawl(store)
+        site.requests.clear()
+
+        second = await _crawl(store)
+
+        assert site.requests == Counter(
+            {("/", 304): 1, ("/aktuelles", 304): 1, ("/aktuelles/windpark", 304): 1, ("/archiv", 200): 1}
+        )
+        assert second.pages_not_modified_count == 3
+        # The page without validators is recognised by its content hash
+        assert second.pages_unchanged_count == 1
+        second._check_and_capture_html.assert_not_awaited()
+        assert second.document_urls == first.document_urls
+        assert all(store.is_known_document(url) for url in second.document_urls)
+        crawl_env.log_url.assert_any_await("job", f"{BASE_URL}/", status="not_modified")
+
+    async def test_changed_page_is_downloaded(self, site, crawl_env):
+        """Test that a changed page is fetched again and its new links are followed."""
+        store = UrlStateStore(uuid.uuid4(), uuid.uuid4())
+        await _crawl(store)
+        site.requests.clear()
+        site.pages["/aktuelles/windpark"] += '<a href="/docs/nachtrag.pdf">Nachtrag</a>'
+
+        crawler = await _crawl(store)
+
+        assert site.requests[("/aktuelles/windpark", 200)] == 1
+        assert crawler._check_and_capture_html.await_count == 1
+        assert f"{BASE_URL}/docs/nachtrag.pdf" in crawler.document_urls
+        state = store.get(f"{BASE_URL}/aktuelles/windpark")
+        assert (state.check_count, state.change_count) == (2, 1)
+
+    async def test_changed_capture_settings_refetch_pages(self, site, crawl_env):
+        """Test that pages are fetched and checked again after the capture settings changed."""
+        source_id, category_id = uuid.uuid4(), uuid.uuid4()
+        store = UrlStateStore(source_id, category_id, config_fingerprint({"search_terms": ["windpark"]}))
+        await _crawl(store)
+        site.requests.clear()
+        store.config_fingerprint = config_fingerprint({"search_terms": ["windpark", "solar"]})
+
+        crawler = await _crawl(store)
+
+        assert set(site.requests) == {(path, 200) for path in site.pages}
+        assert crawler.pages_unchanged_count == 0
+        assert crawler._check_and_capture_html.await_count == 4
+        assert store.conditional_headers(f"{BASE_URL}/")
+
+
+class TestUrlStateStore:
+    """Tests for loading and persisting the URL state."""
+
+    def test_documents_are_never_revalidated(self):
+        """Test that document URLs produce no conditional headers."""
+        store = UrlStateStore(uuid.uuid4(), uuid.uuid4())
+        store.record_document(f"{BASE_URL}/docs/a.pdf")
+
+        assert store.is_known_document(f"{BASE_URL}/docs/a.pdf")
+        assert store.conditional_headers(f"{BASE_URL}/docs/a.pdf") == {}
+        assert not store.is_known_document(f"{BASE_URL}/docs/b.pdf")
+
+    def test_upsert_statement(self):
+        """Test that touched URLs are written with one upsert on the unique key."""
+        store = UrlStateStore(uuid.uuid4(), uuid.uuid4())
+        response = httpx.Response(200, headers={"ETag": '"abc"', "Last-Modified": "Sun, 18 Oct 2026 08:00:00 GMT"})
+        store.record_page(f"{BASE_URL}/", response, "hash", [f"{BASE_URL}/aktuelles"])
+        store.record_document(f"{BASE_URL}/docs/a.pdf")
+
+        statements = store.upsert_statements()
+
+        assert len(statements) == 1
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_crawl_url_state DO UPDATE" in sql
+        assert store.conditional_headers(f"{BASE_URL}/") == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Sun, 18 Oct 2026 08:00:00 GMT",
+        }
+
+    async def test_save_failure_does_not_raise(self):
+        """Test that a failing upsert is logged and leaves the caller's session usable."""
+        store = UrlStateStore(uuid.uuid4(), uuid.uuid4())
+        store.record_document(f"{BASE_URL}/docs/a.pdf")
+
+        @asynccontextmanager
+        async def savepoint():
+            yield
+
+        session = MagicMock(begin_nested=savepoint, execute=AsyncMock(side_effect=RuntimeError("relation missing")))
+
+        assert await store.save(session) == 0
+
+
+class TestDocumentRegistration:
+    """Tests for registering the found documents."""
+
+    async def test_known_document_without_row_is_registered_again(self, crawl_env):
+        """Test that a document known from the URL state is recreated after its row was deleted."""
+        from app.models import Document
+
+        doc_url = f"{BASE_URL}/docs/haushalt.pdf"
+        added = []
+        session = MagicMock(
+            get=AsyncMock(return_value=MagicMock(search_terms=None, url_include_patterns=[], url_exclude_patterns=[])),
+            execute=AsyncMock(return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(all=list)))),
+            add=added.append,
+            commit=AsyncMock(),
+        )
+
+        @asynccontextmanager
+        async def session_context():
+            yield session
+
+        async def crawl_site(self, *args, **kwargs):
+            self.document_urls.add(doc_url)
+
+        async def load(self, _session):
+            self.record_document(doc_url)
+            return 1
+
+        crawler = WebsiteCrawler(respect_robots=False)
+        source = MagicMock(id=uuid.uuid4(), base_url=BASE_URL + "/", crawl_config={"capture_html_content": False})
+        job = MagicMock(id=uuid.uuid4(), category_id=uuid.uuid4())
+        with (
+            patch("app.database.get_session_context", session_context),
+            patch.object(WebsiteCrawler, "_crawl_with_httpx", crawl_site),
+            patch.object(UrlStateStore, "load", load),
+            patch.object(UrlStateStore, "save", AsyncMock(return_value=1)),
+        ):
+            result = await crawler.crawl(source, job)
+
+        assert result.documents_new == 1
+        assert [doc.original_url for doc in added if isinstance(doc, Document)] == [doc_url]
+        assert crawler.documents_skipped_count == 0
@@ -0,0 +1,340 @@
+"""Tests for incremental SharePoint crawls against a fake Graph server."""
+
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.config import settings
+from crawlers.sharepoint_crawler import DELTA_STATE_KEY, ByteBudget, SharePointCrawler
+from external_apis.clients.sharepoint_client import (
+    SharePointClient,
+    SharePointFile,
+    SharePointNotFoundError,
+    SharePointTokenCache,
+)
+
+GRAPH = "https://graph.microsoft.com/v1.0"
+DRIVE = f"{GRAPH}/sites/site-1/drives/drive-1"
+
+
+class FakeGraphServer:
+    """Minimal Microsoft Graph drive with a change log, paged delta responses and downloads."""
+
+    PAGE_SIZE = 2
+
+    def __init__(self):
+        self.version = 0
+        self.items: dict[str, dict] = {}
+        self.changes: list[tuple[int, str]] = []  # (version, item ID)
+        self.downloads: list[str] = []
+        self.failing_downloads: set[str] = set()
+        self.expired_tokens: set[str] = set()
+        self.put_folder("root", "root", None)
+
+    def _touch(self, item_id: str) -> None:
+        self.version += 1
+        self.changes.append((self.version, item_id))
+
+    def put_folder(self, item_id: str, name: str, parent_id: str | None) -> None:
+        self.items[item_id] = {"id": item_id, "name": name, "folder": {}, "parentReference": {"id": parent_id}}
+        if parent_id is None:
+            self.items[item_id]["root"] = {}
+        self._touch(item_id)
+
+    def put_file(self, item_id: str, name: str, parent_id: str, content: bytes) -> None:
+        self.items[item_id] = {
+            "id": item_id,
+            "name": name,
+            "size": len(content),
+            "file": {"mimeType": "application/pdf"},
+            "parentReference": {"id": parent_id, "driveId": "drive-1"},
+            "lastModifiedDateTime": (datetime(2026, 10, 1, tzinfo=UTC) + timedelta(minutes=self.version)).isoformat(),
+            "@microsoft.graph.downloadUrl": f"https://download.example.com/{item_id}",
+            "content": content,
+        }
+        self._touch(item_id)
+
+    def delete(self, item_id: str) -> None:
+        self.items[item_id] = {"id": item_id, "deleted": {"state": "deleted"}}
+        self._touch(item_id)
+
+    def _item_json(self, item_id: str) -> dict:
+        return {key: value for key, value in self.items[item_id].items() if key != "content"}
+
+    def _delta(self, request: httpx.Request) -> httpx.Response:
+        token = request.url.params.get("token")
+        if token in self.expired_tokens:
+            return httpx.Response(410, json={"error": {"code": "resyncRequired"}})
+        since = int(token) if token else 0
+        changed = list(dict.fromkeys(item_id for version, item_id in self.changes if version > since))
+        if since == 0:
+            # Initial sync: current state only, no tombstones
+            changed = [item_id for item_id in changed if "deleted" not in self.items[item_id]]
+        skip = int(request.url.params.get("skip", 0))
+        page = changed[skip : skip + self.PAGE_SIZE]
+        body: dict = {"value": [self._item_json(item_id) for item_id in page]}
+        if skip + self.PAGE_SIZE < len(changed):
+            body["@odata.nextLink"] = f"{DRIVE}/root/delta?since={since}&skip={skip + self.PAGE_SIZE}" + (
+                f"&token={token}" if token else ""
+            )
+        else:
+            body["@odata.deltaLink"] = f"{DRIVE}/root/delta?token={self.version}"
+        return httpx.Response(200, json=body)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if request.url.host == "download.example.com":
+            item_id = request.url.path.strip("/")
+            if item_id in self.failing_downloads:
+                return httpx.Response(503)
+            self.downloads.append(item_id)
+            return httpx.Response(200, content=self.items[item_id]["content"])
+        if url.startswith(f"{GRAPH}/sites/contoso.sharepoint.com:"):
+            return httpx.Response(200, json={"id": "site-1", "name": "Rat", "displayName": "Rat"})
+        if url == f"{GRAPH}/sites/site-1/drives":
+            return httpx.Response(200, json={"value": [{"id": "drive-1", "name": "Dokumente"}]})
+        if request.url.path.endswith("/root/delta"):
+            return self._delta(request)
+        if request.url.path.startswith("/v1.0/sites/site-1/drives/drive-1/root:/"):
+            name = request.url.path.rsplit("/", 1)[-1]
+            folder = next(item for item in self.items.values() if item.get("name") == name and "folder" in item)
+            return httpx.Response(200, json=self._item_json(folder["id"]))
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def graph():
+    server = FakeGraphServer()
+    server.put_folder("f-beschluesse", "Beschluesse", "root")
+    server.put_folder("f-2026", "2026", "f-beschluesse")
+    server.put_folder("f-intern", "Intern", "root")
+    server.put_file("a", "Haushalt.pdf", "f-beschluesse", b"Haushalt " * 100)
+    server.put_file("b", "Windpark.pdf", "f-2026", b"Windpark " * 100)
+    server.put_file("c", "Protokoll.pdf", "f-intern", b"Protokoll " * 100)
+    return server
+
+
+@pytest.fixture
+def environment(graph, tmp_path):
+    """Patch client transport, token, storage and database session."""
+
+    class FakeGraphClient(SharePointClient):
+        async def __aenter__(self):
+            self._client = httpx.AsyncClient(transport=httpx.MockTransport(graph.handler))
+            self._token_cache = SharePointTokenCache("token", datetime.now(UTC) + timedelta(hours=1))
+            return self
+
+    session = MagicMock()
+    session.execute = AsyncMock(
+        return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None), rowcount=1),
+    )
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+
+    @asynccontextmanager
+    async def session_context():
+        yield session
+
+    with (
+        patch("crawlers.sharepoint_crawler.SharePointClient", lambda: FakeGraphClient(timeout=5)),
+        patch("app.database.get_celery_session_context", session_context),
+        patch.object(settings, "document_storage_path", str(tmp_path)),
+    ):
+        yield session
+
+
+def _source(**config) -> SimpleNamespace:
+    crawl_config = {"site_url": "contoso.sharepoint.com:/sites/Rat", **config}
+    return SimpleNamespace(id=uuid4(), name="Ratsinformation", crawl_config=crawl_config, extra_data={})
+
+
+def _job() -> SimpleNamespace:
+    return SimpleNamespace(id=uuid4(), category_id=uuid4())
+
+
+class TestSharePointDeltaCrawl:
+    """Tests for delta-token based SharePoint crawls."""
+
+    async def test_first_crawl_enumerates_library(self, graph, environment, tmp_path):
+        """Test that the initial sync downloads all files and stores the delta token."""
+        source = _source()
+
+        result = await SharePointCrawler().crawl(source, _job())
+
+        assert result.errors == []
+        assert sorted(graph.downloads) == ["a", "b", "c"]
+        assert result.documents_new == 3
+        assert result.stats["delta_sync"] == "full"
+        assert result.stats["bytes_downloaded"] == sum(len(graph.items[i]["content"]) for i in "abc")
+        assert source.extra_data[DELTA_STATE_KEY]["token"] == str(graph.version)
+        stored = sorted(path.read_bytes() for path in tmp_path.rglob("*.pdf"))
+        assert stored == sorted(graph.items[i]["content"] for i in "abc")
+        assert not list(tmp_path.rglob("*.part"))
+
+    async def test_recrawl_only_fetches_changes(self, graph, environment):
+        """Test that a recrawl downloads changed files only and marks deleted ones."""
+        source = _source()
+        crawler = SharePointCrawler()
+        await crawler.crawl(source, _job())
+        graph.downloads.clear()
+        graph.put_file("a", "Haushalt.pdf", "f-beschluesse", b"Nachtragshaushalt " * 100)
+        graph.put_file("d", "Neu.pdf", "f-2026", b"Neu " * 10)
+        graph.delete("c")
+
+        result = await crawler.crawl(source, _job())
+
+        assert sorted(graph.downloads) == ["a", "d"]
+        assert result.stats["delta_sync"] == "incremental"
+        assert result.stats["files_deleted"] == 1
+        update = environment.execute.await_args_list[-1].args[0]
+        assert update.table.name == "documents"
+        assert "processing_status" in str(update)
+
+    async def test_unchanged_library_downloads_nothing(self, graph, environment):
+        """Test that an unchanged library needs only the delta request."""
+        source = _source()
+        crawler = SharePointCrawler()
+        await crawler.crawl(source, _job())
+        graph.downloads.clear()
+
+        result = await crawler.crawl(source, _job())
+
+        assert graph.downloads == []
+        assert result.documents_found == 0
+        assert result.stats["delta_sync"] == "incremental"
+
+    async def test_expired_token_triggers_resync(self, graph, environment):
+        """Test that a 410 answer falls back to a full enumeration."""
+        source = _source()
+        crawler = SharePointCrawler()
+        await crawler.crawl(source, _job())
+        graph.expired_tokens.add(source.extra_data[DELTA_STATE_KEY]["token"])
+        graph.downloads.clear()
+
+        result = await crawler.crawl(source, _job())
+
+        assert result.errors == []
+        assert result.stats["delta_sync"] == "full"
+        assert sorted(graph.downloads) == ["a", "b", "c"]
+
+    async def test_folder_scope_follows_new_subfolders(self, graph, environment):
+        """Test that a configured folder includes subfolders created after the first crawl."""
+        source = _source(folder_path="Beschluesse")
+        crawler = SharePointCrawler()
+        await crawler.crawl(source, _job())
+        assert sorted(graph.downloads) == ["a", "b"]
+        graph.downloads.clear()
+        graph.put_folder("f-2027", "2027", "f-beschluesse")
+        graph.put_file("e", "Planung.pdf", "f-2027", b"Planung")
+        graph.put_file("f", "Notiz.pdf", "f-intern", b"Notiz")
+
+        await crawler.crawl(source, _job())
+
+        assert graph.downloads == ["e"]
+        assert "f-2027" in source.extra_data[DELTA_STATE_KEY]["folder_ids"]
+
+    async def test_failed_download_keeps_token(self, graph, environment):
+        """Test that the delta token is not advanced when a change could not be processed."""
+        source = _source()
+        crawler = SharePointCrawler()
+        await crawler.crawl(source, _job())
+        token = source.extra_data[DELTA_STATE_KEY]["token"]
+        graph.put_file("d", "Neu.pdf", "f-2026", b"Neu")
+        graph.failing_downloads.add("d")
+
+        with patch("asyncio.sleep", AsyncMock()):
+            result = await crawler.crawl(source, _job())
+
+        assert len(result.errors) == 1
+        assert source.extra_data[DELTA_STATE_KEY]["token"] == token
+
+
+class TestStreamedDownload:
+    """Tests for chunked downloads to disk."""
+
+    def _file(self, item_id: str, download_url: str | None = "https://download.example.com/x") -> SharePointFile:
+        return SharePointFile(
+            id=item_id,
+            name="Haushalt.pdf",
+            size=0,
+            mime_type="application/pdf",
+            web_url="",
+            download_url=download_url,
+            created_at=None,
+            modified_at=None,
+            created_by=None,
+            modified_by=None,
+            parent_path="",
+            site_id="site-1",
+            drive_id="drive-1",
+        )
+
+    async def test_stream_to_disk(self, tmp_path):
+        """Test that content is written in chunks and hashed on the way."""
+        content = bytes(range(256)) * 1000
+        chunks = []
+
+        async def body():
+            for offset in range(0, len(content), 4096):
+                chunks.append(offset)
+                yield content[offset : offset + 4096]
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+        destination = tmp_path / "datei.part"
+        async with SharePointClient(timeout=5) as client:
+            client._client = httpx.AsyncClient(transport=transport)
+            size, digest = await client.download_file_to_path(self._file("x"), destination, chunk_size=4096)
+
+        assert size == len(content)
+        assert digest == hashlib.sha256(content).hexdigest()
+        assert destination.read_bytes() == content
+        assert len(chunks) > 1
+
+    async def test_missing_file_leaves_no_partial(self, tmp_path):
+        """Test that a failed download removes the destination."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(404))
+        destination = tmp_path / "datei.part"
+        async with SharePointClient(timeout=5) as client:
+            client._client = httpx.AsyncClient(transport=transport)
+            with pytest.raises(SharePointNotFoundError):
+                await client.download_file_to_path(self._file("x"), destination)
+
+        assert not destination.exists()
+
+
+class TestByteBudget:
+    """Tests for bytes-in-flight limited concurrency."""
+
+    async def _run(self, budget: ByteBudget, sizes: list[int]) -> int:
+        running = peak = 0
+
+        async def download(size: int) -> None:
+            nonlocal running, peak
+            await budget.acquire(size)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            await budget.release(size)
+
+        await asyncio.gather(*(download(size) for size in sizes))
+        return peak
+
+    async def test_small_files_run_in_parallel(self):
+        """Test that many small files share the budget."""
+        assert await self._run(ByteBudget(100), [10] * 8) == 8
+
+    async def test_large_files_are_serialized(self):
+        """Test that large files wait for budget and oversized files still run alone."""
+        budget = ByteBudget(100)
+
+        assert await self._run(budget, [60, 60, 60]) == 1
+        assert await self._run(budget, [500, 10]) == 1
+        assert budget.in_flight == 0
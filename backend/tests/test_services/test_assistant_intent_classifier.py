@@ -0,0 +1,174 @@
+"""Tests for the tiered assistant intent classifier."""
+
+import hashlib
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.assistant import AssistantContext, IntentType, ViewMode
+from services.assistant.intent_classifier import (
+    classify_by_examples,
+    classify_by_rules,
+    reset_example_index,
+)
+
+
+def _fake_embedding(text: str) -> list[float]:
+    """Deterministic bag-of-words embedding (identical wording -> similarity 1)."""
+    vector = [0.0] * 64
+    for word in re.findall(r"\w+", text.lower()):
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0  # noqa: S324
+    return vector
+
+
+@pytest.fixture
+def fake_embeddings():
+    reset_example_index()
+    with (
+        patch(
+            "app.utils.similarity.generate_embeddings_batch",
+            AsyncMock(side_effect=lambda texts, session=None: [_fake_embedding(t) for t in texts]),
+        ) as batch,
+        patch(
+            "app.utils.similarity.generate_embedding",
+            AsyncMock(side_effect=lambda text, session=None: _fake_embedding(text)),
+        ),
+    ):
+        yield batch
+    reset_example_index()
+
+
+def _context(entity: bool = False) -> AssistantContext:
+    return AssistantContext(
+        current_route="/entities/gemeinde/gummersbach" if entity else "/",
+        current_entity_id=str(uuid4()) if entity else None,
+        current_entity_type="gemeinde" if entity else None,
+        view_mode=ViewMode.DETAIL if entity else ViewMode.DASHBOARD,
+    )
+
+
+class TestRuleTier:
+    """Tests for deterministic rules."""
+
+    @pytest.mark.parametrize(
+        ("message", "intent", "data"),
+        [
+            ("Geh zu Gummersbach", IntentType.NAVIGATION, {"target_entity": "Gummersbach"}),
+            ("Navigiere zu Max Mueller!", IntentType.NAVIGATION, {"target_entity": "Max Mueller"}),
+            ("Was weißt du über Bad Rodach?", IntentType.ENTITY_INFO, {"target_entity": "Bad Rodach"}),
+            ("Was kannst du mir über Köln sagen?", IntentType.ENTITY_INFO, {"target_entity": "Köln"}),
+            ("Wie funktioniert das?", IntentType.HELP, {}),
+            ("Fasse zusammen", IntentType.SUMMARIZE, {}),
+        ],
+    )
+    def test_obvious_patterns(self, message, intent, data):
+        """Test that unambiguous messages are classified without I/O."""
+        match = classify_by_rules(message)
+
+        assert match is not None
+        assert (match.intent, match.data, match.tier) == (intent, data, "rules")
+
+    @pytest.mark.parametrize("message", ["Zeige Pain Points in NRW", "Geht es Gummersbach gut?"])
+    def test_other_messages_pass_through(self, message):
+        """Test that messages without a rule are left to the next tiers."""
+        assert classify_by_rules(message) is None
+
+
+class TestExampleTier:
+    """Tests for the kNN tier over example embeddings."""
+
+    async def test_known_query_is_classified(self, fake_embeddings):
+        """Test that a message close to query examples is answered locally."""
+        match = await classify_by_examples(MagicMock(), "Zeige alle Gemeinden in Bayern", _context())
+
+        assert match is not None
+        assert match.intent == IntentType.QUERY
+        assert match.data == {"query_text": "Zeige alle Gemeinden in Bayern"}
+        assert match.tier == "knn"
+
+    async def test_index_is_built_once(self, fake_embeddings):
+        """Test that the example matrix is embedded once per process."""
+        await classify_by_examples(MagicMock(), "Zeige Pain Points", _context())
+        await classify_by_examples(MagicMock(), "Welche Events gibt es?", _context())
+
+        fake_embeddings.assert_awaited_once()
+
+    async def test_write_intents_defer_to_llm(self, fake_embeddings):
+        """Test that intents needing extracted fields are never answered locally."""
+        match = await classify_by_examples(
+            MagicMock(), "Füge allen Gemeinden in NRW einen Pain Point hinzu", _context()
+        )
+
+        assert match is None
+
+    async def test_entity_intents_need_entity_context(self, fake_embeddings):
+        """Test that context queries without a current entity go to the LLM."""
+        message = "Welche Relationen hat diese Entity?"
+
+        assert await classify_by_examples(MagicMock(), message, _context(entity=False)) is None
+        match = await classify_by_examples(MagicMock(), message, _context(entity=True))
+        assert match is not None
+        assert match.intent == IntentType.CONTEXT_QUERY
+
+    async def test_unrelated_message_defers_to_llm(self, fake_embeddings):
+        """Test that low-confidence messages fall through."""
+        assert await classify_by_examples(MagicMock(), "Quartalsbericht Budget Freigabe", _context()) is None
+
+    async def test_missing_embeddings_disable_tier(self):
+        """Test that the tier is skipped when no embedding credentials exist."""
+        reset_example_index()
+        with patch(
+            "app.utils.similarity.generate_embeddings_batch",
+            AsyncMock(side_effect=lambda texts, session=None: [None] * len(texts)),
+        ) as batch:
+            assert await classify_by_examples(MagicMock(), "Zeige Pain Points", _context()) is None
+            assert await classify_by_examples(MagicMock(), "Zeige Pain Points", _context()) is None
+
+        batch.assert_awaited_once()
+        reset_example_index()
+
+
+class TestAssistantClassification:
+    """Tests for the tier order in AssistantService._classify_intent."""
+
+    async def test_llm_only_for_uncertain_messages(self, fake_embeddings):
+        """Test that local hits skip the LLM and each tier is counted."""
+        from app.monitoring.metrics import assistant_intent_classifications_total
+        from services.assistant_service import AssistantService
+
+        service = AssistantService(MagicMock())
+        service._classify_intent_llm = AsyncMock(return_value=(IntentType.BATCH_ACTION, {"batch_action_type": "x"}))
+
+        def count(tier, intent):
+            return assistant_intent_classifications_total.labels(tier=tier, intent=intent.value)._value.get()
+
+        before = {
+            "rules": count("rules", IntentType.NAVIGATION),
+            "knn": count("knn", IntentType.QUERY),
+            "llm": count("llm", IntentType.BATCH_ACTION),
+        }
+
+        assert (await service._classify_intent("Geh zu Gummersbach", _context()))[0] == IntentType.NAVIGATION
+        assert (await service._classify_intent("Zeige Pain Points", _context()))[0] == IntentType.QUERY
+        assert (await service._classify_intent("Füge allen Gemeinden einen Pain Point hinzu", _context()))[
+            0
+        ] == IntentType.BATCH_ACTION
+
+        service._classify_intent_llm.assert_awaited_once()
+        assert count("rules", IntentType.NAVIGATION) == before["rules"] + 1
+        assert count("knn", IntentType.QUERY) == before["knn"] + 1
+        assert count("llm", IntentType.BATCH_ACTION) == before["llm"] + 1
+
+    async def test_local_tiers_can_be_disabled(self):
+        """Test that the LLM classifies everything when local tiers are off."""
+        from services.assistant_service import AssistantService
+
+        service = AssistantService(MagicMock())
+        service._classify_intent_llm = AsyncMock(return_value=(IntentType.HELP, {}))
+
+        with patch("services.assistant_service.settings.assistant_intent_local_enabled", False):
+            await service._classify_intent("Geh zu Gummersbach", _context())
+
+        service._classify_intent_llm.assert_awaited_once()
@@ -0,0 +1,234 @@
+"""Tests for speculative execution in the streaming assistant pipeline."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.assistant import AssistantContext, IntentType, ViewMode
+from services.assistant.intent_classifier import IntentMatch
+from services.assistant.pipeline import SpeculativePipeline
+
+CLASSIFY_DELAY = 0.2
+QUERY_DELAY = 0.3
+
+COUNT_RESULT = {
+    "query_type": "count",
+    "total": 3,
+    "message": "Gefunden: 3 Gemeinden",
+    "query_interpretation": {"primary_entity_type": "Gemeinden"},
+}
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield MagicMock()
+
+
+class _FakeLLM:
+    """Fake classification and smart query with configurable delays."""
+
+    def __init__(self, intent: IntentType, intent_data: dict | None = None):
+        self.intent = intent
+        self.intent_data = intent_data or {}
+        self.queries: list[str] = []
+        self.cancelled_queries = 0
+
+    async def classify(self, message, context):
+        await asyncio.sleep(CLASSIFY_DELAY)
+        return self.intent, self.intent_data
+
+    def smart_query_service(self, session):
+        service = MagicMock()
+
+        async def smart_query(question, allow_write=False):
+            self.queries.append(question)
+            try:
+                await asyncio.sleep(QUERY_DELAY)
+            except asyncio.CancelledError:
+                self.cancelled_queries += 1
+                raise
+            return COUNT_RESULT
+
+        service.smart_query = smart_query
+        return service
+
+
+@pytest.fixture
+def fake_llm():
+    def install(intent: IntentType, intent_data: dict | None = None, hint: IntentType | None = IntentType.QUERY):
+        fake = _FakeLLM(intent, intent_data)
+        hint_match = IntentMatch(intent=hint, data={}, confidence=0.5, tier="knn") if hint else None
+        patches = [
+            patch("services.assistant_service.nearest_intent", AsyncMock(return_value=hint_match)),
+            patch("services.assistant_service.get_session_context", _fake_session),
+            patch("services.assistant_service.SmartQueryService", side_effect=fake.smart_query_service),
+            patch("services.assistant.query_handler.SmartQueryService", side_effect=fake.smart_query_service),
+        ]
+        for p in patches:
+            p.start()
+        installed.extend(patches)
+        return fake
+
+    installed: list = []
+    yield install
+    for p in installed:
+        p.stop()
+
+
+async def _stream(message: str, fake: _FakeLLM, context: AssistantContext | None = None):
+    from services.assistant_service import AssistantService
+
+    service = AssistantService(MagicMock())
+    service._classify_intent_llm = fake.classify
+    context = context or AssistantContext(current_route="/", view_mode=ViewMode.DASHBOARD)
+
+    start = time.perf_counter()
+    events = []
+    async for event in service.process_message_stream(message, context, []):
+        events.append((time.perf_counter() - start, event))
+    return events
+
+
+class TestSpeculativePipeline:
+    """Tests for the branch executor."""
+
+    async def test_events_stream_before_main_finishes(self):
+        """Test that emitted events are yielded while the main coroutine runs."""
+        pipeline = SpeculativePipeline()
+
+        async def main():
+            pipeline.emit({"type": "status", "message": "früh"})
+            await asyncio.sleep(0.1)
+            return "fertig"
+
+        received = []
+        start = time.perf_counter()
+        async for event in pipeline.run(main()):
+            received.append((time.perf_counter() - start, event))
+
+        assert received[0][1]["message"] == "früh"
+        assert received[0][0] < 0.05
+        assert pipeline.result == "fertig"
+
+    async def test_cancel_and_failures(self):
+        """Test that cancelled and failed branches yield no result."""
+        pipeline = SpeculativePipeline()
+        slow = asyncio.Event()
+
+        async def never():
+            await slow.wait()
+
+        async def fails():
+            raise RuntimeError("kaputt")
+
+        pipeline.start("slow", never)
+        pipeline.start("fails", fails)
+        pipeline.cancel("slow")
+
+        assert await pipeline.take("slow") is None
+        assert await pipeline.take("fails") is None
+        assert await pipeline.take("unbekannt") is None
+
+    async def test_run_cancels_remaining_branches(self):
+        """Test that unused branches do not outlive the request."""
+        pipeline = SpeculativePipeline()
+        cancelled = asyncio.Event()
+
+        async def branch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def main():
+            pipeline.start("branch", branch)
+            await asyncio.sleep(0)
+
+        async for _ in pipeline.run(main()):
+            pass
+
+        assert cancelled.is_set()
+
+
+class TestStreamingSpeculation:
+    """End-to-end latency of process_message_stream with a fake LLM."""
+
+    async def test_query_runs_during_classification(self, fake_llm):
+        """Test that a likely query overlaps with the LLM classification."""
+        fake = fake_llm(IntentType.QUERY, {"query_text": "Wie viele Gemeinden gibt es?"})
+
+        events = await _stream("Wie viele Gemeinden gibt es?", fake)
+
+        types = [event["type"] for _, event in events]
+        assert types == ["status", "status", "intent", "complete"]
+        assert fake.queries == ["Wie viele Gemeinden gibt es?"]
+        elapsed, complete = events[-1]
+        assert complete["data"]["response"]["message"] == "Gefunden: 3 Gemeinden"
+        assert elapsed < CLASSIFY_DELAY + QUERY_DELAY - 0.1
+
+    async def test_sequential_without_speculation(self, fake_llm):
+        """Test the baseline latency when speculation is disabled."""
+        fake = fake_llm(IntentType.QUERY)
+
+        with patch("services.assistant_service.settings.assistant_speculation_enabled", False):
+            events = await _stream("Wie viele Gemeinden gibt es?", fake)
+
+        assert fake.queries == ["Wie viele Gemeinden gibt es?"]
+        assert events[-1][0] >= CLASSIFY_DELAY + QUERY_DELAY
+
+    async def test_unneeded_query_is_cancelled(self, fake_llm):
+        """Test that the speculative query is cancelled for other intents."""
+        fake = fake_llm(IntentType.HELP, {"help_topic": "Suche"})
+
+        events = await _stream("Wie suche ich nach Gemeinden?", fake)
+
+        assert events[-1][1]["data"]["response"]["type"] == "help"
+        assert fake.cancelled_queries == 1
+
+    async def test_rewritten_query_is_not_reused(self, fake_llm):
+        """Test that a query rewritten by the classifier runs again."""
+        fake = fake_llm(IntentType.QUERY, {"query_text": "Anzahl Gemeinden"})
+
+        await _stream("Wie viele Gemeinden gibt es eigentlich?", fake)
+
+        assert fake.queries == ["Wie viele Gemeinden gibt es eigentlich?", "Anzahl Gemeinden"]
+        assert fake.cancelled_queries == 1
+
+    async def test_no_speculation_without_query_hint(self, fake_llm):
+        """Test that no LLM work is speculated when the examples do not suggest a query."""
+        fake = fake_llm(IntentType.QUERY, hint=IntentType.BATCH_ACTION)
+
+        await _stream("Wie viele Gemeinden gibt es?", fake)
+
+        assert fake.queries == ["Wie viele Gemeinden gibt es?"]
+        assert fake.cancelled_queries == 0
+
+    async def test_entity_context_is_prefetched(self, fake_llm):
+        """Test that the entity context loads during classification and is reused."""
+        fake = fake_llm(IntentType.CONTEXT_QUERY, hint=None)
+        entity_id = str(uuid4())
+        entity_data = {"name": "Gummersbach", "type_slug": "gemeinde"}
+        context = AssistantContext(
+            current_route=f"/entities/gemeinde/{entity_id}",
+            current_entity_id=entity_id,
+            view_mode=ViewMode.DETAIL,
+        )
+
+        with (
+            patch("services.assistant_service.build_entity_context", AsyncMock(return_value=entity_data)) as prefetch,
+            patch("services.assistant.query_handler.build_entity_context", AsyncMock()) as sequential,
+            patch(
+                "services.assistant.query_handler.generate_context_response_with_ai",
+                AsyncMock(return_value="Gummersbach liegt in NRW."),
+            ),
+        ):
+            events = await _stream("Wo liegt das?", fake, context)
+
+        prefetch.assert_awaited_once()
+        sequential.assert_not_awaited()
+        assert events[-1][1]["data"]["response"]["message"] == "Gummersbach liegt in NRW."
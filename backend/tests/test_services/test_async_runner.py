@@ -0,0 +1,115 @@
+"""Tests for running Celery task bodies on a persistent worker event loop."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+
+from app import database
+from crawlers import website_crawler
+from workers import async_runner
+from workers.async_runner import on_worker_loop, run_async, start_worker_loop, stop_worker_loop
+
+
+def _tasks_run(loop: str) -> float:
+    return REGISTRY.get_sample_value("celery_async_tasks_total", {"loop": loop}) or 0
+
+
+@pytest.fixture
+def worker_loop():
+    with (
+        patch("app.database.reset_celery_engine") as reset_engine,
+        patch("app.database.dispose_celery_engine_async", AsyncMock()) as dispose_engine,
+    ):
+        loop = start_worker_loop()
+        yield loop, reset_engine, dispose_engine
+        stop_worker_loop()
+        asyncio.set_event_loop(None)
+
+
+async def _current_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+class TestPersistentWorkerLoop:
+    """Tests for the event loop of a worker process."""
+
+    def test_tasks_share_loop_and_engine(self, worker_loop):
+        """Test that all tasks run on the worker loop without resetting the engine."""
+        loop, reset_engine, _ = worker_loop
+        reset_engine.reset_mock()
+        before = _tasks_run("persistent")
+
+        loops = [run_async(_current_loop()) for _ in range(3)]
+
+        assert loops == [loop] * 3
+        reset_engine.assert_not_called()
+        assert _tasks_run("persistent") - before == 3
+        assert run_async(self._on_worker_loop()) is True
+
+    def test_loop_bound_clients_are_reused(self, worker_loop):
+        """Test that the shared HTTP client survives between tasks and is closed on shutdown."""
+        _, _, dispose_engine = worker_loop
+        with patch.object(website_crawler, "_http_client", None):
+            first = run_async(website_crawler.get_shared_http_client())
+            second = run_async(website_crawler.get_shared_http_client())
+
+            assert first is second
+            stop_worker_loop()
+
+            assert first.is_closed
+            dispose_engine.assert_awaited_once()
+
+    def test_interrupted_task_does_not_resume(self, worker_loop):
+        """Test that a task interrupted outside its coroutine is cancelled before the next one runs."""
+        loop, _, _ = worker_loop
+        events = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                events.append("cancelled")
+                raise
+
+        def interrupt():
+            raise KeyboardInterrupt
+
+        loop.call_later(0.01, interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            run_async(slow())
+
+        assert events == ["cancelled"]
+        assert run_async(_current_loop()) is loop
+
+    @staticmethod
+    async def _on_worker_loop() -> bool:
+        return on_worker_loop()
+
+
+class TestPerTaskLoop:
+    """Tests for the mode without a worker loop."""
+
+    def test_new_loop_per_task(self):
+        """Test that each task gets its own loop and the engine is reset around it."""
+        assert async_runner._worker_loop is None
+        before = _tasks_run("per_task")
+
+        with patch("app.database.reset_celery_engine") as reset_engine:
+            first = run_async(_current_loop())
+            second = run_async(_current_loop())
+
+        assert first is not second and first.is_closed()
+        assert reset_engine.call_count == 4
+        assert _tasks_run("per_task") - before == 2
+        asyncio.set_event_loop(None)
+
+
+def test_celery_engine_counts_connections():
+    """Test that the Celery engine reports every new database connection."""
+    with patch.object(database, "_celery_engine", None), patch.object(database, "_celery_session_factory", None):
+        engine = database.get_celery_engine()
+
+        assert event.contains(engine.sync_engine, "connect", database._count_celery_connection)
@@ -0,0 +1,142 @@
+"""Tests for the indexed crawl scheduler."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import Category
+from app.utils.cron import get_schedule_timezone
+
+
+def _category(cron: str = "0 2 * * *", next_run_at: datetime | None = None) -> Category:
+    category = Category(
+        id=uuid4(),
+        name="Windkraft",
+        slug="windkraft",
+        purpose="Windkraft-Beschlüsse",
+        schedule_cron=cron,
+        schedule_enabled=True,
+        schedule_owner_id=uuid4(),
+    )
+    category.next_run_at = next_run_at
+    return category
+
+
+def _session(categories: list[Category], source_rows: list[tuple]) -> MagicMock:
+    category_result = MagicMock()
+    category_result.scalars.return_value.all.return_value = categories
+    source_result = MagicMock()
+    source_result.all.return_value = source_rows
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[category_result, source_result])
+    session.commit = AsyncMock()
+    return session
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCollectDueCrawls:
+    """Tests for selecting due categories and sources."""
+
+    async def test_idle_tick_needs_one_query(self):
+        """Test that a tick without due categories stops after the indexed lookup."""
+        from workers.crawl_tasks import collect_due_crawls
+
+        session = _session([], [])
+
+        due = await collect_due_crawls(session, datetime.now(get_schedule_timezone()))
+
+        assert due == []
+        assert session.execute.await_count == 1
+        sql = _sql(session.execute.await_args.args[0])
+        assert "categories.next_run_at <=" in sql
+        assert "FOR UPDATE SKIP LOCKED" in sql
+
+    async def test_due_category_is_advanced(self):
+        """Test that due sources are returned and the schedule moves to the next fire."""
+        from workers.crawl_tasks import collect_due_crawls
+
+        now = datetime.now(get_schedule_timezone())
+        first, second = _category(), _category(cron="*/15 * * * *")
+        source_a, source_b = uuid4(), uuid4()
+        session = _session([first, second], [(source_a, first.id), (source_b, second.id)])
+
+        due = await collect_due_crawls(session, now)
+
+        assert due == [
+            (str(source_a), str(first.id), str(first.schedule_owner_id)),
+            (str(source_b), str(second.id), str(second.schedule_owner_id)),
+        ]
+        assert now < second.next_run_at <= now + timedelta(minutes=15)
+        assert now < first.next_run_at <= now + timedelta(days=1)
+        # Both categories are resolved in one source query
+        assert session.execute.await_count == 2
+        sql = _sql(session.execute.await_args.args[0])
+        assert "CASE data_source_categories.category_id" in sql
+        assert "data_sources.last_crawl IS NOT NULL" in sql
+
+    async def test_invalid_cron_is_skipped(self):
+        """Test that a broken schedule does not block the others."""
+        from workers.crawl_tasks import collect_due_crawls
+
+        broken = _category(cron="kaputt")
+        session = _session([broken], [])
+
+        assert await collect_due_crawls(session, datetime.now(get_schedule_timezone())) == []
+        assert session.execute.await_count == 1
+        assert broken.next_run_at is None
+
+    def test_schedule_change_resets_next_run(self):
+        """Test that editing the schedule makes the category due for evaluation."""
+        category = _category(next_run_at=datetime.now(get_schedule_timezone()) + timedelta(days=1))
+
+        category.schedule_cron = "0 4 * * *"
+
+        assert category.next_run_at is None
+
+
+class TestCheckScheduledCrawls:
+    """Tests for dispatching the scheduler tick."""
+
+    def _run(self, session, due):
+        from workers.crawl_tasks import check_scheduled_crawls
+
+        @asynccontextmanager
+        async def session_context():
+            yield session
+
+        with (
+            patch("app.database.get_celery_session_context", session_context),
+            patch("workers.crawl_tasks.collect_due_crawls", AsyncMock(return_value=due)),
+            patch("workers.crawl_tasks.run_async", asyncio.run),
+            patch("celery.group") as group,
+        ):
+            check_scheduled_crawls()
+        return group
+
+    def test_jobs_are_published_as_one_group(self):
+        """Test that all due crawls are sent in a single group before committing."""
+        session = MagicMock(commit=AsyncMock())
+        due = [(str(uuid4()), "kategorie", "besitzer") for _ in range(3)]
+
+        group = self._run(session, due)
+
+        group.assert_called_once()
+        signatures = list(group.call_args.args[0])
+        assert [sig.args for sig in signatures] == [tuple(row) for row in due]
+        group.return_value.apply_async.assert_called_once()
+        session.commit.assert_awaited_once()
+
+    def test_nothing_published_when_idle(self):
+        """Test that an idle tick publishes nothing."""
+        session = MagicMock(commit=AsyncMock())
+
+        group = self._run(session, [])
+
+        group.assert_not_called()
@@ -475,3 +475,432 @@ class TestSummaryHelpers:
             reason="No changes needed",
         )
         assert should_notify_user(no_update_result, notification_threshold=0.5) is False
+
+
+class TestWidgetExecutionPlanner:
+    """Tests for deduplicated, concurrent widget execution."""
+
+    @staticmethod
+    def _widget(query_config):
+        widget = MagicMock()
+        widget.id = uuid.uuid4()
+        widget.query_config = query_config
+        return widget
+
+    def test_fingerprint_ignores_presentation_and_order(self):
+        """Test that widgets with the same query share a fingerprint."""
+        from services.summaries.widget_planner import widget_query_fingerprint
+
+        table = {"entity_type": "municipality", "facet_types": ["pain_point", "contact"], "title": "Tabelle"}
+        chart = {"facet_types": ["contact", "pain_point"], "entity_type": "municipality", "title": "Diagramm"}
+        other = {"entity_type": "municipality", "facet_types": ["contact"]}
+
+        assert widget_query_fingerprint(table) == widget_query_fingerprint(chart)
+        assert widget_query_fingerprint(table) != widget_query_fingerprint(other)
+
+    def test_plan_groups_identical_queries(self):
+        """Test that identical queries are planned once."""
+        from services.summaries.widget_planner import plan_widget_execution
+
+        widgets = [
+            self._widget({"entity_type": "municipality"}),
+            self._widget({"entity_type": "person"}),
+            self._widget({"entity_type": "municipality"}),
+        ]
+
+        groups = plan_widget_execution(widgets)
+
+        assert len(groups) == 2
+        assert groups[0].widgets == [widgets[0], widgets[2]]
+
+    @pytest.mark.asyncio
+    async def test_planner_runs_distinct_queries_concurrently(self):
+        """Test that wall-clock time approaches the slowest widget."""
+        import asyncio
+        import time
+
+        from services.summaries.widget_planner import WidgetExecutionPlanner
+
+        calls = []
+
+        async def run_query(widget, cache):
+            calls.append(widget.id)
+            await asyncio.sleep(0.1)
+            return {"data": [{"entity_type": widget.query_config["entity_type"]}], "total": 1}
+
+        widgets = [self._widget({"entity_type": f"type_{i % 4}"}) for i in range(8)]
+        planner = WidgetExecutionPlanner(run_query, max_concurrency=4)
+
+        start = time.monotonic()
+        cached_data = await planner.execute(widgets)
+        elapsed = time.monotonic() - start
+
+        assert len(calls) == 4
+        assert elapsed < 0.3
+        assert list(cached_data) == [f"widget_{w.id}" for w in widgets]
+        assert cached_data[f"widget_{widgets[1].id}"] == cached_data[f"widget_{widgets[5].id}"]
+
+    @pytest.mark.asyncio
+    async def test_planner_isolates_widget_failures(self):
+        """Test that a failing or slow widget doesn't abort the others."""
+        import asyncio
+
+        from services.summaries.widget_planner import WidgetExecutionPlanner
+
+        async def run_query(widget, cache):
+            kind = widget.query_config["entity_type"]
+            if kind == "broken":
+                raise RuntimeError("boom")
+            if kind == "slow":
+                await asyncio.sleep(1)
+            return {"data": [], "total": 0}
+
+        widgets = [
+            self._widget({"entity_type": "ok"}),
+            self._widget({"entity_type": "broken"}),
+            self._widget({"entity_type": "slow"}),
+        ]
+        cached_data = await WidgetExecutionPlanner(run_query, timeout_seconds=0.05).execute(widgets)
+
+        assert "error" not in cached_data[f"widget_{widgets[0].id}"]
+        assert cached_data[f"widget_{widgets[1].id}"]["error"] == "boom"
+        assert cached_data[f"widget_{widgets[2].id}"]["timeout"] is True
+
+    @pytest.mark.asyncio
+    async def test_query_cache_single_flight(self):
+        """Test that concurrent loads of the same key run the loader once."""
+        import asyncio
+
+        from services.summaries.widget_planner import WidgetQueryCache
+
+        cache = WidgetQueryCache()
+        loads = 0
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.01)
+            return {"value": 1}
+
+        results = await asyncio.gather(*(cache.get_or_load(("facet_values", "scope"), loader) for _ in range(5)))
+
+        assert loads == 1
+        assert all(result == {"value": 1} for result in results)
+        assert cache.hits == 4
+
+    @pytest.mark.asyncio
+    async def test_query_cache_retries_after_failed_load(self):
+        """Test that waiters reload when the first loader fails."""
+        import asyncio
+
+        from services.summaries.widget_planner import WidgetQueryCache
+
+        cache = WidgetQueryCache()
+        attempts = 0
+
+        async def loader():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            if attempts == 1:
+                raise RuntimeError("connection lost")
+            return "ok"
+
+        results = await asyncio.gather(
+            cache.get_or_load("key", loader),
+            cache.get_or_load("key", loader),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == "ok"
+
+    def test_facet_slugs_union_per_scope(self):
+        """Test that widgets on the same scope load the union of facet types."""
+        from services.summaries.widget_planner import WidgetQueryCache, entity_scope_key
+
+        cache = WidgetQueryCache()
+        cache.register_widgets(
+            [
+                self._widget({"entity_type": "municipality", "facet_types": ["pain_point"]}),
+                self._widget({"entity_type": "municipality", "facet_types": ["contact"]}),
+                self._widget({"entity_type": "person", "facet_types": ["role"]}),
+            ]
+        )
+
+        scope = entity_scope_key("municipality", {})
+        assert cache.facet_slugs_for(scope, ["pain_point"]) == ["contact", "pain_point"]
+
+    @pytest.mark.asyncio
+    async def test_shared_facet_load_limits_per_facet_type(self):
+        """Test that the facet value limit of a shared load applies per facet type."""
+        from types import SimpleNamespace
+
+        from sqlalchemy.dialects import postgresql
+
+        from services.summaries.executor import SummaryExecutor
+
+        entity_id, pain_point_id, contact_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        facet_types = [
+            SimpleNamespace(id=pain_point_id, slug="pain_point"),
+            SimpleNamespace(id=contact_id, slug="contact"),
+        ]
+        facet_values = MagicMock()
+        facet_values.all.return_value = [
+            SimpleNamespace(
+                entity_id=entity_id,
+                facet_type_id=contact_id,
+                value={"name": "A"},
+                confidence_score=0.8,
+                source_type=None,
+            )
+        ]
+        session = MagicMock(execute=AsyncMock(side_effect=[facet_types, facet_values]))
+
+        result = await SummaryExecutor(session)._load_facet_values([entity_id], ["pain_point", "contact"])
+
+        sql = str(session.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY facet_values.facet_type_id" in sql
+        assert "LIMIT" not in sql
+        assert result == {entity_id: {"contact": {"value": {"name": "A"}, "confidence": 0.8, "source_type": None}}}
+
+
+class TestSummaryInputFingerprint:
+    """Tests for change-aware summary scheduling."""
+
+    @staticmethod
+    def _summary(widgets):
+        summary = MagicMock()
+        summary.id = uuid.uuid4()
+        summary.widgets = widgets
+        return summary
+
+    @staticmethod
+    def _widget(query_config):
+        widget = MagicMock()
+        widget.id = uuid.uuid4()
+        widget.query_config = query_config
+        return widget
+
+    @staticmethod
+    def _session(rows):
+        session = AsyncMock()
+        result = MagicMock()
+        result.all.return_value = rows
+        session.execute = AsyncMock(return_value=result)
+        return session
+
+    def test_get_summary_inputs(self):
+        """Test that referenced entity and facet types are collected."""
+        from services.summaries.input_fingerprint import get_summary_inputs
+
+        summary = self._summary(
+            [
+                self._widget({"entity_type": "municipality", "facet_types": ["pain_point"]}),
+                self._widget({"entity_type": "person", "facet_types": ["contact", "pain_point"]}),
+                self._widget({}),
+            ]
+        )
+
+        assert get_summary_inputs(summary) == (["municipality", "person"], ["contact", "pain_point"])
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_changes_with_inputs(self):
+        """Test that the fingerprint only changes when referenced data changes."""
+        from services.summaries.input_fingerprint import compute_input_fingerprint
+
+        summary = self._summary([self._widget({"entity_type": "municipality", "facet_types": ["pain_point"]})])
+        updated = datetime(2026, 1, 1, tzinfo=UTC)
+
+        def row(kind, slug, count, max_updated_at):
+            return MagicMock(kind=kind, slug=slug, row_count=count, max_updated_at=max_updated_at)
+
+        rows = [row("entity_type", "municipality", 10, updated), row("facet_type", "pain_point", 5, updated)]
+        fp1 = await compute_input_fingerprint(self._session(rows), summary)
+        fp2 = await compute_input_fingerprint(self._session(list(rows)), summary)
+        assert fp1 == fp2
+
+        changed = [row("entity_type", "municipality", 10, updated), row("facet_type", "pain_point", 6, updated)]
+        assert await compute_input_fingerprint(self._session(changed), summary) != fp1
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_without_inputs_skips_query(self):
+        """Test that summaries without data widgets need no query."""
+        from services.summaries.input_fingerprint import compute_input_fingerprint
+
+        session = self._session([])
+        await compute_input_fingerprint(session, self._summary([self._widget({})]))
+
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_executor_skips_unchanged_inputs(self):
+        """Test that widget queries don't run when inputs are unchanged."""
+        from app.models.summary_execution import ExecutionStatus
+        from services.summaries.executor import SummaryExecutor
+
+        summary = self._summary([self._widget({"entity_type": "municipality"})])
+        summary.last_data_hash = "a" * 64
+        summary.last_input_fingerprint = "b" * 64
+
+        no_running = MagicMock()
+        no_running.scalar_one_or_none.return_value = None
+        loaded = MagicMock()
+        loaded.scalar_one_or_none.return_value = summary
+
+        session = AsyncMock()
+        session.add = MagicMock()
+        session.execute = AsyncMock(side_effect=[no_running, loaded])
+        executor = SummaryExecutor(session)
+
+        with (
+            patch.object(executor, "_compute_input_fingerprint", AsyncMock(return_value="b" * 64)),
+            patch.object(executor, "_execute_widget_query", AsyncMock()) as widget_query,
+        ):
+            execution = await executor.execute_summary(summary.id, triggered_by="cron")
+
+        assert execution.status == ExecutionStatus.SKIPPED
+        assert execution.has_changes is False
+        widget_query.assert_not_called()
+
+
+class TestExportRendering:
+    """Tests for offline map rendering and the export cache."""
+
+    def test_static_map_svg(self):
+        """Test that maps render offline with escaped marker names."""
+        from services.summaries.static_map import render_static_map_svg
+
+        svg = render_static_map_svg(
+            [
+                {"lat": 52.52, "lng": 13.40, "name": "Berlin <Mitte>"},
+                {"lat": 48.14, "lng": 11.58, "name": "München"},
+            ],
+            boundaries=[{"type": "Polygon", "coordinates": [[[6, 47], [15, 47], [15, 55], [6, 55], [6, 47]]]}],
+        )
+
+        assert svg.startswith("<svg")
+        assert svg.count("<circle") == 2
+        assert "Berlin &lt;Mitte&gt;" in svg
+        assert "http" not in svg.replace("http://www.w3.org/2000/svg", "")
+
+    def test_static_map_points_inside_canvas(self):
+        """Test that projected points stay within the padded map area."""
+        import re
+
+        from services.summaries.static_map import MAP_HEIGHT, MAP_PADDING, MAP_WIDTH, render_static_map_svg
+
+        svg = render_static_map_svg([{"lat": 54.3, "lng": 10.1}, {"lat": 47.6, "lng": 7.6}, {"lat": 51.0, "lng": 14.9}])
+
+        for cx, cy in re.findall(r'cx="([\d.]+)" cy="([\d.]+)"', svg):
+            assert MAP_PADDING <= float(cx) <= MAP_WIDTH - MAP_PADDING
+            assert MAP_PADDING <= float(cy) <= MAP_HEIGHT - MAP_PADDING
+
+    def test_static_map_requires_points(self):
+        """Test that rendering without points fails."""
+        from services.summaries.static_map import render_static_map_svg
+
+        with pytest.raises(ValueError):
+            render_static_map_svg([])
+
+    @staticmethod
+    def _summary():
+        widget = MagicMock()
+        widget.id = uuid.uuid4()
+        widget.widget_type = "table"
+        widget.title = "Tabelle"
+        widget.subtitle = None
+        widget.position_x = 0
+        widget.position_y = 0
+        widget.visualization_config = {}
+
+        summary = MagicMock()
+        summary.id = uuid.uuid4()
+        summary.name = "Test"
+        summary.description = None
+        summary.status = "active"
+        summary.updated_at = datetime(2026, 1, 1, tzinfo=UTC)
+        summary.widgets = [widget]
+        return summary
+
+    def test_export_cache_key(self):
+        """Test that the cache key changes with data and presentation."""
+        from services.summaries.render_service import make_export_cache_key
+
+        summary = self._summary()
+        execution = MagicMock(id=uuid.uuid4(), data_hash="a" * 64)
+
+        key = make_export_cache_key(summary, execution, "pdf")
+        assert key == make_export_cache_key(summary, execution, "pdf")
+        assert key != make_export_cache_key(summary, execution, "xlsx")
+
+        changed_data = MagicMock(id=execution.id, data_hash="b" * 64)
+        assert key != make_export_cache_key(summary, changed_data, "pdf")
+
+        summary.widgets[0].title = "Neuer Titel"
+        assert key != make_export_cache_key(summary, execution, "pdf")
+
+    @pytest.mark.asyncio
+    async def test_export_cache_roundtrip_and_expiry(self, tmp_path):
+        """Test that cached exports are returned until they expire."""
+        import os
+        import time
+
+        from services.summaries.render_service import ExportCache
+
+        cache = ExportCache(str(tmp_path), ttl=60)
+        assert await cache.get("key", "pdf") is None
+
+        await cache.set("key", "pdf", b"%PDF-1.7")
+        assert await cache.get("key", "pdf") == b"%PDF-1.7"
+
+        old = time.time() - 120
+        os.utime(tmp_path / "key.pdf", (old, old))
+        assert await cache.get("key", "pdf") is None
+        assert not (tmp_path / "key.pdf").exists()
+
+    @pytest.mark.asyncio
+    async def test_export_cache_write_sweeps_expired_entries(self, tmp_path):
+        """Test that the writing process removes expired exports, at most once per interval."""
+        import os
+        import time
+
+        from services.summaries.render_service import ExportCache
+
+        old = time.time() - 120
+        for name in ("stale.pdf", "later.xlsx"):
+            (tmp_path / name).write_bytes(b"alt")
+        os.utime(tmp_path / "stale.pdf", (old, old))
+        cache = ExportCache(str(tmp_path), ttl=60)
+
+        await cache.set("new", "pdf", b"%PDF-1.7")
+        os.utime(tmp_path / "later.xlsx", (old, old))
+        await cache.set("next", "pdf", b"%PDF-1.7")
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["later.xlsx", "new.pdf", "next.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_export_to_pdf_serves_cache_without_rendering(self, tmp_path):
+        """Test that repeat downloads skip rendering."""
+        from services.summaries.export_service import SummaryExportService
+        from services.summaries.render_service import ExportCache, make_export_cache_key
+
+        summary = self._summary()
+        summary_result = MagicMock()
+        summary_result.scalar_one_or_none.return_value = summary
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=summary_result)
+
+        cache = ExportCache(str(tmp_path), ttl=60)
+        service = SummaryExportService(session)
+
+        with (
+            patch.object(service, "_get_execution", AsyncMock(return_value=None)),
+            patch("services.summaries.export_service.get_export_cache", return_value=cache),
+            patch("services.summaries.export_service.render_pdf", AsyncMock(return_value=b"%PDF-new")) as render,
+        ):
+            await cache.set(make_export_cache_key(summary, None, "pdf"), "pdf", b"%PDF-cached")
+            pdf_bytes = await service.export_to_pdf(summary.id)
+
+        assert pdf_bytes == b"%PDF-cached"
+        render.assert_not_called()
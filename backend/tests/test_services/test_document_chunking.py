@@ -0,0 +1,214 @@
+"""Tests for chunked (map-reduce) document analysis."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from workers.ai_tasks.chunking import count_tokens, merge_chunk_results, split_into_chunks
+
+
+def _pages(count: int, words_per_page: int = 300) -> str:
+    return "\n\n".join(
+        f"=== SEITE {n} von {count} ===\n" + " ".join(f"wort{n}_{i}" for i in range(words_per_page))
+        for n in range(1, count + 1)
+    )
+
+
+class TestSplitIntoChunks:
+    """Tests for token-aware splitting."""
+
+    def test_short_text_is_single_chunk(self):
+        """Test that texts within the budget are not split."""
+        assert split_into_chunks("Kurzer Text", 1000) == ["Kurzer Text"]
+
+    def test_chunks_respect_budget_and_page_boundaries(self):
+        """Test that pages stay together and no chunk exceeds the budget."""
+        text = _pages(12)
+        page_tokens = count_tokens(text) // 12
+
+        chunks = split_into_chunks(text, page_tokens * 3)
+
+        assert len(chunks) > 1
+        assert all(count_tokens(chunk) <= page_tokens * 3 for chunk in chunks)
+        assert all(chunk.startswith("=== SEITE") for chunk in chunks)
+
+    def test_no_text_is_dropped(self):
+        """Test that all pages end up in exactly one chunk."""
+        text = _pages(20)
+
+        chunks = split_into_chunks(text, 500)
+
+        for n in range(1, 21):
+            assert sum(f"=== SEITE {n} von 20 ===" in chunk for chunk in chunks) == 1
+        assert sum(chunk.count("wort") for chunk in chunks) == text.count("wort")
+
+    def test_oversized_page_is_split_on_lines(self):
+        """Test that a single page larger than the budget is split further."""
+        text = "\n".join(f"Zeile {i} mit etwas Inhalt zum Zählen" for i in range(2000))
+
+        chunks = split_into_chunks(text, 300)
+
+        assert len(chunks) > 1
+        assert all(count_tokens(chunk) <= 300 for chunk in chunks)
+        assert "\n".join(chunks) == text
+
+
+class TestMergeChunkResults:
+    """Tests for the deterministic merge of chunk extractions."""
+
+    def test_lists_are_concatenated_and_deduplicated(self):
+        """Test that similar facet values from several chunks are kept once."""
+        merged = merge_chunk_results(
+            [
+                {"pain_points": [{"description": "Lärmbelästigung durch Windräder", "severity": "hoch"}]},
+                {
+                    "pain_points": [
+                        {"description": "Lärmbelästigung durch Windräder", "severity": "mittel"},
+                        {"description": "Artenschutz Rotmilan"},
+                    ]
+                },
+            ]
+        )
+
+        assert [p["description"] for p in merged["pain_points"]] == [
+            "Lärmbelästigung durch Windräder",
+            "Artenschutz Rotmilan",
+        ]
+
+    def test_scalar_rules(self):
+        """Test relevance, ratings, summaries and first-value rules."""
+        merged = merge_chunk_results(
+            [
+                {"is_relevant": False, "relevanz": "gering", "summary": "Teil A", "municipality": "Musterstadt"},
+                {"is_relevant": True, "relevanz": "hoch", "summary": "Teil B", "municipality": None},
+            ]
+        )
+
+        assert merged["is_relevant"] is True
+        assert merged["relevanz"] == "hoch"
+        assert merged["summary"] == "Teil A\n\nTeil B"
+        assert merged["municipality"] == "Musterstadt"
+
+    def test_merge_is_deterministic(self):
+        """Test that the merge only depends on the chunk order."""
+        results = [{"b": [1, 2], "a": {"x": "hoch"}}, {"a": {"x": "mittel", "y": 1}, "b": [2, 3]}]
+
+        assert merge_chunk_results(results) == merge_chunk_results(json.loads(json.dumps(results)))
+        assert merge_chunk_results(results) == {"b": [1, 2, 3], "a": {"x": "hoch", "y": 1}}
+
+
+@asynccontextmanager
+async def _no_governor(*args, **kwargs):
+    yield
+
+
+def _response(content: dict):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=json.dumps(content)))]
+    response.usage = MagicMock(prompt_tokens=100, completion_tokens=10, total_tokens=110)
+    return response
+
+
+@pytest.fixture
+def chunked_env():
+    client = MagicMock()
+    with (
+        patch(
+            "services.llm_client_service.LLMClientService.get_system_client",
+            AsyncMock(return_value=(client, {"type": "azure"})),
+        ),
+        patch("services.llm_client_service.LLMClientService.get_model_name", return_value="gpt-4o"),
+        patch("workers.ai_tasks.document_analyzer.governed_llm_call", _no_governor),
+        patch("workers.ai_tasks.document_analyzer.record_llm_usage", AsyncMock()),
+        patch("workers.ai_tasks.document_analyzer.settings.ai_analysis_chunk_tokens", 500),
+        patch("workers.ai_tasks.document_analyzer.settings.ai_analysis_chunk_concurrency", 2),
+        patch("services.llm_response_cache.get_cached_response", AsyncMock(return_value=None)),
+        patch("services.llm_response_cache.get_cached_responses", AsyncMock(return_value={})),
+        patch("services.llm_response_cache.store_response", AsyncMock()) as store,
+    ):
+        yield client, store
+
+
+class TestAnalysisTimeLimits:
+    """Tests for time limits scaled with the chunk count."""
+
+    def test_limits_scale_with_chunks(self):
+        """Test that single-chunk documents keep the task default and long ones get more time."""
+        from workers.ai_tasks.document_analyzer import (
+            ANALYSIS_HARD_LIMIT_MARGIN,
+            ANALYSIS_SOFT_TIME_LIMIT,
+            MAX_ANALYSIS_SOFT_TIME_LIMIT,
+            analysis_time_limits,
+        )
+
+        assert analysis_time_limits(1) == (
+            ANALYSIS_SOFT_TIME_LIMIT,
+            ANALYSIS_SOFT_TIME_LIMIT + ANALYSIS_HARD_LIMIT_MARGIN,
+        )
+        soft, hard = analysis_time_limits(6)
+        assert soft > ANALYSIS_SOFT_TIME_LIMIT and hard > soft
+        assert analysis_time_limits(1000)[0] == MAX_ANALYSIS_SOFT_TIME_LIMIT
+
+    async def test_estimate_reuses_split(self, chunked_env):
+        """Test that the estimate counts the analysis chunks, which are not tokenized again."""
+        from workers.ai_tasks import chunking
+        from workers.ai_tasks.document_analyzer import _estimate_chunk_count
+
+        text = _pages(12)
+        with patch("workers.ai_tasks.chunking.count_tokens", wraps=chunking.count_tokens) as counter:
+            chunk_count = await _estimate_chunk_count(AsyncMock(), text)
+            counted = counter.call_count
+
+            assert chunk_count == len(split_into_chunks(text, 500, "gpt-4o")) > 1
+            assert counter.call_count == counted
+
+
+class TestChunkedAnalysis:
+    """Tests for the map-reduce path of _call_azure_openai."""
+
+    async def test_long_text_is_analyzed_in_parallel_chunks(self, chunked_env):
+        """Test that all chunks are analyzed with bounded concurrency and merged."""
+        from workers.ai_tasks.document_analyzer import _call_azure_openai
+
+        client, store = chunked_env
+        running = 0
+        max_running = 0
+
+        async def create(**kwargs):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return _response({"is_relevant": True, "pain_points": [f"Problem {uuid4().hex}"]})
+
+        client.chat.completions.create = AsyncMock(side_effect=create)
+
+        result = await _call_azure_openai(AsyncMock(), _pages(10, words_per_page=50), "Prompt", "test")
+
+        calls = client.chat.completions.create.await_count
+        assert calls > 1
+        assert max_running == 2
+        assert len(result["content"]["pain_points"]) == calls
+        assert result["tokens_used"] == 110 * calls
+        # Every chunk plus the merged document result
+        assert store.await_count == calls + 1
+
+    async def test_failed_chunk_fails_analysis(self, chunked_env):
+        """Test that a failed chunk is never silently dropped."""
+        from workers.ai_tasks.document_analyzer import _call_azure_openai
+
+        client, store = chunked_env
+        client.chat.completions.create = AsyncMock(
+            side_effect=[_response({"is_relevant": True})] * 3 + [TimeoutError("timeout")] * 20
+        )
+
+        with pytest.raises(RuntimeError, match="Textabschnitten fehlgeschlagen"):
+            await _call_azure_openai(AsyncMock(), _pages(10), "Prompt", "test")
+
+        # Successful chunks are still cached for the retry
+        assert store.await_count == 3
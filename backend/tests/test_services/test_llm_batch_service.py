@@ -0,0 +1,368 @@
+"""Tests for offline LLM batch inference."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from services.llm_batch_service import (
+    BatchRequest,
+    LocalFileBatchBackend,
+    parse_result_line,
+    poll_batch,
+    poll_pending_batches,
+    register_batch_handler,
+    submit_batch,
+)
+
+ANALYSIS_CONTENT = {"is_relevant": True, "summary": "Windpark geplant", "pain_points": []}
+
+
+async def _responder(body):
+    if "FEHLER" in body["messages"][-1]["content"]:
+        raise RuntimeError("Inhaltsfilter ausgelöst")
+    return {
+        "choices": [{"message": {"role": "assistant", "content": json.dumps(ANALYSIS_CONTENT)}}],
+        "usage": {"prompt_tokens": 800, "completion_tokens": 100, "total_tokens": 900},
+    }
+
+
+def _request(custom_id: str, text: str) -> BatchRequest:
+    return BatchRequest(
+        custom_id=custom_id,
+        body={"model": "gpt-4o-batch", "messages": [{"role": "user", "content": text}]},
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    with patch("services.llm_batch_service.settings.llm_batch_storage_path", str(tmp_path)):
+        yield tmp_path
+
+
+class TestResultParsing:
+    """Tests for parsing provider output lines."""
+
+    def test_success_line(self):
+        """Test that content and usage are read from a 200 response."""
+        result = parse_result_line(
+            {
+                "custom_id": "a",
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [{"message": {"content": "{}"}}],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+                    },
+                },
+                "error": None,
+            }
+        )
+
+        assert result.content == "{}"
+        assert (result.prompt_tokens, result.completion_tokens) == (10, 5)
+        assert result.error is None
+
+    def test_http_error_line(self):
+        """Test that non-200 responses become errors."""
+        result = parse_result_line(
+            {
+                "custom_id": "a",
+                "response": {"status_code": 429, "body": {"error": {"message": "Rate limit"}}},
+            }
+        )
+
+        assert result.content is None
+        assert result.error == "Rate limit"
+
+    def test_error_line(self):
+        """Test that lines of the error file become errors."""
+        result = parse_result_line({"custom_id": "a", "response": None, "error": {"message": "Timeout"}})
+
+        assert result.error == "Timeout"
+
+
+class TestLocalBatchRoundTrip:
+    """Tests for submit and poll against the local file backend."""
+
+    async def test_results_reach_handler(self, storage):
+        """Test that every item reaches the handler with its result."""
+        handler = AsyncMock()
+        register_batch_handler("test_roundtrip", handler)
+        backend = LocalFileBatchBackend(storage / "local", _responder)
+        session = MagicMock()
+        session.flush = AsyncMock()
+
+        job = await submit_batch(
+            session,
+            backend,
+            "test_roundtrip",
+            "gpt-4o-batch",
+            [_request("ok", "Dokument"), _request("bad", "FEHLER")],
+            {"ok": {"document_id": "1"}, "bad": {"document_id": "2"}},
+        )
+
+        input_lines = [json.loads(line) for line in Path(job.input_file_path).read_text().splitlines()]
+        assert [line["url"] for line in input_lines] == ["/chat/completions"] * 2
+        assert job.status == "submitted"
+
+        assert await poll_batch(session, backend, job) is True
+
+        results = handler.await_args.args[2]
+        assert json.loads(results["ok"].content) == ANALYSIS_CONTENT
+        assert results["bad"].error == "Inhaltsfilter ausgelöst"
+        assert (job.status, job.completed_count, job.failed_count) == ("completed", 1, 1)
+
+    async def test_pending_batch_is_not_finished(self, storage):
+        """Test that a batch without results stays in progress."""
+        handler = AsyncMock()
+        register_batch_handler("test_pending", handler)
+        backend = LocalFileBatchBackend(storage / "local")
+        session = MagicMock()
+        session.flush = AsyncMock()
+
+        job = await submit_batch(session, backend, "test_pending", "gpt-4o-batch", [_request("a", "Text")], {"a": {}})
+
+        assert await poll_batch(session, backend, job) is False
+        assert job.status == "in_progress"
+        handler.assert_not_awaited()
+
+    async def test_handled_batch_files_are_removed(self, storage):
+        """Test that the files of a batch are deleted once its results are committed."""
+        register_batch_handler("test_cleanup", AsyncMock())
+        backend = LocalFileBatchBackend(storage / "local", _responder)
+        session = MagicMock()
+        session.flush = AsyncMock()
+        session.commit = AsyncMock()
+        job = await submit_batch(session, backend, "test_cleanup", "gpt-4o-batch", [_request("a", "Text")], {"a": {}})
+        ids_result = MagicMock()
+        ids_result.scalars.return_value.all.return_value = [job.id]
+        session.execute = AsyncMock(return_value=ids_result)
+        session.get = AsyncMock(return_value=job)
+
+        assert await poll_pending_batches(session, backend) == {"checked": 1, "finished": 1}
+
+        assert list(storage.rglob("*.jsonl")) == []
+
+    async def test_failed_job_does_not_affect_next(self):
+        """Test that jobs are reloaded by id after a rollback and failures are logged by id."""
+        job_ids = [uuid4(), uuid4()]
+        jobs = {job_id: MagicMock(id=job_id, status="submitted", input_file_path=None) for job_id in job_ids}
+        ids_result = MagicMock()
+        ids_result.scalars.return_value.all.return_value = job_ids
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=ids_result)
+        session.get = AsyncMock(side_effect=lambda model, job_id, **kwargs: jobs[job_id])
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        poll = AsyncMock(side_effect=[RuntimeError("Provider nicht erreichbar"), True])
+
+        with (
+            patch("services.llm_batch_service.poll_batch", poll),
+            patch("services.llm_batch_service.logger") as logger,
+        ):
+            stats = await poll_pending_batches(session, MagicMock())
+
+        assert stats == {"checked": 2, "finished": 1}
+        assert [call.args[1] for call in session.get.await_args_list] == job_ids
+        session.rollback.assert_awaited_once()
+        session.commit.assert_awaited_once()
+        assert logger.exception.call_args.kwargs["batch_job_id"] == str(job_ids[0])
+
+
+class TestDocumentAnalysisHandler:
+    """Tests for feeding batch results into the extraction pipeline."""
+
+    @staticmethod
+    def _job(items):
+        job = MagicMock(id=uuid4(), model="gpt-4o-batch", status="expired", items=items, submitted_at=None)
+        return job
+
+    async def test_results_are_stored_and_missing_requeued(self):
+        """Test success, failure and requeue of missing results."""
+        from app.models import ProcessingStatus
+        from services.llm_batch_service import BatchResult
+        from workers.ai_tasks import batch_inference
+
+        ids = [str(uuid4()) for _ in range(3)]
+        items = {
+            doc_id: {
+                "document_id": doc_id,
+                "category_id": str(uuid4()),
+                "page_numbers": None,
+                "cache_key": "k" * 64,
+                "content_key": None,
+                "prompt_hash": "p" * 64,
+            }
+            for doc_id in ids
+        }
+        documents = {doc_id: MagicMock(id=doc_id, processing_status=None) for doc_id in ids}
+        session = MagicMock()
+        session.get = AsyncMock(side_effect=lambda model, key: documents.get(str(key), MagicMock(purpose="test")))
+        session.begin_nested = MagicMock(return_value=AsyncMock())
+        results = {
+            ids[0]: BatchResult(custom_id=ids[0], content=json.dumps(ANALYSIS_CONTENT), prompt_tokens=8),
+            ids[1]: BatchResult(custom_id=ids[1], error="Inhaltsfilter"),
+            ids[2]: None,
+        }
+
+        with (
+            patch("services.llm_response_cache.store_response", AsyncMock()) as store,
+            patch.object(batch_inference, "record_llm_usage", AsyncMock()) as record,
+            patch.object(batch_inference, "_store_analysis_result", AsyncMock()) as apply,
+            patch("workers.ai_tasks.analyze_document.delay") as requeue,
+        ):
+            await batch_inference._handle_document_analysis_results(session, self._job(items), results)
+
+        assert documents[ids[0]].processing_status == ProcessingStatus.COMPLETED
+        assert apply.await_args.args[4]["content"] == ANALYSIS_CONTENT
+        store.assert_awaited_once()
+        assert record.await_args.kwargs["metadata"]["batch_job_id"]
+        assert documents[ids[1]].processing_status == ProcessingStatus.FAILED
+        assert "Inhaltsfilter" in documents[ids[1]].processing_error
+        requeue.assert_called_once_with(ids[2])
+
+    async def test_batch_analyze_routes_to_batch(self):
+        """Test that batch_analyze submits one batch when enabled."""
+        from workers.ai_tasks import batch_analyze
+
+        with (
+            patch("workers.ai_tasks.document_analyzer.settings.llm_batch_enabled", True),
+            patch("workers.ai_tasks.submit_analysis_batch.delay") as submit,
+            patch("workers.ai_tasks.analyze_document.delay") as single,
+        ):
+            batch_analyze(["a", "b"])
+
+        submit.assert_called_once_with(["a", "b"])
+        single.assert_not_called()
+
+
+class TestPySisEnrichmentBatch:
+    """Tests for submitting PySis FacetValue enrichment as batch."""
+
+    SCHEMA = {"properties": {"description": {"type": "string"}, "status": {"type": "string"}}}
+
+    async def test_enrichment_round_trip(self, storage):
+        """Test that submitted enrichments are merged and complete the AITask."""
+        from app.models import AITaskStatus
+        from workers.ai_tasks import batch_inference
+
+        async def responder(body):
+            return {
+                "choices": [{"message": {"content": json.dumps({"status": "genehmigt", "unbekannt": "x"})}}],
+                "usage": {"prompt_tokens": 50, "completion_tokens": 10},
+            }
+
+        facet_type = MagicMock(value_schema=self.SCHEMA)
+        complete = MagicMock(id=uuid4(), value={"description": "Windpark", "status": "geplant"}, facet_type=facet_type)
+        to_enrich = MagicMock(id=uuid4(), value={"description": "Windpark"}, facet_type=facet_type)
+        entity = MagicMock(id=uuid4())
+        entity.name = "Musterstadt"
+        ai_task = MagicMock(status=AITaskStatus.RUNNING, progress_total=2, progress_current=0, fields_extracted=None)
+        session = MagicMock()
+        session.flush = AsyncMock()
+        session.get = AsyncMock(side_effect=lambda model, key, **kwargs: to_enrich if key == to_enrich.id else ai_task)
+        backend = LocalFileBatchBackend(storage / "local", responder)
+        added = []
+        session.add = added.append
+
+        fallback = await batch_inference._submit_pysis_enrichment_batch(
+            session,
+            entity,
+            [complete, to_enrich],
+            [{"name": "status", "value": "genehmigt"}],
+            False,
+            "gpt-4o",
+            uuid4(),
+            backend=backend,
+        )
+
+        assert fallback == []
+        (job,) = added
+        assert list(job.items) == [str(to_enrich.id)]
+        assert ai_task.progress_current == 1
+
+        with (
+            patch.object(batch_inference, "record_llm_usage", AsyncMock()),
+            patch("workers.ai_tasks.enrich_facet_values_from_pysis.delay") as requeue,
+        ):
+            assert await poll_batch(session, backend, job) is True
+
+        assert to_enrich.value == {"description": "Windpark", "status": "genehmigt"}
+        assert (ai_task.status, ai_task.progress_current, ai_task.fields_extracted) == (AITaskStatus.COMPLETED, 2, 1)
+        requeue.assert_not_called()
+
+    async def test_partial_submission_leaves_completion_to_handler(self, storage):
+        """Test that values run synchronously besides a batch keep the task running until its results."""
+        from app.models import AITaskStatus
+        from workers.ai_tasks import batch_inference
+
+        async def responder(body):
+            return {"choices": [{"message": {"content": json.dumps({"status": "genehmigt"})}}], "usage": {}}
+
+        async def submit(*args):
+            if submit.calls == 0:
+                submit.calls += 1
+                raise RuntimeError("Upload fehlgeschlagen")
+            return await submit_batch(*args)
+
+        submit.calls = 0
+        facet_type = MagicMock(value_schema=self.SCHEMA)
+        values = [MagicMock(id=uuid4(), value={"description": "Windpark"}, facet_type=facet_type) for _ in range(2)]
+        entity = MagicMock(id=uuid4())
+        entity.name = "Musterstadt"
+        ai_task = MagicMock(status=AITaskStatus.RUNNING, progress_total=2, progress_current=0, fields_extracted=0)
+        by_id = {fv.id: fv for fv in values}
+        session = MagicMock()
+        session.flush = AsyncMock()
+        session.get = AsyncMock(side_effect=lambda model, key, **kwargs: by_id.get(key, ai_task))
+        backend = LocalFileBatchBackend(storage / "local", responder)
+        added = []
+        session.add = added.append
+
+        with (
+            patch.object(batch_inference.settings, "llm_batch_max_requests", 1),
+            patch.object(batch_inference, "submit_batch", submit),
+        ):
+            fallback = await batch_inference._submit_pysis_enrichment_batch(
+                session, entity, values, [{"name": "status", "value": "genehmigt"}], False, "gpt-4o", uuid4(), backend
+            )
+
+        assert fallback == [values[0]]
+        assert (ai_task.status, ai_task.progress_current) == (AITaskStatus.RUNNING, 0)
+
+        # The synchronous loop counts its value on top of the batch progress
+        ai_task.progress_current += 1
+        with patch.object(batch_inference, "record_llm_usage", AsyncMock()):
+            assert await poll_batch(session, backend, added[0]) is True
+
+        assert (ai_task.status, ai_task.progress_current) == (AITaskStatus.COMPLETED, 2)
+
+    async def test_missing_results_fall_back_to_sync(self):
+        """Test that enrichments of an expired batch are requeued without the batch path."""
+        from workers.ai_tasks import batch_inference
+
+        fv_id, entity_id, task_id = str(uuid4()), str(uuid4()), str(uuid4())
+        job = MagicMock(
+            id=uuid4(),
+            model="gpt-4o-batch",
+            status="expired",
+            items={
+                fv_id: {
+                    "facet_value_id": fv_id,
+                    "entity_id": entity_id,
+                    "ai_task_id": task_id,
+                    "overwrite_existing": True,
+                }
+            },
+        )
+        session = MagicMock()
+        session.get = AsyncMock()
+
+        with patch("workers.ai_tasks.enrich_facet_values_from_pysis.delay") as requeue:
+            await batch_inference._handle_pysis_enrichment_results(session, job, {fv_id: None})
+
+        requeue.assert_called_once_with(entity_id, None, True, task_id, facet_value_ids=[fv_id], use_batch=False)
+        session.get.assert_not_awaited()
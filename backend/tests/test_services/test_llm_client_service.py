@@ -0,0 +1,129 @@
+"""Tests for LLM client pooling and config caching."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.user_api_credentials import LLMPurpose
+from services import llm_client_service
+from services.llm_client_service import (
+    LLMClientService,
+    get_pooled_client,
+    invalidate_llm_config_cache,
+)
+
+AZURE_CONFIG = {
+    "type": "azure",
+    "endpoint": "https://example.openai.azure.com",
+    "api_key": "key-1",
+    "api_version": "2025-04-01-preview",
+    "deployment_name": "gpt-4o",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    invalidate_llm_config_cache()
+    llm_client_service._config_version = None
+    llm_client_service._config_version_checked_at = 0.0
+    with patch.object(llm_client_service, "read_data_versions", AsyncMock(return_value=None)) as versions:
+        yield versions
+    invalidate_llm_config_cache()
+
+
+class TestClientPool:
+    """Tests for the process-wide client registry."""
+
+    async def test_same_config_reuses_client(self):
+        """Test that equal configs share one client (and its connections)."""
+        first = get_pooled_client(dict(AZURE_CONFIG))
+        second = get_pooled_client(dict(AZURE_CONFIG))
+
+        assert first is second
+
+    async def test_rotated_key_creates_new_client(self):
+        """Test that a changed API key yields a different client."""
+        first = get_pooled_client(AZURE_CONFIG)
+        second = get_pooled_client({**AZURE_CONFIG, "api_key": "key-2"})
+
+        assert first is not second
+
+    def test_no_event_loop_creates_unpooled_client(self):
+        """Test that sync contexts get a fresh client."""
+        assert get_pooled_client(AZURE_CONFIG) is not get_pooled_client(AZURE_CONFIG)
+
+
+class TestConfigCache:
+    """Tests for the purpose -> config resolution cache."""
+
+    async def test_system_client_skips_db_when_cached(self):
+        """Test that the admin lookup and decryption run once per TTL."""
+        admin = MagicMock(id=uuid4())
+        service = LLMClientService(AsyncMock())
+
+        with (
+            patch.object(service, "_get_admin_with_credentials", AsyncMock(return_value=admin)) as admin_lookup,
+            patch(
+                "services.llm_client_service.get_openai_compatible_config",
+                AsyncMock(return_value=AZURE_CONFIG),
+            ) as resolve,
+        ):
+            client1, config1 = await service.get_system_client(LLMPurpose.ASSISTANT)
+            client2, config2 = await LLMClientService(AsyncMock()).get_system_client(LLMPurpose.ASSISTANT)
+
+        assert config1 == config2 == AZURE_CONFIG
+        assert client1 is client2
+        admin_lookup.assert_awaited_once()
+        resolve.assert_awaited_once()
+
+    async def test_invalidation_reloads_config(self):
+        """Test that credential changes are picked up after invalidation."""
+        admin = MagicMock(id=uuid4())
+        service = LLMClientService(AsyncMock())
+
+        with (
+            patch.object(service, "_get_admin_with_credentials", AsyncMock(return_value=admin)),
+            patch(
+                "services.llm_client_service.get_openai_compatible_config",
+                AsyncMock(side_effect=[AZURE_CONFIG, {**AZURE_CONFIG, "api_key": "key-2"}]),
+            ),
+        ):
+            _, config1 = await service.get_system_client(LLMPurpose.ASSISTANT)
+            invalidate_llm_config_cache()
+            _, config2 = await service.get_system_client(LLMPurpose.ASSISTANT)
+
+        assert config1["api_key"] == "key-1"
+        assert config2["api_key"] == "key-2"
+
+    async def test_version_change_in_other_process_reloads_config(self, clear_config_cache):
+        """Test that a bumped llm_config version drops the cache after the check interval."""
+        admin = MagicMock(id=uuid4())
+        service = LLMClientService(AsyncMock())
+        clear_config_cache.side_effect = [{"llm_config": 1}, {"llm_config": 2}]
+
+        with (
+            patch.object(service, "_get_admin_with_credentials", AsyncMock(return_value=admin)),
+            patch(
+                "services.llm_client_service.get_openai_compatible_config",
+                AsyncMock(side_effect=[AZURE_CONFIG, {**AZURE_CONFIG, "api_key": "key-2"}]),
+            ),
+        ):
+            _, config1 = await service.get_system_client(LLMPurpose.ASSISTANT)
+            _, cached = await service.get_system_client(LLMPurpose.ASSISTANT)
+            llm_client_service._config_version_checked_at = 0.0
+            _, config2 = await service.get_system_client(LLMPurpose.ASSISTANT)
+
+        assert config1["api_key"] == cached["api_key"] == "key-1"
+        assert config2["api_key"] == "key-2"
+        assert clear_config_cache.await_count == 2
+
+    async def test_missing_credentials_return_none(self):
+        """Test that a missing admin config yields no client."""
+        service = LLMClientService(AsyncMock())
+
+        with patch.object(service, "_get_admin_with_credentials", AsyncMock(return_value=None)):
+            client, config = await service.get_system_client(LLMPurpose.EMBEDDINGS)
+
+        assert client is None
+        assert config is None
@@ -0,0 +1,111 @@
+"""Tests for the cluster-wide LLM rate governor."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from services.llm_rate_governor import (
+    DECREASE_FACTOR,
+    INTERACTIVE_RESERVE,
+    LLMPriority,
+    LLMRateGovernor,
+    governed_llm_call,
+    llm_priority,
+)
+
+
+@pytest.fixture
+def governor():
+    governor = LLMRateGovernor("redis://test")
+    redis = MagicMock()
+    redis.eval = AsyncMock(return_value=[1, 0, 1000])
+    governor._get_redis = MagicMock(return_value=redis)
+    with patch("services.llm_rate_governor.get_rate_governor", return_value=governor):
+        yield governor
+
+
+def _rate_limit_error() -> RateLimitError:
+    request = httpx.Request("POST", "https://example.openai.azure.com/chat/completions")
+    return RateLimitError("Too Many Requests", response=httpx.Response(429, request=request), body=None)
+
+
+class TestAcquire:
+    """Tests for token acquisition."""
+
+    async def test_granted_call_does_not_wait(self, governor):
+        """Test that a granted acquire returns without sleeping."""
+        with patch("services.llm_rate_governor.asyncio.sleep", AsyncMock()) as sleep:
+            await governor.acquire("gpt-4o", 1000, LLMPriority.INTERACTIVE)
+
+        sleep.assert_not_awaited()
+        args = governor._get_redis().eval.await_args.args
+        assert args[2] == "llmgov:gpt-4o"
+        assert args[6] == 1000
+
+    async def test_denied_call_waits_for_refill(self, governor):
+        """Test that a denied acquire sleeps for the returned wait time and retries."""
+        governor._get_redis().eval.side_effect = [[0, 1500, 1000], [1, 0, 1000]]
+
+        with patch("services.llm_rate_governor.asyncio.sleep", AsyncMock()) as sleep:
+            await governor.acquire("gpt-4o", 1000)
+
+        sleep.assert_awaited_once_with(1.5)
+        assert governor._get_redis().eval.await_count == 2
+
+    async def test_background_calls_keep_interactive_reserve(self, governor):
+        """Test that only interactive calls may use the reserved share of the bucket."""
+        await governor.acquire("gpt-4o", 10, LLMPriority.BACKGROUND)
+        assert governor._get_redis().eval.await_args.args[7] == INTERACTIVE_RESERVE
+
+        async with llm_priority(LLMPriority.INTERACTIVE):
+            await governor.acquire("gpt-4o", 10)
+        assert governor._get_redis().eval.await_args.args[7] == 0.0
+
+    async def test_model_limit_override(self, governor):
+        """Test that per-model quotas override the defaults."""
+        with patch("services.llm_rate_governor.settings.llm_governor_model_limits", {"small": (1000, 10)}):
+            await governor.acquire("small", 10)
+
+        args = governor._get_redis().eval.await_args.args
+        assert args[4:6] == (1000, 10)
+
+    async def test_redis_failure_fails_open(self, governor):
+        """Test that an unavailable Redis never blocks LLM calls."""
+        governor._get_redis().eval.side_effect = ConnectionError("refused")
+
+        assert await governor.acquire("gpt-4o", 1000) < 1
+
+
+class TestAIMD:
+    """Tests for the adaptive rate factor."""
+
+    async def test_rate_limit_error_decreases_rate(self, governor):
+        """Test that a 429 halves the rate and empties the bucket."""
+        governor._get_redis().eval.side_effect = [[1, 0, 1000], "0.5"]
+
+        with pytest.raises(RateLimitError):
+            async with governed_llm_call("gpt-4o", 100):
+                raise _rate_limit_error()
+
+        args = governor._get_redis().eval.await_args.args
+        assert args[3:] == (DECREASE_FACTOR, 0.0, 0.05, "1")
+        assert governor._rate_factors["gpt-4o"] == 0.5
+
+    async def test_success_increases_reduced_rate(self, governor):
+        """Test that successful calls raise a reduced rate again."""
+        governor._get_redis().eval.side_effect = [[1, 0, 500], "0.52"]
+
+        async with governed_llm_call("gpt-4o", 100):
+            pass
+
+        assert governor._get_redis().eval.await_count == 2
+        assert governor._rate_factors["gpt-4o"] == 0.52
+
+    async def test_success_at_full_rate_skips_adjust(self, governor):
+        """Test that no extra round trip happens while running at the full rate."""
+        async with governed_llm_call("gpt-4o", 100):
+            pass
+
+        assert governor._get_redis().eval.await_count == 1
@@ -0,0 +1,141 @@
+"""Tests for the content-addressed LLM response cache."""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from services.llm_response_cache import build_cache_keys
+
+CACHED_CONTENT = {"is_relevant": True, "summary": "Windpark geplant", "pain_points": []}
+
+
+class TestCacheKeys:
+    """Tests for request and content key derivation."""
+
+    def test_identical_requests_share_key(self):
+        """Test that equal parameters produce equal keys."""
+        first = build_cache_keys("gpt-4o", "Prompt", "Text", 0.1, {"type": "json_object"})
+        second = build_cache_keys("gpt-4o", "Prompt", "Text", 0.1, {"type": "json_object"})
+
+        assert first == second
+        assert first.content_key is None
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {"model": "gpt-4o-mini"},
+            {"prompt": "Neuer Prompt"},
+            {"text": "Anderer Text"},
+            {"temperature": 0.0},
+            {"response_format": None},
+        ],
+    )
+    def test_every_parameter_is_part_of_key(self, changes):
+        """Test that changing any request parameter changes the key."""
+        params = {
+            "model": "gpt-4o",
+            "prompt": "Prompt",
+            "text": "Text",
+            "temperature": 0.1,
+            "response_format": {"type": "json_object"},
+        }
+
+        assert build_cache_keys(**params).cache_key != build_cache_keys(**{**params, **changes}).cache_key
+
+    def test_content_key_ignores_text_differences(self):
+        """Test that duplicates with the same file hash share the content key."""
+        first = build_cache_keys("gpt-4o", "Prompt", "OCR Lauf 1", 0.1, content_hash="abc", page_numbers=[3, 1])
+        second = build_cache_keys("gpt-4o", "Prompt", "OCR Lauf 2", 0.1, content_hash="abc", page_numbers=[1, 3])
+
+        assert first.cache_key != second.cache_key
+        assert first.content_key == second.content_key
+
+    def test_content_key_includes_pages(self):
+        """Test that different page selections of a document do not share results."""
+        first = build_cache_keys("gpt-4o", "Prompt", "Text", 0.1, content_hash="abc", page_numbers=[1])
+        second = build_cache_keys("gpt-4o", "Prompt", "Text", 0.1, content_hash="abc", page_numbers=[2])
+
+        assert first.content_key != second.content_key
+
+
+@asynccontextmanager
+async def _no_governor(*args, **kwargs):
+    yield
+
+
+@pytest.fixture
+def llm_client():
+    client = MagicMock()
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=json.dumps(CACHED_CONTENT)))]
+    response.usage = MagicMock(prompt_tokens=1000, completion_tokens=200, total_tokens=1200)
+    client.chat.completions.create = AsyncMock(return_value=response)
+
+    with (
+        patch(
+            "services.llm_client_service.LLMClientService.get_system_client",
+            AsyncMock(return_value=(client, {"type": "azure", "deployment_name": "gpt-4o"})),
+        ),
+        patch("services.llm_client_service.LLMClientService.get_model_name", return_value="gpt-4o"),
+        patch("workers.ai_tasks.document_analyzer.governed_llm_call", _no_governor),
+    ):
+        yield client
+
+
+class TestDocumentAnalysisCache:
+    """Tests for the cache in front of _call_azure_openai."""
+
+    async def test_cache_hit_skips_llm_call(self, llm_client):
+        """Test that a cached response is returned without a completion."""
+        from workers.ai_tasks.document_analyzer import _call_azure_openai
+
+        keys = build_cache_keys("gpt-4o", "Prompt", "Text", 0.1, {"type": "json_object"})
+        entry = MagicMock(cache_key=keys.cache_key, response=json.dumps(CACHED_CONTENT))
+        entry.prompt_tokens, entry.completion_tokens = 1000, 200
+
+        with (
+            patch("services.llm_response_cache.get_cached_response", AsyncMock(return_value=entry)),
+            patch("workers.ai_tasks.document_analyzer.record_llm_usage", AsyncMock()) as record,
+        ):
+            result = await _call_azure_openai(AsyncMock(), "Text", "Prompt", "test", document_id=uuid4())
+
+        llm_client.chat.completions.create.assert_not_awaited()
+        assert result["content"] == CACHED_CONTENT
+        assert result["tokens_used"] == 0
+        assert record.await_args.kwargs["cache_hit"] is True
+        assert record.await_args.kwargs["metadata"] == {"saved_tokens": 1200}
+
+    async def test_cache_miss_stores_response(self, llm_client):
+        """Test that a new completion is stored and recorded as miss."""
+        from workers.ai_tasks.document_analyzer import _call_azure_openai
+
+        with (
+            patch("services.llm_response_cache.get_cached_response", AsyncMock(return_value=None)),
+            patch("services.llm_response_cache.store_response", AsyncMock()) as store,
+            patch("workers.ai_tasks.document_analyzer.record_llm_usage", AsyncMock()) as record,
+        ):
+            result = await _call_azure_openai(AsyncMock(), "Text", "Prompt", "test", content_hash="abc")
+
+        llm_client.chat.completions.create.assert_awaited_once()
+        assert result["tokens_used"] == 1200
+        assert store.await_args.args[1].content_key is not None
+        assert record.await_args.kwargs["cache_hit"] is False
+
+    async def test_forced_reanalysis_bypasses_cache(self, llm_client):
+        """Test that use_cache=False skips the lookup but refreshes the entry."""
+        from workers.ai_tasks.document_analyzer import _call_azure_openai
+
+        with (
+            patch("services.llm_response_cache.get_cached_response", AsyncMock()) as lookup,
+            patch("services.llm_response_cache.store_response", AsyncMock()) as store,
+            patch("workers.ai_tasks.document_analyzer.record_llm_usage", AsyncMock()) as record,
+        ):
+            await _call_azure_openai(AsyncMock(), "Text", "Prompt", "test", use_cache=False)
+
+        lookup.assert_not_awaited()
+        store.assert_awaited_once()
+        llm_client.chat.completions.create.assert_awaited_once()
+        assert record.await_args.kwargs["cache_hit"] is None
@@ -0,0 +1,222 @@
+"""Tests for the multiplexed notification pub/sub fan-out."""
+
+import asyncio
+import json
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.services.notification_broadcast import NotificationBroadcaster, SubscriberQueue
+
+
+class FakePubSub:
+    """In-memory pub/sub connection."""
+
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.channels: set[str] = set()
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+        self.fail_next_read = False
+
+    async def connect(self):
+        pass
+
+    async def subscribe(self, *channels):
+        self.redis.commands.append(("SUBSCRIBE", *channels))
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.redis.commands.append(("UNSUBSCRIBE", *channels))
+        self.channels.difference_update(channels)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        if self.fail_next_read:
+            self.fail_next_read = False
+            raise ConnectionError("Connection reset by peer")
+        try:
+            return await asyncio.wait_for(self.inbox.get(), timeout)
+        except TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """Redis stand-in that counts pub/sub connections and commands."""
+
+    def __init__(self):
+        self.pubsubs: list[FakePubSub] = []
+        self.commands: list[tuple] = []
+
+    def pubsub(self) -> FakePubSub:
+        pubsub = FakePubSub(self)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+    @property
+    def open_pubsubs(self) -> list[FakePubSub]:
+        return [pubsub for pubsub in self.pubsubs if not pubsub.closed]
+
+    async def publish(self, channel: str, data: str) -> int:
+        receivers = [pubsub for pubsub in self.open_pubsubs if channel in pubsub.channels]
+        for pubsub in receivers:
+            pubsub.inbox.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(receivers)
+
+    async def close(self):
+        pass
+
+
+async def _until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+class Client:
+    """Simulated SSE client collecting the events of one subscription."""
+
+    def __init__(self, broadcaster: NotificationBroadcaster, user_id: uuid.UUID, read_delay: float = 0):
+        self.events: list[dict] = []
+        self.read_delay = read_delay
+        self.task = asyncio.create_task(self._consume(broadcaster, user_id))
+
+    async def _consume(self, broadcaster, user_id):
+        async for event in broadcaster.subscribe(user_id):
+            if event["type"] != "heartbeat":
+                self.events.append(event)
+            if self.read_delay:
+                await asyncio.sleep(self.read_delay)
+
+
+@pytest.fixture
+async def broadcaster():
+    broadcaster = NotificationBroadcaster()
+    broadcaster._redis = FakeRedis()
+    yield broadcaster
+    await broadcaster.close()
+
+
+async def _disconnect(clients: list[Client]) -> None:
+    for client in clients:
+        client.task.cancel()
+    await asyncio.gather(*(client.task for client in clients), return_exceptions=True)
+
+
+class TestSubscriberQueue:
+    """Tests for the bounded per-client buffer."""
+
+    async def test_full_queue_drops_oldest(self):
+        """Test that a full queue keeps the newest events."""
+        queue = SubscriberQueue(maxsize=3)
+        for i in range(5):
+            queue.put({"type": "new_notification", "data": {"id": i}})
+
+        assert queue.dropped == 2
+        assert [(await queue.get())["data"]["id"] for _ in range(3)] == [2, 3, 4]
+
+    async def test_count_updates_are_coalesced(self):
+        """Test that a pending count update is replaced by the latest one."""
+        queue = SubscriberQueue(maxsize=10)
+        queue.put({"type": "count_update", "data": {"unread_count": 1}})
+        queue.put({"type": "new_notification", "data": {"id": 1}})
+        queue.put({"type": "count_update", "data": {"unread_count": 2}})
+
+        assert queue.coalesced == 1
+        assert queue.depth == 2
+        assert await queue.get() == {"type": "new_notification", "data": {"id": 1}}
+        assert await queue.get() == {"type": "count_update", "data": {"unread_count": 2}}
+
+
+class TestNotificationBroadcaster:
+    """Tests for the shared pub/sub connection."""
+
+    async def test_subscribers_share_one_connection(self, broadcaster):
+        """Test that all clients use one connection and each channel is subscribed once."""
+        redis = broadcaster._redis
+        user_a, user_b = uuid.uuid4(), uuid.uuid4()
+        clients = [Client(broadcaster, user_a), Client(broadcaster, user_a), Client(broadcaster, user_b)]
+        await _until(lambda: len(redis.open_pubsubs) == 1 and len(redis.open_pubsubs[0].channels) == 2)
+
+        await broadcaster.broadcast_count_update(user_a, 5)
+        await _until(lambda: all(client.events for client in clients[:2]))
+
+        assert len(redis.pubsubs) == 1
+        subscribed = [
+            channel for command, *channels in redis.commands if command == "SUBSCRIBE" for channel in channels
+        ]
+        assert sorted(subscribed) == sorted({f"notifications:user:{user_a}", f"notifications:user:{user_b}"})
+        assert clients[0].events == clients[1].events
+        assert clients[0].events[0]["data"] == {"unread_count": 5}
+        assert clients[2].events == []
+
+        await _disconnect(clients[:1])
+        assert len(redis.open_pubsubs[0].channels) == 2
+        await _disconnect(clients[1:])
+        assert redis.open_pubsubs[0].channels == set()
+        assert broadcaster.subscriber_count == 0
+
+    async def test_resubscribes_after_connection_error(self, broadcaster):
+        """Test that the listener reconnects and subscribes the channels of its clients again."""
+        redis = broadcaster._redis
+        user_id = uuid.uuid4()
+        client = Client(broadcaster, user_id)
+        await _until(lambda: redis.open_pubsubs and redis.open_pubsubs[0].channels)
+
+        redis.pubsubs[0].fail_next_read = True
+        await _until(lambda: len(redis.pubsubs) == 2 and redis.pubsubs[1].channels)
+        await broadcaster.broadcast_all_read(user_id)
+        await _until(lambda: client.events)
+
+        assert redis.pubsubs[0].closed
+        assert client.events[0]["type"] == "all_read"
+        await _disconnect([client])
+
+
+class TestFanOutLoad:
+    """Load test: 5000 simulated SSE clients on one process."""
+
+    async def test_5000_subscribers(self, broadcaster):
+        """Test that 5000 clients share one connection and slow clients stay bounded."""
+        redis = broadcaster._redis
+        users = [uuid.uuid4() for _ in range(2500)]
+        slow_user = users[0]
+
+        with patch.object(settings, "notification_sse_queue_size", 16):
+            clients = [Client(broadcaster, user_id) for user_id in users for _ in range(2)]
+            slow = Client(broadcaster, slow_user, read_delay=60)
+            await _until(lambda: broadcaster.subscriber_count == 5001, timeout=30)
+
+        await _until(lambda: redis.open_pubsubs and len(redis.open_pubsubs[0].channels) == 2500, timeout=30)
+
+        for user_id in users:
+            await broadcaster.broadcast_new_notification(user_id, {"id": str(user_id)})
+        await _until(lambda: all(client.events for client in clients), timeout=30)
+
+        # Five bursts of ten events to a user with one fast and one stalled client
+        slow_channel = broadcaster.USER_CHANNEL.format(user_id=str(slow_user))
+        fast = clients[0]
+        for burst in range(5):
+            for i in range(10):
+                await redis.publish(slow_channel, json.dumps({"type": "new_notification", "data": {"id": i}}))
+            await _until(lambda burst=burst: len(fast.events) == 11 + burst * 10)
+
+        assert len(redis.pubsubs) == 1
+        expected_users = [str(user_id) for user_id in users for _ in range(2)]
+        assert [client.events[0]["data"]["id"] for client in clients] == expected_users
+        # The stalled client took one event and buffers only the newest ones
+        slow_queue = next(q for q in broadcaster._subscribers[slow_channel] if q.dropped)
+        assert len(slow.events) == 1
+        assert slow_queue.depth == 16
+        assert slow_queue.dropped == 51 - 1 - 16
+
+        await _disconnect([*clients, slow])
+        assert broadcaster.subscriber_count == 0
+        assert redis.open_pubsubs[0].channels == set()
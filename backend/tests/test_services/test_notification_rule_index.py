@@ -0,0 +1,187 @@
+"""Tests for the compiled notification rule index and event dispatch."""
+
+import random
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.notification import NotificationChannel, NotificationEventType
+from services.notifications import rule_index
+from services.notifications.rule_index import KeywordAutomaton, NotificationRuleIndex
+
+NEW_DOCUMENT = NotificationEventType.NEW_DOCUMENT
+
+
+def _rule(conditions: dict | None = None, event_type: NotificationEventType = NEW_DOCUMENT):
+    rule = NotificationRuleIndex.compile_rule(uuid.uuid4(), uuid.uuid4(), NotificationChannel.IN_APP, conditions)
+    return event_type, conditions or {}, rule
+
+
+class TestKeywordAutomaton:
+    """Tests for the Aho-Corasick keyword automaton."""
+
+    def test_overlapping_keywords(self):
+        """Test that keywords sharing prefixes and suffixes are all found."""
+        automaton = KeywordAutomaton(["Wind", "Windkraft", "kraft", "Kraftwerk", "Solar"])
+
+        assert automaton.find("Neue WINDKRAFTanlage geplant") == {"wind", "windkraft", "kraft"}
+        assert automaton.find("Das Kraftwerk") == {"kraft", "kraftwerk"}
+        assert automaton.find("Bebauungsplan Nr. 12") == set()
+
+    def test_matches_substring_search(self):
+        """Test that the automaton finds exactly the keywords a substring check finds."""
+        rng = random.Random(7)  # noqa: S311
+        alphabet = "abcäö "
+        keywords = {"".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(60)}
+        automaton = KeywordAutomaton(keywords)
+
+        for _ in range(200):
+            text = "".join(rng.choices(alphabet, k=rng.randint(0, 40)))
+            assert automaton.find(text) == {k for k in keywords if k in text}
+
+
+class TestNotificationRuleIndex:
+    """Tests for bucketing rules by event type, category, source and keywords."""
+
+    def test_event_type_bucket(self):
+        """Test that only rules of the event type are returned."""
+        document_rule = _rule()
+        crawl_rule = _rule(event_type=NotificationEventType.CRAWL_FAILED)
+        index = NotificationRuleIndex([document_rule, crawl_rule], version=1)
+
+        assert index.match(NEW_DOCUMENT, {}) == [document_rule[2]]
+        assert index.match(NotificationEventType.SOURCE_ERROR, {}) == []
+
+    def test_category_and_source_restrictions(self):
+        """Test that category and source lists restrict events that name a category or source."""
+        category_id, source_id = str(uuid.uuid4()), str(uuid.uuid4())
+        unrestricted = _rule()
+        by_category = _rule({"category_ids": [category_id]})
+        by_both = _rule({"category_ids": [category_id], "source_ids": [source_id]})
+        no_category = _rule({"category_ids": []})
+        index = NotificationRuleIndex([unrestricted, by_category, by_both, no_category], version=1)
+
+        def matched(payload):
+            return {rule.id for rule in index.match(NEW_DOCUMENT, payload)}
+
+        assert matched({"category_id": category_id, "source_id": source_id}) == {
+            unrestricted[2].id,
+            by_category[2].id,
+            by_both[2].id,
+        }
+        assert matched({"category_id": category_id, "source_id": str(uuid.uuid4())}) == {
+            unrestricted[2].id,
+            by_category[2].id,
+        }
+        assert matched({"category_id": str(uuid.uuid4())}) == {unrestricted[2].id}
+        # Events without a category pass every category restriction
+        assert len(matched({})) == 4
+
+    def test_keywords(self):
+        """Test that keyword rules need one of their keywords in title, text or summary."""
+        wind = _rule({"keywords": ["Windkraft", "Repowering"]})
+        solar = _rule({"keywords": ["Solarpark"]})
+        empty = _rule({"keywords": [""]})
+        index = NotificationRuleIndex([wind, solar, empty], version=1)
+
+        matched = index.match(NEW_DOCUMENT, {"title": "Beschluss", "summary": "Repowering im Windpark"})
+
+        assert [rule.id for rule in matched] == [wind[2].id, empty[2].id]
+
+    def test_residual_conditions_are_kept(self):
+        """Test that conditions the index does not resolve stay on the compiled rule."""
+        _, _, rule = _rule({"keywords": ["Wind"], "min_confidence": 0.8, "category_ids": ["x"]})
+
+        assert rule.conditions == {"min_confidence": 0.8}
+        assert rule.keywords == frozenset({"wind"})
+
+
+class TestRuleIndexVersion:
+    """Tests for rebuilding the index when the rule version changes."""
+
+    @pytest.fixture(autouse=True)
+    def reset_index(self):
+        rule_index.set_rule_index(None)
+        yield
+        rule_index.set_rule_index(None)
+
+    async def test_rebuild_on_version_change(self):
+        """Test that the index is built once per rule version."""
+        versions = iter([3, 3, 4])
+
+        async def read(scopes):
+            return {scope: next(versions) for scope in scopes}
+
+        load = AsyncMock(side_effect=lambda session, version: NotificationRuleIndex([], version))
+
+        with (
+            patch.object(rule_index, "read_data_versions", read),
+            patch.object(NotificationRuleIndex, "load", load),
+        ):
+            first = await rule_index.get_rule_index(MagicMock())
+            second = await rule_index.get_rule_index(MagicMock())
+            third = await rule_index.get_rule_index(MagicMock())
+
+        assert first is second
+        assert third.version == 4
+        assert load.await_count == 2
+
+    async def test_without_redis_builds_per_event(self):
+        """Test that rule changes cannot be missed when the version is unavailable."""
+        load = AsyncMock(side_effect=lambda session, version: NotificationRuleIndex([], version))
+
+        with (
+            patch.object(rule_index, "read_data_versions", AsyncMock(return_value=None)),
+            patch.object(NotificationRuleIndex, "load", load),
+        ):
+            await rule_index.get_rule_index(MagicMock())
+            await rule_index.get_rule_index(MagicMock())
+
+        assert load.await_count == 2
+
+
+class TestDispatchEvent:
+    """Tests for dispatching events through the rule index."""
+
+    async def test_dispatch_creates_notifications_for_matching_rules(self):
+        """Test that matching rules get notifications and one statistics update."""
+        from services.notifications.event_dispatcher import NotificationEventDispatcher
+
+        confident = _rule({"keywords": ["Windpark"], "min_confidence": 0.5})
+        too_strict = _rule({"keywords": ["Windpark"], "min_confidence": 0.9})
+        other_keyword = _rule({"keywords": ["Solarpark"]})
+        index = NotificationRuleIndex([confident, too_strict, other_keyword], version=1)
+        session = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+
+        with (
+            patch("services.notifications.event_dispatcher.get_rule_index", AsyncMock(return_value=index)),
+            patch("services.notifications.event_dispatcher.notification_broadcaster") as broadcaster,
+            patch("services.notifications.event_dispatcher.notification_dispatch_seconds") as histogram,
+        ):
+            broadcaster.broadcast_new_notification = AsyncMock()
+            ids = await NotificationEventDispatcher().dispatch_event(
+                session, NEW_DOCUMENT, {"title": "Windpark Nord", "confidence": 0.7}
+            )
+
+        assert len(ids) == 1
+        notification = session.add.call_args.args[0]
+        assert notification.rule_id == confident[2].id
+        assert notification.user_id == confident[2].user_id
+        session.execute.assert_awaited_once()
+        assert "trigger_count" in str(session.execute.await_args.args[0])
+        histogram.labels.assert_called_once_with(event_type="NEW_DOCUMENT")
+
+    async def test_no_match_skips_database(self):
+        """Test that an event without matching rules costs no statement."""
+        from services.notifications.event_dispatcher import NotificationEventDispatcher
+
+        index = NotificationRuleIndex([_rule({"keywords": ["Solarpark"]})], version=1)
+        session = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+
+        with patch("services.notifications.event_dispatcher.get_rule_index", AsyncMock(return_value=index)):
+            ids = await NotificationEventDispatcher().dispatch_event(session, NEW_DOCUMENT, {"title": "Windpark"})
+
+        assert ids == []
+        session.execute.assert_not_awaited()
+        session.commit.assert_not_awaited()
@@ -0,0 +1,194 @@
+"""Tests for batched multi-field PySis extraction."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+
+def _field(name: str, prompt: str | None = None):
+    return MagicMock(id=uuid4(), internal_name=name, ai_extraction_prompt=prompt)
+
+
+@asynccontextmanager
+async def _no_governor(*args, **kwargs):
+    yield
+
+
+def _answer_all(max_concurrent: list[int] | None = None):
+    """Fake completion that answers every field listed in the system prompt."""
+    running = 0
+
+    async def create(**kwargs):
+        nonlocal running
+        running += 1
+        if max_concurrent is not None:
+            max_concurrent.append(running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+        system_prompt = kwargs["messages"][0]["content"]
+        count = system_prompt.count('- "')
+        answers = {str(i): {"value": f"Wert {i}", "confidence": "0.9"} for i in range(1, count + 1)}
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps({"fields": answers})))]
+        response.usage = MagicMock(prompt_tokens=500, completion_tokens=50 * count, total_tokens=500 + 50 * count)
+        return response
+
+    return create
+
+
+@pytest.fixture
+def llm_client():
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=_answer_all())
+
+    with (
+        patch(
+            "services.llm_client_service.LLMClientService.get_system_client",
+            AsyncMock(return_value=(client, {"type": "azure", "deployment_name": "gpt-4o"})),
+        ),
+        patch("services.llm_client_service.LLMClientService.get_model_name", return_value="gpt-4o"),
+        patch("workers.ai_tasks.pysis_processor.governed_llm_call", _no_governor),
+        patch("workers.ai_tasks.pysis_processor.record_llm_usage", AsyncMock()),
+    ):
+        yield client
+
+
+async def _collect(fields, **settings_overrides):
+    from workers.ai_tasks.pysis_processor import _extract_pysis_fields_batched
+
+    with patch.multiple("workers.ai_tasks.pysis_processor.settings", **settings_overrides):
+        return [chunk async for chunk in _extract_pysis_fields_batched(AsyncMock(), fields, "Kontext", "Musterstadt")]
+
+
+class TestFieldPacking:
+    """Tests for packing fields into requests."""
+
+    def test_fields_fit_budget(self):
+        """Test that each request stays within the token budget."""
+        from workers.ai_tasks.common import PYSIS_FIELD_OUTPUT_TOKENS
+        from workers.ai_tasks.pysis_processor import _pack_pysis_fields
+
+        fields = [_field(f"feld_{i}") for i in range(60)]
+
+        chunks = _pack_pysis_fields(fields, PYSIS_FIELD_OUTPUT_TOKENS * 20)
+
+        assert [f for chunk in chunks for f in chunk] == fields
+        assert len(chunks) == 4
+        assert all(len(chunk) <= 20 for chunk in chunks)
+
+    def test_oversized_field_gets_own_request(self):
+        """Test that a field above the budget is still extracted."""
+        from workers.ai_tasks.pysis_processor import _pack_pysis_fields
+
+        fields = [_field("klein"), _field("gross", "Anweisung " * 2000), _field("klein_2")]
+
+        chunks = _pack_pysis_fields(fields, 1000)
+
+        assert [len(chunk) for chunk in chunks] == [1, 1, 1]
+
+
+class TestBatchedExtraction:
+    """Tests for the multi-field extraction requests."""
+
+    async def test_sixty_fields_need_few_requests(self, llm_client):
+        """Test that 60 fields are extracted with a handful of LLM calls."""
+        fields = [_field(f"feld_{i}", f"Beschreibe Aspekt {i}") for i in range(60)]
+
+        chunks = await _collect(fields, pysis_extraction_batch_tokens=8000, pysis_extraction_concurrency=4)
+
+        assert llm_client.chat.completions.create.await_count <= 5
+        values = {field_id: value for _fields, result, _error in chunks for field_id, value in result.items()}
+        assert set(values) == {f.id for f in fields}
+        assert all(confidence == 0.9 for _value, confidence in values.values())
+
+    async def test_concurrency_is_limited(self, llm_client):
+        """Test that at most pysis_extraction_concurrency requests run at once."""
+        concurrent: list[int] = []
+        llm_client.chat.completions.create = AsyncMock(side_effect=_answer_all(concurrent))
+        fields = [_field(f"feld_{i}") for i in range(12)]
+
+        chunks = await _collect(fields, pysis_extraction_batch_tokens=500, pysis_extraction_concurrency=2)
+
+        assert len(chunks) == 12
+        assert max(concurrent) == 2
+
+    async def test_failed_request_is_reported(self, llm_client):
+        """Test that a failing request reports its fields instead of dropping them."""
+        llm_client.chat.completions.create = AsyncMock(side_effect=TimeoutError("Zeitüberschreitung"))
+        fields = [_field("feld_1"), _field("feld_2")]
+
+        chunks = await _collect(fields, pysis_extraction_batch_tokens=8000, pysis_extraction_concurrency=4)
+
+        assert len(chunks) == 1
+        chunk_fields, values, error = chunks[0]
+        assert chunk_fields == fields
+        assert values == {}
+        assert "Zeitüberschreitung" in error
+
+    async def test_missing_answers_are_omitted(self, llm_client):
+        """Test that fields without an answer are not returned as values."""
+        from workers.ai_tasks.pysis_processor import _extract_pysis_field_batch
+
+        response = MagicMock()
+        response.choices = [
+            MagicMock(message=MagicMock(content=json.dumps({"fields": {"1": {"value": 42, "confidence": 2}}})))
+        ]
+        llm_client.chat.completions.create = AsyncMock(return_value=response)
+        fields = [_field("feld_1"), _field("feld_2")]
+
+        values = await _extract_pysis_field_batch(llm_client, "gpt-4o", fields, "Kontext", "Musterstadt")
+
+        assert values == {fields[0].id: ("42", 1.0)}
+
+    async def test_truncated_answer_is_split(self, llm_client):
+        """Test that a cut-off answer is retried as halves down to single fields."""
+        answer_all = _answer_all()
+        calls: list[int] = []
+
+        async def create(**kwargs):
+            count = kwargs["messages"][0]["content"].count("(feld_")
+            calls.append(count)
+            response = await answer_all(**kwargs)
+            if count > 1:
+                response.choices[0].finish_reason = "length"
+                response.choices[0].message.content = '{"fields": {"1": {"value": "abgeschn'
+            return response
+
+        llm_client.chat.completions.create = AsyncMock(side_effect=create)
+        fields = [_field(f"feld_{i}") for i in range(3)]
+
+        chunks = await _collect(fields, pysis_extraction_batch_tokens=8000, pysis_extraction_concurrency=4)
+
+        assert calls == [3, 1, 2, 1, 1]
+        ((chunk_fields, values, error),) = chunks
+        assert error is None
+        assert set(values) == {f.id for f in fields}
+
+    async def test_invalid_single_field_is_reported(self, llm_client):
+        """Test that a field whose answer stays invalid is reported as error."""
+        response = MagicMock()
+        response.choices = [MagicMock(finish_reason="stop", message=MagicMock(content="kein JSON"))]
+        llm_client.chat.completions.create = AsyncMock(return_value=response)
+        fields = [_field("feld_1"), _field("feld_2")]
+
+        chunks = await _collect(fields, pysis_extraction_batch_tokens=8000, pysis_extraction_concurrency=4)
+
+        assert llm_client.chat.completions.create.await_count == 2
+        ((_chunk_fields, values, error),) = chunks
+        assert values == {}
+        assert "nicht verarbeitet" in error
+
+    async def test_output_budget_per_field(self, llm_client):
+        """Test that every field gets the single-field answer budget, capped per request."""
+        from workers.ai_tasks.common import PYSIS_FIELD_MAX_OUTPUT_TOKENS, PYSIS_MAX_OUTPUT_TOKENS
+
+        await _collect([_field("feld_1"), _field("feld_2")], pysis_extraction_batch_tokens=8000)
+        assert llm_client.chat.completions.create.await_args.kwargs["max_tokens"] == 2 * PYSIS_FIELD_MAX_OUTPUT_TOKENS
+
+        await _collect([_field(f"feld_{i}") for i in range(20)], pysis_extraction_batch_tokens=100_000)
+        assert llm_client.chat.completions.create.await_args.kwargs["max_tokens"] == PYSIS_MAX_OUTPUT_TOKENS
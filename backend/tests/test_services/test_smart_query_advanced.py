@@ -326,6 +326,158 @@ class TestMultiHopRelations:
         assert len(chain) == 2
         assert chain[0]["type"] == "works_for"
 
+    @staticmethod
+    def _loaded_catalog():
+        """Fill the process-wide type catalog with test types."""
+        import time
+
+        from services.smart_query.relation_resolver import CatalogType, get_type_catalog
+
+        catalog = get_type_catalog()
+        catalog.relation_types = {"works_for": CatalogType(uuid4(), "works_for", "arbeitet für")}
+        catalog.facet_types = {"pain_point": CatalogType(uuid4(), "pain_point", "Pain Point")}
+        catalog.entity_types = {"person": CatalogType(uuid4(), "person", "Person")}
+        catalog._loaded_at = time.monotonic()
+        return catalog
+
+    @pytest.mark.asyncio
+    async def test_chain_resolved_in_single_statement(self):
+        """Test that chain, hop filters and target facets compile into one query."""
+        from unittest.mock import MagicMock
+
+        from sqlalchemy.dialects import postgresql
+
+        from services.smart_query.relation_resolver import RelationResolver, get_type_catalog
+
+        self._loaded_catalog()
+        primary_id = uuid4()
+        result = MagicMock()
+        result.all.return_value = [(primary_id,)]
+        mock_session = AsyncMock(spec=AsyncSession)
+        mock_session.execute.return_value = result
+
+        try:
+            resolver = RelationResolver(mock_session)
+            ids = await resolver.resolve_entities_with_related_facets(
+                primary_entity_type_slug="person",
+                relation_chain=[
+                    {"type": "works_for", "direction": "source", "location_filter": "NRW"},
+                    {"type": "works_for", "direction": "target"},
+                ],
+                target_facet_types=["pain_point"],
+            )
+        finally:
+            get_type_catalog().invalidate()
+
+        assert ids == [primary_id]
+        mock_session.execute.assert_awaited_once()
+        sql = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        # One entity_relations alias per hop
+        assert sql.count("entity_relations AS") == 2
+        assert "EXISTS" in sql
+
+    @pytest.mark.asyncio
+    async def test_every_hop_requires_active_entity(self):
+        """Test that hops with only a facet filter (or none) still require an active entity."""
+        from sqlalchemy import literal_column
+        from sqlalchemy.dialects import postgresql
+
+        from services.smart_query.relation_resolver import RelationHop, RelationResolver, get_type_catalog
+
+        self._loaded_catalog()
+        try:
+            resolver = RelationResolver(AsyncMock(spec=AsyncSession))
+            for hop in (RelationHop("works_for", facet_filter="pain_point"), RelationHop("works_for")):
+                conditions = resolver._hop_conditions(literal_column("hop_entity_id"), hop)
+                sql = str(conditions[0].compile(dialect=postgresql.dialect()))
+                assert "entities_1.is_active IS true" in sql
+        finally:
+            get_type_catalog().invalidate()
+
+    @pytest.mark.asyncio
+    async def test_resolve_relation_chain_builds_paths(self):
+        """Test that traversal paths are built from the joined rows."""
+        from unittest.mock import MagicMock
+
+        from services.smart_query.relation_resolver import (
+            RelationChain,
+            RelationHop,
+            RelationResolver,
+            get_type_catalog,
+        )
+
+        self._loaded_catalog()
+        start, middle, end = uuid4(), uuid4(), uuid4()
+        result = MagicMock()
+        result.all.return_value = [(start, middle, end)]
+        mock_session = AsyncMock(spec=AsyncSession)
+        mock_session.execute.return_value = result
+
+        try:
+            resolver = RelationResolver(mock_session)
+            final_ids, paths = await resolver.resolve_relation_chain(
+                [start],
+                RelationChain([RelationHop("works_for"), RelationHop("works_for", "target")]),
+            )
+        finally:
+            get_type_catalog().invalidate()
+
+        assert final_ids == [end]
+        assert [step["entity_id"] for step in paths[end][0]] == [start, middle, end]
+        assert paths[end][0][2]["from_entity"] == middle
+
+    @pytest.mark.asyncio
+    async def test_unknown_relation_type_skips_query(self):
+        """Test that an unknown relation type returns no results without querying."""
+        from services.smart_query.relation_resolver import RelationResolver, get_type_catalog
+
+        self._loaded_catalog()
+        mock_session = AsyncMock(spec=AsyncSession)
+        try:
+            resolver = RelationResolver(mock_session)
+            ids = await resolver.resolve_entities_with_related_facets(
+                primary_entity_type_slug="person",
+                relation_chain=[{"type": "unknown", "direction": "source"}],
+                target_facet_types=[],
+            )
+        finally:
+            get_type_catalog().invalidate()
+
+        assert ids == []
+        mock_session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_catalog_reloads_on_schema_version_change(self):
+        """Test that a bumped schema data version reloads the catalog before the TTL."""
+        from unittest.mock import MagicMock, patch
+
+        from services.smart_query import relation_resolver
+        from services.smart_query.relation_resolver import TypeCatalog
+
+        result = MagicMock()
+        result.all.return_value = []
+        mock_session = AsyncMock(spec=AsyncSession)
+        mock_session.execute.return_value = result
+        catalog = TypeCatalog()
+        versions = AsyncMock(return_value={"schema": 1})
+
+        with (
+            patch.object(relation_resolver, "read_data_versions", versions),
+            patch.object(relation_resolver, "SCHEMA_VERSION_CHECK_SECONDS", 0),
+        ):
+            await catalog.ensure_loaded(mock_session)
+            await catalog.ensure_loaded(mock_session)
+            assert mock_session.execute.await_count == 1
+
+            versions.return_value = {"schema": 2}
+            await catalog.ensure_loaded(mock_session)
+            assert mock_session.execute.await_count == 2
+
+            # Redis unavailable: the TTL applies
+            versions.return_value = None
+            await catalog.ensure_loaded(mock_session)
+            assert mock_session.execute.await_count == 2
+
 
 class TestSuggestionSystem:
     """Test intelligent suggestion system."""
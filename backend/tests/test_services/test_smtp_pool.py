@@ -0,0 +1,208 @@
+"""Tests for pooled SMTP delivery against a local aiosmtpd server."""
+
+import asyncio
+import socket
+import time
+import uuid
+from email.message import EmailMessage
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import aiosmtplib
+import pytest
+
+from app.models.notification import NotificationChannel, NotificationStatus
+from services.notifications.channels.smtp_pool import (
+    SmtpConnectionPool,
+    SmtpRateLimiter,
+    SmtpServer,
+    close_smtp_pools,
+    get_smtp_pool,
+)
+
+controller_module = pytest.importorskip("aiosmtpd.controller")
+
+
+class RecordingHandler:
+    """Accepts all messages except those to rejected@example.com and records the client port."""
+
+    def __init__(self):
+        self.messages: list[tuple[int, str]] = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == "rejected@example.com":
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((session.peer[1], envelope.rcpt_tos[0]))
+        return "250 Message accepted"
+
+    @property
+    def connections(self) -> int:
+        return len({port for port, _ in self.messages})
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = RecordingHandler()
+    controller = controller_module.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield SmtpServer(hostname="127.0.0.1", port=port), handler
+    finally:
+        controller.stop()
+
+
+def _message(recipient: str = "user@example.com") -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@example.com"
+    message["To"] = recipient
+    message["Subject"] = "Neue Dokumente"
+    message.set_content("Es liegen neue Dokumente vor.")
+    return message
+
+
+def _pool(server: SmtpServer, size: int = 3, max_messages: int = 100, rate: float = 0) -> SmtpConnectionPool:
+    return SmtpConnectionPool(server, size=size, max_messages_per_connection=max_messages, max_messages_per_second=rate)
+
+
+class TestSmtpConnectionPool:
+    """Tests for reusing sessions across messages."""
+
+    async def test_messages_share_pooled_sessions(self, smtp_server):
+        """Test that concurrent messages use at most pool-size connections."""
+        server, handler = smtp_server
+        pool = _pool(server, size=3)
+
+        await asyncio.gather(*(pool.send_message(_message()) for _ in range(30)))
+        await pool.close()
+
+        assert len(handler.messages) == 30
+        assert pool.connections_opened <= 3
+        assert handler.connections == pool.connections_opened
+
+    async def test_session_is_replaced_after_max_messages(self, smtp_server):
+        """Test that a session is closed after max_messages_per_connection."""
+        server, handler = smtp_server
+        pool = _pool(server, size=1, max_messages=4)
+
+        for _ in range(10):
+            await pool.send_message(_message())
+        await pool.close()
+
+        assert pool.connections_opened == 3
+        assert handler.connections == 3
+
+    async def test_stale_session_is_retried_on_new_connection(self, smtp_server):
+        """Test that a session closed by the server is replaced and the message is sent once."""
+        server, handler = smtp_server
+        pool = _pool(server, size=1)
+        await pool.send_message(_message())
+        pool._idle[0].client.send_message = AsyncMock(side_effect=aiosmtplib.SMTPServerDisconnected("closed"))
+
+        await pool.send_message(_message())
+        await pool.close()
+
+        assert pool.connections_opened == 2
+        assert len(handler.messages) == 2
+
+    async def test_rejected_recipient_keeps_session(self, smtp_server):
+        """Test that a rejected message is raised without dropping the session."""
+        server, handler = smtp_server
+        pool = _pool(server, size=1)
+
+        with pytest.raises(aiosmtplib.SMTPRecipientsRefused):
+            await pool.send_message(_message("rejected@example.com"))
+        await pool.send_message(_message())
+        await pool.close()
+
+        assert pool.connections_opened == 1
+        assert pool.messages_sent == 1
+
+    async def test_pools_are_per_event_loop(self, smtp_server):
+        """Test that the pool of a server is reused within a loop and closed with it."""
+        server, _ = smtp_server
+
+        pool = get_smtp_pool(server)
+        assert get_smtp_pool(server) is pool
+        await pool.send_message(_message())
+        await close_smtp_pools()
+
+        assert pool._idle == []
+        assert get_smtp_pool(server) is not pool
+        await close_smtp_pools()
+
+
+class TestSmtpRateLimiter:
+    """Tests for the per-server token bucket."""
+
+    async def test_burst_then_rate(self):
+        """Test that a burst of one second passes and further tokens are paced."""
+        limiter = SmtpRateLimiter(rate=20)
+
+        start = time.monotonic()
+        for _ in range(25):
+            await limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        assert 0.2 <= elapsed < 1.0
+
+    async def test_zero_rate_is_unlimited(self):
+        """Test that a rate of 0 disables the limit."""
+        limiter = SmtpRateLimiter(rate=0)
+
+        assert [await limiter.acquire() for _ in range(100)] == [0.0] * 100
+
+
+class TestSendNotifications:
+    """Tests for sending a batch of notifications."""
+
+    async def test_batch_is_claimed_sent_and_stored(self):
+        """Test that a batch costs one claim query and two commits, and failures are retried."""
+        from services.notifications.notification_service import NotificationService
+
+        notifications = [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                channel=NotificationChannel.WEBHOOK,
+                rule=None,
+                status=NotificationStatus.PENDING,
+                retry_count=0,
+                error_message=None,
+                sent_at=None,
+            )
+            for _ in range(3)
+        ]
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = notifications
+        session = MagicMock(execute=AsyncMock(return_value=result), commit=AsyncMock())
+        channel = MagicMock(send=AsyncMock(side_effect=[True, False, RuntimeError("Timeout")]))
+        registry = MagicMock(get=lambda channel_type: channel)
+
+        counts = await NotificationService(session, registry).send_notifications()
+
+        assert counts == {"sent": 1, "failed": 2}
+        session.execute.assert_awaited_once()
+        claim = str(session.execute.await_args.args[0])
+        assert "FOR UPDATE" in claim and "retry_count" in claim
+        assert session.commit.await_count == 2
+        assert [n.status for n in notifications] == [
+            NotificationStatus.SENT,
+            NotificationStatus.PENDING,
+            NotificationStatus.PENDING,
+        ]
+        assert [n.retry_count for n in notifications] == [0, 1, 1]
+
+    async def test_empty_id_list_skips_database(self):
+        """Test that an empty batch costs no statement."""
+        from services.notifications.notification_service import NotificationService
+
+        session = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+
+        assert await NotificationService(session, MagicMock()).send_notifications([]) == {"sent": 0, "failed": 0}
+        session.execute.assert_not_awaited()
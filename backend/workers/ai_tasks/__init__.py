@@ -5,6 +5,8 @@ It has been split into focused sub-modules for better maintainability:
 
 - common.py: Shared utilities, constants, and helper functions
 - document_analyzer.py: Document analysis tasks
+- chunking.py: Token-aware chunking and result merging for long documents
+- batch_inference.py: Offline batch inference for bulk document analyses
 - pysis_processor.py: PySis field extraction and processing
 - entity_operations.py: Entity data analysis and attachment processing
 
@@ -15,12 +17,13 @@ is imported by celery_app.py.
 from workers.celery_app import celery_app
 
 # Import and register tasks from each sub-module
-from . import document_analyzer, entity_operations, pysis_processor
+from . import batch_inference, document_analyzer, entity_operations, pysis_processor
 
 # Register all tasks with the Celery app
 _doc_tasks = document_analyzer.register_tasks(celery_app)
 _pysis_tasks = pysis_processor.register_tasks(celery_app)
 _entity_tasks = entity_operations.register_tasks(celery_app)
+_batch_tasks = batch_inference.register_tasks(celery_app)
 
 # Unpack task references for easy access
 (
@@ -42,6 +45,11 @@ _entity_tasks = entity_operations.register_tasks(celery_app)
     generate_embeddings_task,
 ) = _entity_tasks
 
+(
+    submit_analysis_batch,
+    poll_llm_batches,
+) = _batch_tasks
+
 # Re-export helper functions for API access
 from .entity_operations import get_embedding_task_status  # noqa: E402
 
@@ -60,6 +68,9 @@ __all__ = [
     "analyze_entity_data_for_facets",
     "analyze_attachment_task",
     "generate_embeddings_task",
+    # Batch inference tasks
+    "submit_analysis_batch",
+    "poll_llm_batches",
     # Helper functions
     "get_embedding_task_status",
 ]
@@ -0,0 +1,568 @@
+"""Offline batch inference for bulk document analyses and PySis enrichment.
+
+batch_analyze and reanalyze_low_confidence hand their documents to
+submit_analysis_batch when settings.llm_batch_enabled is set. The analysis
+requests are submitted via the provider batch endpoint (see
+services/llm_batch_service.py) instead of one analyze_document task per
+document, so bulk jobs don't block interactive requests. poll_llm_batches
+(beat) feeds finished results into the same extraction -> facet pipeline
+as analyze_document.
+
+Documents that the batch path can't serve cheaply - cached responses and
+texts that need chunked analysis - fall back to analyze_document, as do
+the requests of failed or expired batches.
+
+enrich_facet_values_from_pysis submits one request per FacetValue the same
+way; its results are merged into the FacetValues and complete the AITask.
+Unfinished requests fall back to the synchronous enrichment.
+"""
+
+import json
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.llm_usage import LLMProvider, LLMTaskType
+from services.llm_batch_service import (
+    BatchBackend,
+    BatchRequest,
+    BatchResult,
+    get_batch_backend,
+    poll_pending_batches,
+    register_batch_handler,
+    submit_batch,
+)
+from services.llm_response_cache import LLMCacheKeys
+from services.llm_usage_tracker import record_llm_usage
+from workers.async_runner import run_async
+
+from .common import _get_default_prompt
+from .document_analyzer import (
+    ANALYSIS_MAX_TOKENS,
+    ANALYSIS_RESPONSE_FORMAT,
+    ANALYSIS_TEMPERATURE,
+    _build_analysis_messages,
+    _build_analysis_result,
+    _enhance_prompt_with_page_context,
+    _get_text_for_analysis,
+    _store_analysis_result,
+    _update_analyzed_pages_atomic,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.models.llm_batch_job import LLMBatchJob
+
+logger = structlog.get_logger()
+
+DOCUMENT_ANALYSIS_PURPOSE = "document_analysis"
+PYSIS_ENRICHMENT_PURPOSE = "pysis_enrichment"
+
+
+# =============================================================================
+# Celery Tasks
+# =============================================================================
+
+
+def register_tasks(celery_app):
+    """Register all batch inference tasks with the Celery app."""
+
+    @celery_app.task(
+        name="workers.ai_tasks.submit_analysis_batch",
+        soft_time_limit=600,
+        time_limit=660,
+    )
+    def submit_analysis_batch(document_ids: list[str], force_reanalysis: bool = False):
+        """
+        Submit the analysis of several documents as offline batch.
+
+        Args:
+            document_ids: UUIDs of the documents to analyze
+            force_reanalysis: Don't serve cached responses
+        """
+        from app.database import get_celery_session_context
+        from workers.ai_tasks import analyze_document
+
+        async def _submit():
+            async with get_celery_session_context() as session:
+                stats, fallback_ids = await _submit_document_analysis_batch(session, document_ids, force_reanalysis)
+                await session.commit()
+
+            for doc_id in fallback_ids:
+                analyze_document.delay(doc_id, force_reanalysis=force_reanalysis)
+
+            logger.info("Submitted analysis batch", **stats)
+            return stats
+
+        return run_async(_submit())
+
+    @celery_app.task(name="workers.ai_tasks.poll_llm_batches")
+    def poll_llm_batches():
+        """Process the results of finished LLM batches."""
+        from app.database import get_celery_session_context
+
+        async def _poll():
+            async with get_celery_session_context() as session:
+                stats = await poll_pending_batches(session)
+            if stats["checked"]:
+                logger.info("Polled LLM batches", **stats)
+            return stats
+
+        return run_async(_poll())
+
+    return submit_analysis_batch, poll_llm_batches
+
+
+# =============================================================================
+# Submission
+# =============================================================================
+
+
+async def _submit_document_analysis_batch(
+    session: "AsyncSession",
+    document_ids: list[str],
+    force_reanalysis: bool = False,
+    backend: BatchBackend | None = None,
+) -> tuple[dict[str, int], list[str]]:
+    """
+    Build and submit the analysis requests of several documents.
+
+    Applies the same relevance filter, page selection and prompt as
+    analyze_document. Submitted documents are marked ANALYZING.
+
+    Returns:
+        Tuple of (stats, document ids for the synchronous fallback)
+    """
+    from app.models import Category, Document, ProcessingStatus
+    from app.models.user_api_credentials import LLMPurpose
+    from services.llm_client_service import LLMClientService
+    from services.llm_response_cache import build_cache_keys, get_cached_responses
+    from services.relevance_checker import check_relevance
+
+    from .chunking import split_into_chunks
+
+    llm_service = LLMClientService(session)
+    _client, config = await llm_service.get_system_client(LLMPurpose.DOCUMENT_ANALYSIS)
+    if not config:
+        raise ValueError(
+            "Keine LLM-Credentials konfiguriert. "
+            "Bitte konfigurieren Sie die API-Zugangsdaten unter /admin/api-credentials."
+        )
+    model_name = llm_service.get_model_name(config)
+    batch_model = settings.llm_batch_deployment or model_name
+
+    result = await session.execute(select(Document).where(Document.id.in_([UUID(d) for d in set(document_ids)])))
+    documents = result.scalars().all()
+
+    stats = {"documents": len(documents), "submitted": 0, "batches": 0, "filtered": 0, "skipped": 0}
+    fallback_ids: list[str] = []
+    pending: list[tuple[Any, BatchRequest, dict[str, Any]]] = []
+
+    for document in documents:
+        category = await session.get(Category, document.category_id) if document.raw_text else None
+        if category is None:
+            stats["skipped"] += 1
+            continue
+
+        relevance_result = check_relevance(document.raw_text, title=document.title, category=category)
+        if not relevance_result.is_relevant and relevance_result.score < 0.2:
+            document.processing_status = ProcessingStatus.FILTERED
+            document.processing_error = f"Filtered: {relevance_result.reason}"
+            stats["filtered"] += 1
+            continue
+
+        prompt = category.ai_extraction_prompt or _get_default_prompt(category)
+        text_to_analyze, page_info = await _get_text_for_analysis(document, session)
+        page_numbers = page_info.get("page_numbers") if page_info else None
+        if page_numbers:
+            prompt = _enhance_prompt_with_page_context(prompt, page_info)
+
+        # Long documents need the chunked map-reduce analysis
+        if len(split_into_chunks(text_to_analyze, settings.ai_analysis_chunk_tokens, model_name)) > 1:
+            fallback_ids.append(str(document.id))
+            continue
+
+        keys = build_cache_keys(
+            model_name,
+            prompt,
+            text_to_analyze,
+            ANALYSIS_TEMPERATURE,
+            ANALYSIS_RESPONSE_FORMAT,
+            content_hash=document.file_hash,
+            page_numbers=page_numbers,
+        )
+        custom_id = str(document.id)
+        request = BatchRequest(
+            custom_id=custom_id,
+            body={
+                "model": batch_model,
+                "messages": _build_analysis_messages(prompt, text_to_analyze),
+                "temperature": ANALYSIS_TEMPERATURE,
+                "max_tokens": ANALYSIS_MAX_TOKENS,
+                "response_format": ANALYSIS_RESPONSE_FORMAT,
+            },
+        )
+        item = {
+            "document_id": custom_id,
+            "category_id": str(category.id),
+            "page_numbers": page_numbers,
+            "cache_key": keys.cache_key,
+            "content_key": keys.content_key,
+            "prompt_hash": keys.prompt_hash,
+        }
+        pending.append((document, request, item))
+
+    # Cached responses are served by analyze_document without a new completion
+    if pending and not force_reanalysis:
+        cached = await get_cached_responses(
+            session, [_cache_keys_from_item(item) for _document, _request, item in pending]
+        )
+        fallback_ids.extend(item["document_id"] for _document, _request, item in pending if item["cache_key"] in cached)
+        pending = [entry for entry in pending if entry[2]["cache_key"] not in cached]
+
+    if pending:
+        backend = backend or await get_batch_backend(session)
+
+    for start in range(0, len(pending), settings.llm_batch_max_requests):
+        group = pending[start : start + settings.llm_batch_max_requests]
+        try:
+            await submit_batch(
+                session,
+                backend,
+                DOCUMENT_ANALYSIS_PURPOSE,
+                batch_model,
+                [request for _document, request, _item in group],
+                {item["document_id"]: item for _document, _request, item in group},
+            )
+        except Exception as e:
+            logger.exception("llm_batch_submit_failed", requests=len(group), error=str(e))
+            fallback_ids.extend(item["document_id"] for _document, _request, item in group)
+            continue
+        for document, _request, _item in group:
+            document.processing_status = ProcessingStatus.ANALYZING
+        stats["submitted"] += len(group)
+        stats["batches"] += 1
+
+    stats["fallback"] = len(fallback_ids)
+    return stats, fallback_ids
+
+
+def _cache_keys_from_item(item: dict[str, Any]) -> LLMCacheKeys:
+    """Restore the LLM cache keys stored with a batch item."""
+    return LLMCacheKeys(
+        cache_key=item["cache_key"],
+        content_key=item.get("content_key"),
+        prompt_hash=item["prompt_hash"],
+    )
+
+
+# =============================================================================
+# Result Handling
+# =============================================================================
+
+
+async def _handle_document_analysis_results(
+    session: "AsyncSession",
+    job: "LLMBatchJob",
+    results: dict[str, BatchResult | None],
+) -> None:
+    """
+    Feed batch results into the extraction -> facet pipeline.
+
+    Requests without a result (failed / expired batch) are requeued as
+    synchronous analyze_document tasks.
+    """
+    from app.models import Document, ProcessingStatus
+    from workers.ai_tasks import analyze_document
+
+    requeue_ids: list[str] = []
+    for custom_id, item in job.items.items():
+        result = results.get(custom_id)
+        document = await session.get(Document, UUID(item["document_id"]))
+        if document is None:
+            continue
+        if result is None:
+            requeue_ids.append(item["document_id"])
+            continue
+
+        try:
+            if result.error:
+                raise RuntimeError(result.error)
+            async with session.begin_nested():
+                await _apply_document_analysis_result(session, job, item, document, result, analyze_document)
+            document.processing_status = ProcessingStatus.COMPLETED
+        except Exception as e:
+            logger.warning("Batch analysis result failed", document_id=item["document_id"], error=str(e))
+            document.processing_status = ProcessingStatus.FAILED
+            document.processing_error = f"AI batch analysis error: {str(e)}"
+
+    for doc_id in requeue_ids:
+        analyze_document.delay(doc_id)
+    if requeue_ids:
+        logger.info(
+            "Requeued documents of unfinished batch",
+            batch_job_id=str(job.id),
+            status=job.status,
+            count=len(requeue_ids),
+        )
+
+
+async def _apply_document_analysis_result(
+    session: "AsyncSession",
+    job: "LLMBatchJob",
+    item: dict[str, Any],
+    document,
+    result: BatchResult,
+    analyze_task,
+) -> None:
+    """Cache, record and store one successful batch analysis."""
+    from app.models import Category, DataSource
+    from services.llm_response_cache import store_response
+
+    try:
+        content = json.loads(result.content)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"KI-Service Fehler: AI-Antwort konnte nicht verarbeitet werden - {str(e)}") from None
+
+    category = await session.get(Category, UUID(item["category_id"]))
+    if category is None:
+        raise RuntimeError(f"Kategorie {item['category_id']} nicht gefunden")
+    source = await session.get(DataSource, document.source_id)
+
+    # Separate session with row lock - runs before this session touches the document
+    if item.get("page_numbers"):
+        await _update_analyzed_pages_atomic(document.id, item["page_numbers"], document.total_relevant_pages)
+
+    await store_response(
+        session,
+        _cache_keys_from_item(item),
+        job.model,
+        ANALYSIS_TEMPERATURE,
+        result.content,
+        prompt_tokens=result.prompt_tokens,
+        completion_tokens=result.completion_tokens,
+    )
+    tokens_used = result.prompt_tokens + result.completion_tokens
+    await record_llm_usage(
+        provider=LLMProvider.AZURE_OPENAI,
+        model=job.model,
+        task_type=LLMTaskType.EXTRACT,
+        prompt_tokens=result.prompt_tokens,
+        completion_tokens=result.completion_tokens,
+        total_tokens=tokens_used,
+        task_name=f"analyze_document_batch_{category.purpose}",
+        document_id=document.id,
+        category_id=category.id,
+        duration_ms=int((time.time() - job.submitted_at.timestamp()) * 1000) if job.submitted_at else None,
+        metadata={"batch_job_id": str(job.id)},
+        cache_hit=False,
+    )
+
+    analysis_result = _build_analysis_result(content, result.content, tokens_used, job.model)
+    await _store_analysis_result(session, document, category, source, analysis_result, analyze_task)
+
+
+register_batch_handler(DOCUMENT_ANALYSIS_PURPOSE, _handle_document_analysis_results)
+
+
+# =============================================================================
+# PySis FacetValue Enrichment
+# =============================================================================
+
+
+async def _submit_pysis_enrichment_batch(
+    session: "AsyncSession",
+    entity,
+    facet_values: list,
+    pysis_fields: list[dict[str, Any]],
+    overwrite_existing: bool,
+    model_name: str,
+    ai_task_id: UUID,
+    backend: BatchBackend | None = None,
+) -> list:
+    """
+    Submit the enrichment requests of an entity's FacetValues as batches.
+
+    FacetValues without a schema or without fields to fill count as done.
+    The AITask is completed by the result handler, or here if nothing
+    was submitted.
+
+    Returns:
+        FacetValues whose submission failed (for the synchronous path)
+    """
+    from app.models import AITask, AITaskStatus
+
+    from .pysis_processor import (
+        ENRICHMENT_MAX_TOKENS,
+        ENRICHMENT_TEMPERATURE,
+        _build_enrichment_messages,
+        _build_enrichment_prompt,
+    )
+
+    batch_model = settings.llm_batch_deployment or model_name
+    pending: list[tuple[BatchRequest, dict[str, Any]]] = []
+    for fv in facet_values:
+        facet_type = fv.facet_type
+        if not facet_type or not facet_type.value_schema:
+            continue
+        prompt = _build_enrichment_prompt(
+            fv.value or {}, facet_type.value_schema, pysis_fields, entity.name, overwrite_existing
+        )
+        if prompt is None:
+            continue
+        custom_id = str(fv.id)
+        request = BatchRequest(
+            custom_id=custom_id,
+            body={
+                "model": batch_model,
+                "messages": _build_enrichment_messages(prompt),
+                "temperature": ENRICHMENT_TEMPERATURE,
+                "max_tokens": ENRICHMENT_MAX_TOKENS,
+                "response_format": {"type": "json_object"},
+            },
+        )
+        item = {
+            "facet_value_id": custom_id,
+            "entity_id": str(entity.id),
+            "ai_task_id": str(ai_task_id),
+            "overwrite_existing": overwrite_existing,
+        }
+        pending.append((request, item))
+
+    if pending:
+        backend = backend or await get_batch_backend(session)
+
+    submitted_ids: set[str] = set()
+    failed_ids: set[str] = set()
+    for start in range(0, len(pending), settings.llm_batch_max_requests):
+        group = pending[start : start + settings.llm_batch_max_requests]
+        ids = {item["facet_value_id"] for _request, item in group}
+        try:
+            await submit_batch(
+                session,
+                backend,
+                PYSIS_ENRICHMENT_PURPOSE,
+                batch_model,
+                [request for request, _item in group],
+                {item["facet_value_id"]: item for _request, item in group},
+            )
+        except Exception as e:
+            logger.exception("llm_batch_submit_failed", requests=len(group), error=str(e))
+            failed_ids |= ids
+            continue
+        submitted_ids |= ids
+
+    ai_task = await session.get(AITask, ai_task_id)
+    if ai_task:
+        # Values without a request are done; submitted ones are counted by the result handler
+        ai_task.progress_current += len(facet_values) - len(submitted_ids) - len(failed_ids)
+        if submitted_ids:
+            ai_task.description = f"{len(submitted_ids)} FacetValues zur Batch-Anreicherung eingereicht"
+        elif not failed_ids:
+            ai_task.status = AITaskStatus.COMPLETED
+            ai_task.completed_at = datetime.now(UTC)
+            ai_task.fields_extracted = 0
+
+    logger.info(
+        "Submitted PySis enrichment batch",
+        entity_id=str(entity.id),
+        submitted=len(submitted_ids),
+        fallback=len(failed_ids),
+    )
+    return [fv for fv in facet_values if str(fv.id) in failed_ids]
+
+
+async def _handle_pysis_enrichment_results(
+    session: "AsyncSession",
+    job: "LLMBatchJob",
+    results: dict[str, BatchResult | None],
+) -> None:
+    """
+    Merge enrichment results into the FacetValues and update the AITask.
+
+    Requests without a result (failed / expired batch) are requeued as
+    synchronous enrich_facet_values_from_pysis tasks.
+    """
+    from sqlalchemy.orm import selectinload
+
+    from app.models import AITask, AITaskStatus, FacetValue
+    from workers.ai_tasks import enrich_facet_values_from_pysis
+
+    from .pysis_processor import _apply_enriched_value, _merge_enrichment
+
+    done: Counter[str] = Counter()
+    enriched: Counter[str] = Counter()
+    requeue: dict[tuple[str, str, bool], list[str]] = {}
+    for custom_id, item in job.items.items():
+        result = results.get(custom_id)
+        if result is None:
+            key = (item["entity_id"], item["ai_task_id"], item["overwrite_existing"])
+            requeue.setdefault(key, []).append(item["facet_value_id"])
+            continue
+
+        done[item["ai_task_id"]] += 1
+        facet_value = await session.get(
+            FacetValue, UUID(item["facet_value_id"]), options=[selectinload(FacetValue.facet_type)]
+        )
+        if facet_value is None or facet_value.facet_type is None:
+            continue
+        try:
+            if result.error:
+                raise RuntimeError(result.error)
+            enriched_value = _merge_enrichment(
+                facet_value.value or {}, facet_value.facet_type.value_schema or {}, result.content
+            )
+            await record_llm_usage(
+                provider=LLMProvider.AZURE_OPENAI,
+                model=job.model,
+                task_type=LLMTaskType.EXTRACT,
+                prompt_tokens=result.prompt_tokens,
+                completion_tokens=result.completion_tokens,
+                total_tokens=result.prompt_tokens + result.completion_tokens,
+                task_name="_enrich_single_facet_value_batch",
+                entity_id=facet_value.entity_id,
+                metadata={"batch_job_id": str(job.id)},
+            )
+            if _apply_enriched_value(facet_value, enriched_value, job.model):
+                enriched[item["ai_task_id"]] += 1
+        except Exception as e:
+            logger.warning("Batch enrichment result failed", facet_value_id=item["facet_value_id"], error=str(e))
+
+    for task_id, count in done.items():
+        # Locked: a synchronous run of the same task may update its progress concurrently
+        ai_task = await session.get(AITask, UUID(task_id), populate_existing=True, with_for_update=True)
+        if ai_task is None:
+            continue
+        ai_task.progress_current = (ai_task.progress_current or 0) + count
+        ai_task.fields_extracted = (ai_task.fields_extracted or 0) + enriched[task_id]
+        if ai_task.status == AITaskStatus.RUNNING and ai_task.progress_current >= (ai_task.progress_total or 0):
+            ai_task.status = AITaskStatus.COMPLETED
+            ai_task.completed_at = datetime.now(UTC)
+            ai_task.current_item = None
+
+    for (entity_id, task_id, overwrite_existing), facet_value_ids in requeue.items():
+        enrich_facet_values_from_pysis.delay(
+            entity_id,
+            None,
+            overwrite_existing,
+            task_id,
+            facet_value_ids=facet_value_ids,
+            use_batch=False,
+        )
+    if requeue:
+        logger.info(
+            "Requeued enrichments of unfinished batch",
+            batch_job_id=str(job.id),
+            status=job.status,
+            count=sum(len(ids) for ids in requeue.values()),
+        )
+
+
+register_batch_handler(PYSIS_ENRICHMENT_PURPOSE, _handle_pysis_enrichment_results)
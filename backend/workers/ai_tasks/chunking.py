@@ -0,0 +1,205 @@
+"""Token-aware chunking and result merging for long document analyses.
+
+Long documents (e.g. Regionalplan PDFs) are split into chunks of at most
+``settings.ai_analysis_chunk_tokens`` tokens, analyzed in parallel and merged
+into one extraction. Chunks are cut on page boundaries ("=== SEITE n ..."
+markers from page-based analysis), falling back to paragraphs and lines, so
+no text is dropped and latency depends on the chunk size instead of the
+document size.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any
+
+import structlog
+
+from app.utils.text import normalize_name
+from services.entity_facet_service import extract_text_representation, is_similar_facet_text
+from services.llm_usage_tracker import estimate_tokens
+
+logger = structlog.get_logger()
+
+# Page markers written by _get_text_for_analysis / DocumentPageFilter
+PAGE_MARKER_PATTERN = re.compile(r"(?m)^(?==== SEITE \d+|--- Seite \d+ ---)")
+
+# Ordinal values of rating fields (relevanz, priority, ...) - the highest wins when merging
+RATING_ORDER = {"keine": 0, "niedrig": 1, "gering": 1, "mittel": 2, "hoch": 3}
+
+# Fields whose values of all chunks are kept (joined) instead of the first one
+TEXT_JOIN_FIELDS = {"summary", "zusammenfassung"}
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Get the tiktoken encoding of a model (None if unavailable, e.g. offline)."""
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Azure deployment names are not known to tiktoken
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("tiktoken_encoding_unavailable", model=model, error=str(e))
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count the tokens of a text (falls back to the character estimate)."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _split_hard(text: str, max_tokens: int, model: str) -> list[str]:
+    """Split a single oversized line at token (or character) boundaries."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        step = max_tokens * 4
+        return [text[i : i + step] for i in range(0, len(text), step)]
+    tokens = encoding.encode(text, disallowed_special=())
+    return [encoding.decode(tokens[i : i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+
+
+def _split_segment(segment: str, max_tokens: int, model: str) -> list[str]:
+    """Split an oversized segment on paragraphs, then lines, then tokens."""
+    for separator in ("\n\n", "\n"):
+        parts = [part for part in segment.split(separator) if part]
+        if len(parts) > 1:
+            return _pack(parts, max_tokens, model, separator)
+    return _split_hard(segment, max_tokens, model)
+
+
+def _pack(segments: list[str], max_tokens: int, model: str, separator: str) -> list[str]:
+    """Greedily pack segments into chunks of at most max_tokens."""
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    separator_tokens = count_tokens(separator, model)
+
+    for segment in segments:
+        segment_tokens = count_tokens(segment, model)
+        if segment_tokens > max_tokens:
+            if current:
+                chunks.append(separator.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_segment(segment, max_tokens, model))
+            continue
+        if current and current_tokens + separator_tokens + segment_tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current, current_tokens = [], 0
+        current.append(segment)
+        current_tokens += segment_tokens + (separator_tokens if len(current) > 1 else 0)
+
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def split_into_chunks(text: str, max_tokens: int, model: str = "gpt-4o") -> list[str]:
+    """
+    Split a document text into chunks of at most max_tokens tokens.
+
+    Pages stay together whenever they fit; larger pages are split on
+    paragraph and line boundaries. The chunks contain all of the text.
+    Recent splits are memoized: the analysis task sizes its time limits
+    from the chunk count and _call_azure_openai then analyzes the same
+    chunks without tokenizing the document again.
+
+    Args:
+        text: Document text (optionally with page markers)
+        max_tokens: Token budget per chunk
+        model: Model name (selects the tokenizer)
+
+    Returns:
+        List of chunks (a single chunk if the text fits)
+    """
+    return list(_split_cached(text, max_tokens, model))
+
+
+@lru_cache(maxsize=8)
+def _split_cached(text: str, max_tokens: int, model: str) -> tuple[str, ...]:
+    if count_tokens(text, model) <= max_tokens:
+        return (text,)
+
+    pages = [page for page in PAGE_MARKER_PATTERN.split(text) if page.strip()]
+    if len(pages) > 1:
+        return tuple(_pack([page.rstrip("\n") for page in pages], max_tokens, model, "\n\n"))
+    return tuple(_split_segment(text, max_tokens, model))
+
+
+# =============================================================================
+# Result merging
+# =============================================================================
+
+
+def _item_text(item: Any) -> str:
+    if isinstance(item, dict):
+        return extract_text_representation(item, "")
+    return str(item)
+
+
+def _merge_lists(values: list[list[Any]]) -> list[Any]:
+    """Concatenate list values in chunk order, skipping duplicate facet values."""
+    merged: list[Any] = []
+    seen: list[str] = []
+    for items in values:
+        for item in items:
+            text = _item_text(item)
+            normalized = normalize_name(text) if len(text) >= 3 else text
+            if item in merged or (normalized and any(is_similar_facet_text(normalized, s) for s in seen if s)):
+                continue
+            merged.append(item)
+            seen.append(normalized)
+    return merged
+
+
+def _merge_values(key: str, values: list[Any]) -> Any:
+    values = [v for v in values if v is not None and v != "" and v != [] and v != {}]
+    if not values:
+        return None
+    first = values[0]
+
+    if all(isinstance(v, list) for v in values):
+        return _merge_lists(values)
+    if all(isinstance(v, dict) for v in values):
+        return merge_chunk_results(values)
+    if all(isinstance(v, bool) for v in values):
+        # e.g. is_relevant: one relevant chunk makes the document relevant
+        return any(values)
+    if all(isinstance(v, int | float) and not isinstance(v, bool) for v in values):
+        return max(values)
+    if all(isinstance(v, str) for v in values):
+        if all(v.lower() in RATING_ORDER for v in values):
+            return max(values, key=lambda v: RATING_ORDER[v.lower()])
+        if key.lower() in TEXT_JOIN_FIELDS:
+            return "\n\n".join(dict.fromkeys(values))
+    return first
+
+
+def merge_chunk_results(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Deterministically merge the JSON extractions of several chunks.
+
+    Rules (applied recursively, chunks in document order):
+    - lists are concatenated, similar facet values are kept once
+    - booleans are OR-ed (is_relevant), numbers take the maximum
+    - ratings (hoch/mittel/gering/keine) take the highest value
+    - summaries are joined, other scalars keep the first non-empty value
+
+    Args:
+        results: Parsed JSON results in chunk order
+
+    Returns:
+        Merged result
+    """
+    keys = list(dict.fromkeys(key for result in results for key in result))
+    merged: dict[str, Any] = {}
+    for key in keys:
+        values = [result[key] for result in results if key in result]
+        merged_value = _merge_values(key, values)
+        merged[key] = merged_value if merged_value is not None else values[0]
+    return merged
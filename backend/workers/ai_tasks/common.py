@@ -27,6 +27,9 @@ PYSIS_BASE_CONFIDENCE = 0.7
 PYSIS_CONFIDENCE_BOOST = 0.05
 PYSIS_MAX_CONFIDENCE = 0.95
 PYSIS_DUPLICATE_SIMILARITY_THRESHOLD = 0.85
+PYSIS_FIELD_OUTPUT_TOKENS = 400  # Expected answer tokens per field (value, confidence, reasoning)
+PYSIS_FIELD_MAX_OUTPUT_TOKENS = 2000  # Answer budget per field (as for single-field requests)
+PYSIS_MAX_OUTPUT_TOKENS = 16000  # Completion limit of a multi-field request
 
 # =============================================================================
 # Constants for AI API calls
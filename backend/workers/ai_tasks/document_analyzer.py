@@ -4,6 +4,7 @@ This module contains Celery tasks for analyzing documents using Azure OpenAI,
 including document analysis, batch processing, and reanalysis of low-confidence results.
 """
 
+import asyncio
 import json
 import time
 from typing import TYPE_CHECKING, Any
@@ -15,7 +16,8 @@ from sqlalchemy import select
 
 from app.config import settings
 from app.models.llm_usage import LLMProvider, LLMTaskType
-from services.llm_usage_tracker import record_llm_usage
+from services.llm_rate_governor import governed_llm_call
+from services.llm_usage_tracker import estimate_tokens, record_llm_usage
 from workers.async_runner import run_async
 
 from .common import (
@@ -55,19 +57,20 @@ def register_tasks(celery_app):
         retry_backoff_max=600,
         retry_jitter=True,
         rate_limit="10/m",  # 10 requests per minute to respect Azure rate limits
-        soft_time_limit=300,  # 5 minutes soft limit for AI analysis
-        time_limit=360,  # 6 minutes hard limit
+        soft_time_limit=ANALYSIS_SOFT_TIME_LIMIT,  # single-chunk documents, see analysis_time_limits
+        time_limit=ANALYSIS_SOFT_TIME_LIMIT + ANALYSIS_HARD_LIMIT_MARGIN,
     )
-    def analyze_document(self, document_id: str, skip_relevance_check: bool = False):
+    def analyze_document(self, document_id: str, skip_relevance_check: bool = False, force_reanalysis: bool = False):
         """
         Analyze a document using Azure OpenAI.
 
         Args:
             document_id: UUID of the document to analyze
             skip_relevance_check: Skip the relevance pre-filter (default: False)
+            force_reanalysis: Bypass the LLM response cache and request a new completion
         """
         from app.database import get_celery_session_context
-        from app.models import Category, DataSource, Document, ExtractedData, ProcessingStatus
+        from app.models import Category, DataSource, Document, ProcessingStatus
         from services.relevance_checker import check_relevance
 
         async def _analyze():
@@ -124,6 +127,23 @@ def register_tasks(celery_app):
                     # Determine which text to analyze (page-based or full)
                     text_to_analyze, page_info = await _get_text_for_analysis(document, session)
 
+                    # Long documents are analyzed in chunks: re-queue with limits for their chunk count
+                    soft_limit, hard_limit = analysis_time_limits(await _estimate_chunk_count(session, text_to_analyze))
+                    current_soft_limit = (self.request.timelimit or (None, None))[1] or self.soft_time_limit
+                    if soft_limit > current_soft_limit:
+                        logger.info(
+                            "Document analysis re-queued with longer time limits",
+                            document_id=document_id,
+                            soft_time_limit=soft_limit,
+                        )
+                        self.apply_async(
+                            args=(document_id,),
+                            kwargs={"skip_relevance_check": True, "force_reanalysis": force_reanalysis},
+                            soft_time_limit=soft_limit,
+                            time_limit=hard_limit,
+                        )
+                        return
+
                     # Enhance prompt with page context if using page-based analysis
                     if page_info and page_info.get("page_numbers"):
                         prompt = _enhance_prompt_with_page_context(prompt, page_info)
@@ -136,6 +156,9 @@ def register_tasks(celery_app):
                         category.purpose,
                         document_id=document.id,
                         category_id=category.id,
+                        use_cache=not force_reanalysis,
+                        content_hash=document.file_hash,
+                        page_numbers=page_info.get("page_numbers") if page_info else None,
                     )
 
                     # Update analyzed_pages atomically with pessimistic locking
@@ -162,122 +185,7 @@ def register_tasks(celery_app):
                         if source_admin_level_1:
                             content["source_admin_level_1"] = source_admin_level_1
 
-                        # Extract internal AI fields before saving
-                        # These are used for processing but should not be stored as facets
-                        internal_fields = _extract_and_remove_internal_fields(content)
-
-                        # Process entity references from AI extraction
-                        # Also creates FacetValues linking non-primary entities to primary entity
-                        entity_references, primary_entity_id = await _process_entity_references(
-                            session, content, category, document_id=document.id
-                        )
-
-                        # Save extracted data
-                        extracted = ExtractedData(
-                            document_id=document.id,
-                            category_id=category.id,
-                            extraction_type=f"{category.slug}_analysis",
-                            extracted_content=content,
-                            confidence_score=result.get("confidence"),
-                            ai_model_used=result.get("model_name", "unknown"),
-                            ai_prompt_version="1.0",
-                            raw_ai_response=result.get("raw_response"),
-                            tokens_used=result.get("tokens_used"),
-                            relevance_score=result.get("relevance_score"),
-                            entity_references=entity_references,
-                            primary_entity_id=primary_entity_id,
-                        )
-                        session.add(extracted)
-                        await session.flush()  # Get the extracted data ID
-
-                        logger.info(
-                            "Document analyzed",
-                            document_id=document_id,
-                            confidence=result.get("confidence"),
-                        )
-
-                        # Convert extraction to Entity-Facet system
-                        try:
-                            # Use extraction_handler from category config
-                            handler = category.extraction_handler or "default"
-                            if handler == "event":
-                                from services.event_extraction_service import convert_event_extraction_to_facets
-
-                                facet_counts = await convert_event_extraction_to_facets(
-                                    session, extracted, source, category
-                                )
-                            else:
-                                # Default handler for pain_points, positive_signals, etc.
-                                from services.entity_facet_service import convert_extraction_to_facets
-
-                                facet_counts = await convert_extraction_to_facets(session, extracted, source)
-                            if sum(facet_counts.values()) > 0:
-                                logger.info(
-                                    "Created facet values",
-                                    document_id=document_id,
-                                    category=category.slug,
-                                    extraction_handler=handler,
-                                    facet_counts=facet_counts,
-                                )
-                        except Exception as facet_error:
-                            logger.warning(
-                                "Failed to create facet values (non-fatal)",
-                                document_id=document_id,
-                                error=str(facet_error),
-                            )
-
-                        # Process AI-suggested additional pages
-                        # This adds new pages to relevant_pages and triggers re-analysis
-                        suggested_pages = internal_fields.get("suggested_additional_pages")
-                        if suggested_pages:
-                            try:
-                                new_pages_count = await _process_suggested_additional_pages(
-                                    document.id,
-                                    suggested_pages,
-                                    analyze_document,  # Pass the task reference for re-triggering
-                                )
-                                if new_pages_count > 0:
-                                    logger.info(
-                                        "AI suggested additional pages queued",
-                                        document_id=document_id,
-                                        new_pages_count=new_pages_count,
-                                    )
-                            except Exception as page_error:
-                                logger.warning(
-                                    "Failed to process suggested pages (non-fatal)",
-                                    document_id=document_id,
-                                    error=str(page_error),
-                                )
-
-                        # Emit notification events
-                        from workers.notification_tasks import emit_event
-
-                        confidence = result.get("confidence", 0)
-
-                        emit_event.delay(
-                            "AI_ANALYSIS_COMPLETED",
-                            {
-                                "entity_type": "document",
-                                "entity_id": document_id,
-                                "title": document.title or "Unbekanntes Dokument",
-                                "confidence": confidence,
-                                "category_id": str(category.id),
-                            },
-                        )
-
-                        # Emit high confidence event if applicable
-                        if confidence >= 0.8:
-                            emit_event.delay(
-                                "HIGH_CONFIDENCE_RESULT",
-                                {
-                                    "entity_type": "document",
-                                    "entity_id": document_id,
-                                    "title": document.title or "Unbekanntes Dokument",
-                                    "confidence": confidence,
-                                    "category_id": str(category.id),
-                                    "summary": result["content"].get("summary", "")[:500],
-                                },
-                            )
+                        await _store_analysis_result(session, document, category, source, result, analyze_document)
 
                     document.processing_status = ProcessingStatus.COMPLETED
 
@@ -288,7 +196,8 @@ def register_tasks(celery_app):
                         document_id=document_id,
                     )
                     document.processing_status = ProcessingStatus.FAILED
-                    document.processing_error = "AI analysis exceeded time limit (5 minutes)"
+                    soft_limit = (self.request.timelimit or (None, None))[1] or self.soft_time_limit
+                    document.processing_error = f"AI analysis exceeded time limit ({soft_limit} seconds)"
 
                 except Exception as e:
                     logger.exception("AI analysis failed", document_id=document_id)
@@ -301,7 +210,18 @@ def register_tasks(celery_app):
 
     @celery_app.task(name="workers.ai_tasks.batch_analyze")
     def batch_analyze(document_ids: list[str]):
-        """Batch analyze multiple documents."""
+        """Batch analyze multiple documents.
+
+        With settings.llm_batch_enabled the documents are submitted as one
+        offline batch (see batch_inference.py) instead of single tasks.
+        """
+        if settings.llm_batch_enabled:
+            from workers.ai_tasks import submit_analysis_batch
+
+            submit_analysis_batch.delay(document_ids)
+            logger.info("Queued offline batch analysis", count=len(document_ids))
+            return
+
         for doc_id in document_ids:
             analyze_document.delay(doc_id)
 
@@ -334,8 +254,13 @@ def register_tasks(celery_app):
                 await session.commit()
 
                 # Requeue for analysis
-                for doc_id in document_ids:
-                    analyze_document.delay(doc_id)
+                if settings.llm_batch_enabled and document_ids:
+                    from workers.ai_tasks import submit_analysis_batch
+
+                    submit_analysis_batch.delay(list(document_ids))
+                else:
+                    for doc_id in document_ids:
+                        analyze_document.delay(doc_id)
 
                 logger.info("Requeued low confidence documents", count=len(document_ids))
 
@@ -350,6 +275,148 @@ def register_tasks(celery_app):
 # =============================================================================
 
 
+async def _store_analysis_result(
+    session: "AsyncSession",
+    document,
+    category: "Category",
+    source,
+    result: dict[str, Any],
+    analyze_task,
+) -> None:
+    """
+    Store an analysis result and convert it to the Entity-Facet system.
+
+    Shared by analyze_document and the batch inference results, so both
+    paths run the same extraction -> facet pipeline.
+
+    Args:
+        session: Database session
+        document: Analyzed document
+        category: Category of the analysis
+        source: DataSource of the document
+        result: Result of _call_azure_openai
+        analyze_task: analyze_document task (re-triggered for suggested pages)
+    """
+    from app.models import ExtractedData
+
+    content = result["content"]
+
+    # Extract internal AI fields before saving
+    # These are used for processing but should not be stored as facets
+    internal_fields = _extract_and_remove_internal_fields(content)
+
+    # Process entity references from AI extraction
+    # Also creates FacetValues linking non-primary entities to primary entity
+    entity_references, primary_entity_id = await _process_entity_references(
+        session, content, category, document_id=document.id
+    )
+
+    # Save extracted data
+    extracted = ExtractedData(
+        document_id=document.id,
+        category_id=category.id,
+        extraction_type=f"{category.slug}_analysis",
+        extracted_content=content,
+        confidence_score=result.get("confidence"),
+        ai_model_used=result.get("model_name", "unknown"),
+        ai_prompt_version="1.0",
+        raw_ai_response=result.get("raw_response"),
+        tokens_used=result.get("tokens_used"),
+        relevance_score=result.get("relevance_score"),
+        entity_references=entity_references,
+        primary_entity_id=primary_entity_id,
+    )
+    session.add(extracted)
+    await session.flush()  # Get the extracted data ID
+
+    logger.info(
+        "Document analyzed",
+        document_id=str(document.id),
+        confidence=result.get("confidence"),
+    )
+
+    # Convert extraction to Entity-Facet system
+    try:
+        # Use extraction_handler from category config
+        handler = category.extraction_handler or "default"
+        if handler == "event":
+            from services.event_extraction_service import convert_event_extraction_to_facets
+
+            facet_counts = await convert_event_extraction_to_facets(session, extracted, source, category)
+        else:
+            # Default handler for pain_points, positive_signals, etc.
+            from services.entity_facet_service import convert_extraction_to_facets
+
+            facet_counts = await convert_extraction_to_facets(session, extracted, source)
+        if sum(facet_counts.values()) > 0:
+            logger.info(
+                "Created facet values",
+                document_id=str(document.id),
+                category=category.slug,
+                extraction_handler=handler,
+                facet_counts=facet_counts,
+            )
+    except Exception as facet_error:
+        logger.warning(
+            "Failed to create facet values (non-fatal)",
+            document_id=str(document.id),
+            error=str(facet_error),
+        )
+
+    # Process AI-suggested additional pages
+    # This adds new pages to relevant_pages and triggers re-analysis
+    suggested_pages = internal_fields.get("suggested_additional_pages")
+    if suggested_pages:
+        try:
+            new_pages_count = await _process_suggested_additional_pages(
+                document.id,
+                suggested_pages,
+                analyze_task,  # Pass the task reference for re-triggering
+            )
+            if new_pages_count > 0:
+                logger.info(
+                    "AI suggested additional pages queued",
+                    document_id=str(document.id),
+                    new_pages_count=new_pages_count,
+                )
+        except Exception as page_error:
+            logger.warning(
+                "Failed to process suggested pages (non-fatal)",
+                document_id=str(document.id),
+                error=str(page_error),
+            )
+
+    # Emit notification events
+    from workers.notification_tasks import emit_event
+
+    confidence = result.get("confidence", 0)
+
+    emit_event.delay(
+        "AI_ANALYSIS_COMPLETED",
+        {
+            "entity_type": "document",
+            "entity_id": str(document.id),
+            "title": document.title or "Unbekanntes Dokument",
+            "confidence": confidence,
+            "category_id": str(category.id),
+        },
+    )
+
+    # Emit high confidence event if applicable
+    if confidence >= 0.8:
+        emit_event.delay(
+            "HIGH_CONFIDENCE_RESULT",
+            {
+                "entity_type": "document",
+                "entity_id": str(document.id),
+                "title": document.title or "Unbekanntes Dokument",
+                "confidence": confidence,
+                "category_id": str(category.id),
+                "summary": result["content"].get("summary", "")[:500],
+            },
+        )
+
+
 async def _process_entity_references(
     session: "AsyncSession",
     content: dict[str, Any],
@@ -1001,6 +1068,53 @@ async def _update_analyzed_pages_atomic(
         return new_status, note
 
 
+# Completion parameters of document analysis (part of the response cache key)
+ANALYSIS_TEMPERATURE = 0.1
+ANALYSIS_MAX_TOKENS = 4096
+ANALYSIS_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Time limits of analyze_document: a single completion gets the base limit,
+# every further chunk adds ANALYSIS_SECONDS_PER_CHUNK (chunks may wait for
+# the rate governor, so parallelism is not counted on)
+ANALYSIS_SOFT_TIME_LIMIT = 300
+ANALYSIS_SECONDS_PER_CHUNK = 120
+ANALYSIS_HARD_LIMIT_MARGIN = 60
+MAX_ANALYSIS_SOFT_TIME_LIMIT = 3300  # worker default task_soft_time_limit
+
+
+async def _estimate_chunk_count(session, text: str) -> int:
+    """Number of chunks _call_azure_openai will analyze the text in.
+
+    Splits with the tokenizer of the analysis model, so the memoized chunks
+    are reused by _call_azure_openai instead of tokenizing the text again.
+    """
+    from app.models.user_api_credentials import LLMPurpose
+    from services.llm_client_service import LLMClientService
+
+    from .chunking import split_into_chunks
+
+    llm_service = LLMClientService(session)
+    _client, config = await llm_service.get_system_client(LLMPurpose.DOCUMENT_ANALYSIS)
+    if not config:
+        # _call_azure_openai reports the missing credentials
+        return 1
+    model_name = llm_service.get_model_name(config)
+    return len(split_into_chunks(text, settings.ai_analysis_chunk_tokens, model_name))
+
+
+def analysis_time_limits(chunk_count: int) -> tuple[int, int]:
+    """Soft and hard time limit for analyzing a document of chunk_count chunks.
+
+    Returns:
+        Tuple of (soft_time_limit, time_limit) in seconds
+    """
+    soft_limit = min(
+        ANALYSIS_SOFT_TIME_LIMIT + ANALYSIS_SECONDS_PER_CHUNK * max(chunk_count - 1, 0),
+        MAX_ANALYSIS_SOFT_TIME_LIMIT,
+    )
+    return soft_limit, soft_limit + ANALYSIS_HARD_LIMIT_MARGIN
+
+
 async def _call_azure_openai(
     session,
     text: str,
@@ -1008,11 +1122,24 @@ async def _call_azure_openai(
     purpose: str,
     document_id: UUID | None = None,
     category_id: UUID | None = None,
+    use_cache: bool = True,
+    content_hash: str | None = None,
+    page_numbers: list[int] | None = None,
 ) -> dict[str, Any]:
     """Call Azure OpenAI API for document analysis.
 
+    Texts longer than settings.ai_analysis_chunk_tokens are analyzed in
+    chunks (split on page boundaries, see chunking.py) with bounded
+    parallelism and merged into one result - no text is truncated.
+    Identical requests are answered from the LLM response cache
+    (see services.llm_response_cache).
+
     Args:
         session: Database session for loading LLM credentials
+        use_cache: Serve/store the response from/in the response cache
+            (False forces a new completion, e.g. for forced re-analysis)
+        content_hash: Document file hash - duplicate documents share the cached extraction
+        page_numbers: Analyzed pages (part of the content-based cache key)
 
     Raises:
         ValueError: If LLM credentials are not configured
@@ -1020,6 +1147,9 @@ async def _call_azure_openai(
     """
     from app.models.user_api_credentials import LLMPurpose
     from services.llm_client_service import LLMClientService
+    from services.llm_response_cache import build_cache_keys, get_cached_response, store_response
+
+    from .chunking import split_into_chunks
 
     llm_service = LLMClientService(session)
     client, config = await llm_service.get_system_client(LLMPurpose.DOCUMENT_ANALYSIS)
@@ -1031,38 +1161,146 @@ async def _call_azure_openai(
         )
 
     model_name = llm_service.get_model_name(config)
+    cache_keys = build_cache_keys(
+        model_name,
+        prompt,
+        text,
+        ANALYSIS_TEMPERATURE,
+        ANALYSIS_RESPONSE_FORMAT,
+        content_hash=content_hash,
+        page_numbers=page_numbers,
+    )
+    usage_kwargs = {
+        "document_id": document_id,
+        "category_id": category_id,
+        "task_name": f"analyze_document_{purpose}",
+    }
+
+    start_time = time.time()
+
+    if use_cache:
+        cached = await get_cached_response(session, cache_keys)
+        content = _parse_cached_response(cached.response) if cached is not None else None
+        if content is not None:
+            await _record_cache_hit(model_name, cached, start_time, **usage_kwargs)
+            logger.info(
+                "llm_response_cache_hit",
+                document_id=str(document_id) if document_id else None,
+                matched_by="request" if cached.cache_key == cache_keys.cache_key else "content",
+            )
+            return _build_analysis_result(content, cached.response, 0, model_name)
+
+    chunks = split_into_chunks(text, settings.ai_analysis_chunk_tokens, model_name)
+    if len(chunks) == 1:
+        completion = await _complete_analysis(
+            client, model_name, prompt, text, record_cache_miss=use_cache, **usage_kwargs
+        )
+    else:
+        completion = await _analyze_chunks(session, client, model_name, prompt, chunks, use_cache, **usage_kwargs)
+
+    # Only parseable responses are cached (forced runs refresh the entry)
+    await store_response(
+        session,
+        cache_keys,
+        model_name,
+        ANALYSIS_TEMPERATURE,
+        completion["raw_response"],
+        prompt_tokens=completion["prompt_tokens"],
+        completion_tokens=completion["completion_tokens"],
+    )
+
+    return _build_analysis_result(
+        completion["content"], completion["raw_response"], completion["tokens_used"], model_name
+    )
+
+
+def _build_analysis_result(
+    content: dict[str, Any], raw_response: str, tokens_used: int | None, model_name: str
+) -> dict[str, Any]:
+    """Build the result dict of _call_azure_openai."""
+    confidence = _calculate_confidence(content)
+    return {
+        "content": content,
+        "confidence": confidence,
+        "relevance_score": confidence,
+        "raw_response": raw_response,
+        "tokens_used": tokens_used,
+        "model_name": model_name,
+    }
+
+
+def _parse_cached_response(raw_response: str) -> dict[str, Any] | None:
+    try:
+        return json.loads(raw_response)
+    except json.JSONDecodeError:
+        return None
+
+
+async def _record_cache_hit(model_name: str, entry, start_time: float, **usage_kwargs) -> None:
+    """Record a response served from the cache (no tokens spent)."""
+    await record_llm_usage(
+        provider=LLMProvider.AZURE_OPENAI,
+        model=model_name,
+        task_type=LLMTaskType.EXTRACT,
+        prompt_tokens=0,
+        completion_tokens=0,
+        total_tokens=0,
+        duration_ms=int((time.time() - start_time) * 1000),
+        metadata={"saved_tokens": entry.prompt_tokens + entry.completion_tokens},
+        cache_hit=True,
+        **usage_kwargs,
+    )
+
+
+def _build_analysis_messages(prompt: str, text: str) -> list[dict[str, str]]:
+    """Build the chat messages of a document analysis (also used for batch requests)."""
+    return [
+        {
+            "role": "system",
+            "content": prompt,
+        },
+        {
+            "role": "user",
+            "content": f"Analysiere folgendes Dokument:\n\n{text}",
+        },
+    ]
+
+
+async def _complete_analysis(
+    client,
+    model_name: str,
+    prompt: str,
+    text: str,
+    record_cache_miss: bool = True,
+    metadata: dict[str, Any] | None = None,
+    **usage_kwargs,
+) -> dict[str, Any]:
+    """Run one analysis completion (a whole document or one chunk).
 
-    # Truncate text if too long (keep first ~100k chars)
-    max_chars = 100000
-    if len(text) > max_chars:
-        text = text[:max_chars] + "\n\n[... Text gekürzt ...]"
+    Does not use the database session, so chunks can run concurrently.
 
+    Returns:
+        Dict with content, raw_response, prompt_tokens, completion_tokens, tokens_used
+
+    Raises:
+        RuntimeError: If the AI call fails or returns invalid JSON
+    """
     start_time = time.time()
 
     try:
-        response = await client.chat.completions.create(
-            model=model_name,
-            messages=[
-                {
-                    "role": "system",
-                    "content": prompt,
-                },
-                {
-                    "role": "user",
-                    "content": f"Analysiere folgendes Dokument:\n\n{text}",
-                },
-            ],
-            temperature=0.1,
-            max_tokens=4096,
-            response_format={"type": "json_object"},
-        )
+        estimated_tokens = estimate_tokens(prompt) + estimate_tokens(text) + ANALYSIS_MAX_TOKENS
+        async with governed_llm_call(model_name, estimated_tokens):
+            response = await client.chat.completions.create(
+                model=model_name,
+                messages=_build_analysis_messages(prompt, text),
+                temperature=ANALYSIS_TEMPERATURE,
+                max_tokens=ANALYSIS_MAX_TOKENS,
+                response_format=ANALYSIS_RESPONSE_FORMAT,
+            )
 
         raw_response = response.choices[0].message.content
         content = json.loads(raw_response)
 
-        # Calculate confidence based on multiple factors
-        confidence = _calculate_confidence(content)
-
         # Track LLM usage
         duration_ms = int((time.time() - start_time) * 1000)
         if response.usage:
@@ -1074,19 +1312,18 @@ async def _call_azure_openai(
                 completion_tokens=response.usage.completion_tokens,
                 total_tokens=response.usage.total_tokens,
                 duration_ms=duration_ms,
-                document_id=document_id,
-                category_id=category_id,
-                task_name=f"analyze_document_{purpose}",
                 is_error=False,
+                metadata=metadata,
+                cache_hit=False if record_cache_miss else None,
+                **usage_kwargs,
             )
 
         return {
             "content": content,
-            "confidence": confidence,
-            "relevance_score": confidence,
             "raw_response": raw_response,
+            "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
+            "completion_tokens": response.usage.completion_tokens if response.usage else 0,
             "tokens_used": response.usage.total_tokens if response.usage else None,
-            "model_name": model_name,
         }
 
     except json.JSONDecodeError as e:
@@ -1104,10 +1341,105 @@ async def _call_azure_openai(
             completion_tokens=0,
             total_tokens=0,
             duration_ms=duration_ms,
-            document_id=document_id,
-            category_id=category_id,
-            task_name=f"analyze_document_{purpose}",
             is_error=True,
             error_message=str(e),
+            metadata=metadata,
+            **usage_kwargs,
         )
         raise RuntimeError(f"KI-Service nicht erreichbar: {str(e)}") from None
+
+
+async def _analyze_chunks(
+    session,
+    client,
+    model_name: str,
+    prompt: str,
+    chunks: list[str],
+    use_cache: bool,
+    **usage_kwargs,
+) -> dict[str, Any]:
+    """Map-reduce analysis of a long document.
+
+    Chunks are analyzed concurrently (at most settings.ai_analysis_chunk_concurrency
+    at a time) and merged in document order. Each chunk is cached on its own,
+    so a retry after a failed chunk only pays for the missing ones.
+
+    Raises:
+        RuntimeError: If any chunk fails (partial results are never returned)
+    """
+    from services.llm_response_cache import build_cache_keys, get_cached_responses, store_response
+
+    from .chunking import merge_chunk_results
+
+    total = len(chunks)
+    chunk_prompts = [
+        f"{prompt}\n\n**Hinweis:** Dies ist Abschnitt {index} von {total} eines längeren Dokuments. "
+        "Extrahiere nur Informationen, die in diesem Abschnitt stehen."
+        for index in range(1, total + 1)
+    ]
+    chunk_keys = [
+        build_cache_keys(model_name, chunk_prompt, chunk, ANALYSIS_TEMPERATURE, ANALYSIS_RESPONSE_FORMAT)
+        for chunk_prompt, chunk in zip(chunk_prompts, chunks, strict=True)
+    ]
+    cached = await get_cached_responses(session, chunk_keys) if use_cache else {}
+    semaphore = asyncio.Semaphore(settings.ai_analysis_chunk_concurrency)
+
+    async def analyze_chunk(index: int) -> dict[str, Any]:
+        entry = cached.get(chunk_keys[index].cache_key)
+        content = _parse_cached_response(entry.response) if entry is not None else None
+        if content is not None:
+            await _record_cache_hit(model_name, entry, time.time(), **usage_kwargs)
+            return {
+                "content": content,
+                "raw_response": entry.response,
+                "prompt_tokens": entry.prompt_tokens,
+                "completion_tokens": entry.completion_tokens,
+                "tokens_used": 0,
+                "cached": True,
+            }
+        async with semaphore:
+            return await _complete_analysis(
+                client,
+                model_name,
+                chunk_prompts[index],
+                chunks[index],
+                record_cache_miss=use_cache,
+                metadata={"chunk": index + 1, "chunks": total},
+                **usage_kwargs,
+            )
+
+    start_time = time.time()
+    outcomes = await asyncio.gather(*(analyze_chunk(i) for i in range(total)), return_exceptions=True)
+
+    # Store new chunk responses (sequentially - the session is not concurrency-safe)
+    for keys, outcome in zip(chunk_keys, outcomes, strict=True):
+        if isinstance(outcome, dict) and not outcome.get("cached"):
+            await store_response(
+                session,
+                keys,
+                model_name,
+                ANALYSIS_TEMPERATURE,
+                outcome["raw_response"],
+                prompt_tokens=outcome["prompt_tokens"],
+                completion_tokens=outcome["completion_tokens"],
+            )
+
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if failures:
+        raise RuntimeError(f"KI-Analyse von {len(failures)} von {total} Textabschnitten fehlgeschlagen: {failures[0]}")
+
+    merged = merge_chunk_results([outcome["content"] for outcome in outcomes])
+    logger.info(
+        "Chunked document analysis completed",
+        document_id=str(usage_kwargs.get("document_id")) if usage_kwargs.get("document_id") else None,
+        chunks=total,
+        cached_chunks=sum(1 for outcome in outcomes if outcome.get("cached")),
+        duration_ms=int((time.time() - start_time) * 1000),
+    )
+    return {
+        "content": merged,
+        "raw_response": json.dumps(merged, ensure_ascii=False),
+        "prompt_tokens": sum(outcome["prompt_tokens"] for outcome in outcomes),
+        "completion_tokens": sum(outcome["completion_tokens"] for outcome in outcomes),
+        "tokens_used": sum(outcome["tokens_used"] or 0 for outcome in outcomes),
+    }
@@ -8,26 +8,34 @@ them to the Entity-Facet system. It handles:
 - Enriching FacetValues from PySis data
 """
 
+import asyncio
 import json
 import time
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, Optional
 from uuid import UUID
 
 import structlog
 
+from app.config import settings
 from app.models.llm_usage import LLMProvider, LLMTaskType
-from services.llm_usage_tracker import record_llm_usage
+from services.llm_rate_governor import governed_llm_call
+from services.llm_usage_tracker import estimate_tokens, record_llm_usage
 from workers.async_runner import run_async
 
+from .chunking import count_tokens
 from .common import (
     AI_EXTRACTION_MAX_TOKENS,
     AI_EXTRACTION_TEMPERATURE,
     PYSIS_BASE_CONFIDENCE,
     PYSIS_CONFIDENCE_BOOST,
     PYSIS_DUPLICATE_SIMILARITY_THRESHOLD,
+    PYSIS_FIELD_MAX_OUTPUT_TOKENS,
+    PYSIS_FIELD_OUTPUT_TOKENS,
     PYSIS_MAX_CONFIDENCE,
     PYSIS_MAX_CONTEXT_LENGTH,
+    PYSIS_MAX_OUTPUT_TOKENS,
     PYSIS_MIN_DEDUP_TEXT_LENGTH,
     PYSIS_MIN_TEXT_LENGTH,
     PYSIS_SUMMARY_MAX_LENGTH,
@@ -206,24 +214,32 @@ def register_tasks(celery_app):
             if len(context_text) > max_context:
                 context_text = context_text[:max_context] + "\n\n[... Text gekürzt ...]"
 
-            # Extract each field
+            # Extract the fields in a few multi-field requests
             fields_extracted = 0
             total_confidence = 0.0
             error_count = 0
-
-            for idx, field in enumerate(fields):
-                # Update task progress
-                ai_task = await session.get(AITask, task_id)
-                if ai_task:
-                    ai_task.progress_current = idx
-                    ai_task.current_item = field.internal_name
-                    await session.commit()
-
-                try:
-                    value, confidence = await _extract_single_pysis_field(
-                        session, field, context_text, process.entity_name
+            fields_done = 0
+
+            async for chunk_fields, values, error in _extract_pysis_fields_batched(
+                session, fields, context_text, process.entity_name
+            ):
+                fields_done += len(chunk_fields)
+                if error is not None:
+                    error_count += len(chunk_fields)
+                    logger.error(
+                        "Field extraction failed",
+                        fields=[f.internal_name for f in chunk_fields],
+                        error=error,
                     )
 
+                for field in chunk_fields:
+                    if field.id not in values:
+                        if error is None:
+                            error_count += 1
+                            logger.warning("Field missing in AI response", field=field.internal_name)
+                        continue
+
+                    value, confidence = values[field.id]
                     if value:
                         # Store AI value as suggestion - don't auto-apply
                         # User must explicitly accept the suggestion
@@ -236,16 +252,15 @@ def register_tasks(celery_app):
                             "Field extracted (pending review)",
                             field=field.internal_name,
                             confidence=confidence,
-                            value_length=len(value) if value else 0,
+                            value_length=len(value),
                         )
 
-                except Exception as e:
-                    error_count += 1
-                    logger.error(
-                        "Field extraction failed",
-                        field=field.internal_name,
-                        error=str(e),
-                    )
+                # Update task progress once per request
+                ai_task = await session.get(AITask, task_id)
+                if ai_task:
+                    ai_task.progress_current = fields_done
+                    ai_task.current_item = chunk_fields[-1].internal_name
+                    await session.commit()
 
             # Update AI task as completed
             ai_task = await session.get(AITask, task_id)
@@ -262,123 +277,6 @@ def register_tasks(celery_app):
             await session.commit()
             logger.info("PySis field extraction completed", process_id=process_id, fields_extracted=fields_extracted)
 
-    async def _extract_single_pysis_field(
-        session, field: "PySisProcessField", context: str, location_name: str
-    ) -> tuple[str, float]:
-        """
-        Extract a single PySis field value using AI.
-
-        Args:
-            session: Database session for loading LLM credentials
-
-        Returns:
-            Tuple of (extracted_value, confidence_score)
-
-        Raises:
-            ValueError: If LLM credentials are not configured
-            RuntimeError: If AI extraction fails
-        """
-        from app.models.user_api_credentials import LLMPurpose
-        from services.llm_client_service import LLMClientService
-
-        llm_service = LLMClientService(session)
-        client, config = await llm_service.get_system_client(LLMPurpose.DOCUMENT_ANALYSIS)
-
-        if not client or not config:
-            raise ValueError(
-                "Keine LLM-Credentials konfiguriert. "
-                "Bitte konfigurieren Sie die API-Zugangsdaten unter /admin/api-credentials."
-            )
-
-        model_name = llm_service.get_model_name(config)
-
-        # Build extraction prompt
-        custom_prompt = field.ai_extraction_prompt or ""
-        extraction_instruction = custom_prompt or f"Extrahiere Informationen zu: {field.internal_name}"
-
-        system_prompt = f"""Du bist ein Experte für die Extraktion von Informationen aus kommunalen Dokumenten zu Windenergie-Projekten.
-
-    Aufgabe: Extrahiere den Wert für das Feld "{field.internal_name}" für die Gemeinde {location_name}.
-
-    {extraction_instruction}
-
-    Antworte AUSSCHLIESSLICH im folgenden JSON-Format:
-    {{
-      "value": "der extrahierte Wert als Text",
-      "confidence": 0.8,
-      "reasoning": "kurze Begründung warum dieser Wert extrahiert wurde"
-    }}
-
-    Regeln:
-    - "value" soll ein aussagekräftiger, gut formulierter Text sein
-    - "confidence" ist eine Zahl zwischen 0.0 und 1.0
-    - Wenn keine relevanten Informationen gefunden werden, setze "value" auf null und "confidence" auf 0.0
-    - Der Text in "value" soll direkt verwendbar sein (keine Platzhalter, keine Unsicherheiten)
-    """
-
-        try:
-            start_time = time.time()
-            response = await client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {
-                        "role": "user",
-                        "content": f"Analysiere die folgenden Dokumente der Gemeinde {location_name}:\n\n{context}",
-                    },
-                ],
-                temperature=0.2,
-                max_tokens=2000,
-                response_format={"type": "json_object"},
-            )
-
-            if response.usage:
-                await record_llm_usage(
-                    provider=LLMProvider.AZURE_OPENAI,
-                    model=model_name,
-                    task_type=LLMTaskType.EXTRACT,
-                    task_name="_extract_single_pysis_field",
-                    prompt_tokens=response.usage.prompt_tokens,
-                    completion_tokens=response.usage.completion_tokens,
-                    total_tokens=response.usage.total_tokens,
-                    duration_ms=int((time.time() - start_time) * 1000),
-                    is_error=False,
-                )
-
-            result = json.loads(response.choices[0].message.content)
-            value = result.get("value")
-            confidence = result.get("confidence", 0.0)
-
-            # Ensure confidence is a float
-            if isinstance(confidence, str):
-                try:
-                    confidence = float(confidence)
-                except ValueError:
-                    confidence = 0.5
-
-            # Ensure confidence is in valid range
-            confidence = max(0.0, min(1.0, confidence))
-
-            return value, confidence
-
-        except json.JSONDecodeError as e:
-            logger.error("Failed to parse AI response as JSON", error=str(e))
-            raise RuntimeError(f"KI-Service Fehler: AI-Antwort konnte nicht verarbeitet werden - {str(e)}") from None
-        except Exception as e:
-            logger.exception("Azure OpenAI API call failed for PySis field extraction")
-            await record_llm_usage(
-                provider=LLMProvider.AZURE_OPENAI,
-                model=model_name,
-                task_type=LLMTaskType.EXTRACT,
-                task_name="_extract_single_pysis_field",
-                prompt_tokens=0,
-                completion_tokens=0,
-                total_tokens=0,
-                duration_ms=0,
-                is_error=True,
-            )
-            raise RuntimeError(f"KI-Service nicht erreichbar: {str(e)}") from None
-
     @celery_app.task(name="workers.ai_tasks.convert_extractions_to_facets")
     def convert_extractions_to_facets(
         min_confidence: float = 0.5,
@@ -1121,15 +1019,23 @@ def register_tasks(celery_app):
         facet_type_id: str | None = None,
         overwrite_existing: bool = False,
         existing_task_id: str | None = None,
+        facet_value_ids: list[str] | None = None,
+        use_batch: bool = True,
     ):
         """
         Enrich existing FacetValues with data from PySis fields.
 
+        With settings.llm_batch_enabled the enrichment requests are submitted
+        as one offline batch (see batch_inference.py); the AITask is completed
+        by the batch result handler.
+
         Args:
             entity_id: UUID of the entity
             facet_type_id: Optional - only enrich this FacetType
             overwrite_existing: Replace existing field values
             existing_task_id: Existing AITask ID (to avoid duplicate creation)
+            facet_value_ids: Optional - only enrich these FacetValues
+            use_batch: Allow the batch path (False for the fallback of unfinished batches)
         """
         run_async(
             _enrich_facet_values_from_pysis_async(
@@ -1138,6 +1044,8 @@ def register_tasks(celery_app):
                 overwrite_existing,
                 self.request.id,
                 existing_task_id,
+                facet_value_ids,
+                use_batch,
             )
         )
 
@@ -1147,9 +1055,11 @@ def register_tasks(celery_app):
         overwrite_existing: bool,
         celery_task_id: str | None = None,
         existing_task_id: str | None = None,
+        facet_value_ids: list[str] | None = None,
+        use_batch: bool = True,
     ):
         """Async implementation of FacetValue enrichment from PySis."""
-        from sqlalchemy import select
+        from sqlalchemy import select, update
         from sqlalchemy.orm import selectinload
 
         from app.database import get_celery_session_context
@@ -1215,6 +1125,8 @@ def register_tasks(celery_app):
             )
             if facet_type_id:
                 query = query.where(FacetValue.facet_type_id == UUID(facet_type_id))
+            if facet_value_ids:
+                query = query.where(FacetValue.id.in_([UUID(fv_id) for fv_id in facet_value_ids]))
 
             result = await session.execute(query)
             facet_values = result.scalars().all()
@@ -1229,9 +1141,12 @@ def register_tasks(celery_app):
                 # Use existing task from service layer
                 ai_task = await session.get(AITask, UUID(existing_task_id))
                 if ai_task:
+                    # The fallback of an unfinished batch continues the progress of its task
+                    if use_batch or ai_task.status != AITaskStatus.RUNNING:
+                        ai_task.description = f"Reichere {len(facet_values)} FacetValues mit PySis-Daten an"
+                        ai_task.progress_current = 0
+                        ai_task.progress_total = len(facet_values)
                     ai_task.status = AITaskStatus.RUNNING
-                    ai_task.description = f"Reichere {len(facet_values)} FacetValues mit PySis-Daten an"
-                    ai_task.progress_total = len(facet_values)
                     ai_task.celery_task_id = celery_task_id
                     await session.commit()
                 else:
@@ -1277,13 +1192,29 @@ def register_tasks(celery_app):
                 await session.commit()
                 return
 
+            # Bulk enrichment: submit as offline batch, unsubmitted values run synchronously
+            if use_batch and settings.llm_batch_enabled:
+                from .batch_inference import _submit_pysis_enrichment_batch
+
+                facet_values = await _submit_pysis_enrichment_batch(
+                    session, entity, facet_values, pysis_fields, overwrite_existing, model_name, task_id
+                )
+                await session.commit()
+                if not facet_values:
+                    return
+
             # 6. Process each FacetValue
             enriched_count = 0
-            for idx, fv in enumerate(facet_values):
-                # Update progress
-                ai_task = await session.get(AITask, task_id)
-                ai_task.progress_current = idx + 1
-                ai_task.current_item = fv.text_representation[:100] if fv.text_representation else None
+            for fv in facet_values:
+                # Update progress (atomic: batch results of the same task are counted concurrently)
+                await session.execute(
+                    update(AITask)
+                    .where(AITask.id == task_id)
+                    .values(
+                        progress_current=AITask.progress_current + 1,
+                        current_item=fv.text_representation[:100] if fv.text_representation else None,
+                    )
+                )
                 await session.commit()
 
                 # Load FacetType for schema
@@ -1303,32 +1234,21 @@ def register_tasks(celery_app):
                         overwrite_existing,
                     )
 
-                    if enriched_value and enriched_value != fv.value:
-                        fv.value = enriched_value
-                        fv.updated_at = datetime.now(UTC)
-                        fv.ai_model_used = model_name
-
-                        # Update text representation
-                        text_repr = (
-                            enriched_value.get("description")
-                            or enriched_value.get("text")
-                            or enriched_value.get("name")
-                            or str(enriched_value)
-                        )
-                        if text_repr:
-                            fv.text_representation = str(text_repr)[:2000]
-
+                    if _apply_enriched_value(fv, enriched_value, model_name):
                         enriched_count += 1
                         await session.commit()
 
                 except Exception as e:
                     logger.error("Failed to enrich FacetValue", facet_value_id=str(fv.id), error=str(e))
 
-            # 7. Complete task
-            ai_task = await session.get(AITask, task_id)
-            ai_task.status = AITaskStatus.COMPLETED
-            ai_task.completed_at = datetime.now(UTC)
-            ai_task.fields_extracted = enriched_count
+            # 7. Complete task - unless batch results are outstanding, the
+            # result handler completes it then
+            ai_task = await session.get(AITask, task_id, populate_existing=True, with_for_update=True)
+            ai_task.fields_extracted = (ai_task.fields_extracted or 0) + enriched_count
+            if ai_task.progress_current >= ai_task.progress_total:
+                ai_task.status = AITaskStatus.COMPLETED
+                ai_task.completed_at = datetime.now(UTC)
+                ai_task.current_item = None
             await session.commit()
 
             logger.info(
@@ -1362,69 +1282,17 @@ def register_tasks(celery_app):
         Returns:
             Enriched value dict or None if no changes
         """
-        # Identify missing or empty fields
-        schema_properties = value_schema.get("properties", {})
-        missing_fields = []
-
-        for field_name, field_def in schema_properties.items():
-            current_field_value = current_value.get(field_name)
-            # Skip fields that have values unless overwrite is enabled
-            if current_field_value and not overwrite_existing:
-                continue
-            # Skip internal fields
-            if field_name in ["id", "created_at", "updated_at"]:
-                continue
-
-            missing_fields.append(
-                {
-                    "name": field_name,
-                    "type": field_def.get("type", "string"),
-                    "description": field_def.get("description", ""),
-                }
-            )
-
-        if not missing_fields:
+        prompt = _build_enrichment_prompt(current_value, value_schema, pysis_fields, entity_name, overwrite_existing)
+        if prompt is None:
             return None
 
-        # Build prompt
-        pysis_text = "\n".join(
-            [
-                f"- {f['name']}: {f['value']}"
-                for f in pysis_fields[:30]  # Limit context
-            ]
-        )
-
-        missing_fields_text = "\n".join([f"- {f['name']} ({f['type']}): {f['description']}" for f in missing_fields])
-
-        prompt = f"""Analysiere die PySis-Daten für "{entity_name}" und extrahiere fehlende Informationen.
-
-    AKTUELLE WERTE:
-    {json.dumps(current_value, ensure_ascii=False, indent=2)}
-
-    FEHLENDE FELDER (zu befüllen):
-    {missing_fields_text}
-
-    VERFÜGBARE PYSIS-DATEN:
-    {pysis_text}
-
-    Ergänze die fehlenden Felder basierend auf den verfügbaren Daten.
-    Antworte im JSON-Format mit NUR den neuen/aktualisierten Feldern.
-    Wenn keine passenden Daten gefunden werden, gib ein leeres Objekt {{}} zurück.
-    Erfinde KEINE Informationen."""
-
         try:
             start_time = time.time()
             response = await client.chat.completions.create(
                 model=model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Du extrahierst strukturierte Daten aus Textfeldern. Antworte nur mit JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
-                max_tokens=1000,
+                messages=_build_enrichment_messages(prompt),
+                temperature=ENRICHMENT_TEMPERATURE,
+                max_tokens=ENRICHMENT_MAX_TOKENS,
                 response_format={"type": "json_object"},
             )
 
@@ -1441,17 +1309,7 @@ def register_tasks(celery_app):
                     is_error=False,
                 )
 
-            enriched = json.loads(response.choices[0].message.content)
-
-            if enriched:
-                # Merge with current value
-                result = current_value.copy()
-                for key, value in enriched.items():
-                    if key in schema_properties and value:
-                        result[key] = value
-                return result
-
-            return None
+            return _merge_enrichment(current_value, value_schema, response.choices[0].message.content)
 
         except Exception as e:
             logger.error("AI enrichment failed", error=str(e))
@@ -1475,3 +1333,396 @@ def register_tasks(celery_app):
         analyze_pysis_fields_for_facets,
         enrich_facet_values_from_pysis,
     )
+
+
+# =============================================================================
+# Batched Field Extraction
+# =============================================================================
+
+
+def _field_instruction(field: "PySisProcessField") -> str:
+    return field.ai_extraction_prompt or f"Extrahiere Informationen zu: {field.internal_name}"
+
+
+def _pack_pysis_fields(
+    fields: list["PySisProcessField"], token_budget: int, model: str = "gpt-4o"
+) -> list[list["PySisProcessField"]]:
+    """
+    Greedily pack fields into requests of at most token_budget tokens.
+
+    The budget covers the field instructions and the expected answers; the
+    shared document context is sent once per request.
+    """
+    chunks: list[list[PySisProcessField]] = []
+    current: list[PySisProcessField] = []
+    used = 0
+    for field in fields:
+        cost = count_tokens(_field_instruction(field), model) + PYSIS_FIELD_OUTPUT_TOKENS
+        if current and used + cost > token_budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(field)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _build_pysis_batch_prompt(fields: list["PySisProcessField"], location_name: str) -> str:
+    """Build the system prompt for extracting several fields at once."""
+    field_lines = "\n".join(
+        f'- "{index}" ({field.internal_name}): {_field_instruction(field)}' for index, field in enumerate(fields, 1)
+    )
+    return f"""Du bist ein Experte für die Extraktion von Informationen aus kommunalen Dokumenten zu Windenergie-Projekten.
+
+Aufgabe: Extrahiere die Werte der folgenden Felder für die Gemeinde {location_name}.
+
+Felder (Nummer, Feldname und Anweisung):
+{field_lines}
+
+Antworte AUSSCHLIESSLICH im folgenden JSON-Format, mit genau einem Eintrag pro Feldnummer:
+{{
+  "fields": {{
+    "1": {{
+      "value": "der extrahierte Wert als Text",
+      "confidence": 0.8,
+      "reasoning": "kurze Begründung warum dieser Wert extrahiert wurde"
+    }}
+  }}
+}}
+
+Regeln:
+- "value" soll ein aussagekräftiger, gut formulierter Text sein
+- "confidence" ist eine Zahl zwischen 0.0 und 1.0
+- Wenn keine relevanten Informationen gefunden werden, setze "value" auf null und "confidence" auf 0.0
+- Der Text in "value" soll direkt verwendbar sein (keine Platzhalter, keine Unsicherheiten)
+- Jedes Feld wird unabhängig von den anderen Feldern beantwortet
+"""
+
+
+class IncompleteFieldBatchError(RuntimeError):
+    """The answer of a multi-field request was cut off or is not valid JSON."""
+
+
+def _normalize_confidence(confidence: Any) -> float:
+    """Coerce an AI confidence value into the range 0.0 - 1.0."""
+    if isinstance(confidence, str):
+        try:
+            confidence = float(confidence)
+        except ValueError:
+            confidence = 0.5
+    if not isinstance(confidence, int | float):
+        confidence = 0.0
+    return max(0.0, min(1.0, float(confidence)))
+
+
+async def _extract_pysis_field_batch(
+    client: "AsyncAzureOpenAI",
+    model_name: str,
+    fields: list["PySisProcessField"],
+    context: str,
+    location_name: str,
+) -> dict[UUID, tuple[str | None, float]]:
+    """
+    Extract several PySis fields with one structured-output request.
+
+    Does not use the database session, so requests can run concurrently.
+    Each field may use up to PYSIS_FIELD_MAX_OUTPUT_TOKENS answer tokens,
+    within the PYSIS_MAX_OUTPUT_TOKENS limit of the request.
+
+    Returns:
+        Dict of field id -> (extracted_value, confidence_score) for all
+        fields contained in the response
+
+    Raises:
+        IncompleteFieldBatchError: If the answer was cut off or is not valid JSON
+        RuntimeError: If AI extraction fails
+    """
+    system_prompt = _build_pysis_batch_prompt(fields, location_name)
+    user_prompt = f"Analysiere die folgenden Dokumente der Gemeinde {location_name}:\n\n{context}"
+    max_tokens = min(len(fields) * PYSIS_FIELD_MAX_OUTPUT_TOKENS, PYSIS_MAX_OUTPUT_TOKENS)
+    start_time = time.time()
+
+    try:
+        estimated_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + max_tokens
+        async with governed_llm_call(model_name, estimated_tokens):
+            response = await client.chat.completions.create(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=AI_EXTRACTION_TEMPERATURE,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"},
+            )
+
+        if response.usage:
+            await record_llm_usage(
+                provider=LLMProvider.AZURE_OPENAI,
+                model=model_name,
+                task_type=LLMTaskType.EXTRACT,
+                task_name="_extract_pysis_field_batch",
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens,
+                total_tokens=response.usage.total_tokens,
+                duration_ms=int((time.time() - start_time) * 1000),
+                is_error=False,
+                metadata={"fields": len(fields)},
+            )
+
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise IncompleteFieldBatchError(f"KI-Antwort nach {max_tokens} Tokens abgeschnitten")
+        answers = json.loads(choice.message.content).get("fields") or {}
+        values: dict[UUID, tuple[str | None, float]] = {}
+        for index, field in enumerate(fields, 1):
+            answer = answers.get(str(index))
+            if not isinstance(answer, dict):
+                continue
+            value = answer.get("value")
+            if value is not None and not isinstance(value, str):
+                value = json.dumps(value, ensure_ascii=False)
+            values[field.id] = (value, _normalize_confidence(answer.get("confidence", 0.0)))
+        return values
+
+    except IncompleteFieldBatchError:
+        raise
+    except json.JSONDecodeError as e:
+        logger.warning("Failed to parse AI response as JSON", fields=len(fields), error=str(e))
+        raise IncompleteFieldBatchError(
+            f"KI-Service Fehler: AI-Antwort konnte nicht verarbeitet werden - {str(e)}"
+        ) from None
+    except Exception as e:
+        logger.exception("Azure OpenAI API call failed for PySis field extraction")
+        await record_llm_usage(
+            provider=LLMProvider.AZURE_OPENAI,
+            model=model_name,
+            task_type=LLMTaskType.EXTRACT,
+            task_name="_extract_pysis_field_batch",
+            prompt_tokens=0,
+            completion_tokens=0,
+            total_tokens=0,
+            duration_ms=int((time.time() - start_time) * 1000),
+            is_error=True,
+            error_message=str(e),
+            metadata={"fields": len(fields)},
+        )
+        raise RuntimeError(f"KI-Service nicht erreichbar: {str(e)}") from None
+
+
+async def _extract_pysis_fields_splitting(
+    client: "AsyncAzureOpenAI",
+    model_name: str,
+    fields: list["PySisProcessField"],
+    context: str,
+    location_name: str,
+) -> dict[UUID, tuple[str | None, float]]:
+    """
+    Extract several PySis fields, splitting the request if its answer is incomplete.
+
+    A cut-off or invalid answer is retried as two requests with half of the
+    fields each, down to single fields.
+
+    Raises:
+        RuntimeError: If AI extraction fails (for a single field: also if incomplete)
+    """
+    try:
+        return await _extract_pysis_field_batch(client, model_name, fields, context, location_name)
+    except IncompleteFieldBatchError as e:
+        if len(fields) == 1:
+            raise
+        logger.info("Splitting PySis field request", fields=len(fields), reason=str(e))
+
+    middle = len(fields) // 2
+    values = await _extract_pysis_fields_splitting(client, model_name, fields[:middle], context, location_name)
+    values.update(await _extract_pysis_fields_splitting(client, model_name, fields[middle:], context, location_name))
+    return values
+
+
+async def _extract_pysis_fields_batched(
+    session: "AsyncSession",
+    fields: list["PySisProcessField"],
+    context: str,
+    location_name: str,
+) -> AsyncIterator[tuple[list["PySisProcessField"], dict[UUID, tuple[str | None, float]], str | None]]:
+    """
+    Extract PySis fields in multi-field requests.
+
+    Fields are packed into requests by settings.pysis_extraction_batch_tokens
+    and at most settings.pysis_extraction_concurrency requests run at a time.
+    Requests with a cut-off answer are split (_extract_pysis_fields_splitting).
+    The session is only used to load the LLM credentials.
+
+    Yields:
+        Tuple of (fields of the request, field id -> (value, confidence),
+        error message or None) as soon as each request completes
+    """
+    from app.models.user_api_credentials import LLMPurpose
+    from services.llm_client_service import LLMClientService
+
+    llm_service = LLMClientService(session)
+    client, config = await llm_service.get_system_client(LLMPurpose.DOCUMENT_ANALYSIS)
+    if not client or not config:
+        yield (
+            list(fields),
+            {},
+            "Keine LLM-Credentials konfiguriert. "
+            "Bitte konfigurieren Sie die API-Zugangsdaten unter /admin/api-credentials.",
+        )
+        return
+
+    model_name = llm_service.get_model_name(config)
+    chunks = _pack_pysis_fields(list(fields), settings.pysis_extraction_batch_tokens, model_name)
+    semaphore = asyncio.Semaphore(settings.pysis_extraction_concurrency)
+
+    logger.info("Extracting PySis fields in batches", field_count=len(fields), requests=len(chunks))
+
+    async def extract_chunk(chunk: list["PySisProcessField"]):
+        async with semaphore:
+            try:
+                values = await _extract_pysis_fields_splitting(client, model_name, chunk, context, location_name)
+                return chunk, values, None
+            except Exception as e:
+                return chunk, {}, str(e)
+
+    tasks = [asyncio.create_task(extract_chunk(chunk)) for chunk in chunks]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# =============================================================================
+# FacetValue Enrichment
+# =============================================================================
+
+# Completion parameters of FacetValue enrichment (shared with the batch path)
+ENRICHMENT_TEMPERATURE = 0.1
+ENRICHMENT_MAX_TOKENS = 1000
+ENRICHMENT_SYSTEM_PROMPT = "Du extrahierst strukturierte Daten aus Textfeldern. Antworte nur mit JSON."
+
+
+def _build_enrichment_prompt(
+    current_value: dict[str, Any],
+    value_schema: dict[str, Any],
+    pysis_fields: list[dict[str, Any]],
+    entity_name: str,
+    overwrite_existing: bool,
+) -> str | None:
+    """
+    Build the enrichment prompt of a FacetValue.
+
+    Returns:
+        The prompt, or None if the value has no fields to fill
+    """
+    # Identify missing or empty fields
+    schema_properties = value_schema.get("properties", {})
+    missing_fields = []
+
+    for field_name, field_def in schema_properties.items():
+        current_field_value = current_value.get(field_name)
+        # Skip fields that have values unless overwrite is enabled
+        if current_field_value and not overwrite_existing:
+            continue
+        # Skip internal fields
+        if field_name in ["id", "created_at", "updated_at"]:
+            continue
+
+        missing_fields.append(
+            {
+                "name": field_name,
+                "type": field_def.get("type", "string"),
+                "description": field_def.get("description", ""),
+            }
+        )
+
+    if not missing_fields:
+        return None
+
+    # Build prompt
+    pysis_text = "\n".join(
+        [
+            f"- {f['name']}: {f['value']}"
+            for f in pysis_fields[:30]  # Limit context
+        ]
+    )
+
+    missing_fields_text = "\n".join([f"- {f['name']} ({f['type']}): {f['description']}" for f in missing_fields])
+
+    return f"""Analysiere die PySis-Daten für "{entity_name}" und extrahiere fehlende Informationen.
+
+    AKTUELLE WERTE:
+    {json.dumps(current_value, ensure_ascii=False, indent=2)}
+
+    FEHLENDE FELDER (zu befüllen):
+    {missing_fields_text}
+
+    VERFÜGBARE PYSIS-DATEN:
+    {pysis_text}
+
+    Ergänze die fehlenden Felder basierend auf den verfügbaren Daten.
+    Antworte im JSON-Format mit NUR den neuen/aktualisierten Feldern.
+    Wenn keine passenden Daten gefunden werden, gib ein leeres Objekt {{}} zurück.
+    Erfinde KEINE Informationen."""
+
+
+def _build_enrichment_messages(prompt: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": ENRICHMENT_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _merge_enrichment(
+    current_value: dict[str, Any], value_schema: dict[str, Any], content: str
+) -> dict[str, Any] | None:
+    """
+    Merge an enrichment response into the current value.
+
+    Only fields of the value schema with a non-empty value are taken over.
+
+    Returns:
+        Enriched value dict or None if the response adds nothing
+
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON
+    """
+    enriched = json.loads(content)
+    if not enriched:
+        return None
+
+    schema_properties = value_schema.get("properties", {})
+    result = current_value.copy()
+    for key, value in enriched.items():
+        if key in schema_properties and value:
+            result[key] = value
+    return result
+
+
+def _apply_enriched_value(facet_value, enriched_value: dict[str, Any] | None, model_name: str) -> bool:
+    """
+    Store an enriched value on a FacetValue.
+
+    Returns:
+        True if the value changed
+    """
+    if not enriched_value or enriched_value == facet_value.value:
+        return False
+
+    facet_value.value = enriched_value
+    facet_value.updated_at = datetime.now(UTC)
+    facet_value.ai_model_used = model_name
+
+    # Update text representation
+    text_repr = (
+        enriched_value.get("description")
+        or enriched_value.get("text")
+        or enriched_value.get("name")
+        or str(enriched_value)
+    )
+    if text_repr:
+        facet_value.text_representation = str(text_repr)[:2000]
+    return True
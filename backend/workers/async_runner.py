@@ -3,30 +3,158 @@
 This module provides a consistent way to run async code in Celery tasks,
 avoiding event loop conflicts.
 
-The run_async function creates a fresh event loop for each task execution,
-ensuring proper cleanup and preventing "Event loop is closed" or
-"Task got Future attached to a different loop" errors.
+With celery_persistent_event_loop (the default), every worker process keeps
+one event loop for its whole lifetime. It is created in worker_process_init
+and closed in worker_process_shutdown (start_worker_loop / stop_worker_loop).
+The database engine, httpx and LLM clients and other loop-bound singletons
+are created once per process and reused by all tasks.
+
+Otherwise run_async creates a fresh event loop for each task execution and
+resets the database engine around it, ensuring proper cleanup and preventing
+"Event loop is closed" or "Task got Future attached to a different loop"
+errors.
 
 IMPORTANT: We do NOT use nest_asyncio because it causes connection pool
-issues with asyncpg. Instead, each task gets its own event loop.
+issues with asyncpg. Tasks never share a loop concurrently: a prefork worker
+process runs one task at a time on its loop.
 """
 
 import asyncio
+import contextlib
 from collections.abc import Coroutine
 from typing import Any, TypeVar
 
+import structlog
+from prometheus_client import REGISTRY
+
+from app.monitoring.metrics import celery_async_tasks_total
+
 T = TypeVar("T")
 
+logger = structlog.get_logger(__name__)
+
+# Event loop of this worker process (None: a new loop per task)
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def start_worker_loop() -> asyncio.AbstractEventLoop:
+    """Create the long-lived event loop of this worker process.
+
+    Called from worker_process_init. The engine inherited from the parent
+    process is discarded so that the pool is opened in this loop.
+
+    Returns:
+        The worker event loop
+    """
+    global _worker_loop
+    from app.database import reset_celery_engine
+
+    reset_celery_engine()
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
+
+
+def stop_worker_loop() -> None:
+    """Close the worker event loop and everything bound to it.
+
+    Called from worker_process_shutdown: disposes the database engine,
+    closes the shared HTTP client and SMTP sessions, cancels remaining tasks
+    and logs how many connections the process opened for its tasks.
+    """
+    global _worker_loop
+    loop, _worker_loop = _worker_loop, None
+    if loop is None or loop.is_closed():
+        return
+
+    from app.database import dispose_celery_engine_async
+    from crawlers.website_crawler import close_shared_http_client
+    from services.notifications.channels.smtp_pool import close_smtp_pools
+
+    async def _close_resources():
+        await dispose_celery_engine_async()
+        await close_shared_http_client()
+        await close_smtp_pools()
+
+    try:
+        loop.run_until_complete(_close_resources())
+    except Exception as e:
+        logger.warning("worker_loop_cleanup_error", error=str(e))
+    finally:
+        _close_loop(loop)
+
+    tasks = REGISTRY.get_sample_value("celery_async_tasks_total", {"loop": "persistent"}) or 0
+    connections = REGISTRY.get_sample_value("celery_db_connections_opened_total") or 0
+    logger.info(
+        "worker_loop_stopped",
+        tasks=int(tasks),
+        db_connections_opened=int(connections),
+        db_connections_per_1000_tasks=round(connections * 1000 / tasks, 1) if tasks else None,
+    )
+
+
+def on_worker_loop() -> bool:
+    """Whether the calling coroutine runs on the persistent worker loop.
+
+    Loop-bound resources (e.g. SMTP sessions) are kept open between tasks
+    there and closed in stop_worker_loop.
+    """
+    return _worker_loop is not None and asyncio.get_running_loop() is _worker_loop
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    # Ensure the loop is properly closed, running any pending cleanup
+    try:
+        # Cancel all pending tasks
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+
+        # Run the loop briefly to let cancellations propagate
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+        # Shutdown async generators
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    except Exception:  # noqa: S110
+        pass
+    finally:
+        loop.close()
+
+
+def _run_on_worker_loop[T](loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, T]) -> T:
+    celery_async_tasks_total.labels(loop="persistent").inc()
+    task = loop.create_task(coro)
+    try:
+        return loop.run_until_complete(task)
+    except BaseException:
+        # Interrupted while the loop waited for I/O (e.g. SoftTimeLimitExceeded):
+        # the task must not resume when the loop runs the next Celery task
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(BaseException):
+                loop.run_until_complete(task)
+        raise
+    finally:
+        _finish_after_commit_tasks(loop)
+
+
+def _finish_after_commit_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    # The loop does not run between tasks: publish the data version bumps
+    # and cache invalidations of this task's commits now
+    from app.core.after_commit import wait_for_after_commit_tasks
+
+    with contextlib.suppress(Exception):
+        loop.run_until_complete(wait_for_after_commit_tasks())
+
 
 def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
     """Run async coroutine in Celery task safely.
 
-    Creates a new event loop for each task execution to avoid conflicts
-    with existing loops. This is the recommended pattern for running
-    async code in synchronous Celery tasks.
-
-    This function also resets the database engine before each execution
-    to ensure connections are fresh and not bound to a stale event loop.
+    Runs the coroutine on the worker event loop if the process has one.
+    Otherwise creates a new event loop for this execution and resets the
+    database engine before and after it, so connections are not bound to
+    a stale event loop.
 
     Args:
         coro: The coroutine to execute
@@ -44,6 +172,11 @@ def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
 
             return run_async(_work())
     """
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        return _run_on_worker_loop(_worker_loop, coro)
+
+    celery_async_tasks_total.labels(loop="per_task").inc()
+
     # Reset the database engine to ensure we get fresh connections
     # bound to the new event loop we're about to create
     from app.database import reset_celery_engine
@@ -56,23 +189,8 @@ def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
     try:
         return loop.run_until_complete(coro)
     finally:
-        # Ensure the loop is properly closed, running any pending cleanup
-        try:
-            # Cancel all pending tasks
-            pending = asyncio.all_tasks(loop)
-            for task in pending:
-                task.cancel()
-
-            # Run the loop briefly to let cancellations propagate
-            if pending:
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-
-            # Shutdown async generators
-            loop.run_until_complete(loop.shutdown_asyncgens())
-        except Exception:  # noqa: S110
-            pass
-        finally:
-            loop.close()
+        _finish_after_commit_tasks(loop)
+        _close_loop(loop)
 
         # Clean up the database engine after task completion
         reset_celery_engine()
@@ -199,6 +199,14 @@ celery_app.conf.update(
             "task": "workers.maintenance_tasks.aggregate_llm_usage",
             "schedule": crontab(day_of_month=1, hour=3, minute=0),  # Monthly on 1st at 3 AM
         },
+        "poll-llm-batches": {
+            "task": "workers.ai_tasks.poll_llm_batches",
+            "schedule": timedelta(minutes=5),  # Every 5 minutes - results of offline batch analyses
+        },
+        "cleanup-llm-response-cache": {
+            "task": "workers.maintenance_tasks.cleanup_llm_response_cache",
+            "schedule": crontab(hour=3, minute=15),  # Daily at 3:15 AM
+        },
         "check-llm-budgets-daily": {
             "task": "workers.maintenance_tasks.check_llm_budgets",
             "schedule": crontab(hour=8, minute=0),  # Daily at 8 AM
@@ -226,16 +234,26 @@ def configure_worker(**kwargs):
     """Configure worker process on initialization."""
     # NOTE: We intentionally DO NOT apply nest_asyncio anymore.
     # nest_asyncio was causing issues with asyncpg connections getting
-    # "attached to a different loop". Instead, each task uses run_async()
-    # which creates a fresh event loop per task execution.
+    # "attached to a different loop". Instead, tasks use run_async(), which
+    # runs them on the event loop of the worker process (or a fresh loop per
+    # task if celery_persistent_event_loop is disabled).
+    if settings.celery_persistent_event_loop:
+        from workers.async_runner import start_worker_loop
 
-    # Reset the database engine for this worker process
-    # This ensures each worker has its own connection pool
-    from app.database import reset_celery_engine
+        # Also resets the engine inherited from the parent process
+        start_worker_loop()
+    else:
+        # Reset the database engine for this worker process
+        # This ensures each worker has its own connection pool
+        from app.database import reset_celery_engine
 
-    reset_celery_engine()
+        reset_celery_engine()
 
-    logger.info("worker_process_initialized", pid=kwargs.get("pid"))
+    logger.info(
+        "worker_process_initialized",
+        pid=kwargs.get("pid"),
+        persistent_event_loop=settings.celery_persistent_event_loop,
+    )
 
 
 @worker_process_shutdown.connect
@@ -247,6 +265,13 @@ def cleanup_worker_process(**kwargs):
 
     logger.info("worker_process_shutting_down", pid=kwargs.get("pid"))
 
+    if settings.celery_persistent_event_loop:
+        from workers.async_runner import stop_worker_loop
+
+        # Disposes the engine and the other clients on the loop they were opened in
+        stop_worker_loop()
+        return
+
     try:
         # Create a new event loop for cleanup since the existing one may be closed
         loop = asyncio.new_event_loop()
@@ -273,6 +273,79 @@ def crawl_source(self, source_id: str, job_id: str, force: bool = False):
     run_async(_crawl())
 
 
+async def collect_due_crawls(session, now: datetime) -> list[tuple[str, str, str]]:
+    """Claim categories whose schedule is due and collect the sources to crawl.
+
+    Due categories are selected through ``ix_categories_schedule_due`` and
+    locked with ``FOR UPDATE SKIP LOCKED``, so overlapping scheduler ticks
+    never claim the same category twice. Their ``next_run_at`` is advanced
+    to the next cron fire; a category without ``next_run_at`` (new, or its
+    schedule was just changed) counts as due.
+
+    A source is due when it was crawled before the latest cron fire of its
+    category. Sources that have never been crawled must be started manually
+    first. All due categories are resolved in a single source query.
+
+    Args:
+        session: Session of the caller's transaction (commit after dispatch)
+        now: Current time in the schedule timezone
+
+    Returns:
+        List of (source_id, category_id, schedule_owner_id) tuples
+    """
+    from sqlalchemy import case, or_, select
+
+    from app.models import Category, DataSource, DataSourceCategory, SourceStatus
+    from app.utils.cron import croniter_for_expression
+
+    result = await session.execute(
+        select(Category)
+        .where(
+            Category.schedule_enabled.is_(True),
+            Category.schedule_owner_id.isnot(None),  # Must have owner for API credentials
+            or_(Category.next_run_at.is_(None), Category.next_run_at <= now),
+        )
+        .with_for_update(skip_locked=True)
+    )
+    categories = result.scalars().all()
+    if not categories:
+        return []
+
+    prev_runs: dict = {}
+    owners: dict = {}
+    for category in categories:
+        # Calculate last scheduled run time for this category
+        try:
+            prev_runs[category.id] = croniter_for_expression(category.schedule_cron, now).get_prev(datetime)
+            category.next_run_at = croniter_for_expression(category.schedule_cron, now).get_next(datetime)
+        except Exception as exc:
+            logger.warning(
+                "category_schedule_invalid",
+                category_id=str(category.id),
+                cron=category.schedule_cron,
+                error=str(exc),
+            )
+            continue
+        owners[category.id] = str(category.schedule_owner_id)
+
+    if not prev_runs:
+        return []
+
+    # Get sources via junction table (N:M relationship), compared against
+    # the last scheduled run of their respective category
+    source_result = await session.execute(
+        select(DataSourceCategory.data_source_id, DataSourceCategory.category_id)
+        .join(DataSource, DataSource.id == DataSourceCategory.data_source_id)
+        .where(
+            DataSourceCategory.category_id.in_(list(prev_runs)),
+            DataSource.status.in_([SourceStatus.ACTIVE, SourceStatus.PENDING]),
+            DataSource.last_crawl.isnot(None),
+            DataSource.last_crawl < case(prev_runs, value=DataSourceCategory.category_id),
+        )
+    )
+    return [(str(source_id), str(category_id), owners[category_id]) for source_id, category_id in source_result.all()]
+
+
 @celery_app.task(name="workers.crawl_tasks.check_scheduled_crawls")
 def check_scheduled_crawls():
     """Check for sources due for scheduled crawling.
@@ -280,76 +353,32 @@ def check_scheduled_crawls():
     IMPORTANT: Only processes categories with:
     - schedule_enabled=True
     - schedule_owner_id set (user whose API credentials will be used)
+
+    Idle ticks cost a single index lookup. Due crawls are published as one
+    Celery group before the advanced schedules are committed, so a failed
+    publish leaves the categories due for the next tick.
     """
-    from sqlalchemy import select
+    from celery import group
 
     from app.database import get_celery_session_context
-    from app.models import Category, DataSource, DataSourceCategory, SourceStatus
-    from app.utils.cron import croniter_for_expression, get_schedule_timezone
+    from app.utils.cron import get_schedule_timezone
 
     async def _check():
         async with get_celery_session_context() as session:
-            # Only get categories that have schedule_enabled AND have a schedule_owner
-            result = await session.execute(
-                select(Category).where(
-                    Category.schedule_enabled.is_(True),
-                    Category.schedule_owner_id.isnot(None),  # Must have owner for API credentials
-                )
-            )
-            categories = result.scalars().all()
-
-            jobs_created = 0
-            schedule_tz = get_schedule_timezone()
-            now = datetime.now(schedule_tz)
-
-            for category in categories:
-                # Calculate last scheduled run time for this category
-                try:
-                    prev_run = croniter_for_expression(category.schedule_cron, now).get_prev(datetime)
-                except Exception as exc:
-                    logger.warning(
-                        "category_schedule_invalid",
-                        category_id=str(category.id),
-                        cron=category.schedule_cron,
-                        error=str(exc),
-                    )
-                    continue
-
-                # Get sources via junction table (N:M relationship)
-                source_result = await session.execute(
-                    select(DataSource)
-                    .join(DataSourceCategory, DataSource.id == DataSourceCategory.data_source_id)
-                    .where(
-                        DataSourceCategory.category_id == category.id,
-                        DataSource.status.in_([SourceStatus.ACTIVE, SourceStatus.PENDING]),
-                    )
-                )
-                sources = source_result.scalars().all()
-
-                for source in sources:
-                    # Skip sources that have never been crawled
-                    # They must be started manually first
-                    if not source.last_crawl:
-                        continue
-
-                    # Check if source was crawled recently (within cron interval)
-                    if source.last_crawl >= prev_run:
-                        continue  # Already crawled this period
-
-                    # Create crawl job using schedule owner's credentials
-                    from workers.crawl_tasks import create_crawl_job
-
-                    create_crawl_job.delay(
-                        str(source.id),
-                        str(category.id),
-                        str(category.schedule_owner_id),  # Use schedule owner's API credentials
-                    )
-                    jobs_created += 1
+            now = datetime.now(get_schedule_timezone())
+            due = await collect_due_crawls(session, now)
+
+            if due:
+                # Create crawl jobs using schedule owner's credentials
+                group(
+                    create_crawl_job.s(source_id, category_id, owner_id) for source_id, category_id, owner_id in due
+                ).apply_async()
+            await session.commit()
 
             logger.info(
                 "scheduled_crawl_check_completed",
-                jobs_created=jobs_created,
-                categories_with_schedule=len(categories),
+                jobs_created=len(due),
+                categories_with_due_sources=len({category_id for _, category_id, _ in due}),
             )
 
     run_async(_check())
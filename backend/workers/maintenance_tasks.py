@@ -219,6 +219,34 @@ def seed_model_pricing():
     return run_async(_seed())
 
 
+@celery_app.task(name="workers.maintenance_tasks.cleanup_llm_response_cache")
+def cleanup_llm_response_cache():
+    """Delete expired entries from the LLM response cache.
+
+    Entries older than LLM_RESPONSE_CACHE_TTL_DAYS are no longer served;
+    entries for outdated prompts or models are never hit again and expire
+    the same way.
+    """
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import delete
+
+    from app.config import settings
+    from app.database import get_celery_session_context
+    from app.models.llm_response_cache import LLMResponseCache
+
+    async def _cleanup():
+        cutoff = datetime.now(UTC) - timedelta(days=settings.llm_response_cache_ttl_days)
+        async with get_celery_session_context() as session:
+            result = await session.execute(delete(LLMResponseCache).where(LLMResponseCache.created_at < cutoff))
+            await session.commit()
+
+        logger.info("llm_response_cache_cleaned", deleted=result.rowcount)
+        return {"deleted": result.rowcount}
+
+    return run_async(_cleanup())
+
+
 @celery_app.task(name="workers.maintenance_tasks.aggregate_llm_usage")
 def aggregate_llm_usage():
     """Aggregate old LLM usage records into monthly summaries.
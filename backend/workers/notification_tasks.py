@@ -5,7 +5,7 @@ from typing import Any
 
 import structlog
 
-from workers.async_runner import run_async
+from workers.async_runner import on_worker_loop, run_async
 from workers.celery_app import celery_app
 
 logger = structlog.get_logger()
@@ -45,6 +45,50 @@ def send_notification(self, notification_id: str):
     return result
 
 
+@celery_app.task(name="workers.notification_tasks.send_notification_batch")
+def send_notification_batch(notification_ids: list[str]):
+    """Send a batch of notifications over pooled connections.
+
+    The IDs are sent in chunks of notification_batch_size. Notifications
+    that are no longer pending (or claimed by another worker) are skipped.
+    Failed sends stay pending and are picked up by retry_failed.
+
+    Args:
+        notification_ids: UUIDs of the notifications to send
+    """
+    from app.config import settings
+    from app.database import get_celery_session_context
+    from services.notifications.channels.smtp_pool import close_smtp_pools
+    from services.notifications.notification_service import NotificationService
+
+    chunk_size = settings.notification_batch_size
+
+    async def _send():
+        totals = {"sent": 0, "failed": 0}
+        try:
+            for offset in range(0, len(notification_ids), chunk_size):
+                async with get_celery_session_context() as session:
+                    counts = await NotificationService(session).send_notifications(
+                        notification_ids[offset : offset + chunk_size]
+                    )
+                for key in totals:
+                    totals[key] += counts[key]
+        finally:
+            # The worker loop keeps the sessions for the next task
+            if not on_worker_loop():
+                await close_smtp_pools()
+        return totals
+
+    totals = run_async(_send())
+
+    logger.info(
+        "Notification batch task completed",
+        requested=len(notification_ids),
+        **totals,
+    )
+    return totals
+
+
 @celery_app.task(name="workers.notification_tasks.emit_event")
 def emit_event(event_type: str, payload: dict[str, Any]):
     """Emit a notification event and create notifications for matching rules.
@@ -75,9 +119,9 @@ def emit_event(event_type: str, payload: dict[str, Any]):
 
             notification_ids = await service.emit_event(event, payload)
 
-            # Queue each notification for sending
-            for nid in notification_ids:
-                send_notification.delay(nid)
+            # Queue all notifications of the event as one delivery batch
+            if notification_ids:
+                send_notification_batch.delay(notification_ids)
 
             return notification_ids
 
@@ -162,18 +206,18 @@ def process_digests():
 
                 if pending_count > 0:
                     # TODO: Create and send digest notification
-                    # For now, just send individual notifications
+                    # For now, just send individual notifications (as one batch)
                     pending_result = await session.execute(
-                        select(Notification)
+                        select(Notification.id)
                         .where(
                             Notification.rule_id == rule.id,
                             Notification.status == NotificationStatus.PENDING,
                         )
                         .limit(100)
                     )
-                    for notification in pending_result.scalars():
-                        send_notification.delay(str(notification.id))
-                        processed_count += 1
+                    pending_ids = [str(nid) for nid in pending_result.scalars()]
+                    send_notification_batch.delay(pending_ids)
+                    processed_count += len(pending_ids)
 
                     rule.last_digest_sent = now
 
@@ -204,8 +248,8 @@ def retry_failed():
             service = NotificationService(session)
             notifications = await service.get_failed_for_retry()
 
-            for notification in notifications:
-                send_notification.delay(str(notification.id))
+            if notifications:
+                send_notification_batch.delay([str(notification.id) for notification in notifications])
 
             return len(notifications)
 
@@ -243,30 +287,44 @@ def cleanup_old():
     return count
 
 
+# Upper bound of chunks drained by one send_pending run
+SEND_PENDING_MAX_CHUNKS = 50
+
+
 @celery_app.task(name="workers.notification_tasks.send_pending")
 def send_pending():
     """Send all pending notifications.
 
     This task can be called to process any notifications that
-    are stuck in pending state.
+    are stuck in pending state. It drains them in chunks of
+    notification_batch_size within this task, reusing the pooled SMTP
+    sessions across chunks.
     """
+    from app.config import settings
     from app.database import get_celery_session_context
+    from services.notifications.channels.smtp_pool import close_smtp_pools
     from services.notifications.notification_service import NotificationService
 
     async def _send_pending():
-        async with get_celery_session_context() as session:
-            service = NotificationService(session)
-            notifications = await service.get_pending_notifications()
-
-            for notification in notifications:
-                send_notification.delay(str(notification.id))
-
-            return len(notifications)
+        count = 0
+        try:
+            for _ in range(SEND_PENDING_MAX_CHUNKS):
+                async with get_celery_session_context() as session:
+                    counts = await NotificationService(session).send_notifications()
+                processed = counts["sent"] + counts["failed"]
+                count += processed
+                if processed < settings.notification_batch_size:
+                    break
+        finally:
+            # The worker loop keeps the sessions for the next task
+            if not on_worker_loop():
+                await close_smtp_pools()
+        return count
 
     count = run_async(_send_pending())
 
     logger.info(
         "Send pending task completed",
-        queued_count=count,
+        processed_count=count,
     )
     return count
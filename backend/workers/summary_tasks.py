@@ -161,7 +161,7 @@ def execute_summary_task(self, summary_id: str, triggered_by: str = "manual", tr
         triggered_by: Who/what triggered (manual, cron, crawl_event).
         trigger_details: Additional context (e.g., crawl_job_id).
     """
-    from app.database import get_celery_session_context
+    from app.database import get_celery_session_context, get_celery_session_factory
     from app.models import CustomSummary
     from app.models.custom_summary import SummaryStatus
     from app.models.summary_execution import ExecutionStatus
@@ -195,7 +195,7 @@ def execute_summary_task(self, summary_id: str, triggered_by: str = "manual", tr
             )
 
             try:
-                executor = SummaryExecutor(session)
+                executor = SummaryExecutor(session, session_factory=get_celery_session_factory())
                 execution = await executor.execute_summary(
                     summary_id=UUID(summary_id),
                     triggered_by=triggered_by,
@@ -844,12 +844,13 @@ def check_summary_updates(
             )
 
             # Execute summary with force=True to ensure update
+            from app.database import get_celery_session_factory
             from app.models import CustomSummary
             from services.summaries import SummaryExecutor
 
             summary = await session.get(CustomSummary, UUID(summary_id))
             if summary:
-                executor = SummaryExecutor(session)
+                executor = SummaryExecutor(session, session_factory=get_celery_session_factory())
                 execution = await executor.execute_summary(
                     summary_id=UUID(summary_id),
                     triggered_by="check_updates",